@@ -0,0 +1,144 @@
+// Case Catalogue - renders the SCP case grid on demand
+// Index pages built by `scp index` embed a compact JSON catalogue of every
+// case instead of hard-coded links. Week sections are only turned into DOM
+// when a filter or search first needs them, so first paint does not grow
+// with the number of cases.
+
+class CaseCatalogue {
+  constructor(dataElement, container) {
+    const data = JSON.parse(dataElement.textContent);
+    this.container = container;
+    this.base = data.base;
+
+    this.weeks = data.weeks.map(([number, label, specialties]) => ({
+      number,
+      label,
+      specialties,
+      cases: [],
+      header: null,
+      grid: null
+    }));
+    const weeksByNumber = new Map(this.weeks.map(week => [week.number, week]));
+
+    // fields: id, title, discipline, series, week, n (stable id, see `scp manifest --assign-ids`)
+    this.cases = data.cases.map(([id, title, discipline, series, weekNumber, n = null]) => {
+      const entry = {
+        id,
+        n,
+        title,
+        discipline,
+        classes: discipline.split(' '),
+        series,
+        week: weeksByNumber.get(weekNumber),
+        label: `${id.replace('_', '.')} ${title}`,
+        card: null
+      };
+      entry.searchText = entry.label.toLowerCase();
+      entry.week.cases.push(entry);
+      return entry;
+    });
+    this.byId = new Map(this.cases.map(entry => [entry.id, entry]));
+
+    console.log('[CaseCatalogue] Loaded', this.cases.length, 'cases in', this.weeks.length, 'weeks');
+  }
+
+  /**
+   * Case ids whose card classes include any of `filters`
+   * @param {Array<string>} filters - Specialty class names
+   */
+  idsFor(filters) {
+    const wanted = new Set(filters);
+    return this.cases.filter(entry => entry.classes.some(cls => wanted.has(cls))).map(entry => entry.id);
+  }
+
+  /**
+   * Case ids whose "X.Y Title" label contains `term` (already lower-cased)
+   */
+  search(term) {
+    return this.cases.filter(entry => entry.searchText.includes(term)).map(entry => entry.id);
+  }
+
+  /**
+   * Show exactly the cases in `ids`, rendering any week sections they need
+   * @param {Array<string>} ids - Case ids such as "12_1"
+   * @returns {number} Number of visible cases
+   */
+  show(ids) {
+    const visible = new Set(ids);
+    const renderedCards = [];
+    let firstVisibleWeek = null;
+
+    this.weeks.forEach(week => {
+      const hasCases = week.cases.some(entry => visible.has(entry.id));
+      if (hasCases && !week.header) {
+        this.renderWeek(week, renderedCards);
+      }
+      if (!week.header) return;
+
+      week.header.style.display = hasCases ? 'block' : 'none';
+      week.grid.style.display = hasCases ? 'flex' : 'none';
+      week.header.classList.remove('first-visible-week');
+
+      if (hasCases) {
+        week.cases.forEach(entry => {
+          entry.card.style.display = visible.has(entry.id) ? 'flex' : 'none';
+        });
+        if (!firstVisibleWeek) firstVisibleWeek = week;
+      }
+    });
+
+    if (firstVisibleWeek) {
+      firstVisibleWeek.header.classList.add('first-visible-week');
+    }
+
+    if (renderedCards.length) {
+      // Let completion/flag UIs decorate the new cards
+      if (window.eventBus) {
+        window.eventBus.emit('catalogue:rendered', { cards: renderedCards });
+      }
+      window.dispatchEvent(new CustomEvent('caseCatalogueRendered', { detail: { cards: renderedCards } }));
+    }
+
+    return visible.size;
+  }
+
+  renderWeek(week, renderedCards) {
+    const header = document.createElement('div');
+    header.className = 'week';
+    header.dataset.specialties = week.specialties.join(' ');
+    header.textContent = `Week ${week.number} - ${week.label}`;
+
+    const grid = document.createElement('div');
+    grid.className = 'case-grid';
+
+    week.cases.forEach(entry => {
+      const card = document.createElement('a');
+      card.href = `${this.base}case${entry.id}.html`;
+      card.className = `case-card ${entry.discipline}`;
+      const title = document.createElement('h3');
+      title.textContent = entry.label;
+      card.appendChild(title);
+      grid.appendChild(card);
+      entry.card = card;
+      renderedCards.push(card);
+    });
+
+    // Keep weeks in manifest order regardless of render order
+    const nextWeek = this.weeks.slice(this.weeks.indexOf(week) + 1).find(w => w.header);
+    const fragment = document.createDocumentFragment();
+    fragment.appendChild(header);
+    fragment.appendChild(grid);
+    this.container.insertBefore(fragment, nextWeek ? nextWeek.header : null);
+
+    week.header = header;
+    week.grid = grid;
+  }
+}
+
+(function initCaseCatalogue() {
+  const dataElement = document.getElementById('caseCatalogue');
+  const container = document.getElementById('scpsMainContent');
+  if (dataElement && container) {
+    window.caseCatalogue = new CaseCatalogue(dataElement, container);
+  }
+})();
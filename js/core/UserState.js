@@ -0,0 +1,161 @@
+// UserState.js - Packed per-user completion and flag state
+// `scp userstate migrate` folds a user's per-case progress and flag documents
+// into one `state` map on users/{uid}: three bitsets indexed by the stable
+// ids `scp manifest --assign-ids` gives every case. Case n is bit n; question
+// q of case n is bit n * QUESTION_STRIDE + q - 1. Bits are LSB-first within
+// each byte and trailing zero bytes are dropped, so a student's whole
+// dashboard is one small document read instead of one read per completed
+// case or flag.
+//
+// Users whose state has not been migrated have no version 2 `state`, and
+// CompletionModule/FlagModule keep using the per-case documents for them.
+//
+// Exam flags are not part of this state. An exam page saves every question's
+// answer and flag together in users/{uid}/exams/{examId}, one document per
+// exam that the page reads anyway and `scp items` reads for its flag rates,
+// so there is no per-flag document to fold away.
+
+const UserState = {
+  VERSION: 2,
+  QUESTION_STRIDE: 16, // case pages have at most 10 questions
+  FIELDS: ['completed', 'caseFlags', 'questionFlags'],
+
+  _ids: null,
+  _loading: null,
+
+  /**
+   * Stable ids from the index page's case catalogue (js/case-catalogue.js)
+   */
+  catalogue() {
+    if (!this._ids) {
+      const cases = window.caseCatalogue ? window.caseCatalogue.cases : [];
+      const byId = new Map();
+      const byNumber = new Map();
+      cases.forEach(entry => {
+        if (entry.n === null || entry.n === undefined) return;
+        byId.set(entry.id, entry.n);
+        byNumber.set(entry.n, entry.id);
+      });
+      this._ids = { byId, byNumber };
+    }
+    return this._ids;
+  },
+
+  /**
+   * Stable id of a case, or null if this page's catalogue does not list it
+   * @param {string} caseId - "1_1" or "year3_1_1"
+   */
+  caseNumber(caseId) {
+    const n = this.catalogue().byId.get(String(caseId).replace(/^year\d+_/, ''));
+    return n === undefined ? null : n;
+  },
+
+  /**
+   * Case id ("1_1") for a stable id, or null if it belongs to another year
+   */
+  caseIdFor(n) {
+    return this.catalogue().byNumber.get(n) || null;
+  },
+
+  /**
+   * Bit of a case question in the questionFlags bitset, or null
+   */
+  questionBit(caseId, questionNumber) {
+    const n = this.caseNumber(caseId);
+    if (n === null || questionNumber < 1 || questionNumber > this.QUESTION_STRIDE) return null;
+    return n * this.QUESTION_STRIDE + questionNumber - 1;
+  },
+
+  /**
+   * All case ids of this page's catalogue, as bits
+   */
+  catalogueBits() {
+    return Array.from(this.catalogue().byNumber.keys());
+  },
+
+  /**
+   * @param {Uint8Array} bytes
+   * @returns {Set<number>} Set bit indices
+   */
+  decode(bytes) {
+    const bits = new Set();
+    for (let i = 0; i < bytes.length; i++) {
+      const byte = bytes[i];
+      if (!byte) continue;
+      for (let b = 0; b < 8; b++) {
+        if (byte & (1 << b)) bits.add(i * 8 + b);
+      }
+    }
+    return bits;
+  },
+
+  /**
+   * @param {Iterable<number>} bits - Set bit indices
+   * @returns {Uint8Array} Packed bytes without trailing zero bytes
+   */
+  encode(bits) {
+    let size = 0;
+    for (const bit of bits) size = Math.max(size, (bit >> 3) + 1);
+    const bytes = new Uint8Array(size);
+    for (const bit of bits) bytes[bit >> 3] |= 1 << (bit & 7);
+    return bytes;
+  },
+
+  /**
+   * Read a user's packed state. Both progress modules ask at sign-in, so the
+   * document is read once per user.
+   * @returns {Promise<Object|null>} { completed, caseFlags, questionFlags } as Sets,
+   *   or null if the user has not been migrated
+   */
+  load(db, uid) {
+    if (!this._loading || this._loading.uid !== uid) {
+      const promise = db.collection('users').doc(uid).get().then(doc => this.fromDoc(doc.exists ? doc.data() : null));
+      promise.catch(() => {
+        if (this._loading && this._loading.promise === promise) this._loading = null;
+      });
+      this._loading = { uid, promise };
+    }
+    return this._loading.promise;
+  },
+
+  fromDoc(data) {
+    const stored = data && data.state;
+    if (!stored || stored.version !== this.VERSION) return null;
+    const state = {};
+    this.FIELDS.forEach(field => {
+      state[field] = stored[field] ? this.decode(stored[field].toUint8Array()) : new Set();
+    });
+    return state;
+  },
+
+  /**
+   * Set or clear bits of one field in a transaction, so concurrent updates
+   * from other tabs and devices are kept
+   * @param {string} field - One of FIELDS
+   * @param {Array<number>} bits
+   * @param {boolean} on
+   */
+  async update(db, uid, field, bits, on) {
+    if (!bits.length) return;
+    const userRef = db.collection('users').doc(uid);
+    await db.runTransaction(async transaction => {
+      const state = this.fromDoc((await transaction.get(userRef)).data());
+      if (!state) throw new Error('User state is not packed');
+      bits.forEach(bit => (on ? state[field].add(bit) : state[field].delete(bit)));
+      transaction.set(userRef, {
+        state: { [field]: firebase.firestore.Blob.fromUint8Array(this.encode(state[field])) }
+      }, { merge: true });
+    });
+    this._loading = null;
+  },
+
+  /**
+   * Forget the cached document (on sign out)
+   */
+  reset() {
+    this._loading = null;
+  }
+};
+
+// Export for CompletionModule and FlagModule
+window.UserState = UserState;
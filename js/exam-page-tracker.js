@@ -63,6 +63,13 @@
 
       console.log('[Exam Tracker] Tracking resource view:', resourceId, resourceTitle, resourceType);
 
+      // Batched through the analytics gateway when one is configured
+      const beacon = window.userAnalytics?.beacon;
+      if (beacon) {
+        beacon.push({ type: 'exam_view', resourceId, title: resourceTitle, resourceType });
+        return;
+      }
+
       // Track in user's document
       const userRef = db.collection('users').doc(user.uid);
       await userRef.set({
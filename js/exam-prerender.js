@@ -0,0 +1,50 @@
+// Exam Prerender - rebuilds examData from markup generated by `scp prerender`
+// Exam pages ship their questions as static HTML: the first question is
+// already rendered in #questionContainer and every question is stored in
+// an inert <template id="examQuestions">. Reading the data back from that
+// markup means no question data has to be downloaded and parsed as
+// JavaScript before the page can paint.
+
+window.ExamPrerender = {
+  hydrate(container) {
+    const template = container.querySelector('template#examQuestions');
+    if (!template) {
+      console.error('[Exam] No prerendered questions found - run `scp prerender`');
+      return { title: document.title, totalQuestions: 0, questions: [] };
+    }
+
+    const isSaq = template.dataset.kind === 'saq';
+    const questions = Array.from(template.content.querySelectorAll('article'), article => {
+      const items = Array.from(article.querySelectorAll('li'), li => li.textContent);
+      const question = {
+        id: Number(article.dataset.id),
+        text: article.querySelector('p').textContent,
+        flagged: false
+      };
+
+      if (isSaq) {
+        question.subQuestions = items;
+        question.answer = '';
+        return question;
+      }
+
+      question.options = items;
+      question.selectedAnswer = null;
+      if (article.dataset.correct !== undefined) {
+        question.correctAnswer = Number(article.dataset.correct);
+      }
+      const image = article.querySelector('img');
+      question.hasImage = Boolean(image);
+      if (image) {
+        question.imageUrl = image.getAttribute('src');
+      }
+      return question;
+    });
+
+    return {
+      title: template.dataset.title,
+      totalQuestions: questions.length,
+      questions
+    };
+  }
+};
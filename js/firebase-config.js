@@ -35,6 +35,11 @@ try {
   console.log('The app will continue to work using localStorage only.');
 }
 
+// Analytics gateway (`scp ingest serve`), e.g. 'https://ingest.example.com/v1/beacon'.
+// When set, user-analytics.js batches its events into beacons for the gateway
+// instead of writing each one to Firestore; leave empty to write directly.
+window.analyticsGatewayUrl = '';
+
 // Export for use in other modules (may be undefined if Firebase not initialized)
 window.firebaseApp = app;
 window.firebaseAuth = auth;
@@ -1,2473 +0,0 @@
-// All MCQs from 2022, 2023 & 2024 with Answers!
-// Complete extraction from MCQ.docx - ALL questions included
-
-const examData = {
-  title: "All MCQs from 2022, 2023 & 2024 with Answers!",
-  totalQuestions: 176,
-  questions: [
-    {
-      id: 1,
-      text: "A 32-year-old woman undergoes an emergency Caesarean section under general anaesthesia. Twelve hours later she develops tachypnoea, coarse rhonchi and rales on auscultation, and decreased breath sounds in the right lower zone. Chest X-ray shows patchy infiltrates consistent with aspiration pneumonitis. Which pre-operative or peri-extubation measure would have been most effective in preventing this complication?",
-      options: [
-        "Administration of ranitidine or another H₂-receptor antagonist pre-operatively",
-        "Regional (neuraxial) anaesthesia instead of general anaesthesia",
-        "Routine nasogastric tube suctioning prior to induction",
-        "Extubation in a deep plane of anaesthesia",
-        "Extubation while heavily sedated but spontaneously breathing",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 2,
-      text: "A 23-year-old sexually active woman presents with lower abdominal pain, cervical motion tenderness, dysuria, mucopurulent cervical discharge, and cervical erythema. She has multiple sexual partners and is awaiting culture results. What is the most appropriate empiric antibiotic option?",
-      options: [
-        "Doxycycline",
-        "Azithromycin",
-        "Metronidazole",
-        "Clindamycin",
-        "Ciprofloxacin",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 3,
-      text: "A patient with a known history of Barrett’s oesophagus presents with progressive dysphagia and weight loss. Endoscopy reveals a distal oesophageal mass. What is the most likely type of cancer?",
-      options: [
-        "Adenocarcinoma",
-        "Squamous",
-        "Adenosquamous",
-        "Small cell",
-        "Basal cell",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 4,
-      text: "A 48-year-old woman is found to have a 20-mm isolated thyroid nodule on ultrasound. She is euthyroid, and the nodule is solid and hypoechoic with irregular margins. What is the most likely underlying thyroid cancer?",
-      options: [
-        "Papillary",
-        "Medullary",
-        "Follicular",
-        "Anaplastic",
-        "Lymphoma",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 5,
-      text: "A premature infant with rapidly rising bilirubin levels becomes pale, lethargic, and develops seizures. What is the most likely diagnosis?",
-      options: [
-        "Kernicterus",
-        "Intraventricular haemorrhage",
-        "Meningitis",
-        "Encephalitis",
-        "Hypoglycaemia",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 6,
-      text: "A woman is overly dramatic, seeks attention, dresses provocatively, and becomes upset when criticised. She frequently dominates conversations talking about herself. What is the most likely diagnosis?",
-      options: [
-        "Bipolar disorder",
-        "Histrionic personality disorder",
-        "Borderline personality disorder",
-        "Antisocial personality disorder",
-        "Narcissistic personality disorder",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 7,
-      text: "A gardener develops a linear line of vesicles along the lateral forearm after clearing plants. What pattern best describes this cutaneous eruption?",
-      options: [
-        "Spinal nerve distribution",
-        "Subcutaneous tract",
-        "Dorsal root ganglion distribution",
-        "Dermal plexus",
-        "Epidermal (Koebner/isomorphic) pattern",
-      ],
-      correctAnswer: 4,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 8,
-      text: "A patient presents with tonsillar membranes, generalised lymphadenopathy, and hepatosplenomegaly. Which investigation is most appropriate?",
-      options: [
-        "Antistreptolysin O titre",
-        "Bone marrow aspirate",
-        "Peripheral smear showing atypical lymphocytes",
-        "CMV IgM serology",
-        "Sick test",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 9,
-      text: "A child has a fixed split S2 and a systolic murmur loudest at the left upper sternal border. What is the most likely diagnosis?",
-      options: [
-        "Ventricular septal defect",
-        "Atrial septal defect",
-        "Pulmonary stenosis",
-        "Aortic stenosis",
-        "Tetralogy of Fallot",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 10,
-      text: "A patient on methotrexate for rheumatoid arthritis requires routine monitoring. Which investigation is required most regularly?",
-      options: [
-        "Biweekly LFTs",
-        "Quarterly renal function tests",
-        "Chest X-ray every 6 months",
-        "Ophthalmoscopy every 2 years",
-        "Monthly full blood count (FBC)",
-      ],
-      correctAnswer: 4,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 11,
-      text: "A patient has blood results consistent with clear megaloblastic anaemia. What is the most likely underlying cause?",
-      options: [
-        "Crohn’s disease",
-        "Methotrexate use",
-        "Ulcerative cholitis",
-        "Alcohol excess",
-        "Hypothyroidism",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 12,
-      text: "A 12-year-old has severe localised right lower quadrant pain. ABG shows severe metabolic acidosis, but vitals are stable. What is the most likely diagnosis?",
-      options: [
-        "DKA",
-        "Appendicitis",
-        "Mesenteric lymphadenitis",
-        "Infectious gastroenteritis",
-        "Constipation",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 13,
-      text: "A man presents with lower urinary tract symptoms suggestive of BPH. What investigation should be obtained first?",
-      options: [
-        "Prostate ultrasound",
-        "PSA level",
-        "MRI prostate",
-        "Urodynamic studies",
-        "Cystoscopy",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 14,
-      text: "A patient with long-standing ulcerative colitis (11 years) presents with pruritus, painless jaundice, and a markedly enlarged gallbladder. What is the most likely diagnosis?",
-      options: [
-        "Cholangiocarcinoma",
-        "Cholestasis of liver disease",
-        "Pancreatic head carcinoma",
-        "Periampullary obstruction",
-        "Benign biliary strictures",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 15,
-      text: "An 80-year-old woman is confused and has urinalysis consistent with a UTI. What is the most appropriate management?",
-      options: [
-        "Reassurance only",
-        "Oral antibiotics",
-        "IV antibiotics",
-        "Delay treatment until culture returns",
-        "Admit for observation only",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 16,
-      text: "A patient with multiple suicide attempts presents again with suicidal ideation. What is the most likely underlying diagnosis?",
-      options: [
-        "Major depressive disorder",
-        "Bipolar disorder",
-        "Schizophrenia",
-        "Borderline personality disorder",
-        "PTSD",
-      ],
-      correctAnswer: 3,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 17,
-      text: "A fetus dies in utero due to hydrops fetalis. What is the most likely cause?",
-      options: [
-        "Parvovirus B19",
-        "Rubella",
-        "Toxoplasmosis",
-        "CMV",
-        "Syphilis",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 18,
-      text: "A woman develops fever 5 days after a hysterectomy. She has lower abdominal pain but no signs of UTI. What is the most likely cause?",
-      options: [
-        "Pelvic abscess",
-        "Wound infection",
-        "Atelectasis",
-        "Catheter-associated UTI",
-        "DVT",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 19,
-      text: "Within 24 hours post-oesophagectomy, a patient develops fever. What is the most likely cause?",
-      options: [
-        "Atelectasis",
-        "Pneumonia",
-        "Anastomotic leak",
-        "Empyema",
-        "Mediastinitis",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 20,
-      text: "A young boy develops an urticarial rash shortly after visiting a friend’s house. No airway compromise, no tongue swelling, and stable vitals. What is the most appropriate management?",
-      options: [
-        "Refer to allergist",
-        "Steroid cream",
-        "Oral antihistamine",
-        "Oral steroids",
-        "Epinephrine",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 21,
-      text: "An infant has poor head control, tongue fasciculations, and absent deep tendon reflexes. What is the most likely site of pathology?",
-      options: [
-        "Neuromuscular junction",
-        "Anterior horn cells",
-        "Peripheral nerves",
-        "Muscle fibres",
-        "Motor end plate",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 22,
-      text: "A child has 4 days of fever exceeding 40°C. On day 5, the fever abruptly resolves and a blanching rash appears. What is the most likely diagnosis?",
-      options: [
-        "Erythema infectiosum",
-        "Roseola infantum",
-        "Measles",
-        "Scarlet fever",
-        "Viral exanthem NOS",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 23,
-      text: "A patient has chronic scaly plaques suspicious for psoriasis. What investigation confirms the diagnosis?",
-      options: [
-        "HLA-B27 testing",
-        "Rheumatoid factor",
-        "Biopsy of psoriatic plaque",
-        "ANA",
-        "ESR",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 24,
-      text: "A patient has classic symptoms of candidiasis with thick \"cottage cheese\" discharge. What finding is consistent on microscopy?",
-      options: [
-        "Clue cells >20%",
-        "Brown agar growth",
-        "Pseudohyphae",
-        "Sick test",
-        "Motile trichomonads",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 25,
-      text: "A young adult sustains a sports injury with suspected ACL rupture. What is the best imaging modality?",
-      options: [
-        "MRI",
-        "Ultrasound",
-        "X-ray",
-        "Bone scan",
-        "CT knee",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 26,
-      text: "A patient lands on a flexed knee and develops medial joint line tenderness, mild swelling, pain on deep flexion, and inability to fully extend. What is the most likely diagnosis?",
-      options: [
-        "ACL tear",
-        "MCL sprain",
-        "Patellar dislocation",
-        "Meniscus tear",
-        "Tibial plateau fracture",
-      ],
-      correctAnswer: 3,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 27,
-      text: "A patient presents with a unilateral erythematous, swollen hand. He has a history of severe podagra affecting the big toe in the past. What is the most likely diagnosis?",
-      options: [
-        "Gout",
-        "Rheumatoid arthritis",
-        "Complex regional pain syndrome",
-        "Cellulitis",
-        "Psoriatic arthritis",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 28,
-      text: "Dorsalis pedis and posterior tibial pulses are absent on the left. Which vessel is most likely occluded?",
-      options: [
-        "Popliteal artery",
-        "Common femoral artery",
-        "Posterior tibial artery",
-        "Superficial femoral artery",
-        "Abdominal aorta",
-      ],
-      correctAnswer: 3,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 29,
-      text: "A woman with widespread body pain, fatigue, sleep disturbance, and tender trigger points is diagnosed with fibromyalgia. What is the next best step in management?",
-      options: [
-        "CBT and amitriptyline",
-        "RF and ANA testing",
-        "Opioids",
-        "Stress leave certificate",
-        "Spinal X-ray",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 30,
-      text: "A 22-year-old man presents with hyperpigmentation, hyponatraemia, hyperkalaemia, mild dehydration, and fatigue. He has a family history of pancreatic cancer but no weight loss. What is the most likely diagnosis?",
-      options: [
-        "Type 1 diabetes",
-        "Type 2 diabetes",
-        "Addison’s disease",
-        "Pancreatic cancer",
-        "Sun-exposure related dehydration",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 31,
-      text: "A breastfeeding woman presents with fever, breast pain, redness, and tenderness. What is the best management?",
-      options: [
-        "Reassure this is normal",
-        "Stop breastfeeding on the affected side",
-        "Oral flucloxacillin",
-        "Paracetamol alone",
-        "Apply ice packs only",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 32,
-      text: "A pregnant woman is exposed to her grandmother who has active shingles. What is the correct management?",
-      options: [
-        "Education only",
-        "ZIG for all exposures",
-        "ZIG if seronegative for varicella",
-        "Immediate delivery",
-        "Empiric oral acyclovir",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 33,
-      text: "A man reports exertional leg pain and also waking at night with chest pain. His ECG shows T-wave inversions. What is the most likely diagnosis?",
-      options: [
-        "Unstable angina",
-        "Peripheral arterial disease",
-        "Aortic aneurysm",
-        "Heart failure",
-        "Prinzmetal angina",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 34,
-      text: "A woman presents with an inguinal lump that previously came and went. Now it is firm, tender, erythematous, and irreducible. Vitals are stable. What is the next best step?",
-      options: [
-        "Urgent surgical referral",
-        "CT abdomen",
-        "Ultrasound",
-        "Fine needle biopsy",
-        "Watch and wait",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 35,
-      text: "A cervical screening test reveals high-grade abnormalities. What is the next step?",
-      options: [
-        "Colposcopy + biopsy",
-        "Repeat CST in 6 months",
-        "Hysterectomy",
-        "HPV vaccination",
-        "Pelvic ultrasound",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 36,
-      text: "A man with alcohol dependence and pneumonia presents with wide-based gait and ocular abnormalities. What is the immediate management?",
-      options: [
-        "IV thiamine",
-        "Oral benzodiazepine",
-        "High-flow oxygen",
-        "IV dextrose",
-        "CT brain",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 37,
-      text: "A woman complains excessively and dramatically about the price of groceries. (Stem suggested exaggerated emotional expression.) What is the most likely option?",
-      options: [
-        "Reasonable concern",
-        "Unreasonable concern",
-        "Histrionic personality disorder",
-        "PCOS",
-        "OCD",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 38,
-      text: "A woman is allergic to cats. What is the most appropriate investigation?",
-      options: [
-        "Allergy testing",
-        "Iron studies",
-        "Full blood count",
-        "Spirometry",
-        "ECG",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 39,
-      text: "Blood test: pancytopenia. What is the most likely diagnosis?",
-      options: [
-        "Aplastic anaemia",
-        "Immune thrombocytopaenia",
-        "Thrombotic thrombocytopaenia",
-        "Acute haemolysis",
-        "Polycythaemia vera",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 40,
-      text: "A woman has worsening migraines over 6 months with aura, nausea, and vomiting. What is the next step?",
-      options: [
-        "Prophylaxis with beta-blocker",
-        "Acute triptan therapy",
-        "MRI brain",
-        "Referral to neurologist",
-        "Oral paracetamol",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 41,
-      text: "A man presents to ED with BP ~160 systolic, signs of LVH on ECG, and pulmonary oedema. What is the most appropriate management of the pulmonary oedema?",
-      options: [
-        "IV diuretics",
-        "IV sodium nitroprusside",
-        "IV beta-blocker",
-        "Oral ACE inhibitor",
-        "Chest physiotherapy",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 42,
-      text: "A patient presents with suspected sleep apnoea: daytime somnolence, morning headaches, loud snoring, high Epworth score. What is the next investigation?",
-      options: [
-        "Repeat Epworth questionnaire",
-        "Sleep study",
-        "Spirometry",
-        "Overnight oximetry only",
-        "Sleep diary",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 43,
-      text: "A smoker and drinker presents with right lower lobe consolidation, high WBC count, and left shift. What is the most likely cause?",
-      options: [
-        "Bacterial pneumonia with alveolar consolidation",
-        "Viral pneumonia",
-        "Aspiration from reflux",
-        "Heart failure",
-        "Pulmonary embolism",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 44,
-      text: "A man believes “like the Terminator movie” that someone will kill him and then the rest of the world after. What type of delusion is this?",
-      options: [
-        "Persecutory delusion",
-        "Grandiose delusion",
-        "Nihilistic delusion",
-        "Somatic delusion",
-        "Thought broadcasting",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 45,
-      text: "A woman with severe depressive episodes and episodes of mania is admitted after stopping medication. What is the appropriate long-term treatment?",
-      options: [
-        "SSRI",
-        "SNRI",
-        "Antipsychotic only",
-        "Lithium",
-        "Diazepam",
-      ],
-      correctAnswer: 3,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 46,
-      text: "A woman has lifelong low mood that has worsened over 2 years with worthlessness and psychomotor slowing. What is the most likely diagnosis?",
-      options: [
-        "Dysthymia",
-        "Major depressive disorder",
-        "Cyclothymia",
-        "Adjustment disorder",
-        "Borderline personality disorder",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 47,
-      text: "A woman with known “chocolate cysts” (endometriomas). What is she at risk for?",
-      options: [
-        "Infertility",
-        "PCOS",
-        "Ovarian torsion",
-        "Cervical cancer",
-        "Thyroid dysfunction",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 48,
-      text: "A woman with primary infertility; husband’s semen is normal. Her cycles are 45–90 days apart with no signs of hyperandrogenism. What is the likely cause?",
-      options: [
-        "PCOS",
-        "Tubal infertility",
-        "Endometriosis",
-        "Husband’s age",
-        "Ovulatory dysfunction",
-      ],
-      correctAnswer: 4,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 49,
-      text: "A woman with oligomenorrhoea, multiple cystic ovarian lesions, a palpable RIF mass, and dyspareunia. What is the most likely diagnosis?",
-      options: [
-        "PCOS",
-        "Endometriomas",
-        "Dermoid cyst",
-        "Functional ovarian cyst",
-        "Ovarian torsion",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 50,
-      text: "A pregnant woman with acute RLQ pain consistent with appendicitis; CTG is normal. What is the next step?",
-      options: [
-        "Urgent surgical review",
-        "Ultrasound for abruption",
-        "CT abdomen",
-        "Tocolysis",
-        "Observe for 24 hours",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 51,
-      text: "A woman at 31 weeks is measuring 27 cm, unchanged for 4 weeks. Dating scan was done early. What is the most likely cause?",
-      options: [
-        "Incorrect dating",
-        "IUGR",
-        "Fibroids",
-        "Twins",
-        "Polyhydramnios",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 52,
-      text: "VBAC: G2P1, spontaneous labour, 4 cm dilated, 1.5 cm effaced, CTG normal, BP 130/80, membranes intact, no scar tenderness. What is the correct management?",
-      options: [
-        "Immediate C-section",
-        "Induce with oxytocin",
-        "Artificial rupture of membranes",
-        "Give 1000 mL fluids",
-        "Continue labour with standard partogram",
-      ],
-      correctAnswer: 4,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 53,
-      text: "A CTG trace is shown. The options include patterns and features. What is the correct interpretation?",
-      options: [
-        "Sinusoidal pattern",
-        "3 in 10 contractions",
-        "Normal variability",
-        "Late decelerations",
-        "Fetal tachycardia",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 54,
-      text: "A 46-year-old woman has heavy, irregular periods and reports fatigue and difficulty concentrating at work. What is the most appropriate initial investigation?",
-      options: [
-        "FSH",
-        "TSH",
-        "Pelvic ultrasound",
-        "Serum prolactin",
-        "Iron studies",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 55,
-      text: "A 16-month-old child has 10 days of fever, increased urinary frequency, poor feeding, and signs of circulatory compromise. What is the likely diagnosis?",
-      options: [
-        "DKA",
-        "Sepsis",
-        "Pyloric stenosis",
-        "Viral gastroenteritis",
-        "Nephrotic syndrome",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 56,
-      text: "A 10-month-old with suspected rickets presents with bowed legs. What X-ray finding is expected?",
-      options: [
-        "Metaphyseal cupping and fraying",
-        "Lytic bone tumours",
-        "Mixed old and new bone lesions",
-        "New bone formation with sclerosis",
-        "Periosteal elevation",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 57,
-      text: "A 10-year-old develops sudden, severe generalised abdominal pain that later localises to the RLQ. ABG shows severe metabolic acidosis and very low base excess. What is the most likely diagnosis?",
-      options: [
-        "DKA",
-        "Appendicitis",
-        "Mesenteric adenitis",
-        "Intussusception",
-        "Bowel obstruction",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 58,
-      text: "A 16-year-old very thin vegetarian girl presents with 5 months of amenorrhoea. What is the most likely diagnosis?",
-      options: [
-        "PCOS",
-        "Hyperprolactinaemia",
-        "Thyroid disease",
-        "Anorexia nervosa",
-        "Functional hypothalamic amenorrhoea unrelated to weight",
-      ],
-      correctAnswer: 3,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 59,
-      text: "A child presents with purulent, foul-smelling vaginal discharge. What is the most likely diagnosis?",
-      options: [
-        "Foreign body in the vagina",
-        "Candida infection",
-        "Trichomonas",
-        "Physiological discharge",
-        "UTI",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 60,
-      text: "A patient with bowed legs is suspected to have Paget’s disease. What would be seen on X-ray?",
-      options: [
-        "Diffuse osteosclerosis",
-        "Metaphyseal cupping",
-        "Widened epiphyseal plates",
-        "Pencil-in-cup deformities",
-        "Patchy osteopenia only",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 61,
-      text: "A patient has fever, diarrhoea and bloody stools. What is the most likely pathogen?",
-      options: [
-        "Campylobacter",
-        "Rotavirus",
-        "Norovirus",
-        "Giardia",
-        "E. coli (ETEC)",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 62,
-      text: "A man with hypersplenism undergoes splenectomy. For how long is he at increased risk of infection?",
-      options: [
-        "Less than 1 year",
-        "1–2 years",
-        "5–10 years",
-        "More than 10 years",
-        "Lifetime protection from vaccines negates risk",
-      ],
-      correctAnswer: 3,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 63,
-      text: "A 3-year-old has maroon-coloured stool and hypotension. What is the most likely diagnosis?",
-      options: [
-        "Ulcerative colitis",
-        "Diverticular disease",
-        "Angiodysplasia",
-        "Intussusception",
-        "Meckel’s diverticulum",
-      ],
-      correctAnswer: 4,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 64,
-      text: "A boy with drooling, fever, and toxicity is suspected to have acute epiglottitis. What is the treatment?",
-      options: [
-        "Inhaled adrenaline",
-        "Systemic steroids + airway management + IV antibiotics",
-        "Oral corticosteroids",
-        "Observe only",
-        "Antihistamines",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 65,
-      text: "An elderly nursing home resident is mentally alert but has vomiting, distension, and a tender groin lump below the inguinal ligament. What is the most essential next step?",
-      options: [
-        "Urgent surgical referral",
-        "CT abdomen",
-        "Ultrasound of lump",
-        "Continue NG + fluids only",
-        "Manual reduction",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 66,
-      text: "An abdominal X-ray (image described) showed a massively dilated inverted-U loop of bowel with “coffee-bean” sign. What is the diagnosis?",
-      options: [
-        "Sigmoid volvulus",
-        "Caecal volvulus",
-        "Small bowel obstruction",
-        "Paralytic ileus",
-        "Toxic megacolon",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 67,
-      text: "A pregnant woman has low folate levels. What is the fetus at increased risk of?",
-      options: [
-        "Cleft palate",
-        "Heart defects",
-        "Neural tube defects",
-        "Gastroschisis",
-        "Preterm birth",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 68,
-      text: "A patient presents with a heart murmur and back pain. Which test would help confirm the suspected inflammatory condition?",
-      options: [
-        "RF",
-        "HLA-B27",
-        "ESR",
-        "ANA",
-        "Troponin",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 69,
-      text: "A grade 2 systolic murmur at the left sternal edge with a split second heart sound. What is the most likely diagnosis?",
-      options: [
-        "Pulmonary valve stenosis",
-        "Aortic stenosis",
-        "Mitral regurgitation",
-        "VSD",
-        "ASD",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 70,
-      text: "A girl has a red rash involving her cheeks and extending to the throat, with sparing of the nasolabial folds. What is the diagnosis?",
-      options: [
-        "Erythema roseolum",
-        "Erythema infectiosum (Parvovirus B19)",
-        "Rubella",
-        "Roseola infantum",
-        "Fifth disease",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 71,
-      text: "Which vaccine should be given to a pregnant woman in addition to influenza?",
-      options: [
-        "Varicella",
-        "DTP (pertussis component)",
-        "Pneumococcal",
-        "Hepatitis A",
-        "MMR",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 72,
-      text: "Crocodile tears syndrome (lacrimation when eating) is caused by a lesion of which nerve?",
-      options: [
-        "Facial nerve (CN VII)",
-        "Oculomotor nerve",
-        "Glossopharyngeal nerve",
-        "Trigeminal nerve",
-        "Vagus nerve",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 73,
-      text: "A person is convinced they have HIV despite no symptoms, three negative tests, and reassurance from multiple doctors. What is the most likely diagnosis?",
-      options: [
-        "Illness anxiety disorder",
-        "Generalised anxiety disorder",
-        "Somatic symptom disorder",
-        "Factitious disorder",
-        "Delusional disorder (somatic type)",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 74,
-      text: "A woman with symptoms consistent with PCOS needs FSH/LH testing. When is the correct time to perform this test?",
-      options: [
-        "Today",
-        "Day 3 of the menstrual cycle",
-        "In 1 week",
-        "Day 10 of cycle",
-        "Immediately before menstruation",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 75,
-      text: "One twin has oligohydramnios and the other polyhydramnios. What is the reason?",
-      options: [
-        "Twin-to-twin transfusion syndrome",
-        "Different growth rates",
-        "Placental insufficiency",
-        "Twin reversed arterial perfusion",
-        "Discordant chromosomal abnormalities",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 76,
-      text: "A child with fever has metabolic acidosis on ABG. What is the most likely cause?",
-      options: [
-        "Diabetic ketoacidosis",
-        "Sepsis",
-        "Renal tubular acidosis",
-        "Viral illness",
-        "Dehydration",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 77,
-      text: "A woman with 8-week amenorrhoea, urinary frequency, and a history of two ectopic pregnancies. What is the most likely cause of this episode?",
-      options: [
-        "Ectopic pregnancy",
-        "PID",
-        "Molar pregnancy",
-        "Early miscarriage",
-        "Implantation bleeding",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 78,
-      text: "A patient has facial droop, facial muscle weakness, and ipsilateral hearing loss. Where is the lesion?",
-      options: [
-        "Inferior pons",
-        "Cerebellopontine angle",
-        "Stylomastoid foramen",
-        "Temporal bone apex",
-        "Internal auditory canal",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 79,
-      text: "A patient with Addison’s disease presents. What is the correct treatment adjustment?",
-      options: [
-        "Increase hydrocortisone and maintain fludrocortisone",
-        "Increase fludrocortisone and maintain hydrocortisone",
-        "Stop fludrocortisone",
-        "Start dexamethasone only",
-        "IV insulin",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 80,
-      text: "A woman has amenorrhoea, cold peripheries, bradycardia (HR 60), BMI 16. What is the most likely cause?",
-      options: [
-        "Hypothyroidism",
-        "Pituitary tumour",
-        "Cushing’s syndrome",
-        "Anorexia nervosa",
-        "Hyperprolactinaemia",
-      ],
-      correctAnswer: 3,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 81,
-      text: "Which medication combination is most likely to cause proximal myopathy?",
-      options: [
-        "Perindopril + amiloride",
-        "Perindopril + indapamide",
-        "Perindopril + paracetamol",
-        "Perindopril + celecoxib",
-        "Perindopril + metformin",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 82,
-      text: "Which antihypertensive most likely precipitated a gout flare?",
-      options: [
-        "Loop diuretic",
-        "Thiazide diuretic",
-        "Calcium-channel blocker",
-        "Beta blocker",
-        "ACE inhibitor",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 83,
-      text: "A high-level netballer has colicky intermittent abdominal pain; growth is normal at 50–70th percentile. What is the most likely diagnosis?",
-      options: [
-        "Functional abdominal pain",
-        "Abdominal migraine",
-        "IBS",
-        "Coeliac disease",
-        "IBD",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 84,
-      text: "A farm worker with social withdrawal, low motivation, poor appetite, and high alcohol use. Wife suspects severe depression. What is the best management?",
-      options: [
-        "CBT",
-        "Men’s support group",
-        "Mirtazapine",
-        "Disulfiram",
-        "Psychodynamic therapy",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 85,
-      text: "Which medication is safest in pregnancy for bipolar disorder?",
-      options: [
-        "Lamotrigine",
-        "Sodium valproate",
-        "Olanzapine",
-        "Carbamazepine",
-        "Lithium",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 86,
-      text: "Woman presents with mild back pain (4/10) and is anxious because a co-worker was fired after a back injury. What factor predisposes most to chronic pain syndrome?",
-      options: [
-        "Anxiety around employment",
-        "Being female",
-        "No previous injuries",
-        "Pain score 4/10",
-        "Age",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 87,
-      text: "A patient has not opened bowels for 5 days and no flatus for 2 days. What investigation should be ordered?",
-      options: [
-        "Abdominal X-ray",
-        "CT with contrast",
-        "Three-phase CT",
-        "Gastrografin enema",
-        "Colonoscopy",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 88,
-      text: "A 45-year-old man has pleuritic chest pain, widespread ST elevation, and a low-grade fever. No SOB. What is the diagnosis?",
-      options: [
-        "Acute pericarditis",
-        "Chronic pericarditis",
-        "Constrictive pericarditis",
-        "Pneumonia",
-        "Pulmonary embolism",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 89,
-      text: "A man with previous MI has sudden palpitations and tachycardia after a 15-hour flight. ECG shows atrial fibrillation. What is the next investigation?",
-      options: [
-        "TSH",
-        "D-dimer",
-        "Echocardiogram",
-        "Troponin",
-        "CTPA",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 90,
-      text: "A 33-year-old woman has been notified of chlamydia exposure. What best reduces spread in the community?",
-      options: [
-        "Contact her partners (contact tracing)",
-        "Give her azithromycin",
-        "Use condoms",
-        "Test for reinfection in 3–6 months",
-        "Abstain from sex for 1 week",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 91,
-      text: "A uni student requests sleeping pills; has insomnia early in week, low mood, and admits to weekend drug use. What is the likely cause?",
-      options: [
-        "Stimulant substance abuse",
-        "Alcohol use",
-        "Depression",
-        "Drug-seeking behaviour",
-        "Adjustment disorder",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 92,
-      text: "A child has bleeding gums, rash, and prolonged PT and PTT. Which factor deficiency explains this?",
-      options: [
-        "Factor II",
-        "Factor VII",
-        "Factor IX",
-        "Factor X deficiency",
-        "von Willebrand disease",
-      ],
-      correctAnswer: 3,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 93,
-      text: "A breast tumour biopsy shows fat cells, stromal cells, and epithelial cells (i.e., fibroadenoma). What is the management?",
-      options: [
-        "Local excision",
-        "Simple mastectomy",
-        "Radical mastectomy",
-        "Tamoxifen",
-        "No follow-up required",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 94,
-      text: "A woman has a 1.8 cm ovarian cyst on day 12 of cycle (just before ovulation). What is the next step?",
-      options: [
-        "Repeat ultrasound in 3 weeks",
-        "CA-125",
-        "Cyst biopsy",
-        "Immediate surgery",
-        "MRI pelvis",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 95,
-      text: "Post–tibial fixation, a patient has 8 hours of severe leg pain. Pain increases with passive dorsiflexion. What is the next step?",
-      options: [
-        "Calf fasciotomy (compartment syndrome)",
-        "Review in 2 hours",
-        "Elevate the leg",
-        "Apply ice",
-        "Increase analgesia",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 96,
-      text: "An older person with SOB, hyperinflated chest, and 40 pack-year smoking history. What is the next investigation?",
-      options: [
-        "Spirometry",
-        "Chest X-ray",
-        "CT chest",
-        "ABG",
-        "Peak flow",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 97,
-      text: "A patient on multiple medications has a hypoglycaemic episode. Ceasing which medication would most increase their awareness of future hypoglycaemic episodes?",
-      options: [
-        "Atenolol",
-        "Amlodipine",
-        "Metformin",
-        "Perindopril",
-        "Valsartan",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 98,
-      text: "A young woman has a longstanding dog phobia. She wants treatment because her partner owns a German Shepherd. What is the best treatment method?",
-      options: [
-        "Ask her to keep a diary of all dogs she sees",
-        "Show her pictures of dogs (graded exposure)",
-        "Ask her to buy a small dog",
-        "Breathing techniques only",
-        "Avoid dogs entirely",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 99,
-      text: "Fundoscopy shows cotton wool spots, microaneurysms, AV nipping, hard exudates, and dot-and-blot haemorrhages. What is the most likely cause?",
-      options: [
-        "Type 2 diabetes mellitus",
-        "Hypertension",
-        "Retinal vein occlusion",
-        "SLE",
-        "Sarcoidosis",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 100,
-      text: "A 4.5 cm abdominal aortic aneurysm is found. How should this be monitored?",
-      options: [
-        "Duplex ultrasound",
-        "CT angiogram",
-        "MRI abdomen",
-        "Serial physical examinations only",
-        "No further monitoring needed",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 101,
-      text: "A 4-month-old boy is brought in for “scrotal swelling.” Exam is normal except one spermatic cord feels slightly larger than the other. What is the best next step?",
-      options: [
-        "Reassure parents there is no lump",
-        "Ask them to return only if lump appears",
-        "Ultrasound of scrotum and inguinal canal",
-        "Repeat ultrasound later",
-        "Urgent surgical referral",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 102,
-      text: "A man with heart failure on frusemide now has a swollen, red knee but is afebrile. What would be seen on joint aspiration?",
-      options: [
-        "RBCs",
-        "Neutrophils",
-        "Gram-negative organism",
-        "Crystals",
-        "Gram-positive organism",
-      ],
-      correctAnswer: 3,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 103,
-      text: "A patient has SOB on exertion, palpitations, chest pain, and recently had a long flight. What is the next investigation?",
-      options: [
-        "ECG",
-        "D-dimer",
-        "V/Q scan",
-        "CTPA",
-        "Troponin",
-      ],
-      correctAnswer: 3,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 104,
-      text: "A person presents with symptoms of temporal arteritis (jaw claudication, scalp tenderness). What is the next step?",
-      options: [
-        "Carbamazepine",
-        "NSAID",
-        "Prednisolone",
-        "Paracetamol",
-        "Temporal artery venogram",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 105,
-      text: "A man has no dyspnoea at rest but becomes breathless after walking 100 m. What is his NYHA classification?",
-      options: [
-        "I",
-        "II",
-        "III",
-        "IV",
-        "VI",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 106,
-      text: "A footballer has knee pain on extension and a small effusion. What is the most likely cause?",
-      options: [
-        "Meniscal injury",
-        "ACL tear",
-        "Patellar fracture",
-        "Tibial plateau fracture",
-        "Collateral ligament sprain",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 107,
-      text: "A 44-year-old woman has had no period for 3 months; her two previous periods were unusually heavy. What is the initial investigation?",
-      options: [
-        "β-hCG",
-        "LH + FSH",
-        "Mid-luteal progesterone",
-        "Pelvic ultrasound",
-        "TSH",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 108,
-      text: "A patient has an abdominal bulge from xiphisternum to umbilicus only when sitting up, not during coughing/straining. What is the most likely diagnosis?",
-      options: [
-        "Divarication of rectus abdominis",
-        "Lipoma",
-        "Epigastric hernia",
-        "Umbilical hernia",
-        "Incisional hernia",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 109,
-      text: "A 56-year-old postmenopausal woman with a uterus needs therapy for worsening menopausal symptoms. What regimen is most appropriate?",
-      options: [
-        "Continuous oestrogen + continuous progestogen",
-        "Cyclical or continuous oestrogen alone",
-        "Oestrogen only patch",
-        "Oestrogen cream only",
-        "Progesterone only",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 110,
-      text: "A young woman with a history of multiple abusive relationships, dissociation, binge eating, gambling when stressed, and childhood bullying. Symptoms improve when living with her mother. What is the most likely diagnosis?",
-      options: [
-        "Borderline personality disorder",
-        "Bipolar disorder",
-        "Dependent personality disorder",
-        "Attachment disorder",
-        "PTSD",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 111,
-      text: "A patient has chest pain radiating to the arm. One radial pulse is present, the other absent. What is the most likely diagnosis?",
-      options: [
-        "Inferior MI",
-        "Anteromedial MI",
-        "Aortic dissection",
-        "Thoracic outlet syndrome",
-        "PE",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 112,
-      text: "A young woman has frequent presentations across multiple hospitals with chest pain, dysmenorrhoea, constipation, diarrhoea, and headaches. All tests normal. Her symptoms worsened after she lost her job and began receiving benefits. What is the most likely diagnosis?",
-      options: [
-        "Somatic symptom disorder",
-        "Factitious disorder",
-        "Endometriosis",
-        "Illness anxiety disorder",
-        "GAD",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 113,
-      text: "A person with longstanding GORD and Barrett’s oesophagus is at risk of developing which cancer?",
-      options: [
-        "Adenocarcinoma",
-        "Squamous cell carcinoma",
-        "Small-cell carcinoma",
-        "Large-cell carcinoma",
-        "Lymphoma",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 114,
-      text: "A 10-year-old has low Hb (90), very elevated WCC (200,000), low platelets (15,000), and a mediastinal mass. What is this suggestive of?",
-      options: [
-        "Acute lymphoblastic leukaemia (T-cell subtype)",
-        "Acute myeloid leukaemia",
-        "Chronic myeloid leukaemia",
-        "Chronic lymphocytic leukaemia",
-        "Hodgkin lymphoma",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 115,
-      text: "A patient with weakness — which additional sign would support a diagnosis of MS?",
-      options: [
-        "Dysarthria",
-        "Fasciculations",
-        "Ataxia",
-        "Optic neuritis",
-        "Flaccid paralysis",
-      ],
-      correctAnswer: 3,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 116,
-      text: "A man in the cardiac ward has difficulty initiating speech; speech is slow, effortful, but content is understandable. What is this?",
-      options: [
-        "Motor aphasia (Broca’s)",
-        "Sensory aphasia",
-        "Dysarthria",
-        "Wernicke’s aphasia",
-        "Verbal apraxia",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 117,
-      text: "An older man has epigastric pain, weight loss, anorexia, vomiting, and succussion splash on examination. He drinks and smokes heavily. What is the likely diagnosis?",
-      options: [
-        "Gastric carcinoma",
-        "Chronic duodenal ulcer",
-        "Alcoholic liver disease",
-        "Colonic cancer",
-        "Pancreatic pseudocyst (gastric outlet obstruction)",
-      ],
-      correctAnswer: 4,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 118,
-      text: "A man has pleuritic chest pain occurring every 5–10 minutes and a night cough. What is the most likely diagnosis?",
-      options: [
-        "GORD",
-        "COPD",
-        "Asthma",
-        "PE",
-        "Costochondritis",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 119,
-      text: "A woman has hypercalcaemia (2.60 mmol/L), with normal renal function, normal ALP, and normal FBC. What is the most likely cause?",
-      options: [
-        "Primary hyperparathyroidism",
-        "High dietary calcium intake",
-        "Tourniquet artefact",
-        "Sarcoidosis",
-        "Multiple myeloma",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 120,
-      text: "A patient presents with a hot, swollen knee suspected to be septic arthritis. What is the next step in management?",
-      options: [
-        "Joint aspiration",
-        "X-ray",
-        "IV antibiotics",
-        "MRI",
-        "ESR/CRP",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 121,
-      text: "A patient has symptoms of obstructive sleep apnoea (OSA). What is the next step in management?",
-      options: [
-        "Sleep study (polysomnography)",
-        "Epworth sleepiness scale only",
-        "CPAP trial without testing",
-        "Overnight oximetry",
-        "ENT review",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 122,
-      text: "A man wants to know his prostate cancer risk. What is the most appropriate next step?",
-      options: [
-        "Perform DRE and PSA immediately",
-        "Discuss pros and cons of PSA testing (shared decision-making)",
-        "Order MRI prostate",
-        "Do a full metastatic screen",
-        "Start 6-monthly screening",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 123,
-      text: "An 11-year-old boy developed testicular torsion symptoms while playing cricket. Pain worsening, cannot examine due to severity. What is the appropriate management?",
-      options: [
-        "Immediate surgical exploration",
-        "Ultrasound of testes",
-        "Wait 1 week",
-        "Analgesics and review",
-        "Manual detorsion in clinic",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 124,
-      text: "A man cannot play golf anymore due to calf pain after 100 m. Imaging shows 90% femoral artery stenosis over 2 cm segment. What is the appropriate management?",
-      options: [
-        "Antiplatelet therapy alone",
-        "Angioplasty balloon + stent",
-        "Femoral-popliteal bypass",
-        "Encourage exercise only",
-        "Compression stockings",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 125,
-      text: "A woman has straw-coloured vaginal discharge 3 weeks after antepartum haemorrhage. She had intercourse last night. Speculum exam shows fluid in vagina. Most likely diagnosis?",
-      options: [
-        "Membrane rupture",
-        "Post-coital fluid",
-        "Residual blood from APH",
-        "Urinary incontinence",
-        "Cervicitis",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 126,
-      text: "A man with signs of aortic regurgitation and heart failure has EF <40% and dyspnoea on minimal exertion. Best management?",
-      options: [
-        "Ramipril twice daily",
-        "Aortic valve replacement",
-        "12-monthly monitoring",
-        "6-monthly echo monitoring",
-        "High-dose beta blocker",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 127,
-      text: "Six hours after thyroidectomy for toxic multinodular goitre, a woman becomes aggressive and confused. Diagnosis?",
-      options: [
-        "Thyrotoxic crisis",
-        "Neuroleptic malignant syndrome",
-        "Stroke",
-        "Hypocalcaemia",
-        "Thyroid storm not possible post-op",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 128,
-      text: "Fijian NESB woman with SOB. Imaging shows right middle lobe pneumonia. Appropriate treatment?",
-      options: [
-        "Lateral aspiration",
-        "Anterior aspiration",
-        "IV antibiotics",
-        "IV frusemide",
-        "Chest physiotherapy only",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 129,
-      text: "A 4-year-old child has swollen eyes and leg oedema. Appropriate management?",
-      options: [
-        "Prednisolone (nephrotic syndrome)",
-        "Restrict protein in diet",
-        "Give diuretics",
-        "Give antibiotics",
-        "Monitor only",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 130,
-      text: "A 3-year-old wets the bed. What is the most appropriate management?",
-      options: [
-        "Reassure — this is normal for age",
-        "Restrict fluids after 6 pm",
-        "Bedwetting alarm",
-        "Desmopressin",
-        "Renal ultrasound",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 131,
-      text: "Man with Parkinson’s disease has 3 years of falls, sleep disturbance, hallucinations of people and dogs. Cause?",
-      options: [
-        "Parkinson’s disease progression",
-        "Lewy body dementia",
-        "Medication side effect (dopaminergic)",
-        "Late-onset psychosis",
-        "PTSD",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 132,
-      text: "A man has left-sided pleural effusion, crackles to mid-zone, HF risk factors, no fever, no weight loss. Next investigation?",
-      options: [
-        "Lateral aspiration",
-        "Frusemide",
-        "Echocardiogram",
-        "CTPA",
-        "CT chest",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 133,
-      text: "An older woman with a previous infarct (Q waves) and exertional dyspnoea. What investigation?",
-      options: [
-        "BNP",
-        "Troponin",
-        "CTPA",
-        "ABG",
-        "ESR",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 134,
-      text: "Young child with petechiae and bruising. Next investigation?",
-      options: [
-        "Coagulation profile",
-        "FBC",
-        "Skeletal survey",
-        "ANA",
-        "Bone marrow biopsy",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 135,
-      text: "Woman with radicular back pain to leg, no red flags, already had analgesia. Next step?",
-      options: [
-        "Continue normal activity",
-        "Bed rest",
-        "Lumbar imaging",
-        "Immediate MRI",
-        "Spinal injections",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 136,
-      text: "A 4-month-old child with bronchiolitis has normal O₂ sats, good hydration, mild subcostal recession. Management?",
-      options: [
-        "Supportive care",
-        "Salbutamol",
-        "Steroids",
-        "Antibiotics",
-        "IV fluids",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 137,
-      text: "A 25-year-old woman with CIN2 on CST. What is the next step?",
-      options: [
-        "Colposcopy + biopsy",
-        "Repeat CST at 6 months",
-        "HPV vaccine",
-        "Hysterectomy",
-        "No further management",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 138,
-      text: "A 36-year-old woman with dyspareunia post-hysterectomy + BSO. What medication can she have?",
-      options: [
-        "Oestrogen replacement",
-        "Combined HRT",
-        "Progesterone only",
-        "Tibolone",
-        "Oral contraceptive pill",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 139,
-      text: "A girl presents with loin pain. What is the diagnosis?",
-      options: [
-        "Pyonephrosis",
-        "Nephrolithiasis",
-        "Hydronephrosis",
-        "Cystitis",
-        "Renal tumour",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 140,
-      text: "Best investigation for thickened vas deferens?",
-      options: [
-        "Ultrasound",
-        "CT",
-        "MRI",
-        "Doppler only",
-        "No imaging needed",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 141,
-      text: "Infant with Down syndrome and soft, non-tender abdomen. Most likely diagnosis?",
-      options: [
-        "Duodenal atresia",
-        "Pyloric stenosis",
-        "Hirschsprung disease",
-        "Malrotation",
-        "Small bowel obstruction",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 142,
-      text: "A 9-month-old has 10 minutes of repeated head bobbing, trunk flexion, and arm extension. No developmental delay. What is this?",
-      options: [
-        "Infantile spasms (West syndrome)",
-        "Febrile convulsions",
-        "Atonic seizures",
-        "Major motor seizure",
-        "Tics",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 143,
-      text: "Child with high fever, tonsillar exudate, hepatosplenomegaly, and rash. What investigation?",
-      options: [
-        "Immature white cells on blood film",
-        "Anti-streptolysin O titre",
-        "ESR",
-        "Rapid strep test",
-        "Monospot",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 144,
-      text: "Child gets urticarial rash at friend’s house. No airway signs. Best management?",
-      options: [
-        "Antihistamine (not steroid cream)",
-        "Steroid cream",
-        "Epinephrine",
-        "Observe only",
-        "Refer to allergist immediately",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 145,
-      text: "Pleural effusion in the mid-zone on imaging (anterior + lateral views). What do you do?",
-      options: [
-        "Anterior chest drain",
-        "Lateral chest drain",
-        "Steroids",
-        "CTPA",
-        "Furosemide",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 146,
-      text: "Woman with 2 weeks of recurrent falls, postural hypotension, diabetes, and fever. MMSE 27/30. What is the most immediate step?",
-      options: [
-        "CT brain",
-        "Repeat blood pressure",
-        "Urinalysis (likely UTI causing delirium)",
-        "Carotid Doppler",
-        "EEG",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 147,
-      text: "Young woman on escitalopram becomes agitated. She then started mirtazapine + quetiapine. She now has fever and neurologic abnormalities. Diagnosis?",
-      options: [
-        "Neuroleptic malignant syndrome",
-        "Serotonin syndrome",
-        "Meningitis",
-        "Thyroid storm",
-        "Panic attack",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 148,
-      text: "A 30-year-old man from Cyprus has microcytic hypochromic anaemia but is asymptomatic and well. What is the most likely cause?",
-      options: [
-        "Iron deficiency anaemia",
-        "Thalassaemia trait",
-        "Anaemia of chronic disease",
-        "Sideroblastic anaemia",
-        "Lead poisoning",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 149,
-      text: "What organism is most commonly responsible for croup?",
-      options: [
-        "Parainfluenza virus",
-        "RSV",
-        "Adenovirus",
-        "Influenza",
-        "Rhinovirus",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 150,
-      text: "A man returns from Africa with diarrhoea. What is the most likely organism?",
-      options: [
-        "E. coli (ETEC / traveller’s diarrhoea)",
-        "Schistosomiasis",
-        "Rotavirus",
-        "Malaria",
-        "Entamoeba histolytica",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 151,
-      text: "A patient is post–right hemicolectomy and has not eaten, but now urea levels are decreasing. What is the most likely cause?",
-      options: [
-        "Liver disease",
-        "Reduced muscle catabolism",
-        "Early sepsis",
-        "High ADH",
-        "Prolonged IV dextrose use",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 152,
-      text: "What is the most common type of hallucination in schizophrenia?",
-      options: [
-        "Auditory",
-        "Visual",
-        "Tactile",
-        "Olfactory",
-        "Gustatory",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 153,
-      text: "A man has medial knee osteoarthritis, no swelling or tenderness, but has reduced his exercise. What is the next management step?",
-      options: [
-        "Regular NSAIDs",
-        "Regular paracetamol",
-        "Corticosteroid injection",
-        "Knee arthroscopy",
-        "Stop all exercise",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 154,
-      text: "An infertile couple; the woman had bleeding in pregnancy requiring curettage. Now she has painful light periods. What investigation is most diagnostic?",
-      options: [
-        "Diagnostic laparoscopy",
-        "Hysteroscopy (Asherman syndrome suspected)",
-        "Haemophilia screen",
-        "Coagulation profile",
-        "Antiphospholipid antibodies",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 155,
-      text: "A patient develops a fine tremor after 6 months on lithium. What is the first step?",
-      options: [
-        "Check lithium level",
-        "Start propranolol",
-        "Refer to neurologist",
-        "Stop lithium immediately",
-        "MRI brain",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 156,
-      text: "What is the 20-year colorectal cancer risk in Crohn’s disease?",
-      options: [
-        "5%",
-        "20%",
-        "30%",
-        "50%",
-        "60%",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 157,
-      text: "Which vaccinations should be given to a grandmother whose daughter is about to have a baby?",
-      options: [
-        "Varicella + influenza",
-        "Hep B + influenza",
-        "MMR + pertussis",
-        "Pertussis + influenza",
-        "Pneumococcal only",
-      ],
-      correctAnswer: 3,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 158,
-      text: "A child from South-East Asia has purpuric abdominal rash. What is the appropriate treatment?",
-      options: [
-        "Blood cultures then antibiotics",
-        "Start IV antibiotics immediately",
-        "Oral amoxicillin",
-        "Steroids",
-        "Wait for throat swab",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 159,
-      text: "A woman has 6 months of mucorrhoeic diarrhoea, weight loss, and RIF pain with a palpable mass. What is the most likely cause?",
-      options: [
-        "IBD (likely Crohn’s disease)",
-        "IBS",
-        "Coeliac disease",
-        "Colorectal cancer",
-        "Ovarian mass",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 160,
-      text: "A 45-year-old woman is concerned about osteoporosis risk. She broke her hip in a car accident in the past; grandmother had osteoporosis at 88. What do you recommend?",
-      options: [
-        "Bone mineral density scan (DEXA)",
-        "Calcium + vitamin D",
-        "Education only",
-        "X-ray",
-        "Weight-bearing exercise only",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 161,
-      text: "What is the biggest risk factor for eczema?",
-      options: [
-        "Food allergies",
-        "Environmental exposures",
-        "Family history (FHx)",
-        "Breastfeeding",
-        "Dust mites",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 162,
-      text: "Wilson disease in one sibling: what is the risk for the next child?",
-      options: [
-        "0%",
-        "25%",
-        "50%",
-        "75%",
-        "100%",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 163,
-      text: "What accumulates in steatosis?",
-      options: [
-        "Fatty acids",
-        "Cholesterol",
-        "Triglycerides",
-        "Glycogen",
-        "Proteins",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 164,
-      text: "A child with preschool wheeze, saturations 96% on room air, age <1 year. What is the management?",
-      options: [
-        "Supportive care + review in 24 hours",
-        "Give oxygen",
-        "Prednisolone",
-        "Salbutamol",
-        "Chest X-ray",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 165,
-      text: "First-line treatment for stress incontinence in women?",
-      options: [
-        "Pelvic floor exercises",
-        "Oxybutynin",
-        "Pessary",
-        "Surgery",
-        "Reduce fluid intake",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 166,
-      text: "Before applying compression therapy for a leg ulcer, what test must be performed?",
-      options: [
-        "Ankle–brachial pressure index (ABPI)",
-        "Ultrasound",
-        "CRP",
-        "D-dimer",
-        "Doppler only",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 167,
-      text: "Major side effect of clozapine?",
-      options: [
-        "Weight loss",
-        "Agranulocytosis",
-        "Diarrhoea",
-        "Hypertension",
-        "Cataracts",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 168,
-      text: "A 2-month-old with flu-like symptoms; father has been coughing for 2 months. Pharyngeal swab taken. What antibiotic should be given to the family?",
-      options: [
-        "Augmentin Duo Forte",
-        "Azithromycin",
-        "Cephalexin",
-        "Doxycycline",
-        "Trimethoprim",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 169,
-      text: "A 28-year-old woman has greenish nipple discharge. Next step in management?",
-      options: [
-        "Ductogram",
-        "Ultrasound breast",
-        "Aspirate nipple",
-        "Mammogram",
-        "MRI",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 170,
-      text: "Woman with RUQ pain, fever, and jaundice. Most likely diagnosis?",
-      options: [
-        "Cholangitis",
-        "Pancreatitis",
-        "Hepatitis",
-        "Cholelithiasis only",
-        "Cholecystitis",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 171,
-      text: "A 70-year-old man with back pain, high ALP, and classic radiological findings. Most likely diagnosis?",
-      options: [
-        "Paget’s disease",
-        "Osteomalacia",
-        "Osteoporosis",
-        "Ankylosing spondylitis",
-        "Myeloma",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 172,
-      text: "Child with low birth weight, microcephaly, and upturned small nose. Which drug caused this?",
-      options: [
-        "Alcohol (FASD)",
-        "LSD",
-        "Methamphetamine",
-        "Cocaine",
-        "Benzodiazepines",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 173,
-      text: "A woman with stage 2 oesophageal cancer asks about 5-year survival. What is the approximate rate?",
-      options: [
-        "5%",
-        "15%",
-        "20%",
-        "30%",
-        "50%",
-      ],
-      correctAnswer: 1,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 174,
-      text: "A 28-week pregnant woman has headache, RUQ pain, and high blood pressure. Diagnosis?",
-      options: [
-        "Pre-eclampsia",
-        "Cholecystitis",
-        "Appendicitis",
-        "HELLP only",
-        "Acute fatty liver",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 175,
-      text: "A homeless man has diarrhoea, recurrent chest infections, upper back and abdominal pain, and history of alcoholism. Most likely diagnosis?",
-      options: [
-        "Hepatitis",
-        "HIV enteropathy",
-        "Pancreatitis (malabsorption + pain)",
-        "TB",
-        "Crohn’s",
-      ],
-      correctAnswer: 2,
-      selectedAnswer: null,
-      flagged: false
-    },
-    {
-      id: 176,
-      text: "To whom should a statin be prescribed?",
-      options: [
-        "Family history of primary hypercholesterolaemia",
-        "Anyone with hypercholesterolaemia",
-        "Anyone with obesity",
-        "Anyone over 40",
-        "All diabetics",
-      ],
-      correctAnswer: 0,
-      selectedAnswer: null,
-      flagged: false
-    }
-  ]
-};
@@ -8,6 +8,7 @@ class CompletionModule {
     this.firebaseService = app.firebaseService;
     this.completedCases = {};
     this.listeners = [];
+    this.packedState = false; // true once the user's progress is a UserState bitset
   }
 
   /**
@@ -74,6 +75,8 @@ class CompletionModule {
     console.log('[CompletionModule] User signed out, clearing data');
     // Clear all completion data
     this.completedCases = {};
+    this.packedState = false;
+    if (window.UserState) window.UserState.reset();
     localStorage.removeItem('scp_completedCases');
     this.eventBus.emit('completion:data-cleared');
   }
@@ -141,6 +144,13 @@ class CompletionModule {
     try {
       console.log('[CompletionModule] Syncing with Firestore...');
       const db = this.firebaseService.getDb();
+      const state = window.UserState ? await window.UserState.load(db, user.uid) : null;
+      this.packedState = !!state;
+      if (state) {
+        await this.syncWithPackedState(db, user, state);
+        return;
+      }
+
       const year = this.getCurrentYear();
       const progressRef = db.collection('users').doc(user.uid).collection(year).doc('progress').collection('cases');
       const snapshot = await progressRef.get();
@@ -195,6 +205,52 @@ class CompletionModule {
     }
   }
 
+  /**
+   * Sync against the user's packed state (see js/core/UserState.js)
+   * Same merge as syncWithFirestore: one document read instead of one per case
+   */
+  async syncWithPackedState(db, user, state) {
+    const firestoreData = {};
+    state.completed.forEach(n => {
+      const caseId = window.UserState.caseIdFor(n);
+      if (caseId) {
+        firestoreData[caseId] = this.completedCases[caseId] || new Date().toISOString();
+      }
+    });
+
+    console.log('[CompletionModule] Loaded packed state:', Object.keys(firestoreData).length, 'cases');
+
+    const localOnly = Object.keys(this.completedCases)
+      .filter(caseId => !firestoreData[caseId])
+      .map(caseId => window.UserState.caseNumber(caseId))
+      .filter(n => n !== null);
+    if (localOnly.length) {
+      await window.UserState.update(db, user.uid, 'completed', localOnly, true);
+      console.log('[CompletionModule] Uploaded localStorage data to packed state');
+    }
+
+    this.completedCases = { ...this.completedCases, ...firestoreData };
+    this.saveToLocalStorage();
+
+    console.log('[CompletionModule] Sync complete, total cases:', Object.keys(this.completedCases).length);
+    this.eventBus.emit('completion:synced', {
+      count: Object.keys(this.completedCases).length,
+      fromFirestore: Object.keys(firestoreData).length,
+      fromLocal: Object.keys(this.completedCases).length - Object.keys(firestoreData).length
+    });
+  }
+
+  /**
+   * Set or clear a case's completion bit in the packed state
+   * @returns {Promise<boolean>} false if the case has no stable id
+   */
+  async savePackedCompletion(db, user, caseId, completed) {
+    const n = window.UserState.caseNumber(caseId);
+    if (n === null) return false;
+    await window.UserState.update(db, user.uid, 'completed', [n], completed);
+    return true;
+  }
+
   /**
    * Mark a case as completed
    * @param {string} caseId - Case identifier (e.g., "1_1")
@@ -229,15 +285,19 @@ class CompletionModule {
       try {
         const db = this.firebaseService.getDb();
         const year = this.getCurrentYear();
-        await db.collection('users')
-          .doc(user.uid)
-          .collection(year)
-          .doc('progress')
-          .collection('cases')
-          .doc(caseId)
-          .set({
-            completedAt: new Date(timestamp)
-          });
+        if (this.packedState) {
+          await this.savePackedCompletion(db, user, caseId, true);
+        } else {
+          await db.collection('users')
+            .doc(user.uid)
+            .collection(year)
+            .doc('progress')
+            .collection('cases')
+            .doc(caseId)
+            .set({
+              completedAt: new Date(timestamp)
+            });
+        }
         console.log(`[CompletionModule] Saved to Firestore (${year}):`, caseId);
       } catch (error) {
         console.error('[CompletionModule] Error saving to Firestore:', error);
@@ -282,13 +342,17 @@ class CompletionModule {
       try {
         const db = this.firebaseService.getDb();
         const year = this.getCurrentYear();
-        await db.collection('users')
-          .doc(user.uid)
-          .collection(year)
-          .doc('progress')
-          .collection('cases')
-          .doc(caseId)
-          .delete();
+        if (this.packedState) {
+          await this.savePackedCompletion(db, user, caseId, false);
+        } else {
+          await db.collection('users')
+            .doc(user.uid)
+            .collection(year)
+            .doc('progress')
+            .collection('cases')
+            .doc(caseId)
+            .delete();
+        }
         console.log(`[CompletionModule] Removed from Firestore (${year}):`, caseId);
       } catch (error) {
         console.error('[CompletionModule] Error removing from Firestore:', error);
@@ -403,7 +467,12 @@ class CompletionModule {
 
       // Clear from Firestore if authenticated
       const user = this.firebaseService.getCurrentUser();
-      if (user) {
+      if (user && this.packedState) {
+        // Only this year's cases: the bitset also holds the other year's
+        const db = this.firebaseService.getDb();
+        await window.UserState.update(db, user.uid, 'completed', window.UserState.catalogueBits(), false);
+        console.log('[CompletionModule] Cleared packed state');
+      } else if (user) {
         const db = this.firebaseService.getDb();
         const progressRef = db.collection('users').doc(user.uid).collection('progress');
         const snapshot = await progressRef.get();
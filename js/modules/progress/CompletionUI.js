@@ -64,6 +64,11 @@ class CompletionUI {
     this.eventBus.on('completion:synced', () => {
       window.dispatchEvent(new CustomEvent('completionDataLoaded'));
     });
+
+    // Decorate case cards rendered on demand from the case catalogue
+    this.eventBus.on('catalogue:rendered', () => {
+      this.updateCaseCards();
+    });
   }
 
   /**
@@ -218,6 +223,8 @@ class CompletionUI {
       const total = caseIds.length;
       const percentage = total > 0 ? Math.round((completed / total) * 100) : 0;
       return { total, completed, percentage };
+    } else if (window.caseCatalogue) {
+      return this.getStats(window.caseCatalogue.cases.map(entry => entry.id));
     } else {
       // Get overall stats from DOM
       const cards = document.querySelectorAll('.case-card');
@@ -242,6 +249,11 @@ class CompletionUI {
    * @returns {Object} { total, completed, percentage }
    */
   getStatsBySpecialty(specialty) {
+    // Count against the catalogue when the grid is rendered on demand
+    if (window.caseCatalogue) {
+      return this.getStats(window.caseCatalogue.idsFor([specialty]));
+    }
+
     const allCards = document.querySelectorAll(`.case-card.${specialty}`);
     const total = allCards.length;
     let completed = 0;
@@ -263,6 +275,10 @@ class CompletionUI {
    * @returns {Object} { total, completed, percentage }
    */
   getStatsByGroup(groupFilters) {
+    if (window.caseCatalogue) {
+      return this.getStats(window.caseCatalogue.idsFor(groupFilters));
+    }
+
     let total = 0;
     let completed = 0;
 
@@ -8,6 +8,7 @@ class FlagModule {
     this.firebaseService = app.firebaseService;
     this.flags = {}; // Question flags: { "1_1_q1": { caseId, questionNumber, questionText, flaggedAt }, ... }
     this.caseFlags = {}; // Case flags: { "1_1": { flaggedAt }, ... }
+    this.packedState = false; // true once the user's flags are UserState bitsets
   }
 
   /**
@@ -62,9 +63,66 @@ class FlagModule {
    */
   handleUserSignedOut() {
     console.log('[FlagModule] User signed out, keeping local data');
+    this.packedState = false;
     // Keep flags in localStorage for offline use
   }
 
+  /**
+   * Load the user's packed state (see js/core/UserState.js), or null if
+   * their flags are still per-flag documents
+   */
+  async loadPackedState(db, user) {
+    const state = window.UserState ? await window.UserState.load(db, user.uid) : null;
+    this.packedState = !!state;
+    return state;
+  }
+
+  /**
+   * Merge one packed flag bitset into `flags` (local takes precedence) and
+   * upload local-only flags
+   * @param {string} field - 'questionFlags' or 'caseFlags'
+   * @param {Set<number>} bits - That field of the packed state
+   * @param {Object} flags - this.flags or this.caseFlags
+   * @param {Function} keyFor - bit -> flag key, or null if not on this page
+   * @param {Function} bitFor - flag key -> bit, or null
+   * @param {Function} entryFor - flag key -> flag data for a flag only in Firestore
+   * @returns {Promise<Object>} Merged flags
+   */
+  async mergePackedFlags(db, user, field, bits, flags, keyFor, bitFor, entryFor) {
+    const firestoreFlags = {};
+    bits.forEach(bit => {
+      const key = keyFor(bit);
+      if (key) firestoreFlags[key] = entryFor(key);
+    });
+
+    const localOnly = Object.keys(flags)
+      .filter(key => !firestoreFlags[key])
+      .map(bitFor)
+      .filter(bit => bit !== null);
+    if (localOnly.length) {
+      await window.UserState.update(db, user.uid, field, localOnly, true);
+      console.log('[FlagModule] Synced', localOnly.length, field, 'to packed state');
+    }
+
+    return { ...firestoreFlags, ...flags };
+  }
+
+  /**
+   * Bit of a question flag id ("1_1_q2") in the questionFlags bitset, or null
+   */
+  questionFlagBit(flagId) {
+    const parsed = this.parseFlagId(flagId);
+    return parsed ? window.UserState.questionBit(parsed.caseId, parsed.questionNumber) : null;
+  }
+
+  /**
+   * Question flag id of a questionFlags bit, or null if not on this page
+   */
+  questionFlagIdFor(bit) {
+    const caseId = window.UserState.caseIdFor(Math.floor(bit / window.UserState.QUESTION_STRIDE));
+    return caseId ? this.createFlagId(caseId, bit % window.UserState.QUESTION_STRIDE + 1) : null;
+  }
+
   // ========== QUESTION FLAG METHODS ==========
 
   /**
@@ -222,6 +280,22 @@ class FlagModule {
     try {
       console.log('[FlagModule] Syncing question flags with Firestore...');
       const db = this.firebaseService.getDb();
+      const state = await this.loadPackedState(db, user);
+      if (state) {
+        this.flags = await this.mergePackedFlags(db, user, 'questionFlags', state.questionFlags, this.flags,
+          bit => this.questionFlagIdFor(bit),
+          flagId => this.questionFlagBit(flagId),
+          flagId => ({ ...this.parseFlagId(flagId), questionText: '', flaggedAt: new Date().toISOString() }));
+        this.saveToLocalStorage();
+        if (this.eventBus) {
+          this.eventBus.emit('flag:synced', {
+            questionCount: this.getFlagCount(),
+            caseCount: this.getFlaggedCaseCount()
+          });
+        }
+        return;
+      }
+
       const year = this.getCurrentYear();
       const flagsRef = db.collection('users').doc(user.uid).collection(year).doc('flags').collection('questions');
       const snapshot = await flagsRef.get();
@@ -279,6 +353,14 @@ class FlagModule {
 
     try {
       const db = this.firebaseService.getDb();
+      if (this.packedState) {
+        const bit = this.questionFlagBit(flagId);
+        if (bit !== null) {
+          await window.UserState.update(db, user.uid, 'questionFlags', [bit], !!this.flags[flagId]);
+        }
+        return;
+      }
+
       const year = this.getCurrentYear();
       const flagRef = db.collection('users').doc(user.uid).collection(year).doc('flags').collection('questions').doc(flagId);
 
@@ -301,7 +383,18 @@ class FlagModule {
 
     // Clear from Firestore if authenticated
     const user = this.firebaseService.getCurrentUser();
-    if (user) {
+    if (user && this.packedState) {
+      try {
+        // Only this year's cases: the bitset also holds the other year's
+        const stride = window.UserState.QUESTION_STRIDE;
+        const bits = window.UserState.catalogueBits()
+          .flatMap(n => Array.from({ length: stride }, (_, q) => n * stride + q));
+        await window.UserState.update(this.firebaseService.getDb(), user.uid, 'questionFlags', bits, false);
+        console.log('[FlagModule] Cleared all question flags from packed state');
+      } catch (error) {
+        console.error('[FlagModule] Error clearing flags from Firestore:', error);
+      }
+    } else if (user) {
       try {
         const db = this.firebaseService.getDb();
       const year = this.getCurrentYear();
@@ -441,6 +534,16 @@ class FlagModule {
     try {
       console.log('[FlagModule] Syncing case flags with Firestore...');
       const db = this.firebaseService.getDb();
+      const state = await this.loadPackedState(db, user);
+      if (state) {
+        this.caseFlags = await this.mergePackedFlags(db, user, 'caseFlags', state.caseFlags, this.caseFlags,
+          bit => window.UserState.caseIdFor(bit),
+          caseId => window.UserState.caseNumber(caseId),
+          () => ({ flaggedAt: new Date().toISOString() }));
+        this.saveCaseFlagsToLocalStorage();
+        return;
+      }
+
       const year = this.getCurrentYear();
       const caseFlagsRef = db.collection('users').doc(user.uid).collection(year).doc('flags').collection('cases');
       const snapshot = await caseFlagsRef.get();
@@ -491,6 +594,14 @@ class FlagModule {
 
     try {
       const db = this.firebaseService.getDb();
+      if (this.packedState) {
+        const n = window.UserState.caseNumber(caseId);
+        if (n !== null) {
+          await window.UserState.update(db, user.uid, 'caseFlags', [n], !!this.caseFlags[caseId]);
+        }
+        return;
+      }
+
       const year = this.getCurrentYear();
       const caseFlagRef = db.collection('users').doc(user.uid).collection(year).doc('flags').collection('cases').doc(caseId);
 
@@ -513,7 +624,15 @@ class FlagModule {
 
     // Clear from Firestore if authenticated
     const user = this.firebaseService.getCurrentUser();
-    if (user) {
+    if (user && this.packedState) {
+      try {
+        const bits = window.UserState.catalogueBits();
+        await window.UserState.update(this.firebaseService.getDb(), user.uid, 'caseFlags', bits, false);
+        console.log('[FlagModule] Cleared all case flags from packed state');
+      } catch (error) {
+        console.error('[FlagModule] Error clearing case flags from Firestore:', error);
+      }
+    } else if (user) {
       try {
         const db = this.firebaseService.getDb();
       const year = this.getCurrentYear();
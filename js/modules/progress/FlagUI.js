@@ -76,6 +76,12 @@ class FlagUI {
     this.eventBus.on('flag:error', (data) => {
       console.error('[FlagUI] Flag error:', data);
     });
+
+    // Decorate case cards rendered on demand from the case catalogue
+    this.eventBus.on('catalogue:rendered', () => {
+      this.updateAllCaseFlagIndicators();
+      this.updateAllFlaggedQuestionsBadges();
+    });
   }
 
   /**
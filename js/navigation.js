@@ -171,7 +171,17 @@ function saveCurrentFilter(filter) {
 const specialties = document.querySelectorAll('.specialty');
 const weekSections = document.querySelectorAll('.week');
 
+// Index pages generated from the case manifest render the grid on demand
+// from a JSON catalogue (js/case-catalogue.js); filter against that instead
+// of scanning the DOM. Hand-written grids fall back to the DOM logic.
+const catalogue = window.caseCatalogue || null;
+
 function applyFilterBySpecialty(filter) {
+  if (catalogue) {
+    catalogue.show(catalogue.idsFor([filter]));
+    return;
+  }
+
   // Only filter case-cards inside scpsMainContent
   document.querySelectorAll('#scpsMainContent .case-card').forEach(card => {
     card.style.display = card.classList.contains(filter) ? 'flex' : 'none';
@@ -277,6 +287,15 @@ groupHeaders.forEach(group => {
       saveCurrentFilter('surgery');
     }
 
+    if (catalogue) {
+      catalogue.show(catalogue.idsFor(filters));
+      const mainElement = document.querySelector('.main');
+      if (mainElement) {
+        mainElement.scrollTop = 0;
+      }
+      return;
+    }
+
     // Only filter case-cards inside scpsMainContent
     document.querySelectorAll('#scpsMainContent .case-card').forEach(card => {
       card.style.display = filters.some(f => card.classList.contains(f)) ? 'flex' : 'none';
@@ -328,6 +347,15 @@ function showFlaggedCasesOnly() {
     return; // No flag system available
   }
 
+  if (catalogue) {
+    catalogue.show(flaggedCaseIds);
+    const mainElement = document.querySelector('.main');
+    if (mainElement) {
+      mainElement.scrollTop = 0;
+    }
+    return;
+  }
+
   // Only filter case-cards inside scpsMainContent
   document.querySelectorAll('#scpsMainContent .case-card').forEach(card => {
     const href = card.getAttribute('href');
@@ -374,13 +402,19 @@ function showFlaggedCasesOnly() {
 // === Auto Count Script ===
 function updateCounts() {
   // Count all case cards by their specialty classes
-  const allCaseCards = document.querySelectorAll('#scpsMainContent .case-card');
+  const allCaseCards = catalogue ? [] : document.querySelectorAll('#scpsMainContent .case-card');
   const groupTotals = { all: 0, medicine: 0, surgery: 0 };
 
   // Define which specialties belong to which groups
   const medicineSpecialties = ['general', 'medicine', 'cardiology', 'psychiatry', 'paediatrics', 'neurology', 'gastroenterology', 'endocrinology', 'renal', 'respiratory', 'rheumatology', 'haematology', 'og'];
   const surgerySpecialties = ['git', 'breast', 'ortho', 'vascular', 'surgery'];
 
+  if (catalogue) {
+    groupTotals.all = catalogue.cases.length;
+    groupTotals.medicine = catalogue.idsFor(medicineSpecialties).length;
+    groupTotals.surgery = catalogue.idsFor(surgerySpecialties).length;
+  }
+
   allCaseCards.forEach(card => {
     groupTotals.all += 1;
 
@@ -564,47 +598,49 @@ document.addEventListener('DOMContentLoaded', () => {
 
 // === Case Card Click Handlers ===
 // Ensure filter and scroll position are saved when clicking on case cards
+// Delegated so cards rendered later from the case catalogue are covered too
 document.addEventListener('DOMContentLoaded', () => {
-  document.querySelectorAll('.case-card:not(.exam-type-card)').forEach(card => {
-    card.addEventListener('click', (e) => {
-      // Get current active filter
-      const activeSpec = document.querySelector('.specialty.active');
-      const activeGroup = document.querySelector('h2[data-group].active');
-
-      let filterToSave = 'all';
-
-      if (activeSpec) {
-        filterToSave = activeSpec.dataset.filter;
-        console.log('[Navigation] Saving filter from active specialty:', filterToSave);
-      } else if (activeGroup) {
-        filterToSave = activeGroup.dataset.group;
-        console.log('[Navigation] Saving filter from active group:', filterToSave);
-      } else {
-        // No active filter, check which category this card belongs to
-        const cardClasses = Array.from(card.classList);
-        const specialtyClass = cardClasses.find(cls =>
-          ['cardiology', 'psychiatry', 'paediatrics', 'neurology', 'gastroenterology',
-           'endocrinology', 'renal', 'respiratory', 'rheumatology', 'haematology', 'og',
-           'git', 'general', 'breast', 'ortho', 'vascular'].includes(cls)
-        );
-        if (specialtyClass) {
-          filterToSave = specialtyClass;
-          console.log('[Navigation] No active filter, detected from card classes:', filterToSave);
-        }
+  document.addEventListener('click', (e) => {
+    const card = e.target.closest('.case-card:not(.exam-type-card)');
+    if (!card) return;
+
+    // Get current active filter
+    const activeSpec = document.querySelector('.specialty.active');
+    const activeGroup = document.querySelector('h2[data-group].active');
+
+    let filterToSave = 'all';
+
+    if (activeSpec) {
+      filterToSave = activeSpec.dataset.filter;
+      console.log('[Navigation] Saving filter from active specialty:', filterToSave);
+    } else if (activeGroup) {
+      filterToSave = activeGroup.dataset.group;
+      console.log('[Navigation] Saving filter from active group:', filterToSave);
+    } else {
+      // No active filter, check which category this card belongs to
+      const cardClasses = Array.from(card.classList);
+      const specialtyClass = cardClasses.find(cls =>
+        ['cardiology', 'psychiatry', 'paediatrics', 'neurology', 'gastroenterology',
+         'endocrinology', 'renal', 'respiratory', 'rheumatology', 'haematology', 'og',
+         'git', 'general', 'breast', 'ortho', 'vascular'].includes(cls)
+      );
+      if (specialtyClass) {
+        filterToSave = specialtyClass;
+        console.log('[Navigation] No active filter, detected from card classes:', filterToSave);
       }
+    }
 
-      // Save scroll positions (main content and sidebar)
-      const mainElement = document.querySelector('.main');
-      const sidebarElement = document.querySelector('.sidebar');
-      const mainScrollPosition = mainElement ? mainElement.scrollTop : 0;
-      const sidebarScrollPosition = sidebarElement ? sidebarElement.scrollTop : 0;
-
-      console.log('[Navigation] Case card clicked, saving filter:', filterToSave, 'main scroll:', mainScrollPosition, 'sidebar scroll:', sidebarScrollPosition);
-      localStorage.setItem('currentFilter', filterToSave);
-      localStorage.setItem('mainScrollPosition', mainScrollPosition);
-      localStorage.setItem('sidebarScrollPosition', sidebarScrollPosition);
-    }, true); // Use capturing phase to run before navigation
-  });
+    // Save scroll positions (main content and sidebar)
+    const mainElement = document.querySelector('.main');
+    const sidebarElement = document.querySelector('.sidebar');
+    const mainScrollPosition = mainElement ? mainElement.scrollTop : 0;
+    const sidebarScrollPosition = sidebarElement ? sidebarElement.scrollTop : 0;
+
+    console.log('[Navigation] Case card clicked, saving filter:', filterToSave, 'main scroll:', mainScrollPosition, 'sidebar scroll:', sidebarScrollPosition);
+    localStorage.setItem('currentFilter', filterToSave);
+    localStorage.setItem('mainScrollPosition', mainScrollPosition);
+    localStorage.setItem('sidebarScrollPosition', sidebarScrollPosition);
+  }, true); // Use capturing phase to run before navigation
 });
 
 // === Search Functionality ===
@@ -629,6 +665,13 @@ function performSearch(searchTerm) {
   specialties.forEach(s => s.classList.remove('active'));
   groupHeaders.forEach(g => g.classList.remove('active'));
 
+  if (catalogue) {
+    if (catalogue.show(catalogue.search(searchTerm)) === 0) {
+      console.log('No cases found for: ' + searchTerm);
+    }
+    return;
+  }
+
   // Show all weeks initially
   weekSections.forEach(week => {
     week.style.display = 'block';
@@ -0,0 +1,274 @@
+// PDF Preview - first-page previews of the source PDFs
+// `scp previews` renders a small WebP of each PDF's first page and one
+// thumbnail per page, listed in previews/index.json with the case page each
+// PDF belongs to. A case page with a PDF gets a "Case PDF" link with the
+// preview, its page count and size, and a collapsed strip of page
+// thumbnails; on a year index page, hovering or focusing a case card shows
+// its first page. Any other link to an indexed PDF gets the same preview.
+// The PDF itself is only fetched when a link is followed; thumbnails only
+// load once the strip is opened, and card previews once a card is pointed at.
+//
+// Usage: <script src="../../js/pdf-preview.js" defer></script> on a case page,
+// a year index page or any page with <a href="...pdf"> links. Links marked
+// data-no-preview are skipped.
+
+(function initPdfPreview() {
+  const script = document.currentScript;
+  if (!script) return;
+
+  // js/ sits at the site root, next to previews/
+  const siteRoot = new URL('../', script.src);
+  const indexUrl = new URL('previews/index.json', siteRoot);
+
+  function formatSize(bytes) {
+    if (bytes >= 1024 * 1024) return `${(bytes / (1024 * 1024)).toFixed(1)} MB`;
+    return `${Math.max(1, Math.round(bytes / 1024))} KB`;
+  }
+
+  function sitePath(url) {
+    const target = new URL(url, document.baseURI);
+    if (target.origin !== siteRoot.origin || !target.pathname.startsWith(siteRoot.pathname)) return null;
+    const path = decodeURIComponent(target.pathname.slice(siteRoot.pathname.length));
+    if (path === '' || path.endsWith('/')) return `${path}index.html`;
+    // Hosting serves pages without their extension (cleanUrls)
+    return /\.[a-z0-9]+$/i.test(path) ? path : `${path}.html`;
+  }
+
+  function describe(entry) {
+    return `${entry.pages} page${entry.pages === 1 ? '' : 's'} · ${formatSize(entry.bytes)} PDF`;
+  }
+
+  function image(entry, [file, width, height], alt) {
+    const img = document.createElement('img');
+    img.src = new URL(`${entry.dir}/${file}`, siteRoot).href;
+    img.width = width;
+    img.height = height;
+    img.alt = alt;
+    img.loading = 'lazy';
+    img.decoding = 'async';
+    return img;
+  }
+
+  function render(link, entry) {
+    const figure = document.createElement('figure');
+    figure.className = 'pdf-preview';
+
+    if (entry.preview) {
+      const previewLink = document.createElement('a');
+      previewLink.href = link.href;
+      previewLink.target = link.target;
+      previewLink.appendChild(image(entry, entry.preview, `First page of ${link.textContent.trim() || 'PDF'}`));
+      figure.appendChild(previewLink);
+    }
+
+    const caption = document.createElement('figcaption');
+    caption.textContent = describe(entry);
+    figure.appendChild(caption);
+
+    if (entry.thumbs.length > 1) {
+      const details = document.createElement('details');
+      const summary = document.createElement('summary');
+      summary.textContent = 'Show all pages';
+      details.appendChild(summary);
+      details.addEventListener('toggle', () => {
+        if (!details.open || details.dataset.loaded) return;
+        details.dataset.loaded = 'true';
+        const strip = document.createElement('div');
+        strip.className = 'pdf-preview-pages';
+        entry.thumbs.forEach((thumb, index) => {
+          const pageLink = document.createElement('a');
+          pageLink.href = `${link.href.split('#')[0]}#page=${index + 1}`;
+          pageLink.target = link.target;
+          pageLink.appendChild(image(entry, thumb, `Page ${index + 1}`));
+          strip.appendChild(pageLink);
+        });
+        details.appendChild(strip);
+      });
+      figure.appendChild(details);
+    }
+
+    link.insertAdjacentElement('afterend', figure);
+  }
+
+  // A case page that does not link its own PDF gets a link after its heading
+  function addCaseLink(pdfPath) {
+    const heading = document.querySelector('h1');
+    if (!heading) return null;
+    const anchor = heading.nextElementSibling && heading.nextElementSibling.matches('p.meta')
+      ? heading.nextElementSibling
+      : heading;
+
+    const link = document.createElement('a');
+    link.href = new URL(pdfPath.split('/').map(encodeURIComponent).join('/'), siteRoot).href;
+    link.target = '_blank';
+    link.rel = 'noopener';
+    link.className = 'pdf-preview-link';
+    link.textContent = 'Case PDF';
+    anchor.insertAdjacentElement('afterend', link);
+    return link;
+  }
+
+  // One floating preview shared by every case card on a year index page
+  function cardPreviews(byPage) {
+    let popup = null;
+    let current = null;
+
+    function show(card) {
+      const entry = byPage.get(sitePath(card.href));
+      if (!entry || !entry.preview || card === current) return;
+      current = card;
+      if (!popup) {
+        popup = document.createElement('figure');
+        popup.className = 'pdf-preview pdf-preview-popup';
+        popup.setAttribute('aria-hidden', 'true');
+        document.body.appendChild(popup);
+      }
+      const img = image(entry, entry.preview, '');
+      img.loading = 'eager';
+      const caption = document.createElement('figcaption');
+      caption.textContent = describe(entry);
+      popup.replaceChildren(img, caption);
+
+      const rect = card.getBoundingClientRect();
+      const left = Math.min(rect.left, document.documentElement.clientWidth - 256);
+      popup.style.left = `${window.scrollX + Math.max(8, left)}px`;
+      popup.style.top = `${window.scrollY + rect.bottom + 6}px`;
+      popup.hidden = false;
+    }
+
+    function hide(card) {
+      if (card !== current) return;
+      current = null;
+      if (popup) popup.hidden = true;
+    }
+
+    document.addEventListener('mouseover', event => {
+      const card = event.target.closest && event.target.closest('a.case-card');
+      if (card) show(card);
+    });
+    document.addEventListener('mouseout', event => {
+      const card = event.target.closest && event.target.closest('a.case-card');
+      if (card && !card.contains(event.relatedTarget)) hide(card);
+    });
+    document.addEventListener('focusin', event => {
+      if (event.target.matches('a.case-card')) show(event.target);
+    });
+    document.addEventListener('focusout', event => {
+      if (event.target.matches('a.case-card')) hide(event.target);
+    });
+  }
+
+  function addStyles() {
+    const style = document.createElement('style');
+    style.textContent = `
+      .pdf-preview {
+        margin: 12px 0;
+        max-width: 240px;
+        font-size: 13px;
+      }
+
+      .pdf-preview img {
+        display: block;
+        max-width: 100%;
+        height: auto;
+        border: 1px solid rgba(0, 0, 0, 0.15);
+        border-radius: 4px;
+        background: #fff;
+      }
+
+      .pdf-preview figcaption {
+        margin-top: 4px;
+        opacity: 0.75;
+      }
+
+      .pdf-preview-pages {
+        display: flex;
+        gap: 6px;
+        overflow-x: auto;
+        padding: 6px 0;
+      }
+
+      .pdf-preview-pages img {
+        width: 80px;
+      }
+
+      .pdf-preview-link {
+        display: inline-block;
+        margin-top: 8px;
+      }
+
+      .pdf-preview-popup {
+        position: absolute;
+        z-index: 1000;
+        width: 240px;
+        margin: 0;
+        padding: 6px;
+        border-radius: 6px;
+        background: #fff;
+        color: #333;
+        box-shadow: 0 4px 16px rgba(0, 0, 0, 0.2);
+        pointer-events: none;
+      }
+    `;
+    document.head.appendChild(style);
+  }
+
+  async function enhance() {
+    const links = Array.from(document.querySelectorAll('a[href$=".pdf" i]:not([data-no-preview])'));
+    const hasCards = Boolean(document.getElementById('caseCatalogue') || document.querySelector('a.case-card'));
+    const isCasePage = /(^|\/)case\d+_\d+\.html$/.test(sitePath(location.href) || '');
+    if (!links.length && !hasCards && !isCasePage) return;
+
+    let index;
+    try {
+      const response = await fetch(indexUrl);
+      if (!response.ok) return;
+      index = await response.json();
+    } catch (error) {
+      console.warn('[PdfPreview] No preview index:', error);
+      return;
+    }
+
+    // Case page -> [PDF path, entry]
+    const byPage = new Map();
+    Object.entries(index.pdfs).forEach(([pdfPath, entry]) => {
+      if (entry.page && !byPage.has(entry.page)) byPage.set(entry.page, Object.assign({ path: pdfPath }, entry));
+    });
+
+    let styled = false;
+    function style() {
+      if (!styled) addStyles();
+      styled = true;
+    }
+
+    const linked = new Set();
+    links.forEach(link => {
+      const path = sitePath(link.href);
+      const entry = index.pdfs[path];
+      if (!entry) return;
+      style();
+      linked.add(path);
+      render(link, entry);
+    });
+
+    const own = byPage.get(sitePath(location.href));
+    if (own && !linked.has(own.path)) {
+      const link = addCaseLink(own.path);
+      if (link) {
+        style();
+        render(link, own);
+      }
+    }
+
+    if (hasCards && byPage.size) {
+      style();
+      cardPreviews(byPage);
+    }
+  }
+
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', enhance);
+  } else {
+    enhance();
+  }
+})();
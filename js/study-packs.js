@@ -0,0 +1,247 @@
+// Study Packs - offline downloads of a discipline's cases
+// `scp packs` zips each discipline's case pages, the files they load and a
+// small offline index page into packs/<year>-<discipline>.<hash>.zip, listed
+// in packs/index.json with the SHA-256 of every chunk. When a specialty is
+// selected on a year index page, this offers its pack (and the variant with
+// the source PDFs, when built).
+//
+// Downloads are fetched one chunk at a time with Range requests, each chunk
+// checked against its hash and kept in Cache Storage, so an interrupted
+// download resumes from the last complete chunk, even after a reload. Pack
+// URLs change whenever their bytes do, so kept chunks never mix versions.
+//
+// Usage: <script src="../js/study-packs.js" defer></script> on a year index page.
+
+(function initStudyPacks() {
+  const script = document.currentScript;
+  if (!script) return;
+
+  // js/ sits at the site root, next to packs/
+  const siteRoot = new URL('../', script.src);
+  const indexUrl = new URL('packs/index.json', siteRoot);
+  const CACHE_NAME = 'study-pack-chunks';
+
+  let packs = null;
+  let bar = null;
+  const busy = new Set();
+
+  function formatSize(bytes) {
+    if (bytes >= 1024 * 1024) return `${(bytes / (1024 * 1024)).toFixed(1)} MB`;
+    return `${Math.max(1, Math.round(bytes / 1024))} KB`;
+  }
+
+  function sitePath(url) {
+    const target = new URL(url, document.baseURI);
+    if (target.origin !== siteRoot.origin || !target.pathname.startsWith(siteRoot.pathname)) return null;
+    const path = decodeURIComponent(target.pathname.slice(siteRoot.pathname.length));
+    return path === '' || path.endsWith('/') ? `${path}index.html` : path;
+  }
+
+  async function sha256(buffer) {
+    // crypto.subtle only exists on https:// and localhost pages
+    if (!window.crypto || !crypto.subtle) return null;
+    const digest = await crypto.subtle.digest('SHA-256', buffer);
+    return Array.from(new Uint8Array(digest), byte => byte.toString(16).padStart(2, '0')).join('');
+  }
+
+  async function verify(buffer, expected) {
+    const actual = await sha256(buffer);
+    if (actual !== null && actual !== expected) throw new Error('Downloaded data did not match the pack');
+  }
+
+  async function openCache() {
+    if (!('caches' in window)) return null;
+    try {
+      return await caches.open(CACHE_NAME);
+    } catch (error) {
+      return null;
+    }
+  }
+
+  /**
+   * Drop kept chunks of packs the index no longer lists
+   */
+  async function pruneChunks(cache) {
+    const current = new Set(packs.map(entry => new URL(entry.file, siteRoot).pathname));
+    const requests = await cache.keys();
+    await Promise.all(requests
+      .filter(request => !current.has(new URL(request.url).pathname))
+      .map(request => cache.delete(request)));
+  }
+
+  /**
+   * Fetch a pack chunk by chunk; returns it as a Blob
+   * @param {Object} entry - packs/index.json entry
+   * @param {Function} onProgress - called with the share downloaded (0-1)
+   */
+  async function fetchPack(entry, chunkSize, onProgress) {
+    const url = new URL(entry.file, siteRoot);
+    const cache = await openCache();
+    const parts = [];
+    let done = 0;
+
+    for (let i = 0; i < entry.chunks.length; i++) {
+      const key = `${url.href}?chunk=${i}`;
+      let part = cache ? await cache.match(key) : null;
+      part = part ? await part.blob() : null;
+
+      if (!part) {
+        const start = i * chunkSize;
+        const end = Math.min(entry.bytes, start + chunkSize) - 1;
+        const response = await fetch(url, { headers: { Range: `bytes=${start}-${end}` } });
+        if (response.status === 200) {
+          // No range support: this is the whole pack
+          const buffer = await response.arrayBuffer();
+          await verify(buffer, entry.sha256);
+          onProgress(1);
+          return new Blob([buffer], { type: 'application/zip' });
+        }
+        if (response.status !== 206) throw new Error(`HTTP ${response.status}`);
+        const buffer = await response.arrayBuffer();
+        await verify(buffer, entry.chunks[i]);
+        part = new Blob([buffer]);
+        if (cache) await cache.put(key, new Response(part));
+      }
+
+      parts.push(part);
+      done += part.size;
+      onProgress(done / entry.bytes);
+    }
+
+    if (cache) await Promise.all(entry.chunks.map((_, i) => cache.delete(`${url.href}?chunk=${i}`)));
+    return new Blob(parts, { type: 'application/zip' });
+  }
+
+  function save(blob, name) {
+    const link = document.createElement('a');
+    link.href = URL.createObjectURL(blob);
+    link.download = name;
+    document.body.appendChild(link);
+    link.click();
+    link.remove();
+    setTimeout(() => URL.revokeObjectURL(link.href), 60000);
+  }
+
+  function button(entry, label, chunkSize) {
+    const element = document.createElement('button');
+    element.type = 'button';
+    element.className = 'study-pack-button';
+    element.textContent = `${label} · ${formatSize(entry.bytes)}`;
+    element.disabled = busy.has(entry.id);
+    element.addEventListener('click', async () => {
+      busy.add(entry.id);
+      element.disabled = true;
+      try {
+        const blob = await fetchPack(entry, chunkSize, share => {
+          element.textContent = `Downloading… ${Math.floor(share * 100)}%`;
+        });
+        save(blob, `${entry.id}.zip`);
+        element.textContent = `${label} · ${formatSize(entry.bytes)}`;
+      } catch (error) {
+        console.warn('[StudyPacks] Download stopped:', error);
+        element.textContent = 'Download interrupted - resume';
+      } finally {
+        busy.delete(entry.id);
+        element.disabled = false;
+      }
+    });
+    return element;
+  }
+
+  function render(discipline, chunkSize) {
+    const matches = packs.filter(entry => entry.discipline === discipline);
+    const plain = matches.find(entry => !entry.pdfs);
+    bar.replaceChildren();
+    bar.hidden = !plain;
+    if (!plain) return;
+
+    const text = document.createElement('span');
+    text.textContent = `${plain.title} offline: ${plain.cases.length} case${plain.cases.length === 1 ? '' : 's'}`;
+    bar.appendChild(text);
+    bar.appendChild(button(plain, 'Download', chunkSize));
+    const withPdfs = matches.find(entry => entry.pdfs);
+    if (withPdfs) bar.appendChild(button(withPdfs, 'With PDFs', chunkSize));
+  }
+
+  function addStyles() {
+    const style = document.createElement('style');
+    style.textContent = `
+      .study-pack-bar {
+        display: flex;
+        flex-wrap: wrap;
+        align-items: center;
+        gap: 8px;
+        margin: 0 0 16px;
+        padding: 10px 14px;
+        font-size: 14px;
+        border: 1px solid var(--claude-border, #E8E3D9);
+        border-radius: 8px;
+        background: var(--claude-card-bg, #fff);
+      }
+
+      .study-pack-bar[hidden] {
+        display: none;
+      }
+
+      .study-pack-bar span {
+        flex: 1 1 auto;
+      }
+
+      .study-pack-button {
+        padding: 6px 12px;
+        font: inherit;
+        color: #fff;
+        background: var(--claude-accent, #D97757);
+        border: none;
+        border-radius: 6px;
+        cursor: pointer;
+      }
+
+      .study-pack-button:disabled {
+        opacity: 0.6;
+        cursor: default;
+      }
+    `;
+    document.head.appendChild(style);
+  }
+
+  async function init() {
+    const content = document.getElementById('scpsMainContent');
+    if (!content) return;
+
+    let index;
+    try {
+      const response = await fetch(indexUrl);
+      if (!response.ok) return;
+      index = await response.json();
+    } catch (error) {
+      console.warn('[StudyPacks] No pack index:', error);
+      return;
+    }
+
+    const page = sitePath(location.href);
+    packs = Object.values(index.packs).filter(entry => entry.index === page);
+    if (!packs.length) return;
+
+    addStyles();
+    bar = document.createElement('div');
+    bar.className = 'study-pack-bar';
+    bar.hidden = true;
+    content.insertAdjacentElement('afterbegin', bar);
+
+    document.querySelectorAll('.specialty').forEach(spec => {
+      spec.addEventListener('click', () => render(spec.dataset.filter, index.chunkSize));
+    });
+    const active = document.querySelector('.specialty.active');
+    if (active) render(active.dataset.filter, index.chunkSize);
+
+    const cache = await openCache();
+    if (cache) pruneChunks(cache).catch(() => {});
+  }
+
+  if (document.readyState === 'loading') {
+    document.addEventListener('DOMContentLoaded', init);
+  } else {
+    init();
+  }
+})();
@@ -1,6 +1,92 @@
 // User Analytics System
 // Tracks user sessions, time on site, and last sign-in
 
+// Batches analytics events for the ingestion gateway (`scp ingest serve`),
+// which coalesces them into a few Firestore writes for everyone. Events are
+// sent every 30 seconds, when 50 are waiting, and when the page is hidden.
+// If the gateway is busy (503) the events are kept and retried later.
+class AnalyticsBeacon {
+  constructor(url, auth) {
+    this.url = url;
+    this.auth = auth;
+    this.events = [];
+    this.token = null;
+    this.retryAt = 0;
+    this.FLUSH_INTERVAL = 30 * 1000;
+    this.MAX_BATCH = 50;
+    this.MAX_QUEUED = 500;
+    this.flushTimer = null;
+
+    // sendBeacon still delivers while the page is being unloaded
+    window.addEventListener('pagehide', () => this.flushOnExit());
+    document.addEventListener('visibilitychange', () => {
+      if (document.hidden) this.flushOnExit();
+    });
+  }
+
+  push(event) {
+    // flushOnExit() can't wait for a token, so have one ready from the first event
+    if (!this.token && this.auth?.currentUser) {
+      this.auth.currentUser.getIdToken().then(token => { this.token = token; }).catch(() => {});
+    }
+    this.events.push({ ...event, t: Date.now() });
+    if (this.events.length > this.MAX_QUEUED) {
+      this.events.splice(0, this.events.length - this.MAX_QUEUED);
+    }
+    if (this.events.length >= this.MAX_BATCH) {
+      this.flush();
+    } else if (!this.flushTimer) {
+      this.flushTimer = setTimeout(() => this.flush(), this.FLUSH_INTERVAL);
+    }
+  }
+
+  body(events) {
+    // text/plain keeps the request "simple", so there is no CORS preflight
+    return new Blob([JSON.stringify({ token: this.token, events })], { type: 'text/plain' });
+  }
+
+  async flush() {
+    clearTimeout(this.flushTimer);
+    this.flushTimer = null;
+    if (!this.events.length || Date.now() < this.retryAt) {
+      if (this.events.length) this.flushTimer = setTimeout(() => this.flush(), this.retryAt - Date.now());
+      return;
+    }
+
+    const user = this.auth?.currentUser;
+    if (!user) return;
+    const events = this.events.splice(0, this.MAX_BATCH);
+
+    try {
+      this.token = await user.getIdToken();
+      const response = await fetch(this.url, { method: 'POST', body: this.body(events), keepalive: true });
+      if (response.status === 503) {
+        const retryAfter = Number(response.headers.get('Retry-After')) || 30;
+        this.retryAt = Date.now() + retryAfter * 1000;
+        this.events.unshift(...events);
+      } else if (!response.ok) {
+        console.warn('UserAnalytics: Gateway rejected beacon:', response.status);
+      }
+    } catch (error) {
+      console.warn('UserAnalytics: Beacon failed, will retry:', error);
+      this.events.unshift(...events);
+    }
+
+    if (this.events.length && !this.flushTimer) {
+      this.flushTimer = setTimeout(() => this.flush(), Math.max(this.FLUSH_INTERVAL, this.retryAt - Date.now()));
+    }
+  }
+
+  flushOnExit() {
+    if (!this.events.length || !this.token) return;
+    while (this.events.length) {
+      const events = this.events.slice(0, this.MAX_BATCH);
+      if (!navigator.sendBeacon(this.url, this.body(events))) return;
+      this.events.splice(0, events.length);
+    }
+  }
+}
+
 class UserAnalytics {
   constructor() {
     this.db = null;
@@ -16,6 +102,7 @@ class UserAnalytics {
     this.activeDuration = 0; // Track only active time in seconds
     this.lastHeartbeatTime = null;
     this.isPaused = false; // Track if session is paused due to inactivity
+    this.beacon = null; // Set when an analytics gateway is configured
   }
 
   // Initialize analytics system
@@ -40,6 +127,11 @@ class UserAnalytics {
       return;
     }
 
+    if (window.analyticsGatewayUrl) {
+      this.beacon = new AnalyticsBeacon(window.analyticsGatewayUrl, this.auth);
+      console.log('UserAnalytics: Batching events for', window.analyticsGatewayUrl);
+    }
+
     // IMPORTANT: Use onAuthStateChanged as the ONLY source of truth
     // Don't check currentUser immediately as it may not be ready yet (race condition)
     console.log('UserAnalytics: Setting up auth state listener...');
@@ -93,6 +185,24 @@ class UserAnalytics {
     this.activeDuration = 0;
     this.isPaused = false;
 
+    if (this.beacon) {
+      // Session ids are generated locally, so the gateway can create the document later
+      this.currentSessionId = this.db.collection('users').doc(user.uid).collection('sessions').doc().id;
+      this.beacon.push({
+        type: 'session_start',
+        session: this.currentSessionId,
+        email: user.email,
+        displayName: user.displayName || user.email.split('@')[0],
+        path: this.currentPage,
+        title: document.title,
+        userAgent: navigator.userAgent,
+        platform: navigator.platform
+      });
+      console.log('UserAnalytics: Session started', this.currentSessionId);
+      this.startHeartbeat();
+      return;
+    }
+
     try {
       // Update user's last sign-in and create new session
       const userRef = this.db.collection('users').doc(user.uid);
@@ -151,26 +261,32 @@ class UserAnalytics {
       }
     }
 
-    try {
-      const userRef = this.db.collection('users').doc(this.auth.currentUser.uid);
-      const sessionRef = userRef.collection('sessions').doc(this.currentSessionId);
+    if (this.beacon) {
+      this.beacon.push({ type: 'session_end', session: this.currentSessionId, duration: this.activeDuration });
+      this.beacon.flushOnExit();
+      console.log('UserAnalytics: Session ended', this.currentSessionId, `Active Duration: ${this.activeDuration}s`);
+    } else {
+      try {
+        const userRef = this.db.collection('users').doc(this.auth.currentUser.uid);
+        const sessionRef = userRef.collection('sessions').doc(this.currentSessionId);
 
-      // Update session document with ONLY active duration
-      await sessionRef.update({
-        endTime: firebase.firestore.FieldValue.serverTimestamp(),
-        duration: this.activeDuration,
-        isActive: false
-      });
+        // Update session document with ONLY active duration
+        await sessionRef.update({
+          endTime: firebase.firestore.FieldValue.serverTimestamp(),
+          duration: this.activeDuration,
+          isActive: false
+        });
 
-      // Update user's lastActive timestamp when session ends
-      await userRef.update({
-        lastActive: firebase.firestore.FieldValue.serverTimestamp()
-      });
+        // Update user's lastActive timestamp when session ends
+        await userRef.update({
+          lastActive: firebase.firestore.FieldValue.serverTimestamp()
+        });
 
-      console.log('UserAnalytics: Session ended', this.currentSessionId, `Active Duration: ${this.activeDuration}s`);
+        console.log('UserAnalytics: Session ended', this.currentSessionId, `Active Duration: ${this.activeDuration}s`);
 
-    } catch (error) {
-      console.error('UserAnalytics: Error ending session:', error);
+      } catch (error) {
+        console.error('UserAnalytics: Error ending session:', error);
+      }
     }
 
     this.stopHeartbeat();
@@ -222,6 +338,11 @@ class UserAnalytics {
 
     this.lastHeartbeatTime = now;
 
+    if (this.beacon) {
+      this.beacon.push({ type: 'heartbeat', session: this.currentSessionId, duration: this.activeDuration });
+      return;
+    }
+
     try {
       const userRef = this.db.collection('users').doc(this.auth.currentUser.uid);
       const sessionRef = userRef.collection('sessions').doc(this.currentSessionId);
@@ -257,6 +378,11 @@ class UserAnalytics {
     this.currentPage = path;
     this.pageViewStart = new Date();
 
+    if (this.beacon) {
+      this.beacon.push({ type: 'page_view', session: this.currentSessionId, path, title });
+      return;
+    }
+
     try {
       const userRef = this.db.collection('users').doc(this.auth.currentUser.uid);
       const sessionRef = userRef.collection('sessions').doc(this.currentSessionId);
@@ -346,6 +472,11 @@ class UserAnalytics {
   async trackCaseView(caseId, caseTitle) {
     if (!this.auth?.currentUser || !this.db) return;
 
+    if (this.beacon) {
+      this.beacon.push({ type: 'case_view', session: this.currentSessionId || undefined, caseId, title: caseTitle });
+      return;
+    }
+
     try {
       const userRef = this.db.collection('users').doc(this.auth.currentUser.uid);
 
@@ -384,6 +515,11 @@ class UserAnalytics {
   async trackFeatureUsage(featureName, details = {}) {
     if (!this.auth?.currentUser || !this.db) return;
 
+    if (this.beacon) {
+      this.beacon.push({ type: 'feature', name: featureName, details });
+      return;
+    }
+
     try {
       const userRef = this.db.collection('users').doc(this.auth.currentUser.uid);
 
@@ -435,6 +571,11 @@ class UserAnalytics {
   async trackExamResource(examType, examYear) {
     if (!this.auth?.currentUser || !this.db) return;
 
+    if (this.beacon) {
+      this.beacon.push({ type: 'exam_resource', examType, examYear: String(examYear) });
+      return;
+    }
+
     try {
       const userRef = this.db.collection('users').doc(this.auth.currentUser.uid);
 
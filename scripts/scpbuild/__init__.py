@@ -0,0 +1,9 @@
+"""
+Build tooling for the SCP case site.
+
+Every command is reachable through the ``scp`` CLI (``python3 -m scpbuild``).
+Submodules are imported only by the command that needs them, so keep this
+file free of imports beyond the standard library basics.
+"""
+
+__version__ = "1.0.0"
@@ -0,0 +1,5 @@
+import sys
+
+from scpbuild.cli import main
+
+sys.exit(main())
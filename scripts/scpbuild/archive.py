@@ -0,0 +1,484 @@
+"""
+Compact old analytics sessions into monthly columnar archives.
+
+user-analytics.js writes one ``users/{uid}/sessions/{id}`` document per
+visit and updates it on every heartbeat; the admin dashboard reads the
+whole collection. This moves sessions older than a cutoff out of
+Firestore into one compressed columnar file per month:
+
+  1. page through the sessions collection group ordered by startTime,
+     using the last document of each page as the cursor (the
+     collection-group index this needs is in firestore.indexes.json;
+     ``firebase deploy --only firestore:indexes`` creates it)
+  2. when the month changes, merge that month's rows into
+     archive/sessions/YYYY-MM.scpcol
+  3. re-read the file and check its row count and keys
+  4. only then delete the archived documents, in batched writes
+
+Sessions come from Firestore (google-cloud-firestore; set
+FIRESTORE_EMULATOR_HOST to run against the emulator) or from a JSON-lines
+export stand-in with one ``{"path": ..., "data": {...}}`` object per
+line. Deletes against an export rewrite the file.
+
+Archive files hold one zlib-compressed block per column, so queries only
+decode the columns they use.
+
+Usage:
+    scp archive compact --export sessions.jsonl --older-than 90
+    scp archive compact --firestore --before 2025-07-01 --dry-run
+    scp archive query --group-by month
+    scp archive query --uid abc123 --since 2025-01 --until 2025-06
+"""
+
+import json
+import os
+import struct
+import sys
+import time
+import zlib
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+from .paths import BASE_DIR
+
+ARCHIVE_DIR = BASE_DIR / "archive" / "sessions"
+
+MAGIC = b"SCPCOL1\n"
+FILE_SUFFIX = ".scpcol"
+
+# Firestore allows at most 500 writes per batch
+DELETE_BATCH = 500
+PAGE_SIZE = 500
+
+NULL_INT = -(1 << 63)
+NULL_CODE = 0xFFFFFFFF
+
+# column -> type; "extra" keeps any fields the tracker adds later
+SESSION_COLUMNS = [
+    ("uid", "str"),
+    ("session_id", "str"),
+    ("start_time", "i64"),
+    ("end_time", "i64"),
+    ("last_heartbeat", "i64"),
+    ("duration", "i64"),
+    ("is_active", "bool"),
+    ("platform", "str"),
+    ("user_agent", "str"),
+    ("page_count", "i64"),
+    ("pages", "json"),
+    ("extra", "json"),
+]
+
+KNOWN_FIELDS = {"startTime", "endTime", "lastHeartbeat", "duration", "isActive", "platform", "userAgent", "pages"}
+
+
+# === Column encoding ===
+
+def _native(values, typecode):
+    data = array(typecode, values)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data.tobytes()
+
+
+def _from_native(raw, typecode):
+    data = array(typecode)
+    data.frombytes(raw)
+    if sys.byteorder != "little":
+        data.byteswap()
+    return data
+
+
+def encode_column(kind, values):
+    if kind == "i64":
+        return _native([NULL_INT if v is None else int(v) for v in values], "q")
+    if kind == "bool":
+        return bytes(2 if v is None else int(bool(v)) for v in values)
+    if kind == "str":
+        # Dictionary encoding: platform, user agent and uid repeat heavily
+        codes = {}
+        for v in values:
+            if v is not None and v not in codes:
+                codes[v] = len(codes)
+        dictionary = json.dumps(list(codes), ensure_ascii=False).encode("utf-8")
+        indices = _native([NULL_CODE if v is None else codes[v] for v in values], "I")
+        return struct.pack("<I", len(dictionary)) + dictionary + indices
+    if kind == "json":
+        return json.dumps(values, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    raise ValueError(f"unknown column type {kind!r}")
+
+
+def decode_column(kind, raw):
+    if kind == "i64":
+        return [None if v == NULL_INT else v for v in _from_native(raw, "q")]
+    if kind == "bool":
+        return [None if b == 2 else bool(b) for b in raw]
+    if kind == "str":
+        (size,) = struct.unpack_from("<I", raw)
+        dictionary = json.loads(raw[4:4 + size])
+        return [None if i == NULL_CODE else dictionary[i] for i in _from_native(raw[4 + size:], "I")]
+    if kind == "json":
+        return json.loads(raw)
+    raise ValueError(f"unknown column type {kind!r}")
+
+
+def write_columns(path, columns, rows):
+    """Write ``rows`` (dicts) to ``path`` atomically, one block per column."""
+    blocks = []
+    meta = []
+    offset = 0
+    for name, kind in columns:
+        block = zlib.compress(encode_column(kind, [row.get(name) for row in rows]), 6)
+        meta.append({"name": name, "type": kind, "offset": offset, "length": len(block)})
+        blocks.append(block)
+        offset += len(block)
+    header = json.dumps({"rows": len(rows), "columns": meta}).encode("utf-8")
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", len(header)))
+        f.write(header)
+        for block in blocks:
+            f.write(block)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class ColumnFile:
+    """Read access to one archive file; columns are decoded on demand."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            if f.read(len(MAGIC)) != MAGIC:
+                raise ValueError(f"{self.path} is not a column archive")
+            (size,) = struct.unpack("<I", f.read(4))
+            header = json.loads(f.read(size))
+        self.data_start = len(MAGIC) + 4 + size
+        self.rows = header["rows"]
+        self.columns = {column["name"]: column for column in header["columns"]}
+
+    def column(self, name):
+        meta = self.columns[name]
+        with open(self.path, "rb") as f:
+            f.seek(self.data_start + meta["offset"])
+            raw = zlib.decompress(f.read(meta["length"]))
+        values = decode_column(meta["type"], raw)
+        if len(values) != self.rows:
+            raise ValueError(f"{self.path}: column {name} has {len(values)} values, expected {self.rows}")
+        return values
+
+    def read(self, names=None):
+        """Return ``{name: values}`` for ``names`` (default: every column)."""
+        return {name: self.column(name) for name in (names or self.columns)}
+
+    def iter_rows(self):
+        data = self.read()
+        names = list(data)
+        for values in zip(*(data[name] for name in names)):
+            yield dict(zip(names, values))
+
+
+# === Session documents ===
+
+def to_millis(value):
+    """Epoch milliseconds from a Firestore timestamp, datetime, ISO string or number."""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        return int(value.timestamp() * 1000)
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, dict):
+        seconds = value.get("_seconds", value.get("seconds", 0))
+        nanos = value.get("_nanoseconds", value.get("nanoseconds", 0))
+        return int(seconds) * 1000 + int(nanos) // 1_000_000
+    if isinstance(value, str):
+        return to_millis(datetime.fromisoformat(value.replace("Z", "+00:00")))
+    raise TypeError(f"unsupported timestamp {value!r}")
+
+
+def month_of(millis):
+    return datetime.fromtimestamp(millis / 1000, timezone.utc).strftime("%Y-%m")
+
+
+def session_row(path, data):
+    """Flatten a ``users/{uid}/sessions/{id}`` document into an archive row."""
+    parts = path.split("/")
+    pages = [
+        {"path": page.get("path"), "title": page.get("title"), "timestamp": to_millis(page.get("timestamp"))}
+        for page in data.get("pages") or []
+    ]
+    extra = {key: value for key, value in data.items() if key not in KNOWN_FIELDS}
+    return {
+        "uid": parts[1],
+        "session_id": parts[3],
+        "start_time": to_millis(data.get("startTime")),
+        "end_time": to_millis(data.get("endTime")),
+        "last_heartbeat": to_millis(data.get("lastHeartbeat")),
+        "duration": int(data.get("duration") or 0),
+        "is_active": data.get("isActive"),
+        "platform": data.get("platform"),
+        "user_agent": data.get("userAgent"),
+        "page_count": len(pages),
+        "pages": pages,
+        "extra": json.loads(json.dumps(extra, default=str)) if extra else None,
+    }
+
+
+class ExportSource:
+    """Sessions from a JSON-lines export, standing in for Firestore."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.docs = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    doc = json.loads(line)
+                    self.docs[doc["path"]] = doc["data"]
+        self.deleted = 0
+
+    def pages(self, cutoff, page_size):
+        """Yield pages of (path, data) with startTime < cutoff, resuming after a cursor."""
+        cutoff_ms = to_millis(cutoff)
+        keys = sorted(
+            (start, path) for path, data in self.docs.items()
+            if path.split("/")[2:3] == ["sessions"]
+            and (start := to_millis(data.get("startTime"))) is not None and start < cutoff_ms
+        )
+        cursor = None
+        while True:
+            begin = bisect_right(keys, cursor) if cursor else 0
+            page = keys[begin:begin + page_size]
+            if not page:
+                return
+            yield [(path, self.docs[path]) for _, path in page if path in self.docs]
+            cursor = page[-1]
+
+    def delete(self, paths):
+        for path in paths:
+            if self.docs.pop(path, None) is not None:
+                self.deleted += 1
+
+    def close(self):
+        if not self.deleted:
+            return
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for path, data in self.docs.items():
+                f.write(json.dumps({"path": path, "data": data}, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+
+
+class FirestoreSource:
+    """Sessions read from and deleted in Firestore (or its emulator)."""
+
+    def __init__(self, project=None):
+        try:
+            from google.cloud import firestore
+        except ImportError:
+            raise SystemExit("scp archive --firestore needs google-cloud-firestore: pip install -e \".[firestore]\"")
+        self.firestore = firestore
+        self.client = firestore.Client(project=project)
+
+    def pages(self, cutoff, page_size):
+        from google.cloud.firestore_v1.base_query import FieldFilter
+
+        # Needs the collection-group index on sessions.startTime (firestore.indexes.json)
+        query = (
+            self.client.collection_group("sessions")
+            .where(filter=FieldFilter("startTime", "<", cutoff))
+            .order_by("startTime")
+            .order_by(self.firestore.FieldPath.document_id())
+            .limit(page_size)
+        )
+        cursor = None
+        while True:
+            snapshots = list((query.start_after(cursor) if cursor else query).stream())
+            if not snapshots:
+                return
+            yield [(snapshot.reference.path, snapshot.to_dict()) for snapshot in snapshots]
+            if len(snapshots) < page_size:
+                return
+            cursor = snapshots[-1]
+
+    def delete(self, paths):
+        batch = self.client.batch()
+        for path in paths:
+            batch.delete(self.client.document(path))
+        batch.commit()
+
+    def close(self):
+        self.client.close()
+
+
+# === Compaction ===
+
+def archive_path(archive_dir, month):
+    return Path(archive_dir) / f"{month}{FILE_SUFFIX}"
+
+
+def write_month(archive_dir, month, rows):
+    """
+    Merge ``rows`` into the month's archive and verify the result.
+
+    Returns the number of rows in the file. Raises ValueError if the file
+    read back does not hold every expected row.
+    """
+    path = archive_path(archive_dir, month)
+    merged = {}
+    if path.exists():
+        for row in ColumnFile(path).iter_rows():
+            merged[row["uid"], row["session_id"]] = row
+    for row in rows:
+        merged[row["uid"], row["session_id"]] = row
+    ordered = sorted(merged.values(), key=lambda row: (row["start_time"], row["uid"], row["session_id"]))
+    write_columns(path, SESSION_COLUMNS, ordered)
+
+    check = ColumnFile(path)
+    keys = set(zip(*check.read(["uid", "session_id"]).values()))
+    if check.rows != len(ordered) or any((row["uid"], row["session_id"]) not in keys for row in rows):
+        raise ValueError(f"{path}: verification failed ({check.rows} rows, expected {len(ordered)})")
+    return check.rows
+
+
+def compact(source, archive_dir, cutoff, page_size=PAGE_SIZE, batch_size=DELETE_BATCH, dry_run=False, log=print):
+    """Archive and delete every session older than ``cutoff``; returns a stats dict."""
+    stats = {"read": 0, "archived": 0, "deleted": 0, "months": {}}
+    pending_month = None
+    pending = []
+
+    def flush():
+        rows = [row for _, row in pending]
+        if dry_run:
+            log(f"  {pending_month}: {len(rows)} sessions (dry run)")
+            stats["months"][pending_month] = len(rows)
+            return
+        total = write_month(archive_dir, pending_month, rows)
+        stats["archived"] += len(rows)
+        stats["months"][pending_month] = total
+        paths = [path for path, _ in pending]
+        for start in range(0, len(paths), batch_size):
+            source.delete(paths[start:start + batch_size])
+            stats["deleted"] += len(paths[start:start + batch_size])
+        log(f"  {pending_month}: archived {len(rows)} sessions ({total} in file), deleted {len(paths)} documents")
+
+    # Pages arrive ordered by startTime, so a month is complete once the next one starts
+    for page in source.pages(cutoff, page_size):
+        for path, data in page:
+            row = session_row(path, data)
+            month = month_of(row["start_time"])
+            if month != pending_month and pending:
+                flush()
+                pending = []
+            pending_month = month
+            pending.append((path, row))
+            stats["read"] += 1
+    if pending:
+        flush()
+    return stats
+
+
+# === Queries ===
+
+def iter_archives(archive_dir, since=None, until=None):
+    for path in sorted(Path(archive_dir).glob(f"*{FILE_SUFFIX}")):
+        month = path.stem
+        if (since and month < since) or (until and month > until):
+            continue
+        yield month, ColumnFile(path)
+
+
+def query(archive_dir, group_by="month", since=None, until=None, uid=None):
+    """Aggregate sessions per group: {group: [sessions, active seconds, pages]}."""
+    wanted = ["duration", "page_count"]
+    if group_by != "month":
+        wanted.append(group_by)
+    if uid and "uid" not in wanted:
+        wanted.append("uid")
+
+    totals = {}
+    scanned = 0
+    for month, archive in iter_archives(archive_dir, since, until):
+        data = archive.read(wanted)
+        scanned += archive.rows
+        groups = [month] * archive.rows if group_by == "month" else data[group_by]
+        uids = data["uid"] if uid else None
+        for i, (group, duration, pages) in enumerate(zip(groups, data["duration"], data["page_count"])):
+            if uids is not None and uids[i] != uid:
+                continue
+            entry = totals.setdefault(group, [0, 0, 0])
+            entry[0] += 1
+            entry[1] += duration or 0
+            entry[2] += pages or 0
+    return totals, scanned
+
+
+def parse_cutoff(args):
+    if args.before:
+        return datetime.fromisoformat(args.before).replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc) - timedelta(days=args.older_than)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="scp archive", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--archive-dir", default=str(ARCHIVE_DIR), help="Directory of monthly archive files")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    compact_parser = commands.add_parser("compact", help="Archive and delete old sessions")
+    source = compact_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--export", metavar="FILE", help="JSON-lines export stand-in")
+    source.add_argument("--firestore", action="store_true", help="Read from Firestore (or FIRESTORE_EMULATOR_HOST)")
+    compact_parser.add_argument("--project", help="Firestore project id")
+    cutoff = compact_parser.add_mutually_exclusive_group()
+    cutoff.add_argument("--before", metavar="YYYY-MM-DD", help="Archive sessions that started before this date")
+    cutoff.add_argument("--older-than", type=int, default=90, metavar="DAYS",
+                        help="Archive sessions older than this many days (default: 90)")
+    compact_parser.add_argument("--page-size", type=int, default=PAGE_SIZE, help="Documents per page")
+    compact_parser.add_argument("--batch-size", type=int, default=DELETE_BATCH, help="Deletes per batched write")
+    compact_parser.add_argument("--dry-run", action="store_true", help="Report without writing or deleting")
+
+    query_parser = commands.add_parser("query", help="Summarise archived sessions")
+    query_parser.add_argument("--group-by", default="month", choices=["month", "uid", "platform", "user_agent"])
+    query_parser.add_argument("--since", metavar="YYYY-MM", help="First month to include")
+    query_parser.add_argument("--until", metavar="YYYY-MM", help="Last month to include")
+    query_parser.add_argument("--uid", help="Only this user's sessions")
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compact":
+        cutoff_time = parse_cutoff(args)
+        source = FirestoreSource(args.project) if args.firestore else ExportSource(args.export)
+        print(f"Compacting sessions started before {cutoff_time:%Y-%m-%d %H:%M} UTC into {args.archive_dir}")
+        started = time.perf_counter()
+        try:
+            stats = compact(source, args.archive_dir, cutoff_time, page_size=args.page_size,
+                            batch_size=args.batch_size, dry_run=args.dry_run)
+        finally:
+            source.close()
+        elapsed = time.perf_counter() - started
+        print(f"✓ {stats['read']} sessions read, {stats['archived']} archived, "
+              f"{stats['deleted']} deleted across {len(stats['months'])} months in {elapsed:.2f}s")
+        return 0
+
+    started = time.perf_counter()
+    totals, scanned = query(args.archive_dir, args.group_by, args.since, args.until, args.uid)
+    elapsed = time.perf_counter() - started
+    print(f"{args.group_by:<24} {'sessions':>9} {'active h':>9} {'avg min':>8} {'pages':>7}")
+    for group in sorted(totals, key=lambda g: (g is None, str(g))):
+        sessions, seconds, pages = totals[group]
+        label = str(group)[:24]
+        print(f"{label:<24} {sessions:>9} {seconds / 3600:>9.1f} {seconds / 60 / sessions:>8.1f} {pages:>7}")
+    rate = scanned / elapsed if elapsed else 0
+    print(f"\nScanned {scanned} archived sessions in {elapsed * 1000:.1f} ms ({rate:,.0f} rows/s)")
+    return 0
@@ -0,0 +1,225 @@
+"""
+Audit case pages against the source PDFs they were built from.
+
+PDF text is extracted once and cached by file hash and backend under
+.cache/text/, so repeat audits only re-read changed PDFs. Each page is
+scored on:
+
+  coverage  - share of the PDF's word shingles that appear on the page
+              (low coverage: content missing or still a placeholder)
+  fidelity  - share of the page's shingles that appear in the PDF
+              (low fidelity: hand edits have drifted from the source)
+
+Pages still carrying generator placeholders such as
+"[Question to be added from PDF]" are flagged, as are pages whose text
+matches a different PDF better than their own.
+
+Usage:
+    scp audit
+    scp audit --only-problems
+    scp audit --json report.json
+"""
+
+import json
+import re
+import unicodedata
+from html.parser import HTMLParser
+from pathlib import Path
+
+from .manifest import PDF_YEAR, year_cases_dir
+from .paths import PDF_DIR, rel
+from .pdftext import BACKENDS, PLACEHOLDER_RE, case_id as case_id_for_pdf, extract_all
+
+# Words per shingle
+SHINGLE_SIZE = 5
+
+# Scores below these thresholds are flagged
+MIN_COVERAGE = 0.6
+MIN_FIDELITY = 0.6
+
+WORD_RE = re.compile(r"[a-z0-9]+")
+
+# Characters PDF extraction commonly substitutes for plain ASCII
+CHAR_FIXES = str.maketrans({
+    "‘": "'", "’": "'", "“": '"', "”": '"',
+    "–": "-", "—": "-", "−": "-", "­": None,
+})
+
+
+class PageTextParser(HTMLParser):
+    """Collect visible text from a case page, skipping scripts and styles."""
+
+    SKIP_TAGS = {"script", "style", "head", "button", "title"}
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in self.SKIP_TAGS:
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in self.SKIP_TAGS and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def page_text(html):
+    parser = PageTextParser()
+    parser.feed(html)
+    return " ".join(parser.parts)
+
+
+def normalise(text):
+    """Lower-case, fold ligatures and typographic punctuation, return word list."""
+    text = unicodedata.normalize("NFKC", text).translate(CHAR_FIXES).lower()
+    return WORD_RE.findall(text)
+
+
+def shingles(words, size=SHINGLE_SIZE):
+    if len(words) < size:
+        return {tuple(words)} if words else set()
+    return {tuple(words[i:i + size]) for i in range(len(words) - size + 1)}
+
+
+def load_pdf_texts(jobs=None, backend=None):
+    """Map case id -> (pdf path, text) for every PDF, extracting in parallel."""
+    pdfs = {}
+    for pdf_path in sorted(PDF_DIR.rglob("*.pdf")):
+        case_id = case_id_for_pdf(pdf_path)
+        if case_id:
+            pdfs[case_id] = str(pdf_path)
+
+    texts = {}
+    errors = {}
+    for pdf_path, text, error in extract_all(list(pdfs.values()), jobs=jobs, backend=backend):
+        case_id = case_id_for_pdf(pdf_path)
+        if text is None:
+            errors[case_id] = error
+        else:
+            texts[case_id] = (pdf_path, text)
+    return pdfs, texts, errors
+
+
+def build_index(pdf_shingles):
+    """Inverted index: shingle -> list of case ids whose PDF contains it."""
+    index = {}
+    for case_id, grams in pdf_shingles.items():
+        for gram in grams:
+            index.setdefault(gram, []).append(case_id)
+    return index
+
+
+def best_source(page_grams, index):
+    """Return (case id, shared shingles) of the PDF sharing the most shingles with the page."""
+    votes = {}
+    for gram in page_grams:
+        for case_id in index.get(gram, ()):
+            votes[case_id] = votes.get(case_id, 0) + 1
+    if not votes:
+        return None, 0
+    case_id = max(votes, key=votes.get)
+    return case_id, votes[case_id]
+
+
+def audit(cases_dir=None, jobs=None, backend=None):
+    """Score the pages in ``cases_dir``, by default the published pages of the PDFs' year."""
+    cases_dir = cases_dir or year_cases_dir()
+    pdfs, texts, errors = load_pdf_texts(jobs=jobs, backend=backend)
+    pdf_shingles = {case_id: shingles(normalise(text)) for case_id, (_, text) in texts.items()}
+    index = build_index(pdf_shingles)
+
+    results = []
+    for page in sorted(Path(cases_dir).glob("case*.html")):
+        case_id = page.stem[len("case"):]
+        if not re.fullmatch(r"\d+_\d+", case_id):
+            continue
+        html = page.read_text(encoding="utf-8", errors="replace")
+        text = page_text(html)
+        grams = shingles(normalise(text))
+        placeholders = sorted(set(PLACEHOLDER_RE.findall(html)))
+
+        result = {
+            "case": case_id,
+            "page": rel(page),
+            "pdf": rel(pdfs[case_id]) if case_id in pdfs else None,
+            "placeholders": placeholders,
+            "coverage": None,
+            "fidelity": None,
+            "best_match": None,
+            "problems": [],
+        }
+
+        if placeholders:
+            result["problems"].append("placeholder")
+
+        source = pdf_shingles.get(case_id)
+        if case_id not in pdfs:
+            result["problems"].append("no-pdf")
+        elif source is None:
+            result["problems"].append(f"extract-failed: {errors.get(case_id)}")
+        elif source and grams:
+            shared = len(source & grams)
+            result["coverage"] = shared / len(source)
+            result["fidelity"] = shared / len(grams)
+            if result["coverage"] < MIN_COVERAGE:
+                result["problems"].append("low-coverage")
+            if result["fidelity"] < MIN_FIDELITY:
+                result["problems"].append("low-fidelity")
+            match, match_shared = best_source(grams, index)
+            result["best_match"] = match
+            if match != case_id and match_shared > shared:
+                result["problems"].append(f"mismatch: closer to {match}")
+
+        results.append(result)
+
+    return results, len(texts), errors
+
+
+def format_score(value):
+    return "   -  " if value is None else f"{value:6.1%}"
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="scp audit", description="Audit case pages against their source PDFs.")
+    parser.add_argument("--cases-dir", help=f"Directory of case pages (default: the manifest's {PDF_YEAR} cases)")
+    parser.add_argument("--only-problems", action="store_true", help="List flagged pages only")
+    parser.add_argument("--json", metavar="PATH", help="Also write the full report as JSON")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes for extraction")
+    parser.add_argument("--backend", choices=list(BACKENDS), help="PDF text backend for every PDF")
+    args = parser.parse_args(argv)
+
+    print("Auditing case pages against source PDFs...")
+    print("=" * 70)
+
+    results, extracted, errors = audit(args.cases_dir and Path(args.cases_dir), jobs=args.jobs, backend=args.backend)
+
+    print(f"{'CASE':<8}{'COVER':>8}{'FIDEL':>8}  PROBLEMS")
+    for result in results:
+        if args.only_problems and not result["problems"]:
+            continue
+        print(f"{result['case'].replace('_', '.'):<8}"
+              f"{format_score(result['coverage']):>8}"
+              f"{format_score(result['fidelity']):>8}  "
+              f"{', '.join(result['problems'])}")
+
+    flagged = [r for r in results if r["problems"]]
+    print("=" * 70)
+    print(f"Pages audited: {len(results)}")
+    print(f"PDFs extracted: {extracted} ({len(errors)} failed)")
+    print(f"Pages with placeholders: {sum(1 for r in results if r['placeholders'])}")
+    print(f"Pages flagged: {len(flagged)}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"Report written to {args.json}")
+
+    return 1 if flagged else 0
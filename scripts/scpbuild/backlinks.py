@@ -0,0 +1,82 @@
+"""
+Update case HTML files to use smart back navigation.
+
+Replaces the static "SCP2.html" back link left by the old generators
+with one that returns to the filter the student was browsing.
+"""
+
+import os
+
+from .paths import BASE_DIR
+
+# Trees whose case pages are rewritten by default
+DEFAULT_DIRS = ["cases", "year3/cases", "year4/cases"]
+
+OLD_BACK_LINK = '<a href="SCP2.html" class="back-link">← Back to Cases</a>'
+
+NEW_BACK_LINK = '''<a href="#" class="back-link" onclick="goBack(event)">← Back to Cases</a>
+    <script>
+      function goBack(event) {
+        event.preventDefault();
+        const lastFilter = localStorage.getItem('currentFilter') || 'all';
+        window.location.href = 'SCP2.html?filter=' + lastFilter;
+      }
+    </script>'''
+
+
+def find_case_files(dirs):
+    """Return every case*.html under ``dirs`` (relative to the repo root)."""
+    case_files = []
+    for directory in dirs:
+        case_files.extend(sorted((BASE_DIR / directory).glob("case*.html")))
+    return case_files
+
+
+def rewrite_back_links(case_files, dry_run=False):
+    """Rewrite old back links in ``case_files``. Returns (updated, skipped, errors)."""
+    updated = 0
+    skipped = 0
+    errors = 0
+
+    for file_path in case_files:
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                content = f.read()
+
+            if OLD_BACK_LINK in content:
+                if not dry_run:
+                    new_content = content.replace(OLD_BACK_LINK, NEW_BACK_LINK)
+                    with open(file_path, 'w', encoding='utf-8') as f:
+                        f.write(new_content)
+
+                updated += 1
+                filename = os.path.basename(file_path)
+                print(f"✓ Updated: {filename}")
+            else:
+                skipped += 1
+
+        except Exception as e:
+            errors += 1
+            print(f"✗ Error with {file_path}: {e}")
+
+    return updated, skipped, errors
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="scp rewrite", description=__doc__.strip().split("\n")[0])
+    parser.add_argument("dirs", nargs="*", default=DEFAULT_DIRS,
+                        help="Directories of case pages, relative to the repo root")
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing")
+    args = parser.parse_args(argv)
+
+    case_files = find_case_files(args.dirs)
+    print(f"Updating {len(case_files)} case files...")
+    updated, skipped, errors = rewrite_back_links(case_files, dry_run=args.dry_run)
+
+    print(f"\n{'='*60}")
+    print(f"Updated: {updated} files")
+    print(f"Skipped: {skipped} files (already updated or different format)")
+    print(f"Total: {len(case_files)} files")
+    return 1 if errors else 0
@@ -0,0 +1,618 @@
+"""
+Build every content stage as one dependency graph.
+
+Each stage plans one task per file it works on and declares the files
+the task reads and writes:
+
+  extract    pdfs/**.pdf              -> .cache/text/<backend>/<sha256>.txt
+  segment    pdfs/**.pdf              -> .cache/build/segments/<pdf>.json
+  render     segment record + page    -> year3/cases/caseX_Y.html (placeholders only)
+  rewrite    case page                -> same page (back links)
+  index      content/manifest.json    -> yearN/index.html
+  prerender  content/exams/<exam>.json -> exam pages
+  hints      manifest page            -> same page, then firebase.json Link headers
+  previews   pdfs/**.pdf              -> previews/<sha256[:16]>/, then previews/index.json
+  packs      case pages and assets    -> packs/<year>-<discipline>.<sha256[:12]>.zip, packs/index.json
+  dist       everything above         -> dist/
+
+A task depends on the last earlier task that writes a file it reads or
+writes, and a writer waits for earlier readers of the same file. Tasks
+are started on a process pool as soon as their own dependencies finish,
+so a page's rewrite and hints run while other PDFs are still being
+segmented; there is no barrier between stages.
+
+A task is skipped when the inputs it reads (by content hash, plus the
+results its upstream tasks passed on) and the files it wrote are
+unchanged since the last build, so after editing one page only that
+page's chain (and the aggregate headers/dist tasks) runs again. Task
+stamps live in .cache/build/state.json.
+
+Stages whose optional dependencies are not installed (the PDF text
+backends in use for extract, PyPDF2 for segment, the ``previews`` extra)
+are left out, and tasks whose
+inputs are neither present nor produced are reported as unavailable.
+The report ends with the critical path: the chain of dependent tasks
+that bounds the build's wall time however many workers there are.
+
+Usage:
+    scp build                    # every stage
+    scp build hints dist         # these stages and everything they depend on
+    scp build --only packs dist  # just these stages, from the files already on disk
+    scp build --jobs 8 --force
+"""
+
+import hashlib
+import json
+import os
+import time
+from importlib.util import find_spec
+from pathlib import Path
+
+from .paths import BASE_DIR, CACHE_DIR, rel
+
+BUILD_DIR = CACHE_DIR / "build"
+STATE_PATH = BUILD_DIR / "state.json"
+STATE_VERSION = 1
+SEGMENTS_DIR = BUILD_DIR / "segments"
+
+
+class Task:
+    """One unit of work in the build graph."""
+
+    __slots__ = ("name", "stage", "fn", "args", "inputs", "outputs", "local", "always", "gather", "deps")
+
+    def __init__(self, stage, target, fn, args=(), inputs=(), outputs=(), local=False, always=False, gather=False):
+        self.name = f"{stage}:{target}"
+        self.stage = stage
+        self.fn = fn
+        self.args = tuple(args)
+        self.inputs = [rel(path) for path in inputs]
+        self.outputs = [rel(path) for path in outputs]
+        self.local = local      # run on a thread in this process (aggregates that start their own pools)
+        self.always = always    # never skipped (does its own incremental work)
+        self.gather = gather    # depends on every earlier task of its stage and receives their results
+        self.deps = []
+
+
+# === Task functions (run in worker processes unless local) ===
+#
+# Each returns (files written or kept, result passed downstream, status).
+
+def extract_task(pdf_path):
+    from .pdftext import backend_for, cache_path, cached_extract
+
+    backend = backend_for(pdf_path)
+    path = cache_path(pdf_path, backend)
+    cached = path.exists()
+    _, text, error = cached_extract(pdf_path, backend)
+    if text is None:
+        raise RuntimeError(error)
+    return [path], None, "cached" if cached else f"extracted ({backend})"
+
+
+def segment_task(pdf_path, out_path):
+    from .segment import segment_pdf
+
+    record = segment_pdf(pdf_path)
+    if record["error"]:
+        raise RuntimeError(record["error"])
+    out_path = Path(out_path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_path.write_text(json.dumps(record, ensure_ascii=False), encoding="utf-8")
+    return [out_path], None, f"{len(record['questions'])} questions"
+
+
+def render_task(record_path, page):
+    from .segment import write_page
+
+    record = json.loads(Path(record_path).read_text(encoding="utf-8"))
+    return [page], None, write_page(record, Path(page).parent)
+
+
+def rewrite_task(page):
+    from .backlinks import NEW_BACK_LINK, OLD_BACK_LINK
+
+    content = Path(page).read_text(encoding="utf-8")
+    if OLD_BACK_LINK not in content:
+        return [page], None, "unchanged"
+    Path(page).write_text(content.replace(OLD_BACK_LINK, NEW_BACK_LINK), encoding="utf-8")
+    return [page], None, "written"
+
+
+def index_task(year):
+    from .indexpages import render_index
+    from .manifest import PDF_YEAR, load_manifest
+
+    year_data = load_manifest()["years"][year]
+    path = BASE_DIR / year_data["index"]
+    return [path], None, write_if_changed(path, lambda current: render_index(current, year_data, year == PDF_YEAR))
+
+
+def prerender_task(exam):
+    from .prerender import EXAMS, exam_pages, load_exam, render_page
+
+    data = load_exam(exam)
+    pages = exam_pages(exam)
+    written = sum(
+        write_if_changed(BASE_DIR / page, lambda current: render_page(current, exam, data, EXAMS[exam], page))
+        == "written"
+        for page in pages
+    )
+    return [BASE_DIR / page for page in pages], None, f"{written} of {len(pages)} pages written" if written else "unchanged"
+
+
+def hints_task(page, neighbours):
+    from .hints import apply_hints, collect_hints
+
+    path = BASE_DIR / page
+    hints = collect_hints(page, path.read_text(encoding="utf-8"), neighbours)
+    status = write_if_changed(path, lambda current: apply_hints(current, hints))
+    return [path], [page, hints.link_header()], status
+
+
+def headers_task(upstream):
+    from .hints import FIREBASE_JSON, update_headers
+
+    link_headers = [tuple(result) for result in upstream.values() if result]
+    status = write_if_changed(FIREBASE_JSON, lambda current: json.dumps(
+        update_headers(json.loads(current), link_headers), indent=2, ensure_ascii=False) + "\n")
+    return [FIREBASE_JSON], None, status
+
+
+def previews_task(pdf_path, out_root):
+    from .previews import QUALITY, PREVIEW_WIDTH, THUMB_WIDTH, file_sha256, read_meta, render_pdf
+
+    settings = {"preview_width": PREVIEW_WIDTH, "thumb_width": THUMB_WIDTH, "quality": QUALITY}
+    out_dir = Path(out_root) / file_sha256(pdf_path)[:16]
+    if read_meta(out_dir, settings):
+        return [out_dir / "meta.json"], None, "reused"
+    _, meta, error = render_pdf((str(pdf_path), str(out_dir), settings))
+    if meta is None:
+        raise RuntimeError(error)
+    return [out_dir / "meta.json"], None, f"{meta['pages']} pages rendered"
+
+
+def previews_index_task(pdf_paths, out_root):
+    from .previews import INDEX_NAME, build
+
+    # Every PDF was rendered by its own task, so this only writes the index and prunes
+    index, counts, _ = build([Path(path) for path in pdf_paths], Path(out_root))
+    return [Path(out_root) / INDEX_NAME], None, f"{len(index['pdfs'])} PDFs, {counts['pruned']} pruned"
+
+
+def packs_task(jobs):
+    from .manifest import load_manifest
+    from .packs import INDEX_NAME, PACKS_DIR, build
+
+    # Members are content-addressed, so this only recompresses changed files
+    index, counts = build(load_manifest(), jobs=jobs)
+    return [PACKS_DIR / INDEX_NAME], None, \
+        f"{len(index['packs'])} packs, {counts['compressed']} members compressed, {counts['written']} written"
+
+
+def dist_task(jobs):
+    from .dist import DIST_DIR, publish
+
+    result = publish(DIST_DIR, BASE_DIR / "firebase.json", jobs=jobs)
+    counts = result["counts"]
+    changed = len(result["allowed"]) - counts["unchanged"]
+    return [], None, f"{len(result['allowed'])} files, {changed} placed, {len(result['removed'])} removed"
+
+
+def write_if_changed(path, render):
+    current = Path(path).read_text(encoding="utf-8")
+    updated = render(current)
+    if updated == current:
+        return "unchanged"
+    Path(path).write_text(updated, encoding="utf-8")
+    return "written"
+
+
+def run_task(fn, args, upstream):
+    """Run one task; returns (outputs, result, status, seconds, error). Runs in worker processes."""
+    started = time.perf_counter()
+    try:
+        outputs, result, status = fn(*args, upstream) if upstream is not None else fn(*args)
+        return [rel(path) for path in outputs], result, status, time.perf_counter() - started, None
+    except Exception as e:
+        return [], None, None, time.perf_counter() - started, f"{type(e).__name__}: {e}"
+
+
+# === Stages ===
+
+def case_pdfs():
+    from .paths import PDF_DIR
+    from .pdftext import case_number
+
+    return sorted(path for path in PDF_DIR.rglob("*.pdf") if case_number(path))
+
+
+def segment_record_path(pdf_path):
+    return SEGMENTS_DIR / (rel(pdf_path).replace("/", "__") + ".json")
+
+
+def plan_extract(manifest, jobs):
+    from .pdftext import BACKEND_CONFIG
+
+    config = [BACKEND_CONFIG] if BACKEND_CONFIG.exists() else []
+    for pdf_path in case_pdfs():
+        yield Task("extract", rel(pdf_path), extract_task, [str(pdf_path)], inputs=[pdf_path, *config])
+
+
+def plan_segment(manifest, jobs):
+    for pdf_path in case_pdfs():
+        out_path = segment_record_path(pdf_path)
+        yield Task("segment", rel(pdf_path), segment_task, [str(pdf_path), str(out_path)],
+                   inputs=[pdf_path], outputs=[out_path])
+
+
+def plan_render(manifest, jobs):
+    from .manifest import PDF_YEAR, case_path
+    from .pdftext import case_id
+
+    for pdf_path in case_pdfs():
+        page = BASE_DIR / case_path(manifest, PDF_YEAR, case_id(pdf_path))
+        if page.exists():
+            record_path = segment_record_path(pdf_path)
+            yield Task("render", rel(page), render_task, [str(record_path), str(page)],
+                       inputs=[record_path, page], outputs=[page])
+
+
+def plan_rewrite(manifest, jobs):
+    from .backlinks import DEFAULT_DIRS, find_case_files
+
+    for page in find_case_files(DEFAULT_DIRS):
+        yield Task("rewrite", rel(page), rewrite_task, [str(page)], inputs=[page], outputs=[page])
+
+
+def plan_index(manifest, jobs):
+    from .manifest import MANIFEST_PATH
+
+    for year, year_data in manifest["years"].items():
+        index = BASE_DIR / year_data["index"]
+        yield Task("index", year, index_task, [year], inputs=[MANIFEST_PATH, index], outputs=[index])
+
+
+def plan_prerender(manifest, jobs):
+    from .prerender import EXAMS, EXAMS_DIR, exam_pages
+
+    for exam in EXAMS:
+        pages = [BASE_DIR / page for page in exam_pages(exam)]
+        yield Task("prerender", exam, prerender_task, [exam], inputs=[EXAMS_DIR / f"{exam}.json", *pages],
+                   outputs=pages)
+
+
+def plan_hints(manifest, jobs):
+    from .hints import FIREBASE_JSON, iter_pages
+
+    for page, neighbours in iter_pages(manifest):
+        if (BASE_DIR / page).exists():
+            yield Task("hints", page, hints_task, [page, neighbours], inputs=[BASE_DIR / page],
+                       outputs=[BASE_DIR / page])
+    yield Task("hints", "firebase.json", headers_task, inputs=[FIREBASE_JSON], outputs=[FIREBASE_JSON],
+               gather=True)
+
+
+def plan_previews(manifest, jobs):
+    from .previews import INDEX_NAME, PREVIEWS_DIR
+
+    pdf_paths = sorted((BASE_DIR / "pdfs").rglob("*.pdf"))
+    renders = []
+    for pdf_path in pdf_paths:
+        task = Task("previews", rel(pdf_path), previews_task, [str(pdf_path), str(PREVIEWS_DIR)], inputs=[pdf_path])
+        renders.append(task)
+        yield task
+    index = Task("previews", INDEX_NAME, previews_index_task, [[str(p) for p in pdf_paths], str(PREVIEWS_DIR)],
+                 outputs=[PREVIEWS_DIR / INDEX_NAME], local=True)
+    index.deps = renders
+    yield index
+
+
+def plan_packs(manifest, jobs):
+    from .manifest import case_path, iter_cases
+    from .packs import INDEX_NAME, PACKS_DIR
+
+    pages = [BASE_DIR / case_path(manifest, year, case["id"])
+             for year in manifest["years"] for _, case in iter_cases(manifest, year)]
+    yield Task("packs", INDEX_NAME, packs_task, [jobs], inputs=[page for page in pages if page.exists()],
+               outputs=[PACKS_DIR / INDEX_NAME], local=True, always=True)
+
+
+def plan_dist(manifest, jobs):
+    yield Task("dist", "dist", dist_task, [jobs], local=True, always=True)
+
+
+def extract_modules():
+    from .pdftext import backend_modules
+
+    return backend_modules()
+
+
+# name -> (planner, modules it needs, or a function returning them)
+STAGES = {
+    "extract": (plan_extract, extract_modules),
+    "segment": (plan_segment, ("PyPDF2",)),
+    "render": (plan_render, ()),
+    "rewrite": (plan_rewrite, ()),
+    "index": (plan_index, ()),
+    "prerender": (plan_prerender, ()),
+    "hints": (plan_hints, ()),
+    "previews": (plan_previews, ("pypdfium2", "PIL")),
+    "packs": (plan_packs, ()),
+    "dist": (plan_dist, ()),
+}
+
+
+# === Graph ===
+
+def link(tasks):
+    """
+    Add file dependencies in plan order: read-after-write, write-after-write
+    and write-after-read. Gather tasks also depend on the earlier tasks of
+    their stage, and dist on every earlier task that writes a file.
+    """
+    writer = {}
+    readers = {}
+    writers = []
+    for task in tasks:
+        deps = list(task.deps)
+        for path in task.inputs:
+            if path in writer:
+                deps.append(writer[path])
+        for path in task.outputs:
+            if path in writer:
+                deps.append(writer[path])
+            deps.extend(readers.pop(path, []))
+        if task.gather:
+            deps.extend(earlier for earlier in writers if earlier.stage == task.stage)
+        if task.stage == "dist":
+            deps.extend(writers)
+        for path in task.inputs:
+            if path not in task.outputs:
+                readers.setdefault(path, []).append(task)
+        for path in task.outputs:
+            writer[path] = task
+        if task.outputs:
+            writers.append(task)
+        seen = set()
+        task.deps = [dep for dep in deps if dep is not task and not (dep.name in seen or seen.add(dep.name))]
+    return tasks
+
+
+def select(tasks, stages, upstream=True):
+    """The tasks of ``stages`` plus (with ``upstream``) everything they depend on, in plan order."""
+    if not upstream:
+        return [task for task in tasks if task.stage in stages]
+    wanted = set()
+    stack = [task for task in tasks if task.stage in stages]
+    while stack:
+        task = stack.pop()
+        if task.name not in wanted:
+            wanted.add(task.name)
+            stack.extend(task.deps)
+    return [task for task in tasks if task.name in wanted]
+
+
+def plan(stages, jobs=None, upstream=True):
+    """Plan and link the build; returns (tasks, stages left out for missing modules)."""
+    from .manifest import load_manifest
+
+    manifest = load_manifest()
+    tasks = []
+    missing = {}
+    for name, (planner, modules) in STAGES.items():
+        if callable(modules):
+            modules = modules()
+        absent = [module for module in modules if find_spec(module) is None]
+        if absent:
+            missing[name] = absent
+            continue
+        tasks.extend(planner(manifest, jobs))
+    tasks = link(tasks)
+    return select(tasks, stages, upstream), missing
+
+
+# === Stamps ===
+
+class Stamps:
+    """Content hashes of files (cached by size and mtime) and per-task build records."""
+
+    def __init__(self):
+        try:
+            with open(STATE_PATH, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            state = {}
+        if state.get("version") != STATE_VERSION:
+            state = {}
+        self.files = state.get("files", {})
+        self.tasks = state.get("tasks", {})
+
+    def digest(self, path):
+        try:
+            stat = os.stat(BASE_DIR / path)
+        except FileNotFoundError:
+            return None
+        cached = self.files.get(path)
+        if cached and cached[0] == stat.st_size and cached[1] == stat.st_mtime_ns:
+            return cached[2]
+        digest = hashlib.sha256()
+        with open(BASE_DIR / path, "rb") as f:
+            for block in iter(lambda: f.read(1 << 20), b""):
+                digest.update(block)
+        self.files[path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return self.files[path][2]
+
+    def stamp(self, task, upstream):
+        """Hash of what the task reads. Files it also writes are checked through its outputs instead."""
+        digest = hashlib.sha256()
+        digest.update(json.dumps([task.fn.__name__, task.args], default=str).encode())
+        for path in task.inputs:
+            if path not in task.outputs:
+                digest.update(f"{path}\0{self.digest(path)}\0".encode())
+        digest.update(json.dumps(upstream, sort_keys=True, default=str).encode())
+        return digest.hexdigest()
+
+    def is_current(self, task, stamp):
+        record = self.tasks.get(task.name)
+        return bool(record) and record["stamp"] == stamp and all(
+            self.digest(path) == digest for path, digest in record["outputs"].items())
+
+    def save(self, records):
+        """Record finished tasks with the final hashes of their outputs."""
+        for name, (stamp, outputs, result) in records.items():
+            self.tasks[name] = {"stamp": stamp, "outputs": {path: self.digest(path) for path in outputs},
+                                "result": result}
+        BUILD_DIR.mkdir(parents=True, exist_ok=True)
+        tmp = STATE_PATH.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": STATE_VERSION, "files": self.files, "tasks": self.tasks}, f)
+        os.replace(tmp, STATE_PATH)
+
+
+# === Scheduler ===
+
+def run(tasks, jobs=None, force=False, log=print):
+    """
+    Run ``tasks`` as their dependencies finish.
+
+    Returns {task name: (status, seconds, error)}; status is one of ran,
+    skipped, failed, blocked (a dependency failed) or unavailable (an
+    input does not exist once its dependencies are done).
+    """
+    from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+    stamps = Stamps()
+    by_name = {task.name: task for task in tasks}
+    dependents = {task.name: [] for task in tasks}
+    waiting = {}
+    for task in tasks:
+        deps = [dep for dep in task.deps if dep.name in by_name]
+        waiting[task.name] = len(deps)
+        for dep in deps:
+            dependents[dep.name].append(task)
+
+    outcome = {}
+    results = {}
+    records = {}
+    running = {}
+    ready = [task for task in tasks if not waiting[task.name]]
+
+    def finish(task, status, seconds=0.0, error=None):
+        outcome[task.name] = (status, seconds, error)
+        for dependent in dependents[task.name]:
+            waiting[dependent.name] -= 1
+            if not waiting[dependent.name]:
+                ready.append(dependent)
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool, ThreadPoolExecutor(max_workers=1) as local:
+        while ready or running:
+            while ready:
+                task = ready.pop(0)
+                failed = [dep.name for dep in task.deps if dep.name in outcome and outcome[dep.name][0] in
+                          ("failed", "blocked")]
+                if failed:
+                    finish(task, "blocked", error=f"after {failed[0]}")
+                    continue
+                absent = [path for path in task.inputs if stamps.digest(path) is None]
+                if absent:
+                    finish(task, "unavailable", error=f"no {absent[0]}")
+                    continue
+                upstream = {dep.name: results.get(dep.name) for dep in task.deps} if task.gather else None
+                stamp = stamps.stamp(task, upstream)
+                if not force and not task.always and stamps.is_current(task, stamp):
+                    results[task.name] = stamps.tasks[task.name]["result"]
+                    records[task.name] = (stamp, list(stamps.tasks[task.name]["outputs"]), results[task.name])
+                    finish(task, "skipped")
+                    continue
+                executor = local if task.local else pool
+                running[executor.submit(run_task, task.fn, task.args, upstream)] = (task, stamp)
+
+            if not running:
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                task, stamp = running.pop(future)
+                outputs, result, status, seconds, error = future.result()
+                if error:
+                    log(f"  ✗ {task.name}: {error}")
+                    finish(task, "failed", seconds, error)
+                    continue
+                results[task.name] = result
+                records[task.name] = (stamp, sorted(set(task.outputs) | set(outputs)), result)
+                if status not in ("unchanged", "complete", "reused", "cached"):
+                    log(f"  ✓ {task.name}: {status}")
+                finish(task, "ran", seconds)
+
+    stamps.save(records)
+    return outcome
+
+
+def critical_path(tasks, outcome):
+    """The chain of dependent tasks with the largest total run time: (seconds, [task, ...])."""
+    best = {}
+    for task in tasks:  # plan order is a topological order
+        if task.name not in outcome:
+            continue
+        previous = max((best[dep.name] for dep in task.deps if dep.name in best), key=lambda item: item[0],
+                       default=(0.0, []))
+        seconds = outcome[task.name][1]
+        best[task.name] = (previous[0] + seconds, previous[1] + [task])
+    return max(best.values(), key=lambda item: item[0], default=(0.0, []))
+
+
+def report(tasks, outcome, elapsed, workers, log=print):
+    statuses = ("ran", "skipped", "failed", "blocked", "unavailable")
+    stages = {}
+    for task in tasks:
+        status, seconds, _ = outcome[task.name]
+        totals = stages.setdefault(task.stage, dict.fromkeys(statuses, 0) | {"seconds": 0.0})
+        totals[status] += 1
+        totals["seconds"] += seconds
+
+    log(f"{'stage':<16} {'tasks':>6} " + " ".join(f"{status:>11}" for status in statuses) + f" {'task time':>10}")
+    for stage, totals in stages.items():
+        count = sum(totals[status] for status in statuses)
+        log(f"{stage:<16} {count:>6} " + " ".join(f"{totals[status]:>11}" for status in statuses)
+            + f" {totals['seconds']:>9.2f}s")
+
+    busy = sum(seconds for _, seconds, _ in outcome.values())
+    length, chain = critical_path(tasks, outcome)
+    log(f"\nCritical path: {length:.2f}s of {elapsed:.2f}s wall ({len(chain)} task{'s' if len(chain) != 1 else ''})")
+    for task in chain:
+        if outcome[task.name][1] >= 0.005 or task is chain[-1]:
+            log(f"  {outcome[task.name][1]:7.2f}s  {task.name}")
+    parallelism = busy / elapsed if elapsed else 0
+    log(f"Task time {busy:.2f}s over {elapsed:.2f}s wall: {parallelism:.1f}x on {workers} workers")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="scp build", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("stages", nargs="*", metavar="STAGE",
+                        help=f"Stages to build with their dependencies (default: all; {', '.join(STAGES)})")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes")
+    parser.add_argument("--force", action="store_true", help="Run every task, ignoring stamps")
+    parser.add_argument("--only", action="store_true",
+                        help="Leave out the stages the named ones depend on (deploy hooks: nothing that "
+                             "rewrites tracked sources or firebase.json runs)")
+    args = parser.parse_args(argv)
+
+    unknown = [stage for stage in args.stages if stage not in STAGES]
+    if unknown:
+        parser.error(f"unknown stage(s): {', '.join(unknown)} (choose from {', '.join(STAGES)})")
+
+    started = time.perf_counter()
+    if args.only and not args.stages:
+        parser.error("--only needs the stages to build")
+    tasks, missing = plan(args.stages or list(STAGES), jobs=args.jobs, upstream=not args.only)
+    for stage, modules in missing.items():
+        print(f"  - {stage}: skipped, needs {', '.join(modules)}")
+    print(f"Building {len(tasks)} tasks")
+    outcome = run(tasks, jobs=args.jobs, force=args.force)
+    elapsed = time.perf_counter() - started
+
+    report(tasks, outcome, elapsed, args.jobs or os.cpu_count())
+    failed = sum(1 for status, _, _ in outcome.values() if status in ("failed", "blocked"))
+    return 1 if failed else 0
@@ -0,0 +1,87 @@
+"""
+Single entry point for the SCP build tooling.
+
+    scp <command> [options]
+
+Each command lives in its own module, imported only when that command
+runs, so ``scp --help`` and no-op runs stay fast enough for editor hooks
+and watch loops.
+"""
+
+import os
+import sys
+
+# command -> (module, summary)
+COMMANDS = {
+    "generate": ("scpbuild.generators", "Create case pages from templates or PDFs"),
+    "extract": ("scpbuild.pdftext", "Extract and cache text from case PDFs"),
+    "pdfbench": ("scpbuild.pdfbench", "Benchmark PDF text extraction backends on the corpus"),
+    "segment": ("scpbuild.segment", "Split PDFs into case/question/answer records"),
+    "rewrite": ("scpbuild.backlinks", "Rewrite case back links to smart navigation"),
+    "audit": ("scpbuild.audit", "Score case pages against their source PDFs"),
+    "dedupe": ("scpbuild.dedupe", "Report duplicate pages/PDFs and mirror trees"),
+    "manifest": ("scpbuild.manifest", "Show or rebuild the case manifest"),
+    "index": ("scpbuild.indexpages", "Generate year index pages from the manifest"),
+    "hints": ("scpbuild.hints", "Add resource hints and Link headers to pages"),
+    "archive": ("scpbuild.archive", "Compact old analytics sessions into monthly archives"),
+    "ingest": ("scpbuild.ingest", "Batch analytics beacons into coalesced Firestore writes"),
+    "userstate": ("scpbuild.userstate", "Pack per-user progress and flag documents into bitsets"),
+    "items": ("scpbuild.items", "Item analysis of saved MCQ exam attempts"),
+    "preview": ("scpbuild.preview", "Serve the site locally with firebase.json rules"),
+    "links": ("scpbuild.linkcheck", "Check links across the publish tree"),
+    "prerender": ("scpbuild.prerender", "Prerender exam questions into static markup"),
+    "previews": ("scpbuild.previews", "Render PDF first-page previews and thumbnails"),
+    "packs": ("scpbuild.packs", "Build offline study packs per discipline and year"),
+    "dist": ("scpbuild.dist", "Build the lean dist/ publish directory"),
+    "build": ("scpbuild.build", "Run every content stage as a parallel, incremental task graph"),
+}
+
+
+def usage():
+    width = max(len(name) for name in COMMANDS)
+    lines = [
+        "usage: scp [--root DIR] <command> [options]",
+        "",
+        "commands:",
+    ]
+    lines += [f"  {name:<{width}}  {summary}" for name, (_, summary) in COMMANDS.items()]
+    lines += [
+        "",
+        "options:",
+        "  --root DIR  repository root (default: the checkout containing scpbuild)",
+        "  -h, --help  show this message; use 'scp <command> --help' for command options",
+    ]
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+
+    # Hand-rolled parsing keeps argparse out of the --help path
+    if argv[:1] == ["--root"] and len(argv) > 1:
+        os.environ["SCP_ROOT"] = os.path.abspath(argv[1])
+        argv = argv[2:]
+
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0
+    if argv[0] == "--version":
+        from scpbuild import __version__
+
+        print(__version__)
+        return 0
+
+    command, args = argv[0], argv[1:]
+    if command not in COMMANDS:
+        print(usage(), file=sys.stderr)
+        print(f"\nscp: unknown command '{command}'", file=sys.stderr)
+        return 2
+
+    import importlib
+
+    module = importlib.import_module(COMMANDS[command][0])
+    return module.main(args) or 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,405 @@
+"""
+Find exact and near-duplicate case pages and source PDFs.
+
+Every file is fingerprinted twice: a SHA-256 of its raw bytes (exact
+duplicates) and a set of content-defined chunks cut with a gear rolling
+hash (near duplicates). Case pages are also hashed after relative
+``href``/``src`` values have been resolved against the site root, so
+``cases/caseX_Y.html`` and ``year3/cases/caseX_Y.html`` compare equal
+when they only differ in ``../`` depth.
+
+Usage:
+    scp dedupe                 # report only
+    scp dedupe --diff          # include divergence diffs
+    scp dedupe --emit-mirror year3/cases cases
+    scp dedupe --link-dist dist
+"""
+
+import hashlib
+import json
+import os
+import posixpath
+import random
+import re
+from pathlib import Path
+
+from .paths import BASE_DIR, CACHE_DIR
+
+# Trees scanned by default
+DEFAULT_ROOTS = ["cases", "year3/cases", "year4/cases", "pdfs"]
+
+CACHE_PATH = CACHE_DIR / "dedupe.json"
+CACHE_VERSION = 1
+
+# Content-defined chunking parameters (bytes)
+MIN_CHUNK = 256
+AVG_CHUNK_BITS = 10          # ~1 KiB average chunk
+MAX_CHUNK = 8192
+
+# Pairs at or above this chunk similarity are reported as near duplicates
+NEAR_THRESHOLD = 0.5
+
+# Deterministic gear table so chunk boundaries are stable between runs
+_rng = random.Random(0x5C9)
+GEAR = [_rng.getrandbits(64) for _ in range(256)]
+MASK64 = (1 << 64) - 1
+CUT_MASK = ((1 << AVG_CHUNK_BITS) - 1) << (64 - AVG_CHUNK_BITS)
+
+URL_ATTR_RE = re.compile(r'(\b(?:href|src)\s*=\s*)(["\'])([^"\']*)\2', re.IGNORECASE)
+EXTERNAL_RE = re.compile(r'^(?:[a-z][a-z0-9+.-]*:|//|#|/)', re.IGNORECASE)
+
+
+def chunk_boundaries(data):
+    """Return the end offsets of the content-defined chunks of ``data``."""
+    gear = GEAR
+    cut_mask = CUT_MASK
+    n = len(data)
+    ends = []
+    start = 0
+    while start < n:
+        limit = min(start + MAX_CHUNK, n)
+        i = start + MIN_CHUNK
+        if i >= limit:
+            ends.append(limit)
+            break
+        h = 0
+        end = limit
+        while i < limit:
+            h = ((h << 1) + gear[data[i]]) & MASK64
+            i += 1
+            if not h & cut_mask:
+                end = i
+                break
+        ends.append(end)
+        start = end
+    return ends
+
+
+def chunk_digests(data):
+    """Return (digest, length) pairs for each chunk of ``data``."""
+    chunks = []
+    start = 0
+    for end in chunk_boundaries(data):
+        piece = data[start:end]
+        chunks.append((hashlib.blake2b(piece, digest_size=12).hexdigest(), len(piece)))
+        start = end
+    return chunks
+
+
+def relocate_html(text, src_rel, dst_rel=None):
+    """
+    Rewrite relative href/src values in ``text``.
+
+    URLs are resolved against ``src_rel`` (a path relative to the repo
+    root). With ``dst_rel`` they are re-expressed relative to that file,
+    otherwise they are written as root-absolute paths ("/css/case.css"),
+    which is the canonical form used for fingerprinting.
+    """
+    src_dir = posixpath.dirname(src_rel)
+    dst_dir = posixpath.dirname(dst_rel) if dst_rel is not None else None
+
+    def _replace(match):
+        prefix, quote, url = match.groups()
+        if not url or EXTERNAL_RE.match(url):
+            return match.group(0)
+        path, sep, rest = url.partition("?") if "?" in url else url.partition("#")
+        target = posixpath.normpath(posixpath.join(src_dir, path))
+        if dst_dir is None:
+            new_path = "/" + target
+        else:
+            new_path = posixpath.relpath(target, dst_dir or ".")
+        return f"{prefix}{quote}{new_path}{sep}{rest}{quote}"
+
+    return URL_ATTR_RE.sub(_replace, text)
+
+
+def fingerprint_file(args):
+    """Fingerprint one file. Runs in a worker process."""
+    rel_path, abs_path = args
+    data = Path(abs_path).read_bytes()
+    record = {
+        "size": len(data),
+        "sha256": hashlib.sha256(data).hexdigest(),
+    }
+    if rel_path.endswith(".html"):
+        canonical = relocate_html(data.decode("utf-8", errors="replace"), rel_path).encode("utf-8")
+        record["canonical"] = hashlib.sha256(canonical).hexdigest()
+        record["chunks"] = chunk_digests(canonical)
+    else:
+        record["canonical"] = record["sha256"]
+        record["chunks"] = chunk_digests(data)
+    return rel_path, record
+
+
+def iter_files(roots):
+    """Yield repo-relative paths for every HTML page and PDF under ``roots``."""
+    for root in roots:
+        root_path = BASE_DIR / root
+        if not root_path.exists():
+            print(f"WARNING: {root} does not exist, skipping")
+            continue
+        for path in sorted(root_path.rglob("*")):
+            if path.is_file() and path.suffix.lower() in (".html", ".pdf"):
+                yield path.relative_to(BASE_DIR).as_posix()
+
+
+def load_cache():
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def save_cache(files):
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "files": files}, f)
+
+
+def fingerprint_all(roots, jobs=None):
+    """Fingerprint every file under ``roots``, reusing cached results by size and mtime."""
+    cache = load_cache()
+    results = {}
+    todo = []
+
+    for rel_path in iter_files(roots):
+        stat = (BASE_DIR / rel_path).stat()
+        cached = cache.get(rel_path)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            results[rel_path] = cached
+        else:
+            todo.append(rel_path)
+
+    if todo:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            work = [(rel, str(BASE_DIR / rel)) for rel in todo]
+            for rel_path, record in pool.map(fingerprint_file, work, chunksize=8):
+                record["mtime_ns"] = (BASE_DIR / rel_path).stat().st_mtime_ns
+                results[rel_path] = record
+
+    if todo or len(results) != len(cache):
+        save_cache(results)
+    return results, len(todo)
+
+
+def group_by(records, key):
+    groups = {}
+    for rel_path, record in records.items():
+        groups.setdefault(record[key], []).append(rel_path)
+    return [sorted(paths) for paths in groups.values() if len(paths) > 1]
+
+
+def near_duplicates(records, threshold=NEAR_THRESHOLD):
+    """
+    Find pairs of files that share a large fraction of their chunks.
+
+    Uses an inverted chunk index so only files sharing at least one chunk
+    are compared. Returns (similarity, path_a, path_b) sorted descending.
+    Only the first file of each canonical group takes part, so mirrored
+    copies are not reported once per tree.
+    """
+    representatives = {}
+    for rel_path in sorted(records):
+        representatives.setdefault(records[rel_path]["canonical"], rel_path)
+
+    index = {}
+    chunk_sets = {}
+    for rel_path in representatives.values():
+        record = records[rel_path]
+        chunks = {digest: size for digest, size in record["chunks"]}
+        chunk_sets[rel_path] = chunks
+        for digest in chunks:
+            index.setdefault(digest, []).append(rel_path)
+
+    shared = {}
+    for paths in index.values():
+        if len(paths) < 2 or len(paths) > 50:
+            # Very common chunks (shared boilerplate) say nothing about pairs
+            continue
+        for i, a in enumerate(paths):
+            for b in paths[i + 1:]:
+                shared[(a, b)] = shared.get((a, b), 0) + 1
+
+    pairs = []
+    for a, b in shared:
+        set_a, set_b = chunk_sets[a], chunk_sets[b]
+        common = set_a.keys() & set_b.keys()
+        common_bytes = sum(set_a[d] for d in common)
+        total_bytes = sum(set_a.values()) + sum(set_b.values()) - common_bytes
+        similarity = common_bytes / total_bytes if total_bytes else 1.0
+        if similarity >= threshold:
+            pairs.append((similarity, a, b))
+
+    pairs.sort(key=lambda p: (-p[0], p[1], p[2]))
+    return pairs
+
+
+def mirror_pairs(records, left, right):
+    """Match files with the same name in two trees and classify them."""
+    left_files = {p[len(left) + 1:]: p for p in records if p.startswith(left + "/")}
+    right_files = {p[len(right) + 1:]: p for p in records if p.startswith(right + "/")}
+    identical, relocated, diverged = [], [], []
+    for name in sorted(left_files.keys() & right_files.keys()):
+        a, b = left_files[name], right_files[name]
+        if records[a]["sha256"] == records[b]["sha256"]:
+            identical.append((a, b))
+        elif records[a]["canonical"] == records[b]["canonical"]:
+            relocated.append((a, b))
+        else:
+            diverged.append((a, b))
+    only_left = sorted(left_files.keys() - right_files.keys())
+    only_right = sorted(right_files.keys() - left_files.keys())
+    return identical, relocated, diverged, only_left, only_right
+
+
+def divergence_diff(a, b, context=1):
+    """Unified diff of two pages after path canonicalisation."""
+    import difflib
+
+    text_a = relocate_html((BASE_DIR / a).read_text(encoding="utf-8", errors="replace"), a)
+    text_b = relocate_html((BASE_DIR / b).read_text(encoding="utf-8", errors="replace"), b)
+    return list(difflib.unified_diff(
+        text_a.splitlines(), text_b.splitlines(), fromfile=a, tofile=b, lineterm="", n=context
+    ))
+
+
+def emit_mirror(source_root, target_root, dry_run=False):
+    """
+    Regenerate every page in ``target_root`` from its canonical copy in
+    ``source_root``, rewriting relative paths for the new location.
+    """
+    written = 0
+    source_dir = BASE_DIR / source_root
+    for src in sorted(source_dir.glob("*.html")):
+        src_rel = src.relative_to(BASE_DIR).as_posix()
+        dst_rel = f"{target_root}/{src.name}"
+        dst = BASE_DIR / dst_rel
+        text = relocate_html(src.read_text(encoding="utf-8"), src_rel, dst_rel)
+        if dst.exists() and dst.read_text(encoding="utf-8") == text:
+            continue
+        if not dry_run:
+            dst.parent.mkdir(parents=True, exist_ok=True)
+            dst.write_text(text, encoding="utf-8")
+        print(f"{'WOULD WRITE' if dry_run else 'WRITE'}: {dst_rel}")
+        written += 1
+    return written
+
+
+def link_identical(output_dir, dry_run=False):
+    """
+    Replace byte-identical files under ``output_dir`` with hard links to a
+    single canonical copy. Returns (files linked, bytes saved).
+    """
+    seen = {}
+    linked = 0
+    saved = 0
+    for path in sorted(Path(output_dir).rglob("*")):
+        if not path.is_file() or path.is_symlink():
+            continue
+        stat = path.stat()
+        digest = hashlib.sha256(path.read_bytes()).hexdigest()
+        key = (digest, stat.st_size)
+        first = seen.setdefault(key, path)
+        if first is path:
+            continue
+        first_stat = first.stat()
+        if (first_stat.st_dev, first_stat.st_ino) == (stat.st_dev, stat.st_ino):
+            continue
+        if not dry_run:
+            tmp = path.with_name(path.name + ".lnk-tmp")
+            os.link(first, tmp)
+            os.replace(tmp, path)
+        linked += 1
+        saved += stat.st_size
+    return linked, saved
+
+
+def format_size(num):
+    for unit in ("B", "KB", "MB", "GB"):
+        if num < 1024 or unit == "GB":
+            return f"{num:.1f} {unit}" if unit != "B" else f"{num} B"
+        num /= 1024
+
+
+def report(records, show_diff=False, threshold=NEAR_THRESHOLD):
+    print("=" * 70)
+    print(f"Fingerprinted {len(records)} files "
+          f"({format_size(sum(r['size'] for r in records.values()))})")
+
+    exact = group_by(records, "sha256")
+    print("=" * 70)
+    print(f"Exact duplicates: {len(exact)} groups")
+    wasted = 0
+    for paths in exact:
+        size = records[paths[0]]["size"]
+        wasted += size * (len(paths) - 1)
+        print(f"  {format_size(size):>10}  " + "  ==  ".join(paths))
+    print(f"  Reclaimable by exact dedup: {format_size(wasted)}")
+
+    print("=" * 70)
+    print("Mirrored trees (cases/ vs year3/cases/):")
+    identical, relocated, diverged, only_left, only_right = mirror_pairs(records, "cases", "year3/cases")
+    print(f"  Byte-identical:          {len(identical)}")
+    print(f"  Identical except paths:  {len(relocated)}")
+    print(f"  Diverged:                {len(diverged)}")
+    for name in only_left:
+        print(f"  Only in cases/:          {name}")
+    for name in only_right:
+        print(f"  Only in year3/cases/:    {name}")
+    mirror_bytes = sum(records[b]["size"] for _, b in identical + relocated)
+    print(f"  Single-source saving:    {format_size(mirror_bytes)}")
+    for a, b in diverged:
+        print(f"  DIVERGED: {a} <> {b}")
+        if show_diff:
+            for line in divergence_diff(a, b)[:40]:
+                print(f"      {line}")
+
+    print("=" * 70)
+    pairs = near_duplicates(records, threshold)
+    print(f"Near duplicates (>= {threshold:.0%} shared content): {len(pairs)} pairs")
+    for similarity, a, b in pairs:
+        print(f"  {similarity:6.1%}  {a}  ~  {b}")
+        if show_diff and a.endswith(".html") and b.endswith(".html"):
+            for line in divergence_diff(a, b)[:40]:
+                print(f"      {line}")
+    print("=" * 70)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="scp dedupe", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("roots", nargs="*", default=DEFAULT_ROOTS,
+                        help="Directories to scan, relative to the repo root")
+    parser.add_argument("--diff", action="store_true", help="Show divergence diffs")
+    parser.add_argument("--threshold", type=float, default=NEAR_THRESHOLD,
+                        help="Minimum shared fraction for near duplicates")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes")
+    parser.add_argument("--emit-mirror", nargs=2, metavar=("SOURCE", "TARGET"),
+                        help="Regenerate TARGET tree from the canonical SOURCE tree")
+    parser.add_argument("--link-dist", metavar="DIR",
+                        help="Hard-link identical files in a publish directory")
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing")
+    args = parser.parse_args(argv)
+
+    if args.emit_mirror:
+        source, target = args.emit_mirror
+        written = emit_mirror(source, target, dry_run=args.dry_run)
+        print(f"Mirrored {source}/ -> {target}/: {written} files changed")
+        return 0
+
+    if args.link_dist:
+        linked, saved = link_identical(args.link_dist, dry_run=args.dry_run)
+        print(f"Hard-linked {linked} files in {args.link_dist}/, saving {format_size(saved)}")
+        return 0
+
+    records, refreshed = fingerprint_all(args.roots, jobs=args.jobs)
+    print(f"Fingerprinting {len(records)} files ({refreshed} changed since last run)...")
+    report(records, show_diff=args.diff, threshold=args.threshold)
+    return 0
@@ -0,0 +1,266 @@
+"""
+Assemble the publish directory (dist/) from the site graph.
+
+Instead of deploying the repository root and relying on ignore lists,
+only files reachable from the entry pages are published: everything the
+pages link, load, prefetch or navigate to (including case catalogue
+entries and ``exams/${year}.html`` style script targets), plus the
+stylesheets' ``url()`` assets, the ``scp previews`` images of any PDF a
+page links to or whose case page is published (with the PDF itself, which
+js/pdf-preview.js loads on demand), and the ``scp packs`` study packs.
+Other source PDFs, .docx exams, docs, tests and scripts never reach dist/.
+
+Files at or above LINK_THRESHOLD are reflinked where the filesystem
+supports it and hard-linked otherwise; smaller files are copied. Files
+whose size and mtime already match are left alone, so rebuilding after a
+one-page edit only touches that page. dist/.deploy-manifest.json records
+the SHA-256 and size of every published file (hashes are reused for
+unchanged files).
+
+Usage:
+    scp dist
+    scp dist --entry index.html admin.html --dry-run
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+from . import packs, previews
+from .hosting import HostingConfig
+from .paths import BASE_DIR
+from .sitegraph import build_graph, expand_glob, links, resolve
+
+DIST_DIR = BASE_DIR / "dist"
+MANIFEST_NAME = ".deploy-manifest.json"
+MANIFEST_VERSION = 1
+
+# Pages published even though nothing links to them
+DEFAULT_ENTRIES = ["index.html", "admin.html", "analytics-advanced.html", "flagged.html"]
+
+# Pre-year-split URLs (shared links, og:url) that must keep resolving; the
+# old cases/ tree is redirected to year3/cases/ in firebase.json instead
+LEGACY_ENTRIES = ["exams/*.html"]
+
+# Published when present: hosting looks these up by name
+WELL_KNOWN = ["404.html", "favicon.ico", "robots.txt", "sitemap.xml"]
+
+# Files at least this large are linked rather than copied
+LINK_THRESHOLD = 64 * 1024
+
+# Linux FICLONE ioctl: share extents copy-on-write (btrfs, XFS, overlayfs on those)
+FICLONE = 0x40049409
+
+SKIP_SCHEMES = ("mailto:", "tel:", "javascript:", "data:", "blob:")
+
+
+def source_files(config_path, dist_dir):
+    """Every file in the repo that hosting's ``ignore`` list would publish."""
+    config = HostingConfig(config_path, public=str(BASE_DIR))
+    skip = os.path.relpath(dist_dir, BASE_DIR).replace(os.sep, "/")
+    files = set()
+    for dirpath, dirnames, filenames in os.walk(BASE_DIR):
+        rel_dir = os.path.relpath(dirpath, BASE_DIR).replace(os.sep, "/")
+        rel_dir = "" if rel_dir == "." else rel_dir + "/"
+        dirnames[:] = [name for name in dirnames
+                       if rel_dir + name != skip and not config.is_ignored(rel_dir + name)]
+        files.update(rel_dir + name for name in filenames if not config.is_ignored(rel_dir + name))
+    return files
+
+
+def allowlist(entries, files, graph):
+    """Files reachable from ``entries`` through the site graph."""
+    allowed = set()
+    globs = {}
+    stack = [entry for entry in entries if entry in files]
+    while stack:
+        path = stack.pop()
+        if path in allowed:
+            continue
+        allowed.add(path)
+        for ref, _ in links(path, graph):
+            url = ref.url
+            if ref.is_external or url.startswith("#") or url.lower().startswith(SKIP_SCHEMES):
+                continue
+            target = resolve(path, url)
+            if target is None:
+                continue
+            if ref.tag == "js-glob":
+                if target not in globs:
+                    globs[target] = expand_glob(target, files)
+                stack.extend(globs[target])
+            elif target in files:
+                stack.append(target)
+            elif target + "/index.html" in files:
+                stack.append(target + "/index.html")
+    return allowed
+
+
+def reflink(src, dst):
+    import fcntl
+
+    with open(src, "rb") as source, open(dst, "wb") as target:
+        fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+
+
+def place(src, dst, size):
+    """Put ``src`` at ``dst`` by reflink, hard link or copy; returns the method used."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    tmp = dst.with_name(dst.name + ".tmp")
+    method = "copy"
+    if size >= LINK_THRESHOLD:
+        try:
+            reflink(src, tmp)
+            shutil.copystat(src, tmp)
+            method = "reflink"
+        except (OSError, ImportError):
+            tmp.unlink(missing_ok=True)
+            try:
+                os.link(src, tmp)
+                method = "link"
+            except OSError:
+                pass
+    if method == "copy":
+        shutil.copy2(src, tmp)
+    os.replace(tmp, dst)
+    return method
+
+
+def is_current(src_stat, dst):
+    try:
+        dst_stat = dst.stat()
+    except FileNotFoundError:
+        return False
+    if (dst_stat.st_dev, dst_stat.st_ino) == (src_stat.st_dev, src_stat.st_ino):
+        return True
+    return dst_stat.st_size == src_stat.st_size and dst_stat.st_mtime_ns == src_stat.st_mtime_ns
+
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_manifest(dist_dir):
+    try:
+        with open(dist_dir / MANIFEST_NAME, "r", encoding="utf-8") as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return manifest.get("files", {}) if manifest.get("version") == MANIFEST_VERSION else {}
+
+
+def build(dist_dir, files, dry_run=False):
+    """Sync ``files`` into ``dist_dir``; returns (counts, manifest files, removed paths)."""
+    previous = load_manifest(dist_dir)
+    counts = {"unchanged": 0, "copy": 0, "link": 0, "reflink": 0}
+    manifest = {}
+
+    for rel_path in sorted(files):
+        src = BASE_DIR / rel_path
+        dst = dist_dir / rel_path
+        stat = src.stat()
+        if is_current(stat, dst):
+            counts["unchanged"] += 1
+        elif dry_run:
+            counts["copy" if stat.st_size < LINK_THRESHOLD else "link"] += 1
+        else:
+            counts[place(src, dst, stat.st_size)] += 1
+
+        cached = previous.get(rel_path)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            manifest[rel_path] = cached
+        else:
+            manifest[rel_path] = {"sha256": file_sha256(src), "size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+    removed = []
+    if dist_dir.exists():
+        for dirpath, _, filenames in os.walk(dist_dir, topdown=False):
+            for name in filenames:
+                rel_path = os.path.relpath(os.path.join(dirpath, name), dist_dir).replace(os.sep, "/")
+                if rel_path != MANIFEST_NAME and rel_path not in files:
+                    removed.append(rel_path)
+                    if not dry_run:
+                        os.unlink(os.path.join(dirpath, name))
+            if not dry_run and dirpath != str(dist_dir) and not os.listdir(dirpath):
+                os.rmdir(dirpath)
+
+    if not dry_run and manifest != previous:
+        dist_dir.mkdir(parents=True, exist_ok=True)
+        with open(dist_dir / MANIFEST_NAME, "w", encoding="utf-8") as f:
+            json.dump({"version": MANIFEST_VERSION, "files": manifest}, f, indent=1, sort_keys=True)
+            f.write("\n")
+    return counts, manifest, removed
+
+
+def crawl_entries(entries, files):
+    """``entries`` plus the well-known and legacy pages among ``files`` that are published unlinked."""
+    crawl = list(entries) + [name for name in WELL_KNOWN if name in files]
+    crawl += [path for pattern in LEGACY_ENTRIES for path in expand_glob(pattern, files)]
+    return crawl
+
+
+def publish(dist_dir, config_path, entries=DEFAULT_ENTRIES, jobs=None, dry_run=False):
+    """
+    Build ``dist_dir`` from the pages reachable from ``entries``.
+
+    Returns a dict of the source files, published files, build counts,
+    manifest, removed paths, reparsed file count, missing entries and the
+    build stages (packs, previews) whose output was not found.
+    """
+    files = source_files(config_path, dist_dir)
+    graph, reparsed = build_graph(sorted(path for path in files if path.endswith((".html", ".js", ".css"))),
+                                  jobs=jobs)
+    allowed = allowlist(crawl_entries(entries, files), files, graph)
+    wants_previews = previews.CLIENT_SCRIPT in allowed or any(path.endswith(".pdf") for path in allowed)
+    preview_files = previews.published_files(allowed) & files
+    pack_files = packs.published_files(files)
+    allowed |= preview_files | pack_files
+    # Build outputs that are gitignored, so absent from a fresh checkout
+    unbuilt = [stage for stage, wanted, found in [("packs", True, pack_files),
+                                                   ("previews", wants_previews, preview_files)] if wanted and not found]
+    counts, manifest, removed = build(dist_dir, allowed, dry_run=dry_run)
+    return {
+        "files": files, "allowed": allowed, "counts": counts, "manifest": manifest, "removed": removed,
+        "reparsed": reparsed, "missing": [entry for entry in entries if entry not in files], "unbuilt": unbuilt,
+    }
+
+
+def main(argv=None):
+    import argparse
+    from pathlib import Path
+
+    from .dedupe import format_size
+
+    parser = argparse.ArgumentParser(prog="scp dist", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--out", default=str(DIST_DIR), help="Publish directory to build")
+    parser.add_argument("--config", default=str(BASE_DIR / "firebase.json"), help="firebase.json with the ignore list")
+    parser.add_argument("--entry", nargs="+", default=DEFAULT_ENTRIES, help="Pages to publish and crawl from")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes for parsing")
+    parser.add_argument("--dry-run", action="store_true", help="Report without writing")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    dist_dir = Path(args.out).resolve()
+    result = publish(dist_dir, args.config, args.entry, jobs=args.jobs, dry_run=args.dry_run)
+    counts, manifest, removed = result["counts"], result["manifest"], result["removed"]
+    elapsed = time.perf_counter() - started
+
+    published = sum(record["size"] for record in manifest.values())
+    root_size = sum((BASE_DIR / path).stat().st_size for path in result["files"])
+    print(f"{'Would publish' if args.dry_run else 'Published'} {len(result['allowed'])} files "
+          f"({format_size(published)}) to {os.path.relpath(dist_dir, BASE_DIR)}/ "
+          f"instead of {len(result['files'])} files ({format_size(root_size)}) from the repo root")
+    print(f"  {counts['unchanged']} unchanged, {counts['copy']} copied, {counts['link']} hard-linked, "
+          f"{counts['reflink']} reflinked, {len(removed)} removed; {result['reparsed']} files reparsed "
+          f"in {elapsed:.2f}s")
+    for entry in result["missing"]:
+        print(f"  ⚠ entry page {entry} does not exist")
+    for stage in result["unbuilt"]:
+        print(f"  ⚠ no {stage} published: run `scp build {stage} dist` to build them first")
+    return 0
@@ -0,0 +1,33 @@
+"""
+Case page generators.
+
+    scp generate og                 # O&G skeletons
+    scp generate paediatrics        # paediatrics pages rendered from PDFs
+    scp generate paediatrics-skeletons
+    scp generate medicine-surgery   # Medicine and Surgery skeletons
+"""
+
+# generator name -> module
+GENERATORS = {
+    "og": "og",
+    "paediatrics": "paediatrics",
+    "paediatrics-skeletons": "paediatrics_skeletons",
+    "medicine-surgery": "medicine_surgery",
+}
+
+
+def main(argv=None):
+    import argparse
+    import importlib
+    import os
+
+    from ..paths import CASES_DIR
+
+    parser = argparse.ArgumentParser(prog="scp generate", description="Create case pages from templates or PDFs.")
+    parser.add_argument("generator", choices=GENERATORS, help="Which set of cases to generate")
+    parser.add_argument("--out", default=str(CASES_DIR), help="Output directory for case pages")
+    args = parser.parse_args(argv)
+
+    os.makedirs(args.out, exist_ok=True)
+    module = importlib.import_module(f".{GENERATORS[args.generator]}", __name__)
+    return module.main(out_dir=args.out) or 0
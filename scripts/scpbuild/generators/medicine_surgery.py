@@ -1,13 +1,10 @@
-#!/usr/bin/env python3
 """
-Script to create skeleton HTML files for Medicine and Surgery cases.
+Create skeleton HTML files for Medicine and Surgery cases.
 """
 
 import os
-import re
 
-# Base directory
-BASE_DIR = "/Users/alexshepherd/Desktop/SCPProject"
+from ..paths import CASES_DIR
 
 # Medicine cases with their metadata
 medicine_cases = {
@@ -261,7 +258,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
 </html>
 '''
 
-def main():
+def main(out_dir=CASES_DIR):
     print("Creating skeleton HTML files...")
     print("=" * 70)
 
@@ -278,7 +275,7 @@ def main():
         else:
             category = "Medicine"
 
-        output_path = f"{BASE_DIR}/case{case_num.replace('.', '_')}.html"
+        output_path = f"{out_dir}/case{case_num.replace('.', '_')}.html"
 
         # Skip if already exists
         if os.path.exists(output_path):
@@ -303,6 +300,3 @@ def main():
     print(f"Created: {created_count} new skeleton files")
     print(f"Skipped: {skipped_count} existing files")
     print(f"Total cases: {len(all_cases)}")
-
-if __name__ == "__main__":
-    main()
@@ -1,10 +1,11 @@
-#!/usr/bin/env python3
 """
-Script to create skeleton HTML files for all O&G cases.
+Create skeleton HTML files for all O&G cases.
 """
 
 import os
 
+from ..paths import CASES_DIR
+
 # All O&G cases based on PDF files found
 all_cases = [
     ("4.1", "Pre-Conception Care"),
@@ -194,7 +195,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
 </html>
 '''
 
-def main():
+def main(out_dir=CASES_DIR):
     print("Creating skeleton HTML files for O&G cases...")
     print("=" * 70)
 
@@ -202,7 +203,7 @@ def main():
     skipped_count = 0
 
     for case_num, title in all_cases:
-        output_path = f"/Users/alexshepherd/Desktop/SCPProject/case{case_num.replace('.', '_')}.html"
+        output_path = f"{out_dir}/case{case_num.replace('.', '_')}.html"
 
         # Skip if already exists
         if os.path.exists(output_path):
@@ -225,6 +226,3 @@ def main():
     print(f"Created: {created_count} new skeleton files")
     print(f"Skipped: {skipped_count} existing files")
     print(f"Total cases: {len(all_cases)}")
-
-if __name__ == "__main__":
-    main()
@@ -1,12 +1,11 @@
-#!/usr/bin/env python3
 """
-Script to create HTML files for all paediatrics cases from PDFs.
+Create HTML files for all paediatrics cases from PDFs.
 Extracts case information and questions verbatim from PDFs.
 """
 
-import os
-import PyPDF2
-from pathlib import Path
+from ..paths import CASES_DIR, PDF_DIR
+from ..pdftext import extract_pdf_text as _extract_pdf_text
+from ..segment import render_blocks, render_questions, segment_pdf
 
 # Define the paediatrics cases mapping
 cases = [
@@ -162,7 +161,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
     <p class="meta"><strong>Category:</strong> Children & Young People | <strong>Discipline:</strong> Paediatrics Medicine</p>
 
     <h2>Case</h2>
-    <p>{case_content}</p>
+{case_content}
 
     <h2>Questions</h2>
     {questions_html}
@@ -186,21 +185,16 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
 def extract_pdf_text(pdf_path):
     """Extract text from PDF file."""
     try:
-        with open(pdf_path, 'rb') as file:
-            reader = PyPDF2.PdfReader(file)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text()
-            return text
+        return _extract_pdf_text(pdf_path)
     except Exception as e:
         print(f"Error reading {pdf_path}: {e}")
         return ""
 
-def create_html_file(case_num, pdf_filename, title):
+def create_html_file(case_num, pdf_filename, title, out_dir=CASES_DIR):
     """Create HTML file for a paediatrics case."""
 
-    pdf_path = f"/Users/alexshepherd/Desktop/SCPProject/Medicine/Paediatrics/{pdf_filename}"
-    output_path = f"/Users/alexshepherd/Desktop/SCPProject/case{case_num.replace('.', '_')}.html"
+    pdf_path = f"{PDF_DIR}/Medicine/Paediatrics/{pdf_filename}"
+    output_path = f"{out_dir}/case{case_num.replace('.', '_')}.html"
 
     # Extract PDF text
     pdf_text = extract_pdf_text(pdf_path)
@@ -209,10 +203,15 @@ def create_html_file(case_num, pdf_filename, title):
         print(f"Warning: Could not extract text from {pdf_filename}")
         return False
 
-    # For now, create a placeholder with instruction to manually add content
-    # This ensures the file structure is created
-    case_content = f"[Content to be extracted from {pdf_filename}]"
-    questions_html = '''
+    # Split the PDF into stem, questions and answers; fall back to a
+    # placeholder when no numbered questions could be found
+    record = segment_pdf(pdf_path)
+    if record["questions"]:
+        case_content = render_blocks(record["stem"], indent="    ")
+        questions_html = render_questions(record).lstrip()
+    else:
+        case_content = f"    <p>[Content to be extracted from {pdf_filename}]</p>"
+        questions_html = '''
     <div class="question">
       <strong>Questions to be added from PDF</strong><br>
       <button class="toggle">Show Answer</button>
@@ -235,19 +234,16 @@ def create_html_file(case_num, pdf_filename, title):
     print(f"Created: case{case_num.replace('.', '_')}.html")
     return True
 
-def main():
+def main(out_dir=CASES_DIR):
     print("Creating paediatrics case HTML files...")
     print("=" * 60)
 
     success_count = 0
     for case_num, pdf_filename, title in cases:
-        if create_html_file(case_num, pdf_filename, title):
+        if create_html_file(case_num, pdf_filename, title, out_dir):
             success_count += 1
 
     print("=" * 60)
     print(f"Successfully created {success_count} out of {len(cases)} files")
-    print("\nNOTE: Files created with placeholder content.")
-    print("Each file needs to be manually updated with verbatim content from PDFs.")
-
-if __name__ == "__main__":
-    main()
+    print("\nNOTE: Files without detectable numbered questions keep placeholder content.")
+    print("Run 'scp segment --write-pages' to repopulate them after fixing the PDF.")
@@ -1,11 +1,12 @@
-#!/usr/bin/env python3
 """
-Script to create skeleton HTML files for all remaining paediatrics cases.
+Create skeleton HTML files for all remaining paediatrics cases.
 These will need to be filled in with verbatim content from PDFs.
 """
 
 import os
 
+from ..paths import CASES_DIR
+
 # Cases already completed
 completed = ["12.1", "12.2", "12.3", "12.4", "12.5", "12.6"]
 
@@ -209,7 +210,7 @@ HTML_TEMPLATE = '''<!DOCTYPE html>
 </html>
 '''
 
-def main():
+def main(out_dir=CASES_DIR):
     print("Creating skeleton HTML files for paediatrics cases...")
     print("=" * 70)
 
@@ -217,7 +218,7 @@ def main():
     skipped_count = 0
 
     for case_num, title in all_cases:
-        output_path = f"/Users/alexshepherd/Desktop/SCPProject/case{case_num.replace('.', '_')}.html"
+        output_path = f"{out_dir}/case{case_num.replace('.', '_')}.html"
 
         # Skip if already exists (completed)
         if os.path.exists(output_path):
@@ -241,6 +242,3 @@ def main():
     print(f"Skipped: {skipped_count} existing files")
     print(f"Total cases: {len(all_cases)}")
     print("\nNOTE: Skeleton files created. Content needs to be added from PDFs.")
-
-if __name__ == "__main__":
-    main()
@@ -0,0 +1,232 @@
+"""
+Resource hints for index and case pages, generated from the site graph.
+
+For every page listed in content/manifest.json:
+
+  preconnect  - each third-party origin the page loads scripts or styles
+                from (Google Tag Manager, the Firebase SDK on gstatic)
+  preload     - render-critical first-party resources: stylesheets,
+                blocking <head> scripts and the few body scripts that
+                paint the page (RENDER_SCRIPTS); deferred and
+                interaction-only scripts are left to the parser
+  prefetch    - the previous and next case in manifest order, since
+                students usually step through a series in sequence
+
+The hints are written into a marked block in each page's <head>. The
+preconnects and preloads (including the head's own stylesheets, which a
+header can announce before any HTML arrives) are also written as a
+``Link`` header in firebase.json; pages of one directory that share a
+header get a single entry.
+
+Usage:
+    scp hints            # update pages and firebase.json
+    scp hints --check    # exit 1 if anything is out of date
+"""
+
+import json
+import posixpath
+import re
+from urllib.parse import quote, urlsplit
+
+from .manifest import case_path, iter_cases, load_manifest
+from .paths import BASE_DIR
+from .sitegraph import parse_refs, resolve
+
+FIREBASE_JSON = BASE_DIR / "firebase.json"
+
+HINTS_START = "<!-- Resource hints generated by `scp hints` -->"
+HINTS_END = "<!-- End resource hints -->"
+HINTS_BLOCK_RE = re.compile(r"[ \t]*" + re.escape(HINTS_START) + r".*?" + re.escape(HINTS_END) + r"\n?", re.S)
+
+# Body scripts the page needs before it can paint its main content
+RENDER_SCRIPTS = {"js/case-catalogue.js"}
+
+# File name of the page globs header_sources() writes
+PAGE_GLOB_RE = re.compile(r"@\([^/*?()]*\)\.html")
+
+# Hints go straight after these, in order of preference
+ANCHOR_RES = [
+    re.compile(r'<meta name="viewport"[^>]*>[ \t]*\n'),
+    re.compile(r"<meta charset=[^>]*>[ \t]*\n", re.I),
+]
+
+
+class PageHints:
+    """The hints for one page."""
+
+    def __init__(self, page):
+        self.page = page
+        self.preconnect = []      # origins
+        self.preload = []         # (url as written, site path, as, in_head)
+        self.prefetch = []        # repo-relative pages
+
+    def html(self):
+        """The <head> block for the page itself."""
+        lines = [f'<link rel="preconnect" href="{origin}">' for origin in self.preconnect]
+        lines += [
+            f'<link rel="preload" href="{url}" as="{kind}">'
+            for url, _, kind, in_head in self.preload
+            if not in_head  # the parser finds head resources on its own
+        ]
+        lines += [f'<link rel="prefetch" href="{relative_url(self.page, target)}">' for target in self.prefetch]
+        if not lines:
+            return ""
+        body = "".join(f"  {line}\n" for line in lines)
+        return f"  {HINTS_START}\n{body}  {HINTS_END}\n"
+
+    def link_header(self):
+        """The ``Link`` header value; prefetches only matter once the page is in, so they stay in the HTML."""
+        values = [f"<{origin}>; rel=preconnect" for origin in self.preconnect]
+        values += [f"<{site_path}>; rel=preload; as={kind}" for _, site_path, kind, _ in self.preload]
+        return ", ".join(values)
+
+
+def relative_url(page, target):
+    return quote(posixpath.relpath(target, posixpath.dirname(page)))
+
+
+def site_url(target):
+    return "/" + quote(target)
+
+
+def is_render_critical(ref, target):
+    """True for scripts that hold up the first paint of the page's content."""
+    if target in RENDER_SCRIPTS:
+        return True
+    deferred = "async" in ref.attrs or "defer" in ref.attrs or ref.attrs.get("type") == "module"
+    return ref.in_head and not deferred
+
+
+def collect_hints(page, html, neighbours=()):
+    """Work out the hints for repo-relative ``page`` from its HTML."""
+    hints = PageHints(page)
+    for ref in parse_refs(HINTS_BLOCK_RE.sub("", html)):
+        if ref.tag == "script":
+            kind = "script"
+        elif ref.tag == "link" and "stylesheet" in ref.rel.split():
+            kind = "style"
+        else:
+            continue
+
+        if ref.is_external:
+            if ref.origin not in hints.preconnect:
+                hints.preconnect.append(ref.origin)
+            continue
+
+        target = resolve(page, ref.url)
+        if not target or not (BASE_DIR / target).exists():
+            continue
+        if kind == "script" and not is_render_critical(ref, target):
+            continue
+        query = urlsplit(ref.url).query
+        path = site_url(target) + (f"?{query}" if query else "")
+        if all(existing[1] != path for existing in hints.preload):
+            hints.preload.append((ref.url, path, kind, ref.in_head))
+
+    hints.prefetch = [target for target in neighbours if target and (BASE_DIR / target).exists()]
+    return hints
+
+
+def apply_hints(html, hints):
+    """Return ``html`` with its generated hint block replaced."""
+    html = HINTS_BLOCK_RE.sub("", html)
+    block = hints.html()
+    if not block:
+        return html
+    for anchor in ANCHOR_RES:
+        match = anchor.search(html)
+        if match:
+            return html[:match.end()] + block + html[match.end():]
+    index = html.lower().index("</head>")
+    return html[:index] + block + html[index:]
+
+
+def iter_pages(manifest):
+    """Yield (page, neighbours) for every index and case page in the manifest."""
+    for year, data in manifest["years"].items():
+        yield data["index"], ()
+        pages = [case_path(manifest, year, case["id"]) for _, case in iter_cases(manifest, year)]
+        for i, page in enumerate(pages):
+            previous = pages[i - 1] if i > 0 else None
+            following = pages[i + 1] if i + 1 < len(pages) else None
+            yield page, (following, previous)
+
+
+def header_sources(link_headers):
+    """
+    Yield (source, value) for the ``Link`` headers of ``(page, value)`` pairs.
+
+    Pages of one directory that share a value are matched by a single
+    ``@(a|b|...)`` glob rather than an entry each.
+    """
+    groups = {}
+    for page, value in link_headers:
+        if value:
+            directory, name = posixpath.split(page)
+            groups.setdefault((directory, value), []).append(name)
+    for (directory, value), names in groups.items():
+        if len(names) == 1:
+            yield site_url(posixpath.join(directory, names[0])), value
+            continue
+        stems = "|".join(quote(name[:-len(".html")]) for name in names)
+        yield f"{site_url(directory)}/@({stems}).html", value
+
+
+def is_generated(entry, pages, directories):
+    """True for a ``Link``-only entry on one of ``pages``, or on a page glob in one of their directories."""
+    if any(header["key"] != "Link" for header in entry["headers"]):
+        return False
+    directory, name = posixpath.split(entry["source"])
+    return entry["source"] in pages or (directory in directories and PAGE_GLOB_RE.fullmatch(name) is not None)
+
+
+def update_headers(config, link_headers):
+    """Replace the generated ``Link`` entries in a firebase.json config, keeping hand-written ones."""
+    pages = {site_url(page) for page, _ in link_headers}
+    directories = {posixpath.dirname(page) for page in pages}
+    headers = [entry for entry in config["hosting"].get("headers", [])
+               if not is_generated(entry, pages, directories)]
+    headers += [
+        {"source": source, "headers": [{"key": "Link", "value": value}]}
+        for source, value in header_sources(link_headers)
+    ]
+    config["hosting"]["headers"] = headers
+    return config
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="scp hints", description="Generate resource hints and Link headers.")
+    parser.add_argument("--check", action="store_true", help="Report stale pages without writing")
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest()
+    stale = []
+    link_headers = []
+    for page, neighbours in iter_pages(manifest):
+        path = BASE_DIR / page
+        if not path.exists():
+            continue
+        current = path.read_text(encoding="utf-8")
+        hints = collect_hints(page, current, neighbours)
+        link_headers.append((page, hints.link_header()))
+        updated = apply_hints(current, hints)
+        if updated != current:
+            stale.append(page)
+            if not args.check:
+                path.write_text(updated, encoding="utf-8")
+
+    current_config = FIREBASE_JSON.read_text(encoding="utf-8")
+    config = update_headers(json.loads(current_config), link_headers)
+    updated_config = json.dumps(config, indent=2, ensure_ascii=False) + "\n"
+    if updated_config != current_config:
+        stale.append(FIREBASE_JSON.name)
+        if not args.check:
+            FIREBASE_JSON.write_text(updated_config, encoding="utf-8")
+
+    verb = "Out of date" if args.check else "Updated"
+    for name in stale:
+        print(f"  {verb}: {name}")
+    print(f"✓ {len(link_headers)} pages checked, {len(stale)} file(s) {verb.lower()}")
+    return 1 if args.check and stale else 0
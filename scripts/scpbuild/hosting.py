@@ -0,0 +1,141 @@
+"""
+Firebase Hosting configuration: the globs of firebase.json and its
+``hosting`` section compiled for lookups.
+
+Shared by ``scp preview`` (which serves with it), ``scp dist`` and
+``scp links`` (which apply its ``ignore`` list) and the site graph's
+script-target globs.
+"""
+
+import json
+import os
+import re
+
+
+def glob_to_regex(pattern):
+    """
+    Compile a Firebase Hosting glob (``**``, ``*``, ``?``, ``@(a|b)``,
+    ``!(a|b)``, ``{a,b}``) into a regex matched against the path without
+    its leading ``/``.
+    """
+    return re.compile("^" + _glob_body(pattern.lstrip("/")) + "$")
+
+
+def _glob_body(pattern):
+    out = []
+    i = 0
+    while i < len(pattern):
+        c = pattern[i]
+        if pattern.startswith("**/", i):
+            out.append("(?:.*/)?")
+            i += 3
+            continue
+        if pattern.startswith("**", i):
+            out.append(".*")
+            i += 2
+            continue
+        if c == "*":
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c in "@!+" and pattern.startswith("(", i + 1):
+            end = pattern.index(")", i)
+            options = "|".join(re.escape(option) for option in pattern[i + 2:end].split("|"))
+            if c == "!":
+                # Any name except an option followed by the rest of the glob
+                rest = _glob_body(pattern[end + 1:])
+                out.append(f"(?!(?:{options}){rest}(?:/|$))[^/]*{rest}")
+                break
+            out.append(f"(?:{options})" + ("+" if c == "+" else ""))
+            i = end + 1
+            continue
+        elif c == "{":
+            end = pattern.index("}", i)
+            out.append("(?:" + "|".join(re.escape(option) for option in pattern[i + 1:end].split(",")) + ")")
+            i = end + 1
+            continue
+        else:
+            out.append(re.escape(c))
+        i += 1
+    return "".join(out)
+
+
+def source_regex(source):
+    """
+    Compile a rule's ``source``: a glob whose segments may also be
+    ``:name`` (one segment) or ``:name*`` (the rest of the path) captures.
+    """
+    if ":" not in source:
+        return glob_to_regex(source)
+    parts = []
+    for segment in source.lstrip("/").split("/"):
+        if segment.startswith(":"):
+            name = segment[1:].rstrip("*")
+            parts.append(f"(?P<{name}>.*)" if segment.endswith("*") else f"(?P<{name}>[^/]+)")
+        else:
+            parts.append(_glob_body(segment))
+    return re.compile("^" + "/".join(parts) + "$")
+
+
+def source_matcher(rule):
+    """Match function for a rule's ``source`` glob or ``regex``; returns the match or None."""
+    if "regex" in rule:
+        regex = re.compile(rule["regex"])
+        return lambda path: regex.fullmatch("/" + path)
+    regex = source_regex(rule["source"])
+    return regex.match
+
+
+def fill_captures(destination, match):
+    """Substitute a redirect's ``:name`` captures into its destination."""
+    captures = match.groupdict()
+    return re.sub(r":(\w+)\*?", lambda m: captures.get(m.group(1), m.group(0)), destination)
+
+
+class HostingConfig:
+    """The ``hosting`` section of firebase.json, compiled for lookups."""
+
+    def __init__(self, config_path, public=None):
+        with open(config_path, "r", encoding="utf-8") as f:
+            hosting = json.load(f)["hosting"]
+        if isinstance(hosting, list):
+            hosting = hosting[0]
+        base = os.path.dirname(os.path.abspath(config_path))
+        self.public = os.path.abspath(public or os.path.join(base, hosting.get("public", ".")))
+        self.ignore = [glob_to_regex(pattern) for pattern in hosting.get("ignore", [])]
+        self.clean_urls = hosting.get("cleanUrls", False)
+        self.redirects = [(source_matcher(rule), rule) for rule in hosting.get("redirects", [])]
+        self.rewrites = [(source_matcher(rule), rule) for rule in hosting.get("rewrites", [])]
+        self.headers = [
+            (source_matcher(rule), [(h["key"], h["value"]) for h in rule["headers"]])
+            for rule in hosting.get("headers", [])
+        ]
+
+    def is_ignored(self, rel_path):
+        parts = rel_path.split("/")
+        prefixes = ["/".join(parts[:i]) for i in range(1, len(parts) + 1)]
+        return any(regex.match(prefix) for regex in self.ignore for prefix in prefixes)
+
+    def file_for(self, rel_path):
+        """Absolute path of a servable file for ``rel_path``, or None."""
+        candidates = [rel_path]
+        if not rel_path or rel_path.endswith("/"):
+            candidates = [rel_path + "index.html"]
+        else:
+            candidates.append(rel_path + "/index.html")
+            if self.clean_urls:
+                candidates.append(rel_path + ".html")
+        for candidate in candidates:
+            if self.is_ignored(candidate):
+                continue
+            path = os.path.join(self.public, *candidate.split("/"))
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def headers_for(self, rel_path):
+        headers = {}
+        for matches, values in self.headers:
+            if matches(rel_path):
+                headers.update(values)
+        return headers
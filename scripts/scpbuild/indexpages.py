@@ -0,0 +1,120 @@
+"""
+Generate the year index pages from the case manifest.
+
+The hand-written week/case grid inside #scpsMainContent is replaced by a
+compact JSON catalogue (id, title, discipline, series, week, stable id). The grid is
+rendered on demand by js/case-catalogue.js, so the size of the page and
+its first paint stay flat as cases are added. js/study-packs.js is added
+after navigation.js to offer each discipline's `scp packs` download, and
+on the year the PDFs belong to, js/pdf-preview.js to show each case
+card's `scp previews` first page.
+
+Usage:
+    scp index               # regenerate every year in the manifest
+    scp index year3 --check # exit 1 if the page is out of date
+"""
+
+import json
+import posixpath
+
+from .manifest import MAIN_CONTENT_END, MAIN_CONTENT_START, PDF_YEAR, load_manifest, series_of
+from .paths import BASE_DIR
+
+CATALOGUE_SCRIPT = "js/case-catalogue.js"
+NAVIGATION_SCRIPT = "js/navigation.js"
+PACKS_SCRIPT = "js/study-packs.js"
+PREVIEWS_SCRIPT = "js/pdf-preview.js"
+
+
+def build_catalogue(year_data):
+    """Return the catalogue dict embedded in a year's index page."""
+    index_dir = posixpath.dirname(year_data["index"])
+    weeks = []
+    cases = []
+    for week in year_data["weeks"]:
+        weeks.append([week["week"], week["label"], week["specialties"]])
+        for case in week["cases"]:
+            discipline = " ".join([case["discipline"], *case.get("tags", [])])
+            cases.append([case["id"], case["title"], discipline, int(series_of(case["id"])), week["week"],
+                          case.get("n")])
+    return {
+        "base": posixpath.relpath(year_data["cases_dir"], index_dir or ".") + "/",
+        "weeks": weeks,
+        "cases": cases,
+    }
+
+
+def render_main_content(year_data):
+    catalogue = json.dumps(build_catalogue(year_data), ensure_ascii=False, separators=(",", ":"))
+    # Keep the JSON from closing the <script> element early
+    catalogue = catalogue.replace("</", "<\\/")
+    return (
+        f"{MAIN_CONTENT_START}\n"
+        "    <!-- Generated by `scp index` from content/manifest.json - edit the manifest, not this block -->\n"
+        f'    <script type="application/json" id="caseCatalogue">{catalogue}</script>\n'
+        "    </div>\n"
+        f"    {MAIN_CONTENT_END}"
+    )
+
+
+def render_index(index_html, year_data, pdf_previews=False):
+    """Return ``index_html`` with its case grid replaced by the catalogue (and previews loaded if ``pdf_previews``)."""
+    start = index_html.index(MAIN_CONTENT_START)
+    end = index_html.index(MAIN_CONTENT_END, start) + len(MAIN_CONTENT_END)
+    html = index_html[:start] + render_main_content(year_data) + index_html[end:]
+
+    # The catalogue script must run before navigation.js reads it
+    index_dir = posixpath.dirname(year_data["index"])
+    catalogue_src = posixpath.relpath(CATALOGUE_SCRIPT, index_dir or ".")
+    navigation_src = posixpath.relpath(NAVIGATION_SCRIPT, index_dir or ".")
+    packs_src = posixpath.relpath(PACKS_SCRIPT, index_dir or ".")
+    navigation_tag = f'<script src="{navigation_src}"></script>'
+    if catalogue_src not in html:
+        html = html.replace(
+            navigation_tag,
+            f'<script src="{catalogue_src}"></script>\n  {navigation_tag}',
+            1,
+        )
+    if packs_src not in html:
+        html = html.replace(
+            navigation_tag,
+            f'{navigation_tag}\n  <script src="{packs_src}" defer></script>',
+            1,
+        )
+    previews_src = posixpath.relpath(PREVIEWS_SCRIPT, index_dir or ".")
+    if pdf_previews and previews_src not in html:
+        packs_tag = f'<script src="{packs_src}" defer></script>'
+        html = html.replace(packs_tag, f'{packs_tag}\n  <script src="{previews_src}" defer></script>', 1)
+    return html
+
+
+def main(argv=None):
+    import argparse
+
+    manifest = load_manifest()
+    parser = argparse.ArgumentParser(prog="scp index", description="Generate year index pages from the manifest.")
+    parser.add_argument("years", nargs="*", metavar="YEAR", help="Years to generate (default: all)")
+    parser.add_argument("--check", action="store_true", help="Report stale pages without writing")
+    args = parser.parse_args(argv)
+
+    unknown = [year for year in args.years if year not in manifest["years"]]
+    if unknown:
+        parser.error(f"unknown year(s): {', '.join(unknown)} (choose from {', '.join(manifest['years'])})")
+
+    stale = 0
+    for year in args.years or manifest["years"]:
+        year_data = manifest["years"][year]
+        path = BASE_DIR / year_data["index"]
+        current = path.read_text(encoding="utf-8")
+        updated = render_index(current, year_data, pdf_previews=year == PDF_YEAR)
+        cases = sum(len(week["cases"]) for week in year_data["weeks"])
+        if updated == current:
+            print(f"✓ {year_data['index']} up to date ({cases} cases)")
+            continue
+        stale += 1
+        if args.check:
+            print(f"✗ {year_data['index']} is out of date")
+        else:
+            path.write_text(updated, encoding="utf-8")
+            print(f"✓ Wrote {year_data['index']} ({cases} cases, {len(current) - len(updated):+,} bytes saved)")
+    return 1 if args.check and stale else 0
@@ -0,0 +1,945 @@
+"""
+Batched analytics ingestion gateway in front of Firestore.
+
+user-analytics.js, case-page-tracker.js and exam-page-tracker.js write
+every heartbeat, page view and case/exam view straight to Firestore,
+two or three documents at a time, from every signed-in client. When a
+gateway URL is configured (``window.analyticsGatewayUrl`` in
+js/firebase-config.js) the clients batch those events into beacons
+instead, and this service:
+
+  1. accepts ``POST /v1/beacon`` and checks the Firebase ID token
+  2. queues the beacon on a bounded queue; when the queue is full it
+     answers 503 with Retry-After and the client keeps its events
+  3. coalesces events in memory into one pending merge per document:
+     a session's heartbeats collapse into its latest duration, and case
+     and exam view counters from every client add up into one increment
+  4. flushes the pending merges on a timer (or when too many documents
+     are pending) as batched writes of up to 500 operations; failed
+     batches are retried on the next flush
+
+The documents and fields written are the same ones the clients write
+directly, so the admin dashboard and ``scp archive`` read them
+unchanged. ``GET /v1/stats`` reports ingest throughput, coalescing and
+flush latency.
+
+Writes go to Firestore (google-cloud-firestore; set
+FIRESTORE_EMULATOR_HOST to use the emulator) or, with ``--memory``, to
+an in-process store that stands in for it. ``bench`` drives a gateway
+with simulated clients over HTTP and reports the same numbers.
+
+Usage:
+    scp ingest serve --port 8090
+    scp ingest serve --memory --trust-uid      # local development, no credentials
+    scp ingest bench --clients 300 --seconds 5 --store-latency 0.05
+"""
+
+import asyncio
+import json
+import math
+import re
+import secrets
+import sys
+import time
+from collections import deque
+from datetime import datetime, timezone
+from email.utils import formatdate
+from urllib.parse import urlsplit
+
+PROJECT_ID = "md3-scp-cases"
+
+# Firestore allows at most 500 writes per batch
+BATCH_SIZE = 500
+FLUSH_INTERVAL = 10.0
+QUEUE_SIZE = 10_000
+# Flush early once this many documents have pending writes
+MAX_PENDING = 5_000
+# Batches committed at once during a flush
+COMMIT_CONCURRENCY = 4
+# Commit attempts before a batch is dropped
+MAX_ATTEMPTS = 3
+RETRY_AFTER = 5
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 64 * 1024
+MAX_EVENTS = 100
+MAX_TEXT = 500
+KEEPALIVE_TIMEOUT = 15
+# Client clocks are trusted up to this far in the past
+MAX_EVENT_AGE = 10 * 60
+
+REASONS = {
+    200: "OK", 202: "Accepted", 204: "No Content", 400: "Bad Request", 401: "Unauthorized",
+    404: "Not Found", 405: "Method Not Allowed", 411: "Length Required", 413: "Payload Too Large",
+    503: "Service Unavailable",
+}
+
+DOC_ID_RE = re.compile(r"^(?!__.*__$)(?!\.\.?$)[^/]{1,200}$")
+
+# Writes the client would have made itself for each event type (see user-analytics.js)
+DIRECT_WRITES = {
+    "session_start": 2, "heartbeat": 2, "session_end": 2, "page_view": 1,
+    "case_view": 3, "feature": 2, "exam_resource": 2, "exam_view": 2,
+}
+
+
+class BeaconError(ValueError):
+    """A beacon that cannot be accepted; the message is sent back to the client."""
+
+
+class StoreError(RuntimeError):
+    pass
+
+
+# === Field transforms ===
+
+class Increment:
+    __slots__ = ("amount",)
+
+    def __init__(self, amount):
+        self.amount = amount
+
+    def __eq__(self, other):
+        return isinstance(other, Increment) and other.amount == self.amount
+
+    def __repr__(self):
+        return f"Increment({self.amount})"
+
+
+class Maximum:
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, Maximum) and other.value == self.value
+
+    def __repr__(self):
+        return f"Maximum({self.value})"
+
+
+class ArrayUnion:
+    __slots__ = ("values",)
+
+    def __init__(self, values):
+        self.values = []
+        for value in values:
+            if value not in self.values:
+                self.values.append(value)
+
+    def __eq__(self, other):
+        return isinstance(other, ArrayUnion) and other.values == self.values
+
+    def __repr__(self):
+        return f"ArrayUnion({self.values!r})"
+
+
+def is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value)
+
+
+def reject_constant(name):
+    raise BeaconError(f"{name} is not a valid number")
+
+
+def merge_fields(target, fields):
+    """
+    Fold a ``set(..., merge=True)`` of ``fields`` into the pending merge ``target``.
+
+    The result has the same effect as applying both writes in order:
+    plain values overwrite, increments add up, maximums keep the larger
+    value, array unions accumulate and nested maps merge key by key.
+    """
+    for key, value in fields.items():
+        current = target.get(key)
+        if isinstance(value, dict):
+            if not isinstance(current, dict):
+                current = target[key] = {}
+            merge_fields(current, value)
+        elif isinstance(value, Increment) and isinstance(current, Increment):
+            target[key] = Increment(current.amount + value.amount)
+        elif isinstance(value, Increment) and is_number(current):
+            target[key] = current + value.amount
+        elif isinstance(value, Maximum) and isinstance(current, Maximum):
+            target[key] = Maximum(max(current.value, value.value))
+        elif isinstance(value, Maximum) and is_number(current):
+            target[key] = max(current, value.value)
+        elif isinstance(value, ArrayUnion) and isinstance(current, ArrayUnion):
+            target[key] = ArrayUnion(current.values + value.values)
+        elif isinstance(value, ArrayUnion) and isinstance(current, list):
+            target[key] = ArrayUnion(current + value.values).values
+        else:
+            target[key] = value
+
+
+def apply_fields(doc, fields):
+    """Apply a merge to a stored document the way Firestore does (used by MemoryStore)."""
+    for key, value in fields.items():
+        current = doc.get(key)
+        if isinstance(value, dict):
+            if not isinstance(current, dict):
+                current = doc[key] = {}
+            apply_fields(current, value)
+        elif isinstance(value, Increment):
+            doc[key] = (current if is_number(current) else 0) + value.amount
+        elif isinstance(value, Maximum):
+            doc[key] = max(current, value.value) if is_number(current) else value.value
+        elif isinstance(value, ArrayUnion):
+            doc[key] = ArrayUnion((current if isinstance(current, list) else []) + value.values).values
+        else:
+            doc[key] = value
+
+
+class Write:
+    """One batched-write operation: a merge into ``path``, or a create of a new document."""
+
+    __slots__ = ("kind", "path", "data", "attempts")
+
+    def __init__(self, kind, path, data):
+        self.kind = kind
+        self.path = path
+        self.data = data
+        self.attempts = 0
+
+    def __repr__(self):
+        return f"Write({self.kind!r}, {self.path!r})"
+
+
+# === Beacons ===
+
+def auto_id():
+    """A 20-character id like the ones Firestore's ``.add()`` and ``.doc()`` generate."""
+    return secrets.token_urlsafe(15)
+
+
+def text(event, key, required=True):
+    value = event.get(key)
+    if value is None and not required:
+        return None
+    if not isinstance(value, str) or (required and not value):
+        raise BeaconError(f"{event.get('type')}: {key} must be a string")
+    return value[:MAX_TEXT]
+
+
+def doc_id(event, key):
+    value = event.get(key)
+    if not isinstance(value, str) or not DOC_ID_RE.match(value):
+        raise BeaconError(f"{event.get('type')}: {key} is not a valid document id")
+    return value
+
+
+def present(**fields):
+    """Drop optional fields the client left out, so they don't overwrite stored values with null."""
+    return {key: value for key, value in fields.items() if value is not None}
+
+
+def event_time(event, received):
+    """The event's client time, clamped to [received - MAX_EVENT_AGE, received]."""
+    millis = event.get("t")
+    seconds = millis / 1000 if is_number(millis) else received
+    return datetime.fromtimestamp(min(received, max(received - MAX_EVENT_AGE, seconds)), timezone.utc)
+
+
+def parse_beacon(body):
+    """Decode a beacon body into (token, uid, events); raises BeaconError."""
+    try:
+        beacon = json.loads(body, parse_constant=reject_constant)
+    except BeaconError:
+        raise
+    except (ValueError, UnicodeDecodeError):
+        raise BeaconError("body is not JSON")
+    if not isinstance(beacon, dict) or not isinstance(beacon.get("events"), list):
+        raise BeaconError("expected {\"token\": ..., \"events\": [...]}")
+    events = beacon["events"]
+    if len(events) > MAX_EVENTS:
+        raise BeaconError(f"at most {MAX_EVENTS} events per beacon")
+    if not all(isinstance(event, dict) and event.get("type") in DIRECT_WRITES for event in events):
+        raise BeaconError("unknown event type")
+    return beacon.get("token"), beacon.get("uid"), events
+
+
+class Coalescer:
+    """
+    Pending writes, one merge per document, built from beacon events.
+
+    Each event becomes the same merge(s) the client used to write
+    directly; merging them here means a document touched by a thousand
+    events is still written once per flush.
+    """
+
+    def __init__(self):
+        self.pending = {}
+        self.creates = []
+        self.events = 0
+
+    def __len__(self):
+        return len(self.pending) + len(self.creates)
+
+    def merge(self, path, fields):
+        merge_fields(self.pending.setdefault(path, {}), fields)
+
+    def apply(self, uid, events, received):
+        """Validate and fold one beacon's events; raises BeaconError before applying any of them."""
+        updates = []
+        for event in events:
+            updates.extend(self.updates(uid, event, event_time(event, received)))
+        for kind, path, fields in updates:
+            if kind == "create":
+                self.creates.append(Write("create", path, fields))
+            else:
+                self.merge(path, fields)
+        self.events += len(events)
+
+    def updates(self, uid, event, at):
+        kind = event["type"]
+        user = f"users/{uid}"
+
+        if kind == "session_start":
+            session = f"{user}/sessions/{doc_id(event, 'session')}"
+            email = text(event, "email", required=False)
+            display_name = text(event, "displayName", required=False) or (email.split("@")[0] if email else None)
+            return [
+                ("merge", user, {
+                    **present(email=email, displayName=display_name),
+                    "lastSignIn": at, "lastActive": at, "updatedAt": at,
+                }),
+                ("merge", session, {
+                    "startTime": at, "endTime": None, "duration": 0, "isActive": True,
+                    "pages": ArrayUnion([{"path": text(event, "path"), "title": text(event, "title", False) or "",
+                                          "timestamp": at}]),
+                    **present(userAgent=text(event, "userAgent", required=False),
+                              platform=text(event, "platform", required=False)),
+                }),
+            ]
+
+        if kind in ("heartbeat", "session_end"):
+            session = f"{user}/sessions/{doc_id(event, 'session')}"
+            duration = event.get("duration")
+            if not is_number(duration) or duration < 0:
+                raise BeaconError(f"{kind}: duration must be a non-negative number")
+            fields = {"duration": Maximum(int(duration))}
+            if kind == "heartbeat":
+                fields["lastHeartbeat"] = at
+            else:
+                fields.update(endTime=at, isActive=False)
+            return [("merge", session, fields), ("merge", user, {"lastActive": at})]
+
+        if kind == "page_view":
+            session = f"{user}/sessions/{doc_id(event, 'session')}"
+            page = {"path": text(event, "path"), "title": text(event, "title", False) or "", "timestamp": at}
+            return [("merge", session, {"pages": ArrayUnion([page])})]
+
+        if kind == "case_view":
+            case_id = doc_id(event, "caseId")
+            title = text(event, "title", required=False) or case_id
+            updates = [
+                ("merge", user, {"lastViewedCase": case_id, "lastViewedCaseTitle": title, "lastViewedCaseTime": at}),
+                ("merge", f"caseAnalytics/{case_id}", {
+                    "caseId": case_id, "title": title, "viewCount": Increment(1),
+                    "lastViewed": at, "uniqueViewers": ArrayUnion([uid]),
+                }),
+            ]
+            if event.get("session") is not None:
+                updates.append(("merge", f"{user}/sessions/{doc_id(event, 'session')}",
+                                {"lastCaseViewed": case_id, "lastCaseViewedTitle": title}))
+            return updates
+
+        if kind == "feature":
+            name = doc_id(event, "name")
+            details = event.get("details") or {}
+            if not isinstance(details, dict) or len(json.dumps(details)) > MAX_TEXT:
+                raise BeaconError("feature: details must be a small object")
+            return [
+                ("merge", user, {"featureUsage": {name: Increment(1)}, "lastFeatureUsed": name,
+                                 "lastFeatureUsedTime": at}),
+                ("create", f"{user}/featureUsage/{auto_id()}", {"feature": name, "details": details, "timestamp": at}),
+            ]
+
+        if kind == "exam_resource":
+            exam_type = text(event, "examType")
+            exam_year = text(event, "examYear")
+            resource = f"{exam_type}_{exam_year}"
+            if not DOC_ID_RE.match(resource):
+                raise BeaconError("exam_resource: examType/examYear do not form a document id")
+            return [
+                ("merge", user, {"examResourceViews": {resource: Increment(1)},
+                                 "lastExamResourceViewed": resource, "lastExamResourceViewedTime": at}),
+                ("merge", f"examAnalytics/{resource}", {
+                    "examType": exam_type, "examYear": exam_year, "viewCount": Increment(1),
+                    "lastViewed": at, "uniqueViewers": ArrayUnion([uid]),
+                }),
+            ]
+
+        # exam_view
+        resource_id = doc_id(event, "resourceId")
+        title = text(event, "title", required=False) or resource_id
+        return [
+            ("merge", user, {"lastViewedExam": resource_id, "lastViewedExamTitle": title, "lastViewedExamTime": at}),
+            ("merge", f"examAnalytics/{resource_id}", {
+                "resourceId": resource_id, "title": title, "type": text(event, "resourceType", False) or "exam",
+                "viewCount": Increment(1), "lastViewed": at, "uniqueViewers": ArrayUnion([uid]),
+            }),
+        ]
+
+    def drain(self):
+        """Return the pending writes and start over; returns (writes, events they cover)."""
+        writes = [Write("merge", path, fields) for path, fields in self.pending.items()] + self.creates
+        events = self.events
+        self.pending = {}
+        self.creates = []
+        self.events = 0
+        return writes, events
+
+
+# === Stores ===
+
+class MemoryStore:
+    """In-process stand-in for Firestore batched writes, with optional latency and failures."""
+
+    def __init__(self, latency=0.0, fail=0):
+        self.docs = {}
+        self.latency = latency
+        self.fail = fail
+        self.commits = 0
+
+    async def commit(self, writes):
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.fail:
+            self.fail -= 1
+            raise StoreError("injected failure")
+        for write in writes:
+            if write.kind == "create" and write.path in self.docs:
+                raise StoreError(f"{write.path} already exists")
+        for write in writes:
+            apply_fields(self.docs.setdefault(write.path, {}), write.data)
+        self.commits += 1
+
+    def close(self):
+        pass
+
+
+class FirestoreStore:
+    """Batched writes to Firestore (or FIRESTORE_EMULATOR_HOST) with the async client."""
+
+    def __init__(self, project=None):
+        try:
+            from google.cloud import firestore
+        except ImportError:
+            raise SystemExit("scp ingest needs google-cloud-firestore: pip install -e \".[firestore]\"")
+        self.firestore = firestore
+        self.client = firestore.AsyncClient(project=project)
+
+    def convert(self, value):
+        firestore = self.firestore
+        if isinstance(value, dict):
+            return {key: self.convert(item) for key, item in value.items()}
+        if isinstance(value, Increment):
+            return firestore.Increment(value.amount)
+        if isinstance(value, Maximum):
+            return firestore.Maximum(value.value)
+        if isinstance(value, ArrayUnion):
+            return firestore.ArrayUnion(value.values)
+        return value
+
+    async def commit(self, writes):
+        batch = self.client.batch()
+        for write in writes:
+            ref = self.client.document(write.path)
+            if write.kind == "create":
+                batch.create(ref, self.convert(write.data))
+            else:
+                batch.set(ref, self.convert(write.data), merge=True)
+        await batch.commit()
+
+    def close(self):
+        self.client.close()
+
+
+class TokenVerifier:
+    """Firebase ID token -> uid, caching each token until it expires."""
+
+    def __init__(self, project=PROJECT_ID):
+        try:
+            from google.auth.transport import requests
+            from google.oauth2 import id_token
+        except ImportError:
+            raise SystemExit("scp ingest needs google-auth: pip install -e \".[firestore]\"")
+        self.id_token = id_token
+        self.request = requests.Request()
+        self.project = project
+        self.cache = {}
+
+    def cached(self, token):
+        entry = self.cache.get(token)
+        return entry[0] if entry and entry[1] > time.time() else None
+
+    def verify(self, token):
+        """Blocking (fetches Google's signing keys); run in an executor."""
+        claims = self.id_token.verify_firebase_token(token, self.request, audience=self.project)
+        if len(self.cache) > 50_000:
+            now = time.time()
+            self.cache = {key: entry for key, entry in self.cache.items() if entry[1] > now}
+        self.cache[token] = (claims["sub"], claims["exp"])
+        return claims["sub"]
+
+
+# === Gateway ===
+
+def percentile(sorted_values, fraction):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+class Gateway:
+    """Bounded queue -> coalescer -> timed batched flushes."""
+
+    def __init__(self, store, flush_interval=FLUSH_INTERVAL, queue_size=QUEUE_SIZE, max_pending=MAX_PENDING,
+                 batch_size=BATCH_SIZE, concurrency=COMMIT_CONCURRENCY, log=None):
+        self.store = store
+        self.flush_interval = flush_interval
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.max_pending = max_pending
+        self.batch_size = batch_size
+        self.commit_slots = asyncio.Semaphore(concurrency)
+        self.coalescer = Coalescer()
+        self.flush_lock = asyncio.Lock()
+        self.retry = []
+        self.tasks = []
+        self.log = log
+        self.started = time.monotonic()
+        self.counts = dict.fromkeys(
+            ["beacons", "events", "rejected_full", "rejected_invalid", "rejected_auth", "writes", "events_flushed",
+             "batches", "failed_batches", "dropped_writes", "flushes"], 0)
+        self.flush_latencies = deque(maxlen=1000)
+
+    def start(self):
+        self.tasks = [asyncio.create_task(self.consume()), asyncio.create_task(self.flush_periodically())]
+
+    def submit(self, uid, events, received=None):
+        """Queue a beacon without waiting; False when the queue is full."""
+        try:
+            self.queue.put_nowait((uid, events, time.time() if received is None else received))
+        except asyncio.QueueFull:
+            self.counts["rejected_full"] += 1
+            return False
+        self.counts["beacons"] += 1
+        self.counts["events"] += len(events)
+        return True
+
+    async def consume(self):
+        while True:
+            uid, events, received = await self.queue.get()
+            try:
+                self.coalescer.apply(uid, events, received)
+            except BeaconError as e:
+                self.counts["rejected_invalid"] += 1
+                if self.log:
+                    self.log(f"✗ dropped beacon from {uid}: {e}")
+            except Exception as e:
+                # A beacon the validation missed must not stop ingestion for everyone
+                self.counts["rejected_invalid"] += 1
+                if self.log:
+                    self.log(f"✗ dropped beacon from {uid}: {type(e).__name__}: {e}")
+            finally:
+                self.queue.task_done()
+            # Stop draining the queue until the pending writes are flushed, so a slow
+            # store fills the queue and clients are told to back off
+            if len(self.coalescer) >= self.max_pending:
+                await self.flush()
+
+    async def flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+
+    async def flush(self):
+        """Commit everything pending in batches; returns the number of writes committed."""
+        async with self.flush_lock:
+            writes, events = self.coalescer.drain()
+            writes = self.retry + writes
+            self.retry = []
+            if not writes:
+                return 0
+            started = time.perf_counter()
+            batches = [writes[i:i + self.batch_size] for i in range(0, len(writes), self.batch_size)]
+            results = await asyncio.gather(*(self.commit(batch) for batch in batches))
+            elapsed = time.perf_counter() - started
+
+            committed = sum(len(batch) for batch, ok in zip(batches, results) if ok)
+            self.flush_latencies.append(elapsed)
+            self.counts["flushes"] += 1
+            self.counts["writes"] += committed
+            self.counts["events_flushed"] += events
+            if self.log:
+                self.log(f"flush: {committed} writes in {len(batches)} batches, {elapsed * 1000:.1f} ms "
+                         f"({events} events, queue {self.queue.qsize()}/{self.queue.maxsize}, "
+                         f"{len(self.retry)} to retry)")
+            return committed
+
+    async def commit(self, batch):
+        async with self.commit_slots:
+            try:
+                await self.store.commit(batch)
+            except Exception as e:
+                self.counts["failed_batches"] += 1
+                retry = [write for write in batch if write.attempts + 1 < MAX_ATTEMPTS]
+                for write in retry:
+                    write.attempts += 1
+                self.retry.extend(retry)
+                self.counts["dropped_writes"] += len(batch) - len(retry)
+                if self.log:
+                    self.log(f"✗ batch of {len(batch)} writes failed ({e}); {len(retry)} will be retried")
+                return False
+            self.counts["batches"] += 1
+            return True
+
+    async def close(self):
+        """Apply everything already queued, flush it (retrying once) and stop."""
+        # Holding the lock means no flush is cancelled halfway through its commits
+        async with self.flush_lock:
+            for task in self.tasks:
+                task.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks = []
+        while not self.queue.empty():
+            uid, events, received = self.queue.get_nowait()
+            try:
+                self.coalescer.apply(uid, events, received)
+            except Exception:
+                self.counts["rejected_invalid"] += 1
+        await self.flush()
+        if self.retry:
+            await self.flush()
+
+    def stats(self):
+        uptime = time.monotonic() - self.started
+        latencies = sorted(self.flush_latencies)
+        counts = self.counts
+        return {
+            **counts,
+            "uptime_s": round(uptime, 1),
+            "queue": self.queue.qsize(),
+            "queue_size": self.queue.maxsize,
+            "pending_docs": len(self.coalescer),
+            "retry_writes": len(self.retry),
+            "events_per_s": round(counts["events"] / uptime, 1) if uptime else 0.0,
+            "events_per_write": round(counts["events_flushed"] / counts["writes"], 2) if counts["writes"] else None,
+            "flush_ms": {
+                "p50": round(percentile(latencies, 0.5) * 1000, 1),
+                "p95": round(percentile(latencies, 0.95) * 1000, 1),
+                "max": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+            },
+        }
+
+
+# === HTTP ===
+
+class IngestServer:
+    """HTTP/1.1 front end: CORS, body limits, token checks, 202/503 answers."""
+
+    def __init__(self, gateway, verifier=None, trust_uid=False, allow_origin="*"):
+        self.gateway = gateway
+        self.verifier = verifier
+        self.trust_uid = trust_uid
+        self.allow_origin = allow_origin
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self.send(writer, 400, {"error": "headers too large"}, keep_alive=False)
+                    return
+                if not await self.respond(head.decode("latin-1"), reader, writer):
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def respond(self, head, reader, writer):
+        lines = head.split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            await self.send(writer, 400, {"error": "bad request line"}, keep_alive=False)
+            return False
+        request = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                request[key.strip().lower()] = value.strip()
+        connection = request.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        path = urlsplit(target).path
+
+        body = b""
+        if method == "POST":
+            length = request.get("content-length", "")
+            if not length.isdigit():
+                await self.send(writer, 411, {"error": "Content-Length required"}, keep_alive=False)
+                return False
+            if int(length) > MAX_BODY_BYTES:
+                await self.send(writer, 413, {"error": f"beacons are limited to {MAX_BODY_BYTES} bytes"},
+                                keep_alive=False)
+                return False
+            body = await reader.readexactly(int(length))
+
+        if method == "OPTIONS":
+            await self.send(writer, 204, None, keep_alive, {
+                "Access-Control-Allow-Methods": "POST, OPTIONS",
+                "Access-Control-Allow-Headers": "Content-Type",
+                "Access-Control-Max-Age": "86400",
+            })
+        elif path == "/v1/beacon":
+            if method != "POST":
+                await self.send(writer, 405, {"error": "use POST"}, keep_alive, {"Allow": "POST, OPTIONS"})
+            else:
+                status, payload, headers = await self.accept(body)
+                await self.send(writer, status, payload, keep_alive, headers)
+        elif path == "/v1/stats" and method == "GET":
+            await self.send(writer, 200, self.gateway.stats(), keep_alive)
+        else:
+            await self.send(writer, 404, {"error": "not found"}, keep_alive)
+        return keep_alive
+
+    async def accept(self, body):
+        try:
+            token, claimed_uid, events = parse_beacon(body)
+        except BeaconError as e:
+            self.gateway.counts["rejected_invalid"] += 1
+            return 400, {"error": str(e)}, {}
+
+        uid = await self.authenticate(token, claimed_uid)
+        if uid is None:
+            self.gateway.counts["rejected_auth"] += 1
+            return 401, {"error": "invalid or expired token"}, {}
+        if not events:
+            return 202, {"accepted": 0}, {}
+        if not self.gateway.submit(uid, events):
+            return 503, {"error": "busy, retry later"}, {"Retry-After": str(RETRY_AFTER)}
+        return 202, {"accepted": len(events)}, {}
+
+    async def authenticate(self, token, claimed_uid):
+        if self.trust_uid:
+            return claimed_uid if isinstance(claimed_uid, str) and DOC_ID_RE.match(claimed_uid) else None
+        if not isinstance(token, str) or not token or self.verifier is None:
+            return None
+        uid = self.verifier.cached(token)
+        if uid:
+            return uid
+        try:
+            return await asyncio.get_running_loop().run_in_executor(None, self.verifier.verify, token)
+        except Exception:
+            return None
+
+    async def send(self, writer, status, payload, keep_alive, headers=None):
+        body = json.dumps(payload).encode() if payload is not None else b""
+        lines = [
+            f"HTTP/1.1 {status} {REASONS.get(status, '')}",
+            f"Date: {formatdate(usegmt=True)}",
+            f"Connection: {'keep-alive' if keep_alive else 'close'}",
+            f"Access-Control-Allow-Origin: {self.allow_origin}",
+            "Cache-Control: no-store",
+            f"Content-Length: {len(body)}",
+        ]
+        if body:
+            lines.append("Content-Type: application/json")
+        lines += [f"{key}: {value}" for key, value in (headers or {}).items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body)
+        await writer.drain()
+
+
+async def start_server(gateway, host, port, **options):
+    server = IngestServer(gateway, **options)
+    return server, await asyncio.start_server(server.handle, host, port, limit=MAX_HEADER_BYTES, backlog=1024)
+
+
+# === Benchmark ===
+
+async def post_beacon(reader, writer, beacon):
+    body = json.dumps(beacon).encode()
+    writer.write(b"POST /v1/beacon HTTP/1.1\r\nHost: ingest\r\nContent-Type: text/plain\r\n"
+                 b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+def simulated_events(session, beat, cases):
+    """One beacon's worth of events from a client that is working through cases."""
+    events = [{"type": "heartbeat", "session": session, "duration": beat * 30}]
+    if beat % 4 == 0:
+        case_id = cases[beat // 4 % len(cases)]
+        events += [
+            {"type": "page_view", "session": session, "path": f"/cases/{case_id}.html", "title": case_id},
+            {"type": "case_view", "session": session, "caseId": case_id, "title": case_id},
+        ]
+    if beat % 10 == 5:
+        events.append({"type": "feature", "name": "flag", "details": {"action": "add"}})
+    return events
+
+
+async def bench(clients, seconds, beacons_per_s, store, flush_interval, queue_size, max_pending, cases=40):
+    gateway = Gateway(store, flush_interval=flush_interval, queue_size=queue_size, max_pending=max_pending)
+    gateway.start()
+    _, server = await start_server(gateway, "127.0.0.1", 0, trust_uid=True)
+    port = server.sockets[0].getsockname()[1]
+    case_ids = [f"case{n // 5 + 1}_{n % 5 + 1}" for n in range(cases)]
+    latencies = []
+    sent = {"events": 0, "direct": 0, "case_views": 0, "busy": 0, "errors": 0}
+    deadline = time.monotonic() + seconds
+
+    async def client(index):
+        uid = f"bench-user-{index}"
+        session = f"bench-session-{index}"
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError:
+            sent["errors"] += 1
+            return
+        backlog = [{"type": "session_start", "session": session, "email": f"{uid}@example.com",
+                    "path": "/index.html", "title": "Home"}]
+        beat = 1
+        try:
+            while True:
+                ending = time.monotonic() >= deadline
+                if ending:
+                    if not backlog or backlog[-1]["type"] != "session_end":
+                        backlog.append({"type": "session_end", "session": session, "duration": beat * 30})
+                else:
+                    backlog += simulated_events(session, beat, case_ids)
+                    beat += 1
+                events = backlog[:MAX_EVENTS]
+                started = time.perf_counter()
+                status = await post_beacon(reader, writer, {"uid": uid, "events": events})
+                latencies.append(time.perf_counter() - started)
+                if status == 202:
+                    sent["events"] += len(events)
+                    sent["direct"] += sum(DIRECT_WRITES[event["type"]] for event in events)
+                    sent["case_views"] += sum(event["type"] == "case_view" for event in events)
+                    del backlog[:len(events)]
+                    if ending and not backlog:
+                        return
+                elif status == 503:
+                    # Keep the events and back off, as js/user-analytics.js does
+                    sent["busy"] += 1
+                    await asyncio.sleep(10 / beacons_per_s)
+                else:
+                    sent["errors"] += 1
+                    return
+                await asyncio.sleep(1 / beacons_per_s)
+        except (OSError, asyncio.IncompleteReadError):
+            sent["errors"] += 1
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    server.close()
+    await server.wait_closed()
+    await gateway.close()
+    elapsed = time.perf_counter() - started
+    return gateway, sent, sorted(latencies), elapsed
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="scp ingest", description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    def add_gateway_options(sub):
+        sub.add_argument("--flush-interval", type=float, default=FLUSH_INTERVAL, help="Seconds between flushes")
+        sub.add_argument("--queue-size", type=int, default=QUEUE_SIZE, help="Beacons queued before answering 503")
+        sub.add_argument("--max-pending", type=int, default=MAX_PENDING,
+                         help="Pending documents that trigger an early flush")
+
+    serve_parser = commands.add_parser("serve", help="Run the gateway")
+    serve_parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    serve_parser.add_argument("--port", type=int, default=8090, help="Port to listen on")
+    serve_parser.add_argument("--project", default=PROJECT_ID, help="Firebase project id (token audience)")
+    serve_parser.add_argument("--allow-origin", default="*", help="Access-Control-Allow-Origin value")
+    serve_parser.add_argument("--memory", action="store_true", help="Write to an in-process store, not Firestore")
+    serve_parser.add_argument("--trust-uid", action="store_true",
+                              help="Take the uid from the beacon instead of verifying a token (development only)")
+    serve_parser.add_argument("--quiet", action="store_true", help="Don't log flushes")
+    add_gateway_options(serve_parser)
+
+    bench_parser = commands.add_parser("bench", help="Drive an in-process gateway with simulated clients")
+    bench_parser.add_argument("--clients", type=int, default=300, help="Concurrent simulated clients")
+    bench_parser.add_argument("--seconds", type=float, default=5, help="How long clients keep sending")
+    bench_parser.add_argument("--rate", type=float, default=20, help="Beacons per second per client")
+    bench_parser.add_argument("--store-latency", type=float, default=0.05, help="Simulated commit latency (s)")
+    add_gateway_options(bench_parser)
+    bench_parser.set_defaults(flush_interval=1.0)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "bench":
+        store = MemoryStore(latency=args.store_latency)
+        gateway, sent, latencies, elapsed = asyncio.run(bench(
+            args.clients, args.seconds, args.rate, store, args.flush_interval, args.queue_size, args.max_pending))
+        stats = gateway.stats()
+        if not latencies:
+            print("✗ No beacons were sent")
+            return 1
+        print(f"{args.clients} clients for {args.seconds:g}s: {stats['beacons']:,} beacons, {sent['events']:,} events "
+              f"in {elapsed:.2f}s ({sent['events'] / elapsed:,.0f} events/s, {stats['beacons'] / elapsed:,.0f} beacons/s)")
+        print(f"  beacon latency p50 {percentile(latencies, 0.5) * 1000:.1f} ms, "
+              f"p99 {percentile(latencies, 0.99) * 1000:.1f} ms; {sent['busy']} answered 503, {sent['errors']} errors")
+        print(f"  {stats['writes']:,} Firestore writes in {stats['batches']} batches over {stats['flushes']} flushes "
+              f"instead of {sent['direct']:,} direct writes ({sent['direct'] / max(1, stats['writes']):,.0f}x fewer)")
+        print(f"  flush latency p50 {stats['flush_ms']['p50']} ms, p95 {stats['flush_ms']['p95']} ms, "
+              f"max {stats['flush_ms']['max']} ms")
+        views = sum(doc.get("viewCount", 0) for path, doc in store.docs.items() if path.startswith("caseAnalytics/"))
+        if views != sent["case_views"] or stats["dropped_writes"]:
+            print(f"✗ caseAnalytics counts {views} views, clients sent {sent['case_views']}")
+            return 1
+        print(f"✓ caseAnalytics view counts match the {views:,} case views sent")
+        return 1 if sent["errors"] else 0
+
+    log = None if args.quiet else (lambda message: print(message, file=sys.stderr))
+    store = MemoryStore() if args.memory else FirestoreStore(args.project)
+    verifier = None if args.trust_uid else TokenVerifier(args.project)
+
+    async def serve_forever():
+        gateway = Gateway(store, flush_interval=args.flush_interval, queue_size=args.queue_size,
+                          max_pending=args.max_pending, log=log)
+        gateway.start()
+        _, server = await start_server(gateway, args.host, args.port, verifier=verifier,
+                                       trust_uid=args.trust_uid, allow_origin=args.allow_origin)
+        target = "memory" if args.memory else f"Firestore ({args.project})"
+        print(f"Ingesting on http://{args.host}:{args.port}/v1/beacon into {target}, "
+              f"flushing every {args.flush_interval:g}s (Ctrl+C to stop)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            server.close()
+            await gateway.close()
+            stats = gateway.stats()
+            print(f"Flushed {stats['events_flushed']:,} events as {stats['writes']:,} writes; "
+                  f"{stats['events_per_s']:,} events/s, flush p95 {stats['flush_ms']['p95']} ms")
+
+    try:
+        asyncio.run(serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        store.close()
+    return 0
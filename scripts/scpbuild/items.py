@@ -0,0 +1,472 @@
+"""
+Item analysis for the MCQ exams.
+
+Exam pages save each signed-in student's answers to
+``users/{uid}/exams/{examId}`` as ``questions: [{id, selectedAnswer,
+flagged}]``. Every saved attempt of an exam is loaded into an attempts x
+questions NumPy array of chosen options (-1 where unanswered), which is
+reduced in batches of attempts to:
+
+  facility        share of the students answering a question who chose
+                  the key
+  discrimination  point-biserial correlation between answering a
+                  question correctly and the score on the rest of the exam
+  choices         share of answers choosing each option
+  flagged         share of attempts that flagged the question
+  topics          mean per-student score on the questions of each topic
+                  (the optional ``topic`` of a question in content/exams/)
+
+Attempts that answered fewer than half of the keyed questions
+(--min-answered) are left out. mcq-2023 has no answer key, so only its
+choice and flag rates are computed. Questions with at least
+MIN_RESPONSES answers are marked for review when they are very hard or
+very easy, discriminate poorly (or negatively), or have distractors
+almost nobody chooses.
+
+Each exam's results are one small document, itemAnalysis/{examId}, which
+the admin dashboard reads instead of every attempt. Attempts come from
+Firestore (google-cloud-firestore; set FIRESTORE_EMULATOR_HOST to run
+against the emulator) or from a JSON-lines export stand-in with one
+``{"path": ..., "data": {...}}`` object per line, as for `scp userstate`.
+
+``scp items bench`` times the engine on synthetic attempts against a
+plain-Python per-question pass over the same answers.
+
+Usage:
+    scp items analyse --export users.jsonl --json items.json
+    scp items analyse --firestore --publish
+    scp items bench --attempts 50000
+"""
+
+import json
+import math
+import re
+import time
+from datetime import datetime, timezone
+
+from .prerender import EXAMS, load_exam
+
+MCQ_EXAMS = [exam for exam, layout in EXAMS.items() if layout.startswith("mcq")]
+ATTEMPT_PATH = re.compile(r"^users/(?P<uid>[^/]+)/exams/(?P<exam>[^/]+)$")
+
+COLLECTION = "itemAnalysis"
+DOC_VERSION = 1
+
+# Attempts reduced per batch
+BATCH = 8192
+# Share of keyed questions an attempt must answer to count
+MIN_ANSWERED = 0.5
+
+# Review thresholds (questions with fewer answers are not marked)
+MIN_RESPONSES = 20
+HARD = 0.3
+EASY = 0.9
+LOW_DISCRIMINATION = 0.15
+WEAK_DISTRACTOR = 0.05
+
+
+def require_numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise SystemExit("scp items needs NumPy: pip install -e \".[items]\"")
+    return numpy
+
+
+class ExamKey:
+    """Question order, options, answer key and topics of one exam."""
+
+    def __init__(self, exam, data):
+        questions = data["questions"]
+        self.exam = exam
+        self.title = data["title"]
+        self.ids = [question["id"] for question in questions]
+        self.numbers = [question.get("n") for question in questions]
+        self.column = {question["id"]: index for index, question in enumerate(questions)}
+        self.options = [len(question["options"]) for question in questions]
+        self.key = [question["correctAnswer"] if question.get("correctAnswer") is not None else -1
+                    for question in questions]
+        self.topic = [question.get("topic") for question in questions]
+        self.topics = sorted({topic for topic in self.topic if topic})
+
+    @classmethod
+    def load(cls, exam):
+        return cls(exam, load_exam(exam))
+
+
+def attempt_matrix(key, attempts):
+    """
+    Return (choices, flagged) for a list of saved ``questions`` lists:
+    attempts x questions arrays, choices -1 where unanswered.
+    """
+    np = require_numpy()
+
+    rows, cols, picks = [], [], []
+    flag_rows, flag_cols = [], []
+    for row, questions in enumerate(attempts):
+        for question in questions or ():
+            col = key.column.get(question.get("id"))
+            if col is None:
+                continue
+            choice = question.get("selectedAnswer")
+            if type(choice) is int and 0 <= choice < key.options[col]:
+                rows.append(row)
+                cols.append(col)
+                picks.append(choice)
+            if question.get("flagged"):
+                flag_rows.append(row)
+                flag_cols.append(col)
+
+    choices = np.full((len(attempts), len(key.ids)), -1, dtype=np.int8)
+    choices[rows, cols] = picks
+    flagged = np.zeros(choices.shape, dtype=bool)
+    flagged[flag_rows, flag_cols] = True
+    return choices, flagged
+
+
+def analyse(key, choices, flagged, batch=BATCH, min_answered=MIN_ANSWERED):
+    """Reduce an exam's attempts to its item analysis document."""
+    np = require_numpy()
+
+    questions = len(key.ids)
+    width = max(key.options)
+    answer = np.array(key.key, dtype=np.int8)
+    keyed = answer >= 0
+    keyed_count = int(keyed.sum())
+    required = math.ceil(min_answered * (keyed_count or questions))
+
+    # Topic membership of keyed questions
+    topics = np.zeros((questions, len(key.topics)))
+    for col, topic in enumerate(key.topic):
+        if topic and keyed[col]:
+            topics[col, key.topics.index(topic)] = 1
+
+    # Per-question sums over answering attempts: x is 1 if correct, r the rest score
+    n = np.zeros(questions)
+    sx = np.zeros(questions)
+    sr = np.zeros(questions)
+    srr = np.zeros(questions)
+    sxr = np.zeros(questions)
+    counts = np.zeros(questions * width, dtype=np.int64)
+    flags = np.zeros(questions)
+    topic_sum = np.zeros(len(key.topics))
+    topic_n = np.zeros(len(key.topics))
+    attempts = 0
+    score_sum = 0.0
+
+    for start in range(0, len(choices), batch):
+        chunk = choices[start:start + batch]
+        answered = chunk >= 0
+        keep = (answered[:, keyed] if keyed_count else answered).sum(1) >= required
+        chunk = chunk[keep]
+        answered = answered[keep]
+        attempts += len(chunk)
+        flags += flagged[start:start + batch][keep].sum(0)
+
+        mask = answered.astype(np.float64)
+        correct = ((chunk == answer) & answered & keyed).astype(np.float64)
+        total = correct.sum(1)
+        rest = (total[:, None] - correct) * mask
+        n += mask.sum(0)
+        sx += correct.sum(0)
+        sr += rest.sum(0)
+        srr += (rest * rest).sum(0)
+        sxr += (correct * rest).sum(0)
+
+        rows, cols = np.nonzero(answered)
+        counts += np.bincount(cols * width + chunk[rows, cols], minlength=questions * width)
+
+        if keyed_count:
+            score_sum += float(total.sum()) / keyed_count
+        if key.topics:
+            topic_answered = mask @ topics
+            topic_correct = correct @ topics
+            took = topic_answered > 0
+            topic_sum += np.divide(topic_correct, topic_answered, out=np.zeros_like(topic_correct), where=took).sum(0)
+            topic_n += took.sum(0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        facility = np.where(keyed & (n > 0), sx / n, np.nan)
+        spread = (n * sx - sx * sx) * (n * srr - sr * sr)
+        discrimination = np.where(keyed & (spread > 0), (n * sxr - sx * sr) / np.sqrt(spread), np.nan)
+        rates = counts.reshape(questions, width) / n[:, None]
+
+    items = []
+    for col in range(questions):
+        item = {
+            "id": key.ids[col],
+            "n": key.numbers[col],
+            "answered": int(n[col]),
+            "facility": rounded(facility[col]),
+            "discrimination": rounded(discrimination[col]),
+            "choices": [rounded(rate) for rate in rates[col, :key.options[col]]],
+            "flagged": rounded(flags[col] / attempts if attempts else math.nan),
+        }
+        if key.topic[col]:
+            item["topic"] = key.topic[col]
+        review = review_reasons(item, key.key[col])
+        if review:
+            item["review"] = review
+        items.append(item)
+
+    return {
+        "version": DOC_VERSION,
+        "exam": key.exam,
+        "title": key.title,
+        "attempts": attempts,
+        "meanScore": rounded(score_sum / attempts if attempts and keyed_count else math.nan),
+        "items": items,
+        "topics": {
+            topic: {
+                "questions": int(topics[:, index].sum()),
+                "attempts": int(topic_n[index]),
+                "meanScore": rounded(topic_sum[index] / topic_n[index] if topic_n[index] else math.nan),
+            }
+            for index, topic in enumerate(key.topics)
+        },
+    }
+
+
+def rounded(value, digits=3):
+    value = float(value)
+    return round(value, digits) if math.isfinite(value) else None
+
+
+def review_reasons(item, answer):
+    if item["answered"] < MIN_RESPONSES:
+        return []
+    reasons = []
+    facility, discrimination = item["facility"], item["discrimination"]
+    if facility is not None and facility < HARD:
+        reasons.append("hard")
+    if facility is not None and facility > EASY:
+        reasons.append("easy")
+    if discrimination is not None and discrimination < 0:
+        reasons.append("negative-discrimination")
+    elif discrimination is not None and discrimination < LOW_DISCRIMINATION:
+        reasons.append("low-discrimination")
+    if answer >= 0 and any(rate < WEAK_DISTRACTOR for option, rate in enumerate(item["choices"]) if option != answer):
+        reasons.append("weak-distractor")
+    return reasons
+
+
+# === Sources ===
+
+def export_attempts(path):
+    """Yield (exam, questions) for every saved exam in a JSON-lines export."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            doc = json.loads(line)
+            match = ATTEMPT_PATH.match(doc["path"])
+            if match:
+                yield match.group("exam"), doc["data"].get("questions")
+
+
+def firestore_client(project=None):
+    try:
+        from google.cloud import firestore
+    except ImportError:
+        raise SystemExit("scp items --firestore/--publish needs google-cloud-firestore: "
+                         "pip install -e \".[firestore]\"")
+    return firestore, firestore.Client(project=project)
+
+
+def firestore_attempts(project=None):
+    """Yield (exam, questions) for every saved exam in Firestore."""
+    _, client = firestore_client(project)
+    try:
+        for doc in client.collection_group("exams").stream():
+            match = ATTEMPT_PATH.match(doc.reference.path)
+            if match:
+                yield match.group("exam"), (doc.to_dict() or {}).get("questions")
+    finally:
+        client.close()
+
+
+def publish(documents, project=None):
+    """Write each exam's document to itemAnalysis/{examId} in one batch."""
+    firestore, client = firestore_client(project)
+    try:
+        batch = client.batch()
+        for document in documents:
+            batch.set(client.collection(COLLECTION).document(document["exam"]),
+                      {**document, "computedAt": firestore.SERVER_TIMESTAMP})
+        batch.commit()
+    finally:
+        client.close()
+
+
+# === Commands ===
+
+def run_analyse(args):
+    exams = args.exam or MCQ_EXAMS
+    attempts = {exam: [] for exam in exams}
+    started = time.perf_counter()
+    source = firestore_attempts(args.project) if args.firestore else export_attempts(args.export)
+    for exam, questions in source:
+        if exam in attempts:
+            attempts[exam].append(questions)
+    loaded = time.perf_counter()
+
+    documents = []
+    print(f"{'EXAM':<20}{'SAVED':>8}{'SCORED':>8}{'MEAN':>8}{'REVIEW':>8}{'SECONDS':>9}")
+    for exam in exams:
+        key = ExamKey.load(exam)
+        exam_started = time.perf_counter()
+        choices, flagged = attempt_matrix(key, attempts[exam])
+        document = analyse(key, choices, flagged, batch=args.batch, min_answered=args.min_answered)
+        elapsed = time.perf_counter() - exam_started
+        documents.append(document)
+        review = sum(1 for item in document["items"] if item.get("review"))
+        mean = document["meanScore"]
+        print(f"{exam:<20}{len(attempts[exam]):>8}{document['attempts']:>8}"
+              f"{'-' if mean is None else format(mean, '.1%'):>8}{review:>8}{elapsed:>9.3f}")
+
+    print(f"\nLoaded {sum(map(len, attempts.values()))} saved attempts in {loaded - started:.2f}s")
+    for document in documents:
+        reasons = {}
+        for item in document["items"]:
+            for reason in item.get("review", ()):
+                reasons[reason] = reasons.get(reason, 0) + 1
+        if reasons:
+            print(f"  {document['exam']}: " + ", ".join(f"{count} {reason}" for reason, count in sorted(reasons.items())))
+
+    if args.json:
+        computed_at = datetime.now(timezone.utc).isoformat()
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump([{**document, "computedAt": computed_at} for document in documents], f, indent=2)
+        print(f"Results written to {args.json}")
+    if args.publish:
+        publish(documents, args.project)
+        sizes = ", ".join(f"{d['exam']} {len(json.dumps(d, separators=(',', ':'))) / 1024:.1f} KB" for d in documents)
+        print(f"✓ Published {len(documents)} documents to {COLLECTION}/ ({sizes})")
+    return 0
+
+
+def synthetic_choices(key, attempts, seed=1, omit=0.03):
+    """Answers from a two-parameter logistic model: ability, item difficulty and discrimination."""
+    np = require_numpy()
+
+    rng = np.random.default_rng(seed)
+    questions = len(key.ids)
+    width = max(key.options)
+    options = np.array(key.options)
+    answer = np.array([k if k >= 0 else 0 for k in key.key])
+
+    ability = rng.normal(size=attempts)
+    difficulty = rng.normal(-0.5, 1.0, questions)
+    slope = rng.uniform(0.2, 2.0, questions)
+    correct = rng.random((attempts, questions)) < 1 / (1 + np.exp(-slope * (ability[:, None] - difficulty)))
+
+    # Each question's distractors are chosen with uneven preferences
+    weights = rng.dirichlet(np.full(width - 1, 0.7), questions) * (np.arange(width - 1) < options[:, None] - 1)
+    cumulative = np.cumsum(weights / weights.sum(1, keepdims=True), axis=1)
+    distractor = (rng.random((attempts, questions, 1)) > cumulative[None]).sum(2)
+    distractor = np.minimum(distractor, options - 2)
+    wrong = distractor + (distractor >= answer)
+
+    choices = np.where(correct, answer, wrong).astype(np.int8)
+    choices[rng.random((attempts, questions)) < omit] = -1
+    flagged = rng.random((attempts, questions)) < 0.02
+    return choices, flagged
+
+
+def reference_analysis(key, attempts):
+    """Facility and discrimination one question at a time over saved attempts, as a browser would."""
+    rows = []
+    for questions in attempts:
+        answers = {question["id"]: question.get("selectedAnswer") for question in questions}
+        rows.append(answers)
+    totals = [sum(1 for qid, k in zip(key.ids, key.key) if k >= 0 and row.get(qid) == k) for row in rows]
+
+    facility, discrimination = [], []
+    for qid, k in zip(key.ids, key.key):
+        xs, rs = [], []
+        for row, total in zip(rows, totals):
+            if row.get(qid) is None:
+                continue
+            x = 1 if row[qid] == k else 0
+            xs.append(x)
+            rs.append(total - x)
+        count = len(xs)
+        mean_x = sum(xs) / count
+        mean_r = sum(rs) / count
+        cov = sum((x - mean_x) * (r - mean_r) for x, r in zip(xs, rs))
+        var_x = sum((x - mean_x) ** 2 for x in xs)
+        var_r = sum((r - mean_r) ** 2 for r in rs)
+        facility.append(mean_x)
+        discrimination.append(cov / math.sqrt(var_x * var_r) if var_x and var_r else None)
+    return facility, discrimination
+
+
+def run_bench(args):
+    key = ExamKey.load(args.exam)
+    if min(key.key) < 0:
+        raise SystemExit(f"{args.exam} has no answer key; bench an exam with correctAnswer set")
+    print(f"Item analysis bench: {args.attempts} synthetic attempts x {len(key.ids)} questions ({args.exam})")
+
+    choices, flagged = synthetic_choices(key, args.attempts, seed=args.seed)
+    started = time.perf_counter()
+    document = analyse(key, choices, flagged, batch=args.batch, min_answered=0)
+    engine = time.perf_counter() - started
+    print(f"  {'analyse, all attempts':<36}{engine:8.3f}s {args.attempts / engine:>12,.0f} attempts/s")
+
+    # Saved attempts as Firestore returns them, for a sample
+    sample = min(args.attempts, args.sample)
+    saved = [[{"id": qid, "selectedAnswer": int(choice) if choice >= 0 else None, "flagged": bool(flag)}
+              for qid, choice, flag in zip(key.ids, row, flags)]
+             for row, flags in zip(choices[:sample], flagged[:sample])]
+    started = time.perf_counter()
+    attempt_matrix(key, saved)
+    load = time.perf_counter() - started
+    print(f"  {f'load {sample} saved attempts':<36}{load:8.3f}s {sample / load:>12,.0f} attempts/s")
+
+    started = time.perf_counter()
+    facility, discrimination = reference_analysis(key, saved)
+    reference = time.perf_counter() - started
+    print(f"  {f'per-question loop, {sample} attempts':<36}{reference:8.3f}s {sample / reference:>12,.0f} attempts/s")
+
+    sample_document = analyse(key, *attempt_matrix(key, saved), min_answered=0)
+    errors = [abs(item["facility"] - f) for item, f in zip(sample_document["items"], facility)]
+    errors += [abs(item["discrimination"] - d) for item, d in zip(sample_document["items"], discrimination)
+               if d is not None and item["discrimination"] is not None]
+    print(f"  max difference from the per-question loop: {max(errors):.4f} (values rounded to 0.001)")
+
+    size = len(json.dumps(document, separators=(",", ":")))
+    review = sum(1 for item in document["items"] if item.get("review"))
+    values = [item["discrimination"] for item in document["items"] if item["discrimination"] is not None]
+    print(f"  document: {size / 1024:.1f} KB, {review} questions marked for review, "
+          f"discrimination {min(values):.2f}..{max(values):.2f}")
+    return 0
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="scp items", description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    analyse_parser = commands.add_parser("analyse", help="Analyse saved exam attempts")
+    source = analyse_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--export", metavar="FILE", help="JSON-lines export stand-in")
+    source.add_argument("--firestore", action="store_true", help="Read from Firestore (or FIRESTORE_EMULATOR_HOST)")
+    analyse_parser.add_argument("--project", help="Firestore project id")
+    analyse_parser.add_argument("--exam", action="append", choices=MCQ_EXAMS, help="Exam to analyse (repeatable; default: all MCQ exams)")
+    analyse_parser.add_argument("--min-answered", type=float, default=MIN_ANSWERED,
+                                help="Share of keyed questions an attempt must answer to count")
+    analyse_parser.add_argument("--batch", type=int, default=BATCH, help="Attempts per vectorised batch")
+    analyse_parser.add_argument("--publish", action="store_true", help=f"Write the documents to {COLLECTION}/ in Firestore")
+    analyse_parser.add_argument("--json", metavar="PATH", help="Also write the documents as JSON")
+
+    bench_parser = commands.add_parser("bench", help="Time the engine on synthetic attempts")
+    bench_parser.add_argument("--exam", choices=MCQ_EXAMS, default="mcq-all-2022-2024")
+    bench_parser.add_argument("--attempts", type=int, default=50000)
+    bench_parser.add_argument("--sample", type=int, default=2000, help="Attempts for the load and per-question loop timings")
+    bench_parser.add_argument("--batch", type=int, default=BATCH, help="Attempts per vectorised batch")
+    bench_parser.add_argument("--seed", type=int, default=1)
+
+    args = parser.parse_args(argv)
+    require_numpy()
+    return run_analyse(args) if args.command == "analyse" else run_bench(args)
@@ -0,0 +1,168 @@
+"""
+Check every link in the publish tree before it reaches production.
+
+All HTML pages, stylesheets and the first-party scripts that pages load
+are parsed in parallel into the cached site graph; every ``href``/``src``,
+CSS ``url()``, inline script navigation target (including the
+``SCP2.html?filter=`` style back links) and case catalogue entry is
+resolved against the tree Firebase Hosting publishes. Reported:
+
+  dangling    - the target does not exist, or climbs above the site root
+  case        - the target only exists with different capitalisation
+                (works on macOS, 404s once deployed)
+  unpublished - the target exists but firebase.json ``ignore`` drops it
+  orphaned    - a page no link path reaches from the entry pages (the
+                pages ``scp dist`` publishes unlinked: admin and
+                dashboard pages, well-known names, legacy exam URLs)
+
+Usage:
+    scp links
+    scp links --entry index.html admin.html
+    scp links --json links.json
+"""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from .dist import DEFAULT_ENTRIES, crawl_entries
+from .hosting import HostingConfig
+from .paths import BASE_DIR
+from .sitegraph import build_graph, climbs_above_root, expand_glob, links, resolve
+
+# Schemes that are never files in the tree
+SKIP_SCHEMES = ("mailto:", "tel:", "javascript:", "data:", "blob:")
+
+
+def publish_tree(config_path, public=None):
+    """Return (public dir, set of published repo-relative files, set of ignored files)."""
+    config = HostingConfig(config_path, public)
+    root = Path(config.public)
+    published = set()
+    ignored = set()
+    for dirpath, dirnames, filenames in os.walk(root):
+        rel_dir = os.path.relpath(dirpath, root).replace(os.sep, "/")
+        rel_dir = "" if rel_dir == "." else rel_dir + "/"
+        # Don't descend into ignored trees such as .git or node_modules
+        dirnames[:] = [name for name in dirnames if not config.is_ignored(rel_dir + name)]
+        for name in filenames:
+            rel_path = rel_dir + name
+            (ignored if config.is_ignored(rel_path) else published).add(rel_path)
+    return root, published, ignored
+
+
+def check(graph, published, ignored, entries):
+    """Return a list of problem dicts and the set of pages reachable from ``entries``."""
+    lower = {}
+    for rel_path in published:
+        lower.setdefault(rel_path.lower(), rel_path)
+
+    problems = []
+    edges = {}
+    globs = {}
+    pages = sorted(path for path in graph if path.endswith(".html") and path in published)
+    stylesheets = sorted(path for path in graph if path.endswith(".css") and path in published)
+
+    for page in pages + stylesheets:
+        targets = edges.setdefault(page, set())
+        for ref, source in links(page, graph):
+            url = ref.url
+            if ref.is_external or url.startswith("#") or url.lower().startswith(SKIP_SCHEMES):
+                continue
+            target = resolve(page, url)
+            if target is None:
+                if climbs_above_root(page, url):
+                    problems.append({"kind": "dangling", "source": source, "url": url, "target": None,
+                                     "detail": "climbs above the site root"})
+                continue
+            if ref.tag == "js-glob":
+                if target not in globs:
+                    globs[target] = expand_glob(target, published)
+                if not globs[target]:
+                    problems.append({"kind": "dangling", "source": source, "url": url, "target": target,
+                                     "detail": "no file matches"})
+                targets.update(globs[target])
+                continue
+            if target not in published and target + "/index.html" in published:
+                target += "/index.html"
+
+            if target in published:
+                targets.add(target)
+            elif target.lower() in lower:
+                actual = lower[target.lower()]
+                problems.append({"kind": "case", "source": source, "url": url, "target": target,
+                                 "detail": f"file is {actual}"})
+                targets.add(actual)
+            elif target in ignored:
+                problems.append({"kind": "unpublished", "source": source, "url": url, "target": target,
+                                 "detail": "excluded by firebase.json ignore"})
+            else:
+                problems.append({"kind": "dangling", "source": source, "url": url, "target": target,
+                                 "detail": "no such file"})
+
+    reachable = set()
+    stack = [entry for entry in entries if entry in edges]
+    while stack:
+        page = stack.pop()
+        if page in reachable:
+            continue
+        reachable.add(page)
+        stack.extend(target for target in edges.get(page, ()) if target.endswith(".html"))
+    for page in pages:
+        if page not in reachable:
+            problems.append({"kind": "orphaned", "source": page, "url": None, "target": None,
+                             "detail": "not linked from any entry page"})
+    return problems, reachable
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="scp links", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--config", default=str(BASE_DIR / "firebase.json"), help="firebase.json for the publish tree")
+    parser.add_argument("--public", help="Directory to check instead of hosting.public")
+    parser.add_argument("--entry", nargs="+", default=DEFAULT_ENTRIES,
+                        help="Pages that count as reachable, besides the well-known and legacy pages "
+                             "(default: the scp dist entry pages)")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes")
+    parser.add_argument("--no-orphans", action="store_true", help="Skip the orphaned page report")
+    parser.add_argument("--json", metavar="FILE", help="Also write the problems as JSON")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    root, published, ignored = publish_tree(args.config, args.public)
+    if not root.is_dir():
+        print(f"✗ {root} does not exist; run `scp dist` first or pass --public .", file=sys.stderr)
+        return 2
+    files = sorted(path for path in published if path.endswith((".html", ".js", ".css")))
+    graph, reparsed = build_graph(files, base_dir=root, jobs=args.jobs)
+    problems, reachable = check(graph, published, ignored, crawl_entries(args.entry, published))
+    if args.no_orphans:
+        problems = [problem for problem in problems if problem["kind"] != "orphaned"]
+    elapsed = time.perf_counter() - started
+
+    pages = sum(1 for path in graph if path.endswith(".html") and path in published)
+    print(f"Checked {pages} pages ({reparsed} files reparsed) in {elapsed:.2f}s; "
+          f"{len(reachable)} reachable from {', '.join(args.entry)}")
+
+    for kind in ("dangling", "case", "unpublished", "orphaned"):
+        found = [problem for problem in problems if problem["kind"] == kind]
+        if not found:
+            continue
+        print(f"\n{kind.upper()} ({len(found)})")
+        print("-" * 60)
+        for problem in found:
+            if problem["url"] is None:
+                print(f"  {problem['source']}")
+            else:
+                print(f"  {problem['source']}: {problem['url']}  ({problem['detail']})")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(problems, f, indent=2)
+
+    if not problems:
+        print("✓ No broken links")
+    return 1 if any(problem["kind"] != "orphaned" for problem in problems) else 0
@@ -0,0 +1,211 @@
+"""
+The case manifest: every year's weeks and cases in teaching order.
+
+content/manifest.json is the single source of truth for which cases
+exist, their titles and disciplines. Index pages, resource hints and
+other build stages are generated from it.
+
+It also assigns every case, and every exam question in content/exams/,
+a stable integer id ("n"). Users' packed progress and flag bitsets (see
+userstate.py) are indexed by the case ids and ``scp items`` reports each
+exam question under its id, so they are never reused:
+``next_ids`` records the next free id of each kind, and a removed
+case's id stays retired.
+
+Usage:
+    scp manifest                          # summary
+    scp manifest --import year3           # rebuild a year from its index.html
+    scp manifest --assign-ids             # give new cases and exam questions their ids
+"""
+
+import html
+import json
+import re
+import sys
+
+from .paths import BASE_DIR
+
+MANIFEST_PATH = BASE_DIR / "content" / "manifest.json"
+
+# Default layout of each year; --import fills in the weeks
+YEARS = {
+    "year3": {"index": "year3/index.html", "cases_dir": "year3/cases"},
+    "year4": {"index": "year4/index.html", "cases_dir": "year4/cases"},
+}
+
+# The year whose cases the PDFs under pdfs/ were written for
+PDF_YEAR = "year3"
+
+MAIN_CONTENT_START = '<div id="scpsMainContent">'
+MAIN_CONTENT_END = "<!-- End SCPs Main Content -->"
+
+WEEK_RE = re.compile(r'<div class="week" data-specialties="([^"]*)">\s*Week\s+(\d+)\s*-\s*(.*?)</div>')
+CARD_RE = re.compile(
+    r'<a href="([^"]*?case(\d+_\d+)\.html)" class="case-card ([^"]*)">\s*<h3>\s*[\d.]+\s+(.*?)</h3>\s*</a>'
+)
+
+
+def load_manifest(path=MANIFEST_PATH):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(manifest, path=MANIFEST_PATH):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+def series_of(case_id):
+    """Return the series ("12") of a case id ("12_3")."""
+    return case_id.split("_", 1)[0]
+
+
+def iter_cases(manifest, year):
+    """Yield (week, case) for every case of ``year`` in manifest order."""
+    for week in manifest["years"][year]["weeks"]:
+        for case in week["cases"]:
+            yield week, case
+
+
+def case_path(manifest, year, case_id):
+    """Repo-relative path of a case page."""
+    return f"{manifest['years'][year]['cases_dir']}/case{case_id}.html"
+
+
+def year_cases_dir(year=PDF_YEAR, manifest=None):
+    """Absolute path of the directory holding ``year``'s published case pages."""
+    manifest = manifest or load_manifest()
+    return BASE_DIR / manifest["years"][year]["cases_dir"]
+
+
+def assign_ids(manifest, exams):
+    """
+    Give every case and exam question without an id the next free one.
+
+    ``exams`` maps exam name -> its content/exams data. Existing ids are
+    kept, including those of cases re-imported with ``--import``.
+    Returns the number of ids assigned.
+    """
+    next_ids = manifest.setdefault("next_ids", {"case": 0, "question": 0})
+    assigned = 0
+
+    def take(kind):
+        nonlocal assigned
+        assigned += 1
+        next_ids[kind] += 1
+        return next_ids[kind] - 1
+
+    for year in manifest["years"]:
+        for _, case in iter_cases(manifest, year):
+            if "n" not in case:
+                case["n"] = take("case")
+    for data in exams.values():
+        for index, question in enumerate(data["questions"]):
+            if "n" not in question:
+                # Keep "n" next to the question's own id
+                data["questions"][index] = {"id": question["id"], "n": take("question"), **question}
+    return assigned
+
+
+def case_numbers(manifest):
+    """Return {"year3_1_1": n} for every case that has an id."""
+    return {f"{year}_{case['id']}": case["n"]
+            for year in manifest["years"] for _, case in iter_cases(manifest, year) if "n" in case}
+
+
+def import_index(index_html, known_ids=None):
+    """
+    Parse the hand-written week/case grid of an index page into manifest weeks.
+
+    ``known_ids`` maps case ids already in the manifest to their "n", so
+    re-importing a year keeps its cases' ids.
+    """
+    known_ids = known_ids or {}
+    start = index_html.index(MAIN_CONTENT_START)
+    end = index_html.index(MAIN_CONTENT_END, start)
+    section = index_html[start:end]
+
+    weeks = []
+    positions = [(m.start(), m) for m in WEEK_RE.finditer(section)] + [(len(section), None)]
+    for (pos, match), (next_pos, _) in zip(positions, positions[1:]):
+        specialties, number, label = match.groups()
+        cases = []
+        for card in CARD_RE.finditer(section, pos, next_pos):
+            _, case_id, classes, title = card.groups()
+            classes = classes.split()
+            case = {"id": case_id, "title": html.unescape(title).strip(), "discipline": classes[0]}
+            if case_id in known_ids:
+                case["n"] = known_ids[case_id]
+            if len(classes) > 1:
+                case["tags"] = classes[1:]
+            cases.append(case)
+        weeks.append({
+            "week": int(number),
+            "label": html.unescape(label).strip(),
+            "specialties": specialties.split(),
+            "cases": cases,
+        })
+    return weeks
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="scp manifest", description="Show or rebuild the case manifest.")
+    parser.add_argument("--import", dest="import_years", nargs="+", choices=YEARS, metavar="YEAR",
+                        help="Rebuild these years from their current index.html")
+    parser.add_argument("--assign-ids", action="store_true",
+                        help="Give cases and exam questions without a stable id the next free one")
+    args = parser.parse_args(argv)
+
+    if args.import_years:
+        manifest = load_manifest() if MANIFEST_PATH.exists() else {"version": 1, "years": {}}
+        for year in args.import_years:
+            layout = YEARS[year]
+            index_html = (BASE_DIR / layout["index"]).read_text(encoding="utf-8")
+            if 'id="caseCatalogue"' in index_html:
+                # `scp index` has already replaced the hand-written grid
+                print(f"✗ {layout['index']} carries the generated catalogue; edit the manifest instead",
+                      file=sys.stderr)
+                return 1
+            known = list(iter_cases(manifest, year)) if year in manifest["years"] else []
+            weeks = import_index(index_html, {case["id"]: case["n"] for _, case in known if "n" in case})
+            found = sum(len(week["cases"]) for week in weeks)
+            if not weeks or found < len(known):
+                print(f"✗ {layout['index']} lists {len(weeks)} weeks and {found} cases, but the manifest "
+                      f"holds {len(known)} cases for {year}; not overwriting it", file=sys.stderr)
+                return 1
+            manifest["years"][year] = dict(layout, weeks=weeks)
+        save_manifest(manifest)
+        print(f"Manifest written to {MANIFEST_PATH.relative_to(BASE_DIR)}")
+
+    if args.assign_ids:
+        from .prerender import EXAMS, load_exam, save_exam
+
+        manifest = load_manifest()
+        exams = {exam: load_exam(exam) for exam in EXAMS}
+        before = dict(manifest.get("next_ids", {"case": 0, "question": 0}))
+        assigned = assign_ids(manifest, exams)
+        if assigned:
+            # next_ids sits before the (long) years block
+            manifest = {"version": manifest["version"], "next_ids": manifest.pop("next_ids"), **manifest}
+            save_manifest(manifest)
+            for exam, data in exams.items():
+                save_exam(exam, data)
+        next_ids = manifest["next_ids"]
+        print(f"Assigned {next_ids['case'] - before['case']} case ids and "
+              f"{next_ids['question'] - before['question']} question ids "
+              f"(next: case {next_ids['case']}, question {next_ids['question']})")
+
+    manifest = load_manifest()
+    print("=" * 60)
+    for year, data in manifest["years"].items():
+        cases = sum(len(week["cases"]) for week in data["weeks"])
+        missing = [c["id"] for _, c in iter_cases(manifest, year)
+                   if not (BASE_DIR / case_path(manifest, year, c["id"])).exists()]
+        print(f"{year}: {len(data['weeks'])} weeks, {cases} cases"
+              + (f", {len(missing)} missing pages: {', '.join(missing)}" if missing else ""))
+    print("=" * 60)
+    return 0
@@ -0,0 +1,504 @@
+"""
+Build offline study packs: one zip per year and discipline.
+
+A pack holds a discipline's case pages for one year, the stylesheets,
+scripts and images they load (followed through stylesheets' url() and
+@import), and a generated <year>/index.html listing its cases, which is
+where the pages' back links lead, so the unzipped pack works from disk.
+With --pdfs each year 3 pack also gets a "-pdfs" variant carrying the
+source PDFs of its cases; later runs (and `scp build`) keep building the
+variants until --no-pdfs.
+
+Members are content-addressed: each distinct file is deflated once into
+.cache/packs/members/<sha256> (stored as-is when deflate would not
+shrink it), and a pack is written by concatenating those
+streams into a zip with fixed timestamps. After editing one page only
+that page is recompressed, and a pack whose member list is unchanged is
+not rewritten at all.
+
+Packs are named by the hash of their bytes
+(packs/year3-paediatrics.<sha256[:12]>.zip), so a URL always serves the
+same bytes and an interrupted download can resume with Range requests.
+packs/index.json lists each pack's cases, size, SHA-256 and the SHA-256
+of every CHUNK_SIZE chunk; js/study-packs.js offers the pack of the
+selected discipline on the year index page and verifies each range it
+downloads. Pack files the index no longer lists are removed.
+
+Usage:
+    scp packs                         # every year and discipline
+    scp packs year3 --pdfs            # year 3, with source PDF variants
+    scp packs --no-pdfs               # drop the PDF variants
+    scp packs --discipline paediatrics --discipline og
+"""
+
+import hashlib
+import html
+import json
+import os
+import posixpath
+import re
+import struct
+import time
+import zlib
+from pathlib import Path
+from urllib.parse import quote
+
+from .paths import BASE_DIR, CACHE_DIR, PDF_DIR, rel
+
+PACKS_DIR = BASE_DIR / "packs"
+INDEX_NAME = "index.json"
+INDEX_VERSION = 1
+CHUNK_SIZE = 4 * 1024 * 1024
+# Bump when member selection or the zip layout changes, to rewrite every pack
+PACK_FORMAT = 1
+
+STORE_DIR = CACHE_DIR / "packs"
+MEMBERS_DIR = STORE_DIR / "members"
+CACHE_PATH = STORE_DIR / "cache.json"
+CACHE_VERSION = 1
+
+# pdfs/ holds the year 3 case PDFs; year 4 reuses their case ids
+PDF_YEAR = "year3"
+
+# Referenced files a page needs to render; <a> targets are left out
+ASSET_TAGS = {"link", "script", "img", "source", "embed", "object", "css"}
+ASSET_RELS = {"stylesheet", "icon", "apple-touch-icon", "preload", "modulepreload", "manifest"}
+SPECIALTY_RE = re.compile(r'<div class="specialty" data-filter="([^"]+)">([^<]*)<')
+
+# Zip constants: 1980-01-01 00:00 (the earliest zip date) on every member
+STORED, DEFLATED = 0, 8
+UTF8_FLAG = 0x800
+ZIP_TIME, ZIP_DATE = 0, (1 << 5) | 1
+MADE_BY = (3 << 8) | 20  # Unix, zip 2.0, so the file modes below are used
+FILE_MODE = 0o100644 << 16
+LEVEL = 9
+
+
+# === Member store ===
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_cache():
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        cache = {}
+    if cache.get("version") != CACHE_VERSION:
+        cache = {}
+    return {"files": cache.get("files", {}), "members": cache.get("members", {}), "packs": cache.get("packs", {})}
+
+
+def save_cache(cache):
+    STORE_DIR.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, **cache}, f)
+
+
+def digest(cache, path):
+    """SHA-256 of a repo-relative file, rehashed only when its size or mtime changed."""
+    stat = os.stat(BASE_DIR / path)
+    cached = cache["files"].get(path)
+    if not (cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns):
+        cached = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": file_sha256(BASE_DIR / path)}
+        cache["files"][path] = cached
+    return cached["sha256"]
+
+
+def compress_member(item):
+    """
+    Deflate one member into the store; runs in worker processes.
+
+    ``source`` is a file path or the member's bytes. Returns (sha256, record).
+    """
+    sha256, source = item
+    data = source if isinstance(source, bytes) else Path(source).read_bytes()
+    compressor = zlib.compressobj(LEVEL, zlib.DEFLATED, -15)
+    stream = compressor.compress(data) + compressor.flush()
+    method = DEFLATED
+    if len(stream) >= len(data):
+        stream, method = data, STORED
+    blob = MEMBERS_DIR / sha256
+    tmp = blob.with_name(blob.name + ".tmp")
+    tmp.write_bytes(stream)
+    os.replace(tmp, blob)
+    return sha256, {"method": method, "crc": zlib.crc32(data), "size": len(data), "csize": len(stream)}
+
+
+def is_stored(cache, sha256):
+    record = cache["members"].get(sha256)
+    try:
+        return bool(record) and (MEMBERS_DIR / sha256).stat().st_size == record["csize"]
+    except FileNotFoundError:
+        return False
+
+
+# === Pack contents ===
+
+def direct_assets(path, refs):
+    """First-party files ``path`` loads directly."""
+    from .sitegraph import resolve
+
+    assets = set()
+    for ref in refs:
+        if ref.tag not in ASSET_TAGS or ref.is_external:
+            continue
+        if ref.tag == "link" and not set(ref.rel.lower().split()) & ASSET_RELS:
+            continue
+        target = resolve(path, ref.url)
+        if target and (BASE_DIR / target).is_file():
+            assets.add(target)
+    return assets
+
+
+def page_assets(pages, jobs=None):
+    """Map each page to the sorted files it loads, including those of its stylesheets."""
+    from .sitegraph import build_graph
+
+    graph, _ = build_graph(pages, base_dir=BASE_DIR, jobs=jobs)
+    loads = {page: direct_assets(page, graph[page]) for page in pages}
+    sheets = sorted({asset for assets in loads.values() for asset in assets if asset.endswith(".css")})
+    while sheets:
+        graph, _ = build_graph(sheets, base_dir=BASE_DIR)
+        loads.update((sheet, direct_assets(sheet, graph[sheet])) for sheet in sheets)
+        sheets = sorted({asset for sheet in sheets for asset in loads[sheet]
+                         if asset.endswith(".css") and asset not in loads})
+
+    closure = {}
+    for page in pages:
+        seen = set()
+        stack = list(loads[page])
+        while stack:
+            asset = stack.pop()
+            if asset not in seen:
+                seen.add(asset)
+                stack.extend(loads.get(asset, ()) if asset.endswith(".css") else ())
+        closure[page] = sorted(seen)
+    return closure
+
+
+def case_pdfs():
+    """Map year 3 case ids to their repo-relative source PDFs."""
+    from .pdftext import case_id
+
+    pdfs = {}
+    for pdf_path in sorted(PDF_DIR.rglob("*.pdf")):
+        pdf_case = case_id(pdf_path)
+        if pdf_case:
+            pdfs.setdefault(pdf_case, []).append(rel(pdf_path))
+    return pdfs
+
+
+def specialty_labels(index_html):
+    """Sidebar labels by discipline ("og" -> "O&G") from a year index page."""
+    return {key: html.unescape(label).strip() for key, label in SPECIALTY_RE.findall(index_html)}
+
+
+def year_label(year):
+    return re.sub(r"^year(\d+)$", r"Year \1", year)
+
+
+def href(from_path, target):
+    return quote(posixpath.relpath(target, posixpath.dirname(from_path) or "."))
+
+
+def render_index(index_path, title, weeks, pdfs):
+    """The pack's year index page: its cases by week, with their PDFs when packed."""
+    lines = [
+        "<!DOCTYPE html>",
+        '<html lang="en">',
+        "<head>",
+        '  <meta charset="UTF-8">',
+        '  <meta name="viewport" content="width=device-width, initial-scale=1.0">',
+        f"  <title>{html.escape(title)}</title>",
+        "  <style>",
+        "    body { font-family: system-ui, sans-serif; max-width: 42rem; margin: 2rem auto; padding: 0 1rem; "
+        "line-height: 1.5; }",
+        "    h2 { font-size: 1rem; margin: 1.5rem 0 0.25rem; color: #555; }",
+        "    ul { margin: 0; padding-left: 1.25rem; }",
+        "    .pdf { font-size: 0.85em; }",
+        "  </style>",
+        "</head>",
+        "<body>",
+        f"  <h1>{html.escape(title)}</h1>",
+        "  <!-- Generated by `scp packs` for the offline pack -->",
+    ]
+    for (number, label), cases in weeks:
+        lines.append(f"  <h2>Week {number} - {html.escape(label)}</h2>")
+        lines.append("  <ul>")
+        for case, page in cases:
+            item = f'<a href="{href(index_path, page)}">{case["id"].replace("_", ".")} {html.escape(case["title"])}</a>'
+            item += "".join(f' <a class="pdf" href="{href(index_path, pdf)}">(PDF)</a>'
+                            for pdf in pdfs.get(case["id"], ()))
+            lines.append(f"    <li>{item}</li>")
+        lines.append("  </ul>")
+    lines += ["</body>", "</html>", ""]
+    return "\n".join(lines).encode("utf-8")
+
+
+def render_redirect(index_path):
+    target = quote(index_path)
+    return (
+        "<!DOCTYPE html>\n"
+        f'<meta charset="UTF-8"><meta http-equiv="refresh" content="0; url={target}">\n'
+        f'<a href="{target}">Open the cases</a>\n'
+    ).encode("utf-8")
+
+
+def plan(manifest, years=None, disciplines=None, with_pdfs=False, jobs=None):
+    """
+    Return the packs to build: dicts of id, year, index page, discipline,
+    title, cases and members, a sorted list of (zip name, path or bytes).
+    """
+    from .manifest import case_path
+
+    packs = []
+    pdf_map = case_pdfs() if with_pdfs else {}
+    for year in years or manifest["years"]:
+        year_data = manifest["years"][year]
+        index_path = year_data["index"]
+        labels = specialty_labels((BASE_DIR / index_path).read_text(encoding="utf-8"))
+
+        groups = {}
+        for week in year_data["weeks"]:
+            for case in week["cases"]:
+                page = case_path(manifest, year, case["id"])
+                if (BASE_DIR / page).exists() and (not disciplines or case["discipline"] in disciplines):
+                    by_week = groups.setdefault(case["discipline"], {})
+                    by_week.setdefault((week["week"], week["label"]), []).append((case, page))
+        if not groups:
+            continue
+        assets = page_assets(sorted(page for weeks in groups.values() for cases in weeks.values()
+                                    for _, page in cases), jobs=jobs)
+
+        for discipline, weeks in groups.items():
+            pages = [page for cases in weeks.values() for _, page in cases]
+            title = f"{labels.get(discipline, discipline.title())} - {year_label(year)}"
+            base = {
+                "id": f"{year}-{discipline}",
+                "year": year,
+                "index": index_path,
+                "discipline": discipline,
+                "title": title,
+                "cases": [case["id"] for cases in weeks.values() for case, _ in cases],
+            }
+            files = set(pages)
+            files.update(asset for page in pages for asset in assets[page])
+            variants = [({}, False)]
+            if with_pdfs and year == PDF_YEAR:
+                pdfs = {case: pdf_map[case] for case in base["cases"] if case in pdf_map}
+                if pdfs:
+                    variants.append((pdfs, True))
+            for pdfs, has_pdfs in variants:
+                members = {path: str(BASE_DIR / path) for path in files}
+                members.update((pdf, str(BASE_DIR / pdf)) for paths in pdfs.values() for pdf in paths)
+                members[index_path] = render_index(index_path, title, list(weeks.items()), pdfs)
+                members["index.html"] = render_redirect(index_path)
+                packs.append({**base, "id": base["id"] + ("-pdfs" if has_pdfs else ""), "pdfs": has_pdfs,
+                              "members": sorted(members.items())})
+    return packs
+
+
+# === Zip assembly ===
+
+def write_zip(path, members, cache):
+    """Write a zip of ``members`` [(name, sha256)] from their stored streams."""
+    central = []
+    offset = 0
+    with open(path, "wb") as out:
+        for name, sha256 in members:
+            record = cache["members"][sha256]
+            encoded = name.encode("utf-8")
+            fields = (record["method"], ZIP_TIME, ZIP_DATE, record["crc"], record["csize"], record["size"],
+                      len(encoded))
+            header = (0x04034B50, 20, UTF8_FLAG) + fields + (0,)
+            out.write(struct.pack("<IHHHHHIIIHH", *header) + encoded)
+            with open(MEMBERS_DIR / sha256, "rb") as blob:
+                for block in iter(lambda: blob.read(1 << 20), b""):
+                    out.write(block)
+            central.append(struct.pack("<IHHHHHHIIIHHHHHII", 0x02014B50, MADE_BY, 20, UTF8_FLAG, *fields,
+                                       0, 0, 0, 0, FILE_MODE, offset) + encoded)
+            offset += 30 + len(encoded) + record["csize"]
+        directory = b"".join(central)
+        out.write(directory)
+        out.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, len(members), len(members), len(directory), offset, 0))
+
+
+def chunk_digests(path):
+    """(SHA-256 of the file, [SHA-256 of each CHUNK_SIZE chunk])."""
+    whole = hashlib.sha256()
+    chunks = []
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+            whole.update(chunk)
+            chunks.append(hashlib.sha256(chunk).hexdigest())
+    return whole.hexdigest(), chunks
+
+
+def pack_key(members):
+    return hashlib.sha256(json.dumps([PACK_FORMAT, members]).encode("utf-8")).hexdigest()
+
+
+# === Index ===
+
+def load_index(out_root=PACKS_DIR):
+    try:
+        with open(out_root / INDEX_NAME, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return index if index.get("version") == INDEX_VERSION else None
+
+
+def build(manifest, years=None, disciplines=None, with_pdfs=None, out_root=PACKS_DIR, jobs=None):
+    """
+    Build the selected packs and update the index.
+
+    Every pack of the selected years and disciplines is rebuilt or reused;
+    index entries outside the selection are kept while their file exists.
+    ``with_pdfs=None`` builds the PDF variants if the index already has any.
+    Returns (index dict, counts).
+    """
+    cache = load_cache()
+    previous = (load_index(out_root) or {"packs": {}})["packs"]
+    if with_pdfs is None:
+        with_pdfs = any(entry["pdfs"] for entry in previous.values())
+    packs = plan(manifest, years, disciplines, with_pdfs, jobs=jobs)
+
+    # Hash every member, then compress the ones not in the store yet
+    todo = {}
+    for pack in packs:
+        hashed = []
+        for name, source in pack["members"]:
+            if isinstance(source, bytes):
+                sha256 = hashlib.sha256(source).hexdigest()
+            else:
+                sha256 = digest(cache, rel(source))
+            if not is_stored(cache, sha256):
+                todo.setdefault(sha256, source)
+            hashed.append([name, sha256])
+        pack["members"] = hashed
+    counts = {"compressed": len(todo), "written": 0, "reused": 0, "pruned": 0}
+
+    if todo:
+        MEMBERS_DIR.mkdir(parents=True, exist_ok=True)
+        if len(todo) < 16:
+            results = map(compress_member, todo.items())
+            pool = None
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            pool = ProcessPoolExecutor(max_workers=jobs)
+            results = pool.map(compress_member, todo.items(), chunksize=4)
+        try:
+            cache["members"].update(results)
+        finally:
+            if pool:
+                pool.shutdown()
+
+    selected_years = set(years or manifest["years"])
+    entries = {pack_id: entry for pack_id, entry in previous.items()
+               if (BASE_DIR / entry["file"]).exists()
+               and not (entry["year"] in selected_years and (not disciplines or entry["discipline"] in disciplines))}
+    index_dir = rel(out_root)
+    out_root.mkdir(parents=True, exist_ok=True)
+    for pack in packs:
+        key = pack_key(pack["members"])
+        entry = previous.get(pack["id"])
+        if entry and entry["key"] == key and (BASE_DIR / entry["file"]).exists():
+            counts["reused"] += 1
+        else:
+            tmp = out_root / f"{pack['id']}.zip.tmp"
+            write_zip(tmp, pack["members"], cache)
+            sha256, chunks = chunk_digests(tmp)
+            path = out_root / f"{pack['id']}.{sha256[:12]}.zip"
+            os.replace(tmp, path)
+            entry = {
+                "id": pack["id"],
+                "year": pack["year"],
+                "index": pack["index"],
+                "discipline": pack["discipline"],
+                "title": pack["title"],
+                "pdfs": pack["pdfs"],
+                "cases": pack["cases"],
+                "file": f"{index_dir}/{path.name}",
+                "bytes": path.stat().st_size,
+                "sha256": sha256,
+                "chunks": chunks,
+                "members": len(pack["members"]),
+                "key": key,
+            }
+            counts["written"] += 1
+        entries[pack["id"]] = entry
+        cache["packs"][pack["id"]] = [sha256 for _, sha256 in pack["members"]]
+
+    index = {"version": INDEX_VERSION, "chunkSize": CHUNK_SIZE, "packs": dict(sorted(entries.items()))}
+    with open(out_root / INDEX_NAME, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+
+    referenced = {entry["file"].rsplit("/", 1)[-1] for entry in entries.values()}
+    for path in out_root.iterdir():
+        if path.name != INDEX_NAME and path.name not in referenced:
+            path.unlink()
+            counts["pruned"] += 1
+
+    # Drop stored members no listed pack uses (only when every pack's members are known)
+    cache["packs"] = {pack_id: shas for pack_id, shas in cache["packs"].items() if pack_id in entries}
+    if set(cache["packs"]) == set(entries):
+        used = {sha256 for shas in cache["packs"].values() for sha256 in shas}
+        for sha256 in [sha256 for sha256 in cache["members"] if sha256 not in used]:
+            del cache["members"][sha256]
+            (MEMBERS_DIR / sha256).unlink(missing_ok=True)
+    save_cache(cache)
+    return index, counts
+
+
+def published_files(files, out_root=PACKS_DIR):
+    """Repo-relative pack files to publish, limited to ``files`` (used by ``scp dist``)."""
+    index = load_index(out_root)
+    if not index:
+        return set()
+    published = {entry["file"] for entry in index["packs"].values()} & files
+    if published:
+        published.add(f"{rel(out_root)}/{INDEX_NAME}")
+    return published
+
+
+def main(argv=None):
+    import argparse
+
+    from .dedupe import format_size
+    from .manifest import load_manifest
+
+    manifest = load_manifest()
+    parser = argparse.ArgumentParser(prog="scp packs", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("years", nargs="*", metavar="YEAR", help="Years to pack (default: all)")
+    parser.add_argument("--discipline", action="append", dest="disciplines", metavar="NAME",
+                        help="Pack only this discipline (repeatable)")
+    parser.add_argument("--pdfs", action="store_true", default=None,
+                        help=f"Also build {PDF_YEAR} variants with the source PDFs")
+    parser.add_argument("--no-pdfs", action="store_false", dest="pdfs", help="Stop building the PDF variants")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes")
+    args = parser.parse_args(argv)
+
+    unknown = [year for year in args.years if year not in manifest["years"]]
+    if unknown:
+        parser.error(f"unknown year(s): {', '.join(unknown)} (choose from {', '.join(manifest['years'])})")
+
+    started = time.perf_counter()
+    index, counts = build(manifest, args.years or None, args.disciplines, args.pdfs, jobs=args.jobs)
+    elapsed = time.perf_counter() - started
+
+    print(f"{'PACK':<34}{'CASES':>6}{'FILES':>7}{'SIZE':>11}")
+    for entry in index["packs"].values():
+        print(f"{entry['id']:<34}{len(entry['cases']):>6}{entry['members']:>7}{format_size(entry['bytes']):>11}")
+    print(f"Packs: {len(index['packs'])} ({format_size(sum(e['bytes'] for e in index['packs'].values()))})")
+    print(f"  {counts['compressed']} members compressed, {counts['written']} packs written, "
+          f"{counts['reused']} reused, {counts['pruned']} pruned in {elapsed:.2f}s")
+    return 0
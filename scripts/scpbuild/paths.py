@@ -0,0 +1,25 @@
+"""
+Shared repository paths.
+
+The repository root defaults to two levels above this package
+(scripts/scpbuild/) and can be overridden with the SCP_ROOT environment
+variable or the CLI's --root option.
+"""
+
+import os
+from pathlib import Path
+
+BASE_DIR = Path(os.environ.get("SCP_ROOT") or Path(__file__).resolve().parent.parent.parent)
+
+CASES_DIR = BASE_DIR / "cases"
+PDF_DIR = BASE_DIR / "pdfs"
+CACHE_DIR = BASE_DIR / ".cache"
+
+
+def rel(path):
+    """Return ``path`` relative to the repo root as a POSIX string when possible."""
+    path = Path(path)
+    try:
+        return path.resolve().relative_to(BASE_DIR.resolve()).as_posix()
+    except ValueError:
+        return path.as_posix()
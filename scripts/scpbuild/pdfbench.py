@@ -0,0 +1,195 @@
+"""
+Benchmark the PDF text extraction backends on the pdfs/ corpus.
+
+Each installed backend extracts the PDFs one at a time in its own freshly
+spawned worker process, bypassing the text cache, and is scored on:
+
+  pages/s    pages extracted per second of extraction time
+  peak RSS   the worker's peak resident memory, backend library included
+  coverage   as `scp audit`: share of the extracted word shingles found
+  fidelity   on the case page built from the PDF, and share of the page's
+             shingles found in the extracted text (mean over PDFs whose
+             page has no placeholders)
+  artefacts  ligature glyphs, U+FFFD, "(cid:N)" glyph ids, private-use
+             and control characters per 1000 extracted characters
+  spaced     share of words in runs of single letters ("h y p e r"),
+             from text laid out with letter spacing
+
+Coverage and fidelity compare backends against the same hand-checked
+pages, so differences between backends are what matter, not the absolute
+scores. Backends that are not installed are reported as unavailable; pin
+the winner for a run with SCP_PDF_BACKEND or per file in
+content/pdf-backends.json.
+
+Usage:
+    scp pdfbench
+    scp pdfbench --backend pypdfium2 --backend pymupdf --limit 20
+    scp pdfbench pdfs/Surgery --json bench.json
+"""
+
+import json
+import re
+import sys
+import time
+from pathlib import Path
+
+from .paths import CASES_DIR, PDF_DIR, rel
+from .pdftext import BACKENDS, PLACEHOLDER_RE, available_backends, case_id, extract_pages
+
+ARTEFACT_RE = re.compile(r"[\ufb00-\ufb06\ufffd\ue000-\uf8ff\x00-\x08\x0b\x0c\x0e-\x1f]|\(cid:\d+\)")
+SPACED_RE = re.compile(r"(?<!\w)(?:[A-Za-z] ){3,}[A-Za-z](?!\w)")
+WORD_RE = re.compile(r"\S+")
+
+
+def peak_rss():
+    """Peak resident memory of this process in bytes, or None where unsupported."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def run_backend(backend, pdf_paths):
+    """Extract ``pdf_paths`` with one backend. Runs in a spawned worker process."""
+    __import__(BACKENDS[backend][1])
+    texts = {}
+    errors = {}
+    pages = 0
+    seconds = 0.0
+    for pdf_path in pdf_paths:
+        start = time.perf_counter()
+        try:
+            page_texts = extract_pages(pdf_path, backend)
+        except Exception as e:
+            errors[pdf_path] = str(e)
+            continue
+        finally:
+            seconds += time.perf_counter() - start
+        pages += len(page_texts)
+        texts[pdf_path] = "\n".join(page_texts)
+    return {"pages": pages, "seconds": seconds, "peak_rss": peak_rss(), "texts": texts, "errors": errors}
+
+
+def reference_pages(pdf_paths):
+    """Map pdf path -> word shingles of its case page, for pages without placeholders."""
+    from .audit import normalise, page_text, shingles
+
+    references = {}
+    for pdf_path in pdf_paths:
+        pdf_case = case_id(pdf_path)
+        page = CASES_DIR / f"case{pdf_case}.html"
+        if not pdf_case or not page.exists():
+            continue
+        html = page.read_text(encoding="utf-8", errors="replace")
+        if PLACEHOLDER_RE.search(html):
+            continue
+        grams = shingles(normalise(page_text(html)))
+        if grams:
+            references[pdf_path] = grams
+    return references
+
+
+def score(texts, references):
+    """Text quality of one backend's output."""
+    from .audit import normalise, shingles
+
+    coverage = []
+    fidelity = []
+    for pdf_path, page_grams in references.items():
+        if pdf_path not in texts:
+            continue
+        grams = shingles(normalise(texts[pdf_path]))
+        shared = len(grams & page_grams)
+        coverage.append(shared / len(grams) if grams else 0.0)
+        fidelity.append(shared / len(page_grams))
+
+    chars = sum(len(text) for text in texts.values())
+    words = sum(len(WORD_RE.findall(text)) for text in texts.values())
+    artefacts = sum(len(ARTEFACT_RE.findall(text)) for text in texts.values())
+    spaced = sum(len(WORD_RE.findall(match)) for text in texts.values() for match in SPACED_RE.findall(text))
+    return {
+        "scored": len(coverage),
+        "coverage": sum(coverage) / len(coverage) if coverage else None,
+        "fidelity": sum(fidelity) / len(fidelity) if fidelity else None,
+        "chars": chars,
+        "artefacts_per_1k": 1000 * artefacts / chars if chars else None,
+        "spaced": spaced / words if words else None,
+    }
+
+
+def benchmark(pdf_paths, backends):
+    """Run each backend in its own spawned process; returns one result per backend."""
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    installed = set(available_backends())
+    references = reference_pages(pdf_paths)
+    results = []
+    for backend in backends:
+        result = {"backend": backend, "available": backend in installed}
+        results.append(result)
+        if not result["available"]:
+            continue
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+            run = pool.submit(run_backend, backend, pdf_paths).result()
+        result.update({
+            "pdfs": len(run["texts"]),
+            "failed": {rel(path): error for path, error in run["errors"].items()},
+            "pages": run["pages"],
+            "seconds": run["seconds"],
+            "pages_per_s": run["pages"] / run["seconds"] if run["seconds"] else None,
+            "peak_rss": run["peak_rss"],
+        })
+        result.update(score(run["texts"], references))
+    return results
+
+
+def fmt(value, spec, width):
+    return f"{'-' if value is None else format(value, spec):>{width}}"
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="scp pdfbench", description="Benchmark PDF text extraction backends.")
+    parser.add_argument("paths", nargs="*", default=[str(PDF_DIR)], help="PDF files or directories")
+    parser.add_argument("--backend", action="append", choices=list(BACKENDS), dest="backends",
+                        help="Backend to benchmark (repeatable; default: all)")
+    parser.add_argument("--limit", type=int, default=None, help="Benchmark the first N PDFs only")
+    parser.add_argument("--json", metavar="PATH", help="Also write the results as JSON")
+    args = parser.parse_args(argv)
+
+    pdfs = []
+    for path in map(Path, args.paths):
+        pdfs.extend(sorted(path.rglob("*.pdf")) if path.is_dir() else [path])
+    pdfs = [str(p) for p in pdfs[:args.limit]]
+    if not pdfs:
+        parser.error("no PDFs found")
+
+    print(f"Benchmarking PDF backends on {len(pdfs)} PDFs...")
+    print("=" * 86)
+    results = benchmark(pdfs, args.backends or list(BACKENDS))
+
+    print(f"{'BACKEND':<11}{'PDFS':>6}{'FAIL':>6}{'PAGES':>7}{'PAGES/S':>9}{'PEAK MB':>9}"
+          f"{'COVER':>8}{'FIDEL':>8}{'ARTEF/1K':>10}{'SPACED':>8}")
+    for result in results:
+        if not result["available"]:
+            print(f"{result['backend']:<11}  unavailable (pip install -e \".[{BACKENDS[result['backend']][2]}]\")")
+            continue
+        print(f"{result['backend']:<11}{result['pdfs']:>6}{len(result['failed']):>6}{result['pages']:>7}"
+              f"{fmt(result['pages_per_s'], '.1f', 9)}"
+              f"{fmt(result['peak_rss'] and result['peak_rss'] / 2**20, '.0f', 9)}"
+              f"{fmt(result['coverage'], '.1%', 8)}{fmt(result['fidelity'], '.1%', 8)}"
+              f"{fmt(result['artefacts_per_1k'], '.2f', 10)}{fmt(result['spaced'], '.2%', 8)}")
+    print("=" * 86)
+    scored = [r for r in results if r["available"]]
+    print(f"Pages scored against: {max((r['scored'] for r in scored), default=0)} case pages without placeholders")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"pdfs": [rel(p) for p in pdfs], "results": results}, f, indent=2)
+        print(f"Results written to {args.json}")
+
+    return 0 if scored else 1
@@ -0,0 +1,240 @@
+"""
+PDF text extraction shared by the audit, build and generate commands.
+
+Text comes from one of several backends:
+
+  pypdf2     PyPDF2 (the default; the ``pdf`` extra)
+  pypdfium2  PDFium bindings (the ``pdfium`` extra)
+  pdfminer   pdfminer.six layout analysis (the ``pdfminer`` extra)
+  pymupdf    MuPDF bindings (the ``pymupdf`` extra)
+
+A run uses SCP_PDF_BACKEND (or ``--backend``), and individual PDFs can
+be pinned to another backend by glob in content/pdf-backends.json:
+
+    {"pdfs/Surgery/Ortho/*.pdf": "pymupdf"}
+
+An explicit ``--backend`` wins over the file. ``scp pdfbench`` compares
+the installed backends on the corpus. Backend libraries are imported
+inside the functions that need them so commands that never open a PDF do
+not pay for them. Extracted text is cached by file hash and backend under
+.cache/text/<backend>/.
+"""
+
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+from fnmatch import fnmatchcase
+from pathlib import Path
+
+from .paths import BASE_DIR, CACHE_DIR, rel
+
+TEXT_CACHE_DIR = CACHE_DIR / "text"
+BACKEND_CONFIG = BASE_DIR / "content" / "pdf-backends.json"
+DEFAULT_BACKEND = "pypdf2"
+
+PDF_NAME_RE = re.compile(r"^(\d+)\.(\d+)_")
+PLACEHOLDER_RE = re.compile(r"\[[^\]\n]{0,80}\bto be (?:added|extracted)\b[^\]\n]{0,80}\]", re.IGNORECASE)
+
+
+def case_number(pdf_path):
+    """Return "12.1" for "12.1_Febrile Seizures.pdf", or None."""
+    match = PDF_NAME_RE.match(Path(pdf_path).name)
+    return f"{match.group(1)}.{match.group(2)}" if match else None
+
+
+def case_id(pdf_path):
+    """Return "12_1" for "12.1_Febrile Seizures.pdf", or None."""
+    number = case_number(pdf_path)
+    return number.replace(".", "_") if number else None
+
+
+# === Backends ===
+#
+# Each returns the text of every page, in order.
+
+def pypdf2_pages(pdf_path):
+    import PyPDF2
+
+    with open(pdf_path, "rb") as file:
+        return [page.extract_text() or "" for page in PyPDF2.PdfReader(file).pages]
+
+
+def pypdfium2_pages(pdf_path):
+    import pypdfium2 as pdfium
+
+    pdf = pdfium.PdfDocument(str(pdf_path))
+    pages = []
+    try:
+        for page in pdf:
+            textpage = page.get_textpage()
+            pages.append(textpage.get_text_range().replace("\r\n", "\n"))
+            textpage.close()
+            page.close()
+    finally:
+        pdf.close()
+    return pages
+
+
+def pdfminer_pages(pdf_path):
+    from pdfminer.high_level import extract_pages
+    from pdfminer.layout import LTTextContainer
+
+    return [
+        "".join(element.get_text() for element in layout if isinstance(element, LTTextContainer))
+        for layout in extract_pages(str(pdf_path))
+    ]
+
+
+def pymupdf_pages(pdf_path):
+    import pymupdf
+
+    with pymupdf.open(str(pdf_path)) as document:
+        return [page.get_text() for page in document]
+
+
+# name -> (page extractor, module it imports, extra that installs it)
+BACKENDS = {
+    "pypdf2": (pypdf2_pages, "PyPDF2", "pdf"),
+    "pypdfium2": (pypdfium2_pages, "pypdfium2", "pdfium"),
+    "pdfminer": (pdfminer_pages, "pdfminer", "pdfminer"),
+    "pymupdf": (pymupdf_pages, "pymupdf", "pymupdf"),
+}
+
+
+def check_backend(name):
+    if name not in BACKENDS:
+        raise ValueError(f"unknown PDF backend {name!r} (choose from {', '.join(BACKENDS)})")
+    return name
+
+
+def available_backends():
+    """Names of the backends whose library is installed."""
+    from importlib.util import find_spec
+
+    return [name for name, (_, module, _) in BACKENDS.items() if find_spec(module) is not None]
+
+
+@lru_cache(maxsize=None)
+def backend_overrides():
+    """Per-file backends from content/pdf-backends.json as [(glob, backend)]."""
+    if not BACKEND_CONFIG.exists():
+        return []
+    config = json.loads(BACKEND_CONFIG.read_text(encoding="utf-8"))
+    return [(pattern, check_backend(name)) for pattern, name in config.items()]
+
+
+def backend_for(pdf_path, backend=None):
+    """
+    The backend for ``pdf_path``: ``backend`` if given, else the first
+    matching glob in content/pdf-backends.json, else SCP_PDF_BACKEND or
+    pypdf2.
+    """
+    if backend:
+        return check_backend(backend)
+    path = rel(pdf_path)
+    for pattern, name in backend_overrides():
+        if fnmatchcase(path, pattern):
+            return name
+    return default_backend()
+
+
+def default_backend():
+    return check_backend(os.environ.get("SCP_PDF_BACKEND") or DEFAULT_BACKEND)
+
+
+def backend_modules():
+    """Modules the run's default and per-file backends import."""
+    names = {default_backend()} | {name for _, name in backend_overrides()}
+    return tuple(sorted({BACKENDS[name][1] for name in names}))
+
+
+def extract_pages(pdf_path, backend=None):
+    """Return the text of each page of a PDF file."""
+    return BACKENDS[backend_for(pdf_path, backend)][0](pdf_path)
+
+
+def extract_pdf_text(pdf_path, backend=None):
+    """Extract text from PDF file."""
+    return "\n".join(extract_pages(pdf_path, backend))
+
+
+def file_digest(path):
+    return hashlib.sha256(Path(path).read_bytes()).hexdigest()
+
+
+def cache_path(pdf_path, backend=None):
+    return TEXT_CACHE_DIR / backend_for(pdf_path, backend) / f"{file_digest(pdf_path)}.txt"
+
+
+def read_cached(pdf_path, backend=None):
+    """Return cached text for ``pdf_path`` or None."""
+    path = cache_path(pdf_path, backend)
+    return path.read_text(encoding="utf-8") if path.exists() else None
+
+
+def cached_extract(pdf_path, backend=None):
+    """Return (pdf_path, text or None, error). Safe to run in a worker process."""
+    try:
+        backend = backend_for(pdf_path, backend)
+        path = cache_path(pdf_path, backend)
+        if path.exists():
+            return pdf_path, path.read_text(encoding="utf-8"), None
+        text = extract_pdf_text(pdf_path, backend)
+    except Exception as e:
+        return pdf_path, None, str(e)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+    return pdf_path, text, None
+
+
+def extract_all(pdf_paths, jobs=None, backend=None):
+    """
+    Extract every PDF, reading the cache first and only starting a
+    process pool for PDFs that still need extracting. ``backend``
+    overrides the per-file and default backends for the whole run.
+
+    Returns a list of (pdf_path, text or None, error).
+    """
+    results = []
+    todo = []
+    for pdf_path in pdf_paths:
+        name = backend_for(pdf_path, backend)
+        text = read_cached(pdf_path, name)
+        if text is None:
+            todo.append((pdf_path, name))
+        else:
+            results.append((pdf_path, text, None))
+
+    if todo:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            results.extend(pool.map(cached_extract, *zip(*todo), chunksize=4))
+    return results
+
+
+def main(argv=None):
+    import argparse
+
+    from .paths import PDF_DIR
+
+    parser = argparse.ArgumentParser(prog="scp extract", description="Extract and cache text for case PDFs.")
+    parser.add_argument("paths", nargs="*", default=[str(PDF_DIR)], help="PDF files or directories")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes")
+    parser.add_argument("--backend", choices=list(BACKENDS),
+                        help="Extract every PDF with this backend (default: content/pdf-backends.json, "
+                             "then SCP_PDF_BACKEND, then pypdf2)")
+    args = parser.parse_args(argv)
+
+    pdfs = []
+    for path in map(Path, args.paths):
+        pdfs.extend(sorted(path.rglob("*.pdf")) if path.is_dir() else [path])
+
+    results = extract_all([str(p) for p in pdfs], jobs=args.jobs, backend=args.backend)
+    failed = [(p, e) for p, text, e in results if text is None]
+    for pdf_path, error in failed:
+        print(f"✗ {rel(pdf_path)}: {error}")
+    print(f"Extracted: {len(results) - len(failed)} PDFs ({len(failed)} failed)")
+    return 1 if failed else 0
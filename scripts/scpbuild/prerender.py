@@ -0,0 +1,207 @@
+"""
+Prerender the exam pages from their question data.
+
+content/exams/<exam>.json holds each exam's questions. The first
+question and the question navigation are rendered into the page as
+static markup, so an exam paints from the HTML alone; every question is
+also stored, compactly, in an inert <template>. js/exam-prerender.js rebuilds
+``examData`` from that template for the page's own script, which then
+only adds interactivity: answer selection, flags, progress sync, scoring
+and review. No question data is shipped as JavaScript.
+
+Usage:
+    scp prerender                 # regenerate every exam page
+    scp prerender saq-2023 --check
+"""
+
+import html
+import json
+import posixpath
+
+from .paths import BASE_DIR
+
+EXAMS_DIR = BASE_DIR / "content" / "exams"
+HYDRATE_SCRIPT = "js/exam-prerender.js"
+
+# exam -> question layout; the markup mirrors each page's loadQuestion()
+EXAMS = {
+    "mcq-2023": "mcq-image",
+    "mcq-2024": "mcq",
+    "mcq-all-2022-2024": "mcq",
+    "saq-2022": "saq",
+    "saq-2023": "saq",
+    "saq-2024": "saq",
+}
+
+# Directories holding copies of the exam pages
+EXAM_DIRS = ["exams", "year3/exams", "year4/exams"]
+
+NAV_OPEN = '<div class="question-nav-list" id="questionNavList">'
+CONTAINER_OPEN = '<div class="question-container" id="questionContainer">'
+REGION_START = "<!-- Prerendered by `scp prerender` from content/exams/ - edit the JSON, not this block -->"
+REGION_END = "<!-- End prerendered block -->"
+
+
+# === Question data ===
+
+def exam_pages(exam):
+    """Repo-relative paths of every copy of ``exam``'s page."""
+    return [f"{directory}/{exam}.html" for directory in EXAM_DIRS
+            if (BASE_DIR / directory / f"{exam}.html").exists()]
+
+
+def load_exam(exam):
+    with open(EXAMS_DIR / f"{exam}.json", "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_exam(exam, data):
+    EXAMS_DIR.mkdir(parents=True, exist_ok=True)
+    with open(EXAMS_DIR / f"{exam}.json", "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2, ensure_ascii=False)
+        f.write("\n")
+
+
+# === Rendering ===
+
+def attr(value):
+    return html.escape(str(value), quote=True)
+
+
+def text(value):
+    return html.escape(value, quote=False)
+
+
+def render_question(question, index, layout, page):
+    """Markup for the first question as the page's loadQuestion() builds it."""
+    correct = question.get("correctAnswer")
+    parts = [f'<div class="question-content-wrapper" data-question-id="{question["id"]}"'
+             + (f' data-correct-answer="{correct}"' if correct is not None else "") + ">",
+             '<div class="question-header">',
+             f'<div class="question-number">Question {index + 1}</div>',
+             '<button class="flag-btn" id="flagBtn"><span id="flagBtnText">Flag Question</span></button>',
+             "</div>"]
+
+    if layout == "saq":
+        subs = "".join(f'<div class="sub-question">{text(sub)}</div>' for sub in question.get("subQuestions", []))
+        parts.append(f'<div class="question-text">{text(question["text"])}'
+                     + (f'<div class="sub-questions">{subs}</div>' if subs else "") + "</div>")
+        parts.append('<div class="answer-area"><textarea id="answerInput" class="answer-input" '
+                     'placeholder="Type your answer here..."></textarea></div>')
+    else:
+        if layout == "mcq-image":
+            parts.append(f'<div class="question-text"><div class="question-text-content">{text(question["text"])}</div>'
+                         f"{render_image(question, page)}</div>")
+        else:
+            parts.append(f'<div class="question-text">{text(question["text"])}</div>')
+        parts.append('<div class="mcq-options">')
+        for option_index, option in enumerate(question["options"]):
+            parts.append(f'<div class="mcq-option " data-option-index="{option_index}">'
+                         f'<span class="mcq-option-label">{chr(65 + option_index)}</span>'
+                         f"<span>{text(option)}</span>"
+                         '<span class="mcq-option-check">✓</span>'
+                         '<span class="your-answer-label">Your answer</span></div>')
+        parts.append("</div>")
+    parts.append("</div>")
+    return "".join(parts)
+
+
+def render_image(question, page):
+    if not question.get("imageUrl"):
+        return ""
+    src = posixpath.relpath(question["imageUrl"], posixpath.dirname(page))
+    return f'<img src="{attr(src)}" alt="Question image" class="question-image">'
+
+
+def render_stored(question, layout, page):
+    """
+    Compact copy of a question for the <template> store.
+
+    The <ol> holds the options (MCQ) or sub-questions (SAQ). Only
+    js/exam-prerender.js reads these, so they skip the display markup.
+    """
+    correct = question.get("correctAnswer")
+    items = question.get("subQuestions", []) if layout == "saq" else question["options"]
+    return (f'<article data-id="{question["id"]}"' + (f' data-correct="{correct}"' if correct is not None else "") + ">"
+            + f"<p>{text(question['text'])}</p>"
+            + (render_image(question, page) if layout == "mcq-image" else "")
+            + (f"<ol>{''.join(f'<li>{text(item)}</li>' for item in items)}</ol>" if items else "")
+            + "</article>")
+
+
+def render_nav(data, layout):
+    buttons = []
+    for index in range(len(data["questions"])):
+        label = f"<span>{index + 1}</span>" if layout == "saq" else str(index + 1)
+        active = " active" if index == 0 else ""
+        buttons.append(f'<button class="question-nav-btn{active}">{label}<span class="flag-indicator">🚩</span></button>')
+    return "".join(buttons)
+
+
+def render_questions(data, layout, page, exam):
+    questions = data["questions"]
+    first = render_question(questions[0], 0, layout, page) if questions else ""
+    stored = "".join(render_stored(question, layout, page) for question in questions)
+    kind = "saq" if layout == "saq" else "mcq"
+    return (first + f'<template id="examQuestions" data-exam="{attr(exam)}" data-kind="{kind}" '
+            f'data-title="{attr(data["title"])}">{stored}</template>')
+
+
+def replace_region(page_html, open_tag, body):
+    """Replace the contents of the element opened by ``open_tag`` with a generated region."""
+    tag_at = page_html.index(open_tag)
+    start = tag_at + len(open_tag)
+    indent = page_html[page_html.rindex("\n", 0, tag_at) + 1:tag_at]
+    region_end = page_html.find(REGION_END, start)
+    if page_html[start:].lstrip().startswith(REGION_START) and region_end != -1:
+        end = page_html.index("</div>", region_end)
+    else:
+        end = page_html.index("</div>", start)
+    region = f"\n{indent}  {REGION_START}\n{indent}  {body}\n{indent}  {REGION_END}\n{indent}"
+    return page_html[:start] + region + page_html[end:]
+
+
+def render_page(page_html, exam, data, layout, page):
+    """Return ``page_html`` with its questions and navigation prerendered."""
+    page_html = replace_region(page_html, NAV_OPEN, render_nav(data, layout))
+    page_html = replace_region(page_html, CONTAINER_OPEN, render_questions(data, layout, page, exam))
+
+    hydrate_src = posixpath.relpath(HYDRATE_SCRIPT, posixpath.dirname(page))
+    hydrate_tag = f'<script src="{hydrate_src}"></script>'
+    if hydrate_tag not in page_html:
+        script_at = page_html.index("<script>", page_html.index(CONTAINER_OPEN))
+        page_html = page_html[:script_at] + f"{hydrate_tag}\n  " + page_html[script_at:]
+    return page_html
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="scp prerender", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("exams", nargs="*", metavar="EXAM", help="Exams to prerender (default: all)")
+    parser.add_argument("--check", action="store_true", help="Report stale pages without writing")
+    args = parser.parse_args(argv)
+
+    unknown = [exam for exam in args.exams if exam not in EXAMS]
+    if unknown:
+        parser.error(f"unknown exam(s): {', '.join(unknown)} (choose from {', '.join(EXAMS)})")
+    exams = args.exams or list(EXAMS)
+
+    stale = 0
+    for exam in exams:
+        layout = EXAMS[exam]
+        data = load_exam(exam)
+        for page in exam_pages(exam):
+            path = BASE_DIR / page
+            current = path.read_text(encoding="utf-8")
+            updated = render_page(current, exam, data, layout, page)
+            if updated == current:
+                print(f"✓ {page} up to date ({len(data['questions'])} questions)")
+                continue
+            stale += 1
+            if args.check:
+                print(f"✗ {page} is out of date")
+            else:
+                path.write_text(updated, encoding="utf-8")
+                print(f"✓ Wrote {page} ({len(data['questions'])} questions)")
+    return 1 if args.check and stale else 0
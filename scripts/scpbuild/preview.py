@@ -0,0 +1,382 @@
+"""
+Local preview server that behaves like Firebase Hosting.
+
+Reads firebase.json and applies its ``public`` directory, ``ignore``
+list, ``redirects``, ``rewrites`` and ``headers`` (plus Hosting's default
+``Cache-Control: max-age=3600``), so cache headers, rewrites and Link
+hints can be checked locally. On top of plain file serving it:
+
+  - serves ``file.br`` / ``file.gz`` siblings when the client accepts them
+  - answers single-range requests (206/416) and If-Range
+  - sends strong ETags and answers If-None-Match with 304
+  - streams bodies with ``sendfile`` where the platform supports it
+
+The core is a single asyncio event loop with HTTP/1.1 keep-alive, which
+holds hundreds of concurrent connections; ``--load-test`` measures that.
+
+Usage:
+    scp preview                       # http://127.0.0.1:8080
+    scp preview --port 5000 --public .    # serve the working tree, not dist/
+    scp preview --load-test --clients 300 --requests 20
+"""
+
+import asyncio
+import mimetypes
+import os
+import posixpath
+import re
+import sys
+import time
+from email.utils import formatdate
+from urllib.parse import unquote, urlsplit
+
+from .hosting import HostingConfig, fill_captures
+from .paths import BASE_DIR
+
+# Firebase Hosting's Cache-Control when firebase.json sets none
+DEFAULT_CACHE_CONTROL = "max-age=3600"
+
+# Preferred precompressed sibling first
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+
+MAX_HEADER_BYTES = 64 * 1024
+KEEPALIVE_TIMEOUT = 15
+
+REASONS = {
+    200: "OK", 206: "Partial Content", 301: "Moved Permanently", 302: "Found", 304: "Not Modified",
+    400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed", 416: "Range Not Satisfiable",
+}
+
+RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+mimetypes.add_type("text/javascript", ".js")
+mimetypes.add_type("text/javascript", ".mjs")
+mimetypes.add_type("image/webp", ".webp")
+mimetypes.add_type("application/manifest+json", ".webmanifest")
+
+
+def etag_for(stat, encoding=None):
+    tag = f"{stat.st_size:x}-{stat.st_mtime_ns:x}"
+    return f'"{tag}-{encoding}"' if encoding else f'"{tag}"'
+
+
+def parse_range(value, size):
+    """Return (start, end) inclusive for a single ``bytes=`` range, None to ignore, or "invalid"."""
+    match = RANGE_RE.match(value.replace(" ", ""))
+    if not match:
+        return None  # multi-range or other units: serve the whole file
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        length = int(last)
+        if length == 0:
+            return "invalid"
+        return max(size - length, 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or end < start:
+        return "invalid"
+    return start, end
+
+
+class PreviewServer:
+    def __init__(self, config, log=True):
+        self.config = config
+        self.log = log
+        self.requests = 0
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEPALIVE_TIMEOUT)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self.send_simple(writer, "GET", 400, {}, keep_alive=False)
+                    return
+                keep_alive = await self.respond(head.decode("latin-1"), writer)
+                if not keep_alive:
+                    return
+        except ConnectionError:
+            pass
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def respond(self, head, writer):
+        lines = head.split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ")
+        except ValueError:
+            await self.send_simple(writer, "GET", 400, {}, keep_alive=False)
+            return False
+        request = {}
+        for line in lines[1:]:
+            if ":" in line:
+                key, value = line.split(":", 1)
+                request[key.strip().lower()] = value.strip()
+
+        connection = request.get("connection", "").lower()
+        keep_alive = connection != "close" if version == "HTTP/1.1" else connection == "keep-alive"
+        self.requests += 1
+
+        if method not in ("GET", "HEAD"):
+            await self.send_simple(writer, method, 405, {"Allow": "GET, HEAD"}, keep_alive)
+            return keep_alive
+
+        path = unquote(urlsplit(target).path)
+        normal = posixpath.normpath("/" + path)
+        rel_path = normal.lstrip("/") + ("/" if path.endswith("/") and normal != "/" else "")
+        if normal == "/":
+            rel_path = ""
+
+        status = await self.serve(method, rel_path, request, writer, keep_alive)
+        if self.log:
+            print(f"{method} {target} {status}", file=sys.stderr)
+        return keep_alive
+
+    async def serve(self, method, rel_path, request, writer, keep_alive):
+        config = self.config
+        for matches, rule in config.redirects:
+            match = matches(rel_path)
+            if match:
+                headers = {"Location": fill_captures(rule["destination"], match)}
+                status = int(rule.get("type", 301))
+                await self.send_simple(writer, method, status, headers, keep_alive)
+                return status
+
+        file_path = config.file_for(rel_path)
+        if file_path is None:
+            for matches, rule in config.rewrites:
+                if matches(rel_path) and "destination" in rule:
+                    file_path = config.file_for(rule["destination"].lstrip("/"))
+                    break
+        if file_path is None:
+            not_found = config.file_for("404.html")
+            if not_found:
+                return await self.send_file(method, "404.html", not_found, request, writer, keep_alive, status=404)
+            await self.send_simple(writer, method, 404, {}, keep_alive)
+            return 404
+        return await self.send_file(method, rel_path, file_path, request, writer, keep_alive)
+
+    async def send_file(self, method, rel_path, file_path, request, writer, keep_alive, status=200):
+        content_type = mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+        if content_type.startswith("text/") or content_type.endswith(("json", "javascript")):
+            content_type += "; charset=utf-8"
+
+        headers = {"Cache-Control": DEFAULT_CACHE_CONTROL}
+        headers.update(self.config.headers_for(rel_path))
+        headers["Content-Type"] = content_type
+
+        # Precompressed sibling, if the client accepts it
+        accepted = request.get("accept-encoding", "")
+        encoding = None
+        serve_path = file_path
+        has_sibling = False
+        for name, suffix in ENCODINGS:
+            if os.path.isfile(file_path + suffix):
+                has_sibling = True
+                if encoding is None and re.search(rf"\b{name}\b(?!;q=0(?:\.0*)?\b)", accepted):
+                    encoding, serve_path = name, file_path + suffix
+        if has_sibling:
+            headers["Vary"] = "Accept-Encoding"
+        if encoding:
+            headers["Content-Encoding"] = encoding
+
+        stat = os.stat(serve_path)
+        etag = etag_for(stat, encoding)
+        headers["ETag"] = etag
+        headers["Last-Modified"] = formatdate(stat.st_mtime, usegmt=True)
+        headers["Accept-Ranges"] = "bytes"
+
+        if status == 200 and etag in {tag.strip() for tag in request.get("if-none-match", "").split(",")}:
+            await self.send_simple(writer, method, 304, headers, keep_alive, body=False)
+            return 304
+
+        start, end = 0, stat.st_size - 1
+        if status == 200 and "range" in request and request.get("if-range", etag) == etag:
+            byte_range = parse_range(request["range"], stat.st_size)
+            if byte_range == "invalid":
+                headers["Content-Range"] = f"bytes */{stat.st_size}"
+                await self.send_simple(writer, method, 416, headers, keep_alive)
+                return 416
+            if byte_range:
+                start, end = byte_range
+                status = 206
+                headers["Content-Range"] = f"bytes {start}-{end}/{stat.st_size}"
+
+        length = end - start + 1 if stat.st_size else 0
+        headers["Content-Length"] = str(length)
+        self.write_head(writer, status, headers, keep_alive)
+        if method == "HEAD" or not length:
+            await writer.drain()
+            return status
+
+        await writer.drain()
+        with open(serve_path, "rb") as f:
+            try:
+                await asyncio.get_running_loop().sendfile(writer.transport, f, start, length)
+            except (NotImplementedError, RuntimeError):
+                f.seek(start)
+                remaining = length
+                while remaining:
+                    chunk = f.read(min(remaining, 256 * 1024))
+                    writer.write(chunk)
+                    remaining -= len(chunk)
+                    await writer.drain()
+        return status
+
+    def write_head(self, writer, status, headers, keep_alive):
+        headers = dict(headers)
+        headers["Date"] = formatdate(usegmt=True)
+        headers["Connection"] = "keep-alive" if keep_alive else "close"
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, '')}"]
+        lines += [f"{key}: {value}" for key, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def send_simple(self, writer, method, status, headers, keep_alive, body=True):
+        headers = dict(headers)
+        payload = f"{status} {REASONS.get(status, '')}\n".encode() if body and status not in (304,) else b""
+        if status != 304:
+            headers["Content-Type"] = "text/plain; charset=utf-8"
+            headers["Content-Length"] = str(len(payload))
+        self.write_head(writer, status, headers, keep_alive)
+        if method != "HEAD":
+            writer.write(payload)
+        await writer.drain()
+
+
+async def start_server(config, host, port, log=True):
+    server = PreviewServer(config, log=log)
+    return server, await asyncio.start_server(server.handle, host, port, limit=MAX_HEADER_BYTES, backlog=1024)
+
+
+# === Load test ===
+
+async def fetch(reader, writer, path, host):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: {host}\r\nAccept-Encoding: br, gzip\r\n\r\n".encode())
+    head = await reader.readuntil(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    length = 0
+    for line in head.split(b"\r\n"):
+        if line.lower().startswith(b"content-length:"):
+            length = int(line.split(b":", 1)[1])
+    await reader.readexactly(length)
+    return status
+
+
+async def load_test(host, port, paths, clients, requests_per_client):
+    latencies = []
+    errors = 0
+
+    async def client(index):
+        nonlocal errors
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except OSError:
+            errors += requests_per_client
+            return
+        try:
+            for i in range(requests_per_client):
+                path = paths[(index + i) % len(paths)]
+                started = time.perf_counter()
+                status = await fetch(reader, writer, path, host)
+                latencies.append(time.perf_counter() - started)
+                if status >= 400:
+                    errors += 1
+        except (OSError, asyncio.IncompleteReadError):
+            errors += 1
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(client(i) for i in range(clients)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def run_load_test(config, paths, clients, requests_per_client):
+    """Start a server in a background thread and hammer it from this one."""
+    import threading
+
+    ready = threading.Event()
+    state = {}
+
+    def serve():
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        state["loop"] = loop
+        preview, server = loop.run_until_complete(start_server(config, "127.0.0.1", 0, log=False))
+        state["port"] = server.sockets[0].getsockname()[1]
+        ready.set()
+        loop.run_forever()
+
+        # Let handlers see their clients hang up before the loop goes away
+        server.close()
+        deadline = time.monotonic() + 2
+        while preview.connections and time.monotonic() < deadline:
+            loop.run_until_complete(asyncio.sleep(0.01))
+        tasks = asyncio.all_tasks(loop)
+        for task in tasks:
+            task.cancel()
+        loop.run_until_complete(asyncio.gather(*tasks, return_exceptions=True))
+        loop.close()
+
+    thread = threading.Thread(target=serve, daemon=True)
+    thread.start()
+    ready.wait()
+    try:
+        return asyncio.run(load_test("127.0.0.1", state["port"], paths, clients, requests_per_client))
+    finally:
+        state["loop"].call_soon_threadsafe(state["loop"].stop)
+        thread.join()
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="scp preview", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--host", default="127.0.0.1", help="Interface to bind")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on")
+    parser.add_argument("--config", default=str(BASE_DIR / "firebase.json"), help="firebase.json to apply")
+    parser.add_argument("--public", help="Directory to serve instead of hosting.public")
+    parser.add_argument("--quiet", action="store_true", help="Don't log requests")
+    parser.add_argument("--load-test", action="store_true", help="Benchmark an in-process server and exit")
+    parser.add_argument("--clients", type=int, default=200, help="Concurrent connections for --load-test")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per connection for --load-test")
+    parser.add_argument("--paths", nargs="+",
+                        default=["/year3/index.html", "/year3/cases/case1_1.html", "/css/case.css", "/js/auth.js"],
+                        help="Paths requested round-robin by --load-test")
+    args = parser.parse_args(argv)
+
+    config = HostingConfig(args.config, args.public)
+    if not os.path.isdir(config.public):
+        print(f"✗ {config.public} does not exist; run `scp dist` first or pass --public .", file=sys.stderr)
+        return 2
+
+    if args.load_test:
+        latencies, errors, elapsed = run_load_test(config, args.paths, args.clients, args.requests)
+        latencies.sort()
+        if not latencies:
+            print(f"✗ No successful requests ({errors} errors)")
+            return 1
+        p50 = latencies[len(latencies) // 2] * 1000
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] * 1000
+        print(f"{args.clients} clients x {args.requests} requests: {len(latencies)} responses in {elapsed:.2f}s "
+              f"({len(latencies) / elapsed:,.0f} req/s), p50 {p50:.1f} ms, p99 {p99:.1f} ms, {errors} errors")
+        return 1 if errors else 0
+
+    async def serve_forever():
+        _, server = await start_server(config, args.host, args.port, log=not args.quiet)
+        print(f"Serving {config.public} on http://{args.host}:{args.port} (Ctrl+C to stop)")
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(serve_forever())
+    except KeyboardInterrupt:
+        pass
+    return 0
@@ -0,0 +1,310 @@
+"""
+Render first-page previews and page thumbnails for the source PDFs.
+
+Each PDF is rasterised locally with pypdfium2 into a low-resolution
+WebP of its first page plus one small thumbnail per page, so pages can
+show what a PDF contains and load the full file only when a student
+asks for it. js/pdf-preview.js shows them on the case page each PDF
+belongs to, on the year index's case cards and next to any link to a
+PDF. ``scp dist`` publishes the previews (and the PDF, fetched only on
+demand) of every PDF a page links to or whose case page is published.
+
+Output is content-addressed: previews/<sha256[:16]>/ holds a PDF's
+images and is reused for as long as the PDF's bytes (and the render
+settings) stay the same, so renaming or moving a PDF costs nothing and
+only new or edited PDFs are rendered, in a process pool.
+previews/index.json maps each PDF to its hash, case id and case page,
+page count, size and image files.
+
+Requires the ``previews`` extra (pypdfium2 and Pillow).
+
+Usage:
+    scp previews                    # every PDF under pdfs/
+    scp previews pdfs/Medicine/Paediatrics --jobs 4
+    scp previews --thumb-width 120 --quality 50
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from pathlib import Path
+
+from .paths import BASE_DIR, CACHE_DIR, PDF_DIR, rel
+
+PREVIEWS_DIR = BASE_DIR / "previews"
+INDEX_NAME = "index.json"
+INDEX_VERSION = 2
+META_NAME = "meta.json"
+CLIENT_SCRIPT = "js/pdf-preview.js"
+
+DIGEST_CACHE_PATH = CACHE_DIR / "previews.json"
+DIGEST_CACHE_VERSION = 1
+
+PREVIEW_WIDTH = 480
+THUMB_WIDTH = 160
+QUALITY = 60
+
+
+# === Hashing ===
+
+def file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def load_digest_cache():
+    try:
+        with open(DIGEST_CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return cache.get("files", {}) if cache.get("version") == DIGEST_CACHE_VERSION else {}
+
+
+def save_digest_cache(files):
+    DIGEST_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(DIGEST_CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump({"version": DIGEST_CACHE_VERSION, "files": files}, f)
+
+
+def digest_all(pdf_paths):
+    """Return {repo-relative path: (sha256, size)}, hashing only PDFs whose size or mtime changed."""
+    cache = load_digest_cache()
+    records = {}
+    digests = {}
+    for path in pdf_paths:
+        key = rel(path)
+        stat = os.stat(path)
+        cached = cache.get(key)
+        if not (cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns):
+            cached = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "sha256": file_sha256(path)}
+        records[key] = cached
+        digests[key] = (cached["sha256"], stat.st_size)
+    if any(cache.get(key) != record for key, record in records.items()):
+        cache.update(records)
+        save_digest_cache(cache)
+    return digests
+
+
+# === Rendering ===
+
+def render_pdf(job):
+    """
+    Render one PDF into ``out_dir``; runs in worker processes.
+
+    Writes to a fresh sibling temporary directory first so an interrupted
+    run never leaves a half-rendered preview that later runs would reuse,
+    and two jobs rendering byte-identical PDFs never share one.
+    Returns (pdf path, meta dict or None, error).
+    """
+    pdf_path, out_dir, settings = job
+    import pypdfium2 as pdfium
+
+    out_dir = Path(out_dir)
+    out_dir.parent.mkdir(parents=True, exist_ok=True)
+    tmp_dir = Path(tempfile.mkdtemp(dir=out_dir.parent, prefix=out_dir.name + "."))
+
+    def save(page, width, name):
+        page_width, _ = page.get_size()
+        image = page.render(scale=width / page_width).to_pil()
+        image.save(tmp_dir / name, "WEBP", quality=settings["quality"], method=6)
+        return [name, image.width, image.height]
+
+    try:
+        pdf = pdfium.PdfDocument(pdf_path)
+        try:
+            thumbs = []
+            preview = None
+            for index in range(len(pdf)):
+                page = pdf[index]
+                try:
+                    if index == 0:
+                        preview = save(page, settings["preview_width"], "preview.webp")
+                    thumbs.append(save(page, settings["thumb_width"], f"p{index + 1}.webp"))
+                finally:
+                    page.close()
+        finally:
+            pdf.close()
+    except Exception as e:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        return pdf_path, None, str(e)
+
+    meta = {"settings": settings, "pages": len(thumbs), "preview": preview, "thumbs": thumbs}
+    with open(tmp_dir / META_NAME, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    shutil.rmtree(out_dir, ignore_errors=True)
+    try:
+        os.replace(tmp_dir, out_dir)
+    except OSError:
+        # Another job placed the same content first
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        if read_meta(out_dir, settings) != meta:
+            raise
+    return pdf_path, meta, None
+
+
+def read_meta(out_dir, settings):
+    """Return the meta of an existing render made with ``settings``, or None."""
+    try:
+        with open(out_dir / META_NAME, "r", encoding="utf-8") as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get("settings") == settings else None
+
+
+def build(pdf_paths, out_root=PREVIEWS_DIR, settings=None, jobs=None):
+    """
+    Render every PDF in ``pdf_paths`` that has no current preview and update the index.
+
+    Index entries for PDFs outside ``pdf_paths`` are kept while the PDF
+    exists; preview directories no entry refers to are removed. A PDF's
+    ``page`` is its case page in the manifest's PDF year, or None.
+    Returns (index dict, counts, list of (path, error)).
+    """
+    settings = settings or {"preview_width": PREVIEW_WIDTH, "thumb_width": THUMB_WIDTH, "quality": QUALITY}
+    digests = digest_all(pdf_paths)
+    index_dir = rel(out_root)
+
+    metas = {}
+    todo = {}
+    for pdf_path in pdf_paths:
+        sha256, _ = digests[rel(pdf_path)]
+        key = sha256[:16]
+        if key in metas or key in todo:
+            continue
+        meta = read_meta(out_root / key, settings)
+        if meta:
+            metas[key] = meta
+        else:
+            todo[key] = (str(pdf_path), str(out_root / key), settings)
+    counts = {"rendered": 0, "reused": len(metas), "pruned": 0}
+
+    failed = []
+    if todo:
+        from concurrent.futures import ProcessPoolExecutor
+
+        path_keys = {job[0]: key for key, job in todo.items()}
+        with ProcessPoolExecutor(max_workers=jobs) as pool:
+            for pdf_path, meta, error in pool.map(render_pdf, todo.values()):
+                if meta is None:
+                    failed.append((pdf_path, error))
+                else:
+                    metas[path_keys[pdf_path]] = meta
+                    counts["rendered"] += 1
+
+    from .manifest import PDF_YEAR, case_path, iter_cases, load_manifest
+    from .pdftext import case_id
+
+    manifest = load_manifest()
+    case_ids = {case["id"] for _, case in iter_cases(manifest, PDF_YEAR)}
+    previous = load_index(out_root) or {"pdfs": {}}
+    pdfs = {path: entry for path, entry in previous["pdfs"].items()
+            if (BASE_DIR / path).exists() and (BASE_DIR / entry["dir"]).is_dir()}
+    for pdf_path in pdf_paths:
+        sha256, size = digests[rel(pdf_path)]
+        meta = metas.get(sha256[:16])
+        if meta is None:
+            pdfs.pop(rel(pdf_path), None)
+            continue
+        case = case_id(pdf_path)
+        pdfs[rel(pdf_path)] = {
+            "sha256": sha256,
+            "case": case,
+            "page": case_path(manifest, PDF_YEAR, case) if case in case_ids else None,
+            "bytes": size,
+            "pages": meta["pages"],
+            "dir": f"{index_dir}/{sha256[:16]}",
+            "preview": meta["preview"],
+            "thumbs": meta["thumbs"],
+        }
+    index = {"version": INDEX_VERSION, "pdfs": dict(sorted(pdfs.items()))}
+    out_root.mkdir(parents=True, exist_ok=True)
+    with open(out_root / INDEX_NAME, "w", encoding="utf-8") as f:
+        json.dump(index, f, ensure_ascii=False, separators=(",", ":"))
+
+    referenced = {entry["dir"].rsplit("/", 1)[-1] for entry in pdfs.values()}
+    for entry in out_root.iterdir():
+        if entry.is_dir() and entry.name not in referenced:
+            shutil.rmtree(entry)
+            counts["pruned"] += 1
+    return index, counts, failed
+
+
+def load_index(out_root=PREVIEWS_DIR):
+    try:
+        with open(out_root / INDEX_NAME, "r", encoding="utf-8") as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return index if index.get("version") == INDEX_VERSION else None
+
+
+def published_files(paths, out_root=PREVIEWS_DIR):
+    """
+    Repo-relative files to publish for the PDFs among ``paths`` and the PDFs of the case pages among them.
+
+    Used by ``scp dist``: a PDF found through its case page is published
+    along with its previews, since js/pdf-preview.js links it there.
+    """
+    index = load_index(out_root)
+    if not index:
+        return set()
+    paths = set(paths)
+    files = set()
+    for pdf_path, entry in index["pdfs"].items():
+        if pdf_path in paths or entry["page"] in paths:
+            files.add(pdf_path)
+            if entry["preview"]:  # None for a PDF with no pages
+                files.add(f"{entry['dir']}/{entry['preview'][0]}")
+            files.update(f"{entry['dir']}/{thumb[0]}" for thumb in entry["thumbs"])
+    if files:
+        files.add(f"{rel(out_root)}/{INDEX_NAME}")
+    return files
+
+
+def main(argv=None):
+    import argparse
+
+    from .dedupe import format_size
+
+    parser = argparse.ArgumentParser(prog="scp previews", description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("paths", nargs="*", default=[str(PDF_DIR)], help="PDF files or directories")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes")
+    parser.add_argument("--preview-width", type=int, default=PREVIEW_WIDTH, help="First-page preview width (px)")
+    parser.add_argument("--thumb-width", type=int, default=THUMB_WIDTH, help="Page thumbnail width (px)")
+    parser.add_argument("--quality", type=int, default=QUALITY, help="WebP quality (0-100)")
+    args = parser.parse_args(argv)
+
+    try:
+        import pypdfium2  # noqa: F401
+        import PIL  # noqa: F401
+    except ImportError:
+        print("✗ scp previews needs pypdfium2 and Pillow: pip install -e '.[previews]'")
+        return 2
+
+    pdfs = []
+    for path in map(Path, args.paths):
+        pdfs.extend(sorted(path.rglob("*.pdf")) if path.is_dir() else [path])
+
+    started = time.perf_counter()
+    settings = {"preview_width": args.preview_width, "thumb_width": args.thumb_width, "quality": args.quality}
+    index, counts, failed = build(pdfs, settings=settings, jobs=args.jobs)
+    elapsed = time.perf_counter() - started
+
+    for pdf_path, error in failed:
+        print(f"✗ {rel(pdf_path)}: {error}")
+    entries = index["pdfs"].values()
+    image_bytes = sum((BASE_DIR / path).stat().st_size for path in published_files(index["pdfs"])
+                      if not path.endswith((INDEX_NAME, ".pdf")))
+    print(f"Previews: {len(index['pdfs'])} PDFs, {sum(entry['pages'] for entry in entries)} pages "
+          f"({format_size(image_bytes)} of WebP for {format_size(sum(entry['bytes'] for entry in entries))} of PDF)")
+    print(f"  {counts['rendered']} rendered, {counts['reused']} reused, {len(failed)} failed, "
+          f"{counts['pruned']} pruned in {elapsed:.2f}s")
+    return 1 if failed else 0
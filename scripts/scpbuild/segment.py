@@ -0,0 +1,373 @@
+"""
+Split case PDFs into structured case/question/answer records.
+
+Text is pulled out of each PDF together with its layout (position, font
+size and weight) and segmented with a few rules that match how the SCP
+PDFs are written:
+
+  - running headers/footers repeat at the same height on most pages and
+    are dropped
+  - the largest text on the first page is the title
+  - a line starting with a number ("1.", "2)", "Question 3") opens a
+    question; following bold lines continue it
+  - everything after a question up to the next one is its answer
+  - text before the first question is the case stem
+  - lines made of widely separated spans become table rows
+
+Records are written as JSON lines and can be rendered straight into the
+existing `.question`/`.answer` markup used by the case pages.
+
+Usage:
+    scp segment                       # all PDFs -> .cache/segments.jsonl
+    scp segment pdfs/Medicine/Paediatrics
+    scp segment --write-pages         # fill placeholder pages
+    scp segment --write-pages --force # repopulate every page
+"""
+
+import html
+import json
+import math
+import re
+import time
+from collections import Counter
+from pathlib import Path
+
+from .manifest import PDF_YEAR, year_cases_dir
+from .paths import BASE_DIR, CACHE_DIR, PDF_DIR, rel
+from .pdftext import PLACEHOLDER_RE, case_number
+
+DEFAULT_OUTPUT = CACHE_DIR / "segments.jsonl"
+
+QUESTION_RE = re.compile(r"^\s*(?:Q(?:uestion)?\s*)?(\d{1,2})\s*[.):]\s*(.*)$", re.IGNORECASE)
+ANSWER_LABEL_RE = re.compile(r"^\s*(?:model |suggested |sample )?answers?\s*:?\s*$", re.IGNORECASE)
+BULLET_RE = re.compile(r"^\s*[•▪●◦\-–o]\s+(.*)$")
+
+# Two spans on one line further apart than this many font sizes are table cells
+CELL_GAP = 2.5
+# Approximate glyph width as a fraction of font size, used to estimate span ends
+GLYPH_WIDTH = 0.5
+# A line on at least this share of pages, at the same height, is a header/footer
+RUNNING_SHARE = 0.5
+
+
+def extract_lines(pdf_path):
+    """
+    Return text lines with layout from a PDF.
+
+    Each line is a dict with page, x, y, size, bold, text and cells (the
+    text of each horizontally separated span group).
+    """
+    import PyPDF2
+
+    reader = PyPDF2.PdfReader(str(pdf_path))
+    lines = []
+    for page_no, page in enumerate(reader.pages):
+        spans = []
+
+        def visitor(text, cm, tm, font_dict, font_size, page_no=page_no):
+            for part in text.split("\n"):
+                if not part.strip():
+                    continue
+                x = tm[4] * cm[0] + tm[5] * cm[2] + cm[4]
+                y = tm[4] * cm[1] + tm[5] * cm[3] + cm[5]
+                size = font_size * math.hypot(tm[2], tm[3]) * math.hypot(cm[2], cm[3]) or font_size
+                base_font = str(font_dict.get("/BaseFont", "")) if font_dict else ""
+                bold = any(w in base_font.lower() for w in ("bold", "black", "heavy", "semibold"))
+                spans.append({"page": page_no, "x": x, "y": y, "size": round(size, 1),
+                              "bold": bold, "text": part})
+
+        page.extract_text(visitor_text=visitor)
+        lines.extend(group_lines(spans))
+    return lines
+
+
+def group_lines(spans):
+    """Merge spans sharing a baseline into lines, splitting distant spans into cells."""
+    lines = []
+    for span in sorted(spans, key=lambda s: (s["page"], -round(s["y"]), s["x"])):
+        line = lines[-1] if lines else None
+        if (line and line["page"] == span["page"]
+                and abs(line["y"] - span["y"]) < 0.5 * max(span["size"], 1)):
+            gap = span["x"] - line["_end"]
+            if gap > CELL_GAP * span["size"]:
+                line["cells"].append(span["text"].strip())
+            else:
+                line["cells"][-1] = (line["cells"][-1] + " " + span["text"].strip()).strip()
+            line["bold"] = line["bold"] and span["bold"]
+            line["size"] = max(line["size"], span["size"])
+            line["_end"] = span["x"] + len(span["text"]) * span["size"] * GLYPH_WIDTH
+        else:
+            lines.append({
+                "page": span["page"], "x": span["x"], "y": span["y"],
+                "size": span["size"], "bold": span["bold"],
+                "cells": [span["text"].strip()],
+                "_end": span["x"] + len(span["text"]) * span["size"] * GLYPH_WIDTH,
+            })
+    for line in lines:
+        del line["_end"]
+        line["text"] = " ".join(c for c in line["cells"] if c)
+    return lines
+
+
+def drop_running_lines(lines):
+    """Remove headers, footers and page numbers repeated across pages."""
+    pages = {line["page"] for line in lines}
+    if len(pages) < 2:
+        return lines
+    seen = Counter()
+    for line in lines:
+        key = (round(line["y"]), re.sub(r"\d+", "#", line["text"]))
+        seen[key] += 1
+    threshold = max(2, RUNNING_SHARE * len(pages))
+    return [
+        line for line in lines
+        if seen[(round(line["y"]), re.sub(r"\d+", "#", line["text"]))] < threshold
+        and not re.fullmatch(r"(?:page\s*)?\d+(?:\s*(?:of|/)\s*\d+)?", line["text"].strip(), re.IGNORECASE)
+    ]
+
+
+def body_size(lines):
+    sizes = Counter()
+    for line in lines:
+        sizes[line["size"]] += len(line["text"])
+    return sizes.most_common(1)[0][0] if sizes else 0
+
+
+def to_blocks(lines):
+    """Turn a run of lines into paragraph, list and table blocks."""
+    blocks = []
+    for line in lines:
+        text = line["text"].strip()
+        if not text or ANSWER_LABEL_RE.match(text):
+            continue
+        last = blocks[-1] if blocks else None
+        bullet = BULLET_RE.match(text)
+        if len(line["cells"]) > 1:
+            if last and last["type"] == "table":
+                last["rows"].append(line["cells"])
+            else:
+                blocks.append({"type": "table", "rows": [line["cells"]]})
+        elif bullet:
+            if last and last["type"] == "list":
+                last["items"].append(bullet.group(1).strip())
+            else:
+                blocks.append({"type": "list", "items": [bullet.group(1).strip()]})
+        elif last and last["type"] == "list" and not line["bold"] and text[:1].islower():
+            # Wrapped continuation of the previous bullet
+            last["items"][-1] += " " + text
+        elif last and last["type"] == "paragraph" and not text[:1].isupper():
+            last["text"] += " " + text
+        elif last and last["type"] == "paragraph" and not last["text"].rstrip().endswith((".", ":", "?", "!")):
+            last["text"] += " " + text
+        else:
+            blocks.append({"type": "paragraph", "text": text})
+    return blocks
+
+
+def segment_lines(lines):
+    """Split layout lines into title, stem and numbered questions with answers."""
+    lines = drop_running_lines(lines)
+    if not lines:
+        return {"title": "", "stem": [], "questions": []}
+
+    base = body_size(lines)
+    first_page = [line for line in lines if line["page"] == lines[0]["page"]]
+    title_size = max(line["size"] for line in first_page)
+    title = ""
+    if title_size > base * 1.15:
+        title = " ".join(line["text"] for line in first_page if line["size"] == title_size).strip()
+        lines = [line for line in lines if not (line["page"] == lines[0]["page"] and line["size"] == title_size)]
+
+    stem_lines = []
+    questions = []
+    current = None
+    in_question_text = False
+    expected = 1
+
+    for line in lines:
+        match = QUESTION_RE.match(line["text"])
+        if match and len(line["cells"]) == 1 and int(match.group(1)) == expected:
+            current = {"number": expected, "text": match.group(2).strip(), "_answer": []}
+            questions.append(current)
+            expected += 1
+            in_question_text = line["bold"] or not match.group(2).strip().endswith("?")
+            continue
+        if current is None:
+            stem_lines.append(line)
+        elif in_question_text and line["bold"] and len(line["cells"]) == 1 and not ANSWER_LABEL_RE.match(line["text"]):
+            current["text"] = (current["text"] + " " + line["text"]).strip()
+        else:
+            in_question_text = False
+            current["_answer"].append(line)
+
+    for question in questions:
+        question["answer"] = to_blocks(question.pop("_answer"))
+
+    return {"title": title, "stem": to_blocks(stem_lines), "questions": questions}
+
+
+def segment_pdf(pdf_path):
+    """Segment one PDF into a record. Runs in a worker process."""
+    start = time.perf_counter()
+    record = {
+        "case": case_number(pdf_path),
+        "source": rel(pdf_path),
+    }
+    try:
+        lines = extract_lines(pdf_path)
+        record.update(segment_lines(lines))
+        record["pages"] = len({line["page"] for line in lines})
+        record["error"] = None
+    except Exception as e:
+        record.update({"title": "", "stem": [], "questions": [], "pages": 0, "error": str(e)})
+    record["seconds"] = round(time.perf_counter() - start, 4)
+    return record
+
+
+def render_blocks(blocks, indent="        "):
+    """Render blocks as the HTML used inside case pages."""
+    out = []
+    for block in blocks:
+        if block["type"] == "paragraph":
+            out.append(f"{indent}<p>{html.escape(block['text'], quote=False)}</p>")
+        elif block["type"] == "list":
+            out.append(f"{indent}<ul>")
+            for item in block["items"]:
+                out.append(f"{indent}  <li>{html.escape(item, quote=False)}</li>")
+            out.append(f"{indent}</ul>")
+        elif block["type"] == "table":
+            out.append(f"{indent}<table>")
+            header, *rows = block["rows"]
+            out.append(f"{indent}  <tr>" + "".join(f"<th>{html.escape(c, quote=False)}</th>" for c in header) + "</tr>")
+            for row in rows:
+                out.append(f"{indent}  <tr>" + "".join(f"<td>{html.escape(c, quote=False)}</td>" for c in row) + "</tr>")
+            out.append(f"{indent}</table>")
+    return "\n".join(out)
+
+
+def render_questions(record):
+    """Render a record's questions as `.question` blocks."""
+    parts = []
+    for question in record["questions"]:
+        answer = render_blocks(question["answer"]) or "        <p></p>"
+        parts.append(
+            '    <div class="question">\n'
+            f'      <strong>{question["number"]}. {html.escape(question["text"], quote=False)}</strong><br>\n'
+            '      <button class="toggle">Show Answer</button>\n'
+            '      <div class="answer">\n'
+            f'{answer}\n'
+            '      </div>\n'
+            '    </div>'
+        )
+    return "\n\n".join(parts)
+
+
+def render_case_body(record):
+    """Render the Case and Questions sections of a case page."""
+    stem = render_blocks(record["stem"], indent="    ") or "    <p></p>"
+    return (
+        "<h2>Case</h2>\n"
+        f"{stem}\n\n"
+        "    <h2>Questions</h2>\n\n"
+        f"{render_questions(record)}\n"
+    )
+
+
+def _find_div_end(text, start):
+    """Return the index just past the </div> closing the <div> at ``start``."""
+    depth = 0
+    for match in re.compile(r"<div\b|</div>").finditer(text, start):
+        depth += 1 if match.group(0) == "<div" else -1
+        if depth == 0:
+            return match.end()
+    return -1
+
+
+def write_page(record, cases_dir=None, force=False):
+    """
+    Replace the Case/Questions sections of an existing page with the
+    rendered record. ``cases_dir`` defaults to the published case pages
+    of the PDFs' year. Pages without placeholders are left alone unless
+    ``force`` is set. Returns a status string.
+    """
+    page = Path(cases_dir or year_cases_dir()) / f"case{record['case'].replace('.', '_')}.html"
+    if not page.exists():
+        return "missing"
+    if not record["questions"]:
+        return "no-questions"
+    content = page.read_text(encoding="utf-8")
+    if not force and not PLACEHOLDER_RE.search(content):
+        return "complete"
+
+    start = content.find("<h2>Case</h2>")
+    last_question = content.rfind('<div class="question">')
+    end = _find_div_end(content, last_question) if last_question > start else -1
+    if start < 0 or end < 0:
+        return "unrecognised"
+
+    new_content = content[:start] + render_case_body(record).rstrip("\n") + content[end:]
+    if new_content == content:
+        return "unchanged"
+    page.write_text(new_content, encoding="utf-8")
+    return "written"
+
+
+def iter_pdfs(paths):
+    for path in paths:
+        path = Path(path)
+        if not path.is_absolute():
+            path = BASE_DIR / path
+        if path.is_dir():
+            yield from sorted(path.rglob("*.pdf"))
+        elif path.suffix.lower() == ".pdf":
+            yield path
+
+
+def main(argv=None):
+    import argparse
+    from concurrent.futures import ProcessPoolExecutor
+
+    parser = argparse.ArgumentParser(prog="scp segment", description="Segment case PDFs into case/question/answer records.")
+    parser.add_argument("paths", nargs="*", default=[str(PDF_DIR)], help="PDF files or directories")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="JSON lines output path")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes")
+    parser.add_argument("--write-pages", action="store_true",
+                        help="Render records into case pages that still have placeholders")
+    parser.add_argument("--force", action="store_true", help="With --write-pages, overwrite every page")
+    parser.add_argument("--cases-dir", help=f"Directory of case pages (default: the manifest's {PDF_YEAR} cases)")
+    args = parser.parse_args(argv)
+
+    pdfs = [p for p in iter_pdfs(args.paths) if case_number(p)]
+    print(f"Segmenting {len(pdfs)} PDFs...")
+    print("=" * 70)
+
+    started = time.perf_counter()
+    records = []
+    with ProcessPoolExecutor(max_workers=args.jobs) as pool:
+        for record in pool.map(segment_pdf, pdfs, chunksize=2):
+            records.append(record)
+            status = f"ERROR: {record['error']}" if record["error"] else \
+                f"{len(record['questions'])} questions, {record['pages']} pages"
+            print(f"{record['case']:>6}  {record['seconds']:7.3f}s  {status}")
+    elapsed = time.perf_counter() - started
+
+    output = Path(args.output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    if args.write_pages:
+        cases_dir = args.cases_dir or year_cases_dir()
+        statuses = Counter(write_page(r, cases_dir, force=args.force) for r in records if not r["error"])
+        print("=" * 70)
+        for status, count in sorted(statuses.items()):
+            print(f"Pages {status}: {count}")
+
+    failed = sum(1 for r in records if r["error"])
+    print("=" * 70)
+    print(f"Segmented: {len(records) - failed} PDFs ({failed} failed)")
+    print(f"Questions: {sum(len(r['questions']) for r in records)}")
+    print(f"Wall time: {elapsed:.2f}s (sum of per-document time {sum(r['seconds'] for r in records):.2f}s)")
+    print(f"Records written to {output}")
+    return 1 if failed else 0
@@ -0,0 +1,317 @@
+"""
+The site graph: which URLs each HTML page references.
+
+Pages are parsed once into a flat list of references (tag, URL, rel,
+whether it sits in <head>, line). Besides element attributes this
+includes navigation targets written in inline scripts and ``on*``
+handlers (``window.location.href = 'SCP2.html?filter=' + ...``) and the
+case links in an embedded ``#caseCatalogue``. First-party scripts are
+scanned for navigation targets too, which resolve against the page that
+loads them; stylesheets are scanned for ``url()`` and ``@import``.
+
+Parsed records are cached under .cache/sitegraph.json by size and mtime,
+so rebuilding the graph after an edit only reparses the changed files.
+"""
+
+import json
+import os
+import posixpath
+import re
+from html.parser import HTMLParser
+from urllib.parse import unquote, urlsplit
+
+from .hosting import glob_to_regex
+from .paths import BASE_DIR, CACHE_DIR
+
+CACHE_PATH = CACHE_DIR / "sitegraph.json"
+CACHE_VERSION = 3
+
+# tag -> attribute holding the URL it references
+URL_ATTRS = {
+    "a": "href",
+    "link": "href",
+    "script": "src",
+    "img": "src",
+    "iframe": "src",
+    "source": "src",
+    "embed": "src",
+    "object": "data",
+}
+
+# Navigation in script: location(.href) = '...', location.assign/replace('...'), window.open('...')
+NAV_RE = re.compile(
+    r"""(?:\blocation(?:\.href)?\s*=|\blocation\.(?:assign|replace)\s*\(|\bwindow\.open\s*\()\s*"""
+    r"""(["'`])((?:(?!\1)[^\\\n])*)\1"""
+)
+TEMPLATE_VAR_RE = re.compile(r"\$\{[^}]*\}")
+
+CSS_URL_RE = re.compile(r"""(?:url\(\s*(["']?)([^"')]+)\1\s*\)|@import\s+(["'])([^"']+)\3)""")
+
+
+class Ref:
+    """One URL referenced by a page."""
+
+    __slots__ = ("tag", "url", "rel", "in_head", "line", "attrs")
+
+    def __init__(self, tag, url, rel="", in_head=False, line=0, attrs=None):
+        self.tag = tag
+        self.url = url
+        self.rel = rel
+        self.in_head = in_head
+        self.line = line
+        self.attrs = attrs or {}
+
+    @property
+    def is_external(self):
+        return bool(urlsplit(self.url).scheme) or self.url.startswith("//")
+
+    @property
+    def origin(self):
+        parts = urlsplit(self.url)
+        return f"{parts.scheme or 'https'}://{parts.netloc}" if parts.netloc else None
+
+    def to_list(self):
+        return [self.tag, self.url, self.rel, self.in_head, self.line, self.attrs]
+
+    @classmethod
+    def from_list(cls, values):
+        return cls(*values)
+
+    def __repr__(self):
+        return f"Ref({self.tag!r}, {self.url!r}, rel={self.rel!r}, line={self.line})"
+
+
+def script_targets(text, first_line=1):
+    """
+    Yield (line, url, tag) for navigation targets in script ``text``.
+
+    Template literals whose ``${...}`` only appear in the query or
+    fragment keep their static path (tag "js"). A variable inside the path
+    becomes a ``*`` wildcard (tag "js-glob", ``exams/${year}.html`` ->
+    ``exams/*.html``) when the path has a static prefix; fully dynamic
+    paths are skipped.
+    """
+    for match in NAV_RE.finditer(text):
+        url = match.group(2)
+        tag = "js"
+        if TEMPLATE_VAR_RE.search(url):
+            path = re.split(r"[?#]", url, 1)[0]
+            if TEMPLATE_VAR_RE.search(path):
+                if path.startswith("${"):
+                    continue
+                url, tag = TEMPLATE_VAR_RE.sub("*", path), "js-glob"
+            else:
+                url = url[:TEMPLATE_VAR_RE.search(url).start()]
+        if url:
+            yield first_line + text.count("\n", 0, match.start()), url, tag
+
+
+def css_targets(text):
+    """Yield (line, url) for ``url()`` and ``@import`` targets in a stylesheet."""
+    for match in CSS_URL_RE.finditer(text):
+        url = (match.group(2) or match.group(4)).strip()
+        if not url.startswith("data:"):
+            yield 1 + text.count("\n", 0, match.start()), url
+
+
+class RefParser(HTMLParser):
+    """Collect URL references from a page in document order."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.refs = []
+        self._in_head = False
+        self._script = None
+
+    def handle_starttag(self, tag, attrs):
+        line = self.getpos()[0]
+        if tag == "head":
+            self._in_head = True
+            return
+        if tag == "body":
+            self._in_head = False
+        attrs = dict(attrs)
+
+        for name, value in attrs.items():
+            if name.startswith("on") and value:
+                for _, url, ref_tag in script_targets(value):
+                    self.refs.append(Ref(ref_tag, url, "", self._in_head, line))
+
+        if tag == "script" and not attrs.get("src"):
+            self._script = {"line": line, "id": attrs.get("id"), "type": attrs.get("type") or "", "parts": []}
+
+        attr = URL_ATTRS.get(tag)
+        url = (attrs.get(attr) or "").strip() if attr else ""
+        if url:
+            rel = (attrs.get("rel") or "").lower()
+            self.refs.append(Ref(tag, url, rel, self._in_head, line, attrs))
+
+    handle_startendtag = handle_starttag
+
+    def handle_data(self, data):
+        if self._script is not None:
+            self._script["parts"].append(data)
+
+    def handle_endtag(self, tag):
+        if tag == "head":
+            self._in_head = False
+        elif tag == "script" and self._script is not None:
+            script, self._script = self._script, None
+            text = "".join(script["parts"])
+            if script["id"] == "caseCatalogue":
+                self.refs.extend(catalogue_refs(text, script["line"]))
+            elif "json" not in script["type"]:
+                for line, url, ref_tag in script_targets(text, script["line"]):
+                    self.refs.append(Ref(ref_tag, url, "", self._in_head, line))
+
+
+def catalogue_refs(text, line):
+    """Case links held in a page's embedded case catalogue (see js/case-catalogue.js)."""
+    try:
+        catalogue = json.loads(text)
+    except ValueError:
+        return []
+    base = catalogue.get("base", "")
+    return [Ref("catalogue", f"{base}case{case[0]}.html", "", False, line) for case in catalogue.get("cases", [])]
+
+
+def parse_refs(html):
+    parser = RefParser()
+    parser.feed(html)
+    parser.close()
+    return parser.refs
+
+
+def page_refs(page, base_dir=BASE_DIR):
+    """References of a repo-relative ``page``."""
+    return parse_refs((base_dir / page).read_text(encoding="utf-8"))
+
+
+def resolve(page, url):
+    """
+    Resolve ``url`` as referenced from repo-relative ``page``.
+
+    Returns the repo-relative target path (query and fragment dropped),
+    or None for external, in-page and non-HTTP URLs, and for paths that
+    climb above the site root.
+    """
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc or not parts.path:
+        return None
+    path = unquote(parts.path)
+    if path.startswith("/"):
+        target = path.lstrip("/")
+    else:
+        target = posixpath.join(posixpath.dirname(page), path)
+    target = posixpath.normpath(target) if target else "."
+    if target.startswith(".."):
+        return None
+    if path.endswith("/"):
+        target = posixpath.join(target, "index.html") if target != "." else "index.html"
+    return target
+
+
+def climbs_above_root(page, url):
+    """True if a relative ``url`` on ``page`` resolves above the site root."""
+    parts = urlsplit(url)
+    if parts.scheme or parts.netloc or not parts.path or parts.path.startswith("/"):
+        return False
+    return posixpath.normpath(posixpath.join(posixpath.dirname(page), unquote(parts.path))).startswith("..")
+
+
+def links(path, graph):
+    """
+    Yield (ref, source) for everything ``path`` references.
+
+    For pages this includes the navigation targets of the first-party
+    scripts they load; all refs resolve against ``path`` itself.
+    """
+    for ref in graph.get(path, ()):
+        yield ref, f"{path}:{ref.line}"
+        if path.endswith(".html") and ref.tag == "script" and not ref.is_external:
+            script = resolve(path, ref.url)
+            for script_ref in graph.get(script, ()) if script else ():
+                yield script_ref, f"{path} (via {script}:{script_ref.line})"
+
+
+def expand_glob(pattern, files):
+    """Files matching a ``js-glob`` target resolved to a repo-relative pattern."""
+    regex = glob_to_regex(pattern)
+    return sorted(path for path in files if regex.match(path))
+
+
+# === Cached graph ===
+
+def parse_file(item):
+    """Parse one HTML or JS file; runs in worker processes."""
+    rel_path, abs_path = item
+    with open(abs_path, "r", encoding="utf-8", errors="replace") as f:
+        text = f.read()
+    if rel_path.endswith(".js"):
+        refs = [Ref(tag, url, "", False, line) for line, url, tag in script_targets(text)]
+    elif rel_path.endswith(".css"):
+        refs = [Ref("css", url, "", False, line) for line, url in css_targets(text)]
+    else:
+        refs = parse_refs(text)
+    return rel_path, [ref.to_list() for ref in refs]
+
+
+def load_cache():
+    try:
+        with open(CACHE_PATH, "r", encoding="utf-8") as f:
+            cache = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    if cache.get("version") != CACHE_VERSION:
+        return {}
+    return cache.get("files", {})
+
+
+def save_cache(files):
+    CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    with open(CACHE_PATH, "w", encoding="utf-8") as f:
+        json.dump({"version": CACHE_VERSION, "files": files}, f)
+
+
+def build_graph(paths, base_dir=BASE_DIR, jobs=None):
+    """
+    Parse ``paths`` (repo-relative .html/.js/.css files), reusing cached records.
+
+    Returns ({path: [Ref, ...]}, number of files reparsed).
+    """
+    cache = load_cache()
+    records = {}
+    todo = []
+    for rel_path in paths:
+        stat = os.stat(base_dir / rel_path)
+        cached = cache.get(rel_path)
+        if cached and cached["size"] == stat.st_size and cached["mtime_ns"] == stat.st_mtime_ns:
+            records[rel_path] = cached
+        else:
+            records[rel_path] = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns, "refs": None}
+            todo.append(rel_path)
+
+    if todo:
+        work = [(rel, str(base_dir / rel)) for rel in todo]
+        if len(todo) < 16:
+            results = map(parse_file, work)
+            pool = None
+        else:
+            from concurrent.futures import ProcessPoolExecutor
+
+            pool = ProcessPoolExecutor(max_workers=jobs)
+            results = pool.map(parse_file, work, chunksize=8)
+        try:
+            for rel_path, refs in results:
+                records[rel_path]["refs"] = refs
+        finally:
+            if pool:
+                pool.shutdown()
+
+    if todo:
+        # Keep records for files outside ``paths``: dist/ holds copies of the
+        # same files (same size and mtime), so both trees share one cache.
+        cache.update(records)
+        save_cache(cache)
+    graph = {rel_path: [Ref.from_list(ref) for ref in record["refs"]] for rel_path, record in records.items()}
+    return graph, len(todo)
@@ -0,0 +1,440 @@
+"""
+Migrate per-user completion and flag state into packed bitsets.
+
+Progress and flags have been written in two layouts, one document per
+completed case or flag:
+
+  users/{uid}/progress/{caseId}                    completion-tracker.js
+  users/{uid}/flags/{caseId}_q{n}                  flag-tracker.js
+  users/{uid}/caseFlags/{caseId}
+  users/{uid}/{year}/progress/cases/{caseId}       CompletionModule.js
+  users/{uid}/{year}/flags/questions/{caseId}_q{n} FlagModule.js
+  users/{uid}/{year}/flags/cases/{caseId}
+
+so a dashboard load reads a document per completed case and flag. This
+folds all of them into one ``state`` map on ``users/{uid}``:
+
+  state: {version: 2, completed: bytes, caseFlags: bytes,
+          questionFlags: bytes, migratedAt: timestamp}
+
+Each field is a bitset over the stable ids ``scp manifest --assign-ids``
+gives every case: case n is bit n, question q of case n is bit
+``n * QUESTION_STRIDE + q - 1``. Bits are LSB-first within each byte and
+trailing zero bytes are dropped. js/core/UserState.js reads and updates
+the same layout; CompletionModule and FlagModule use it for any user
+whose state is version 2 and the per-case documents otherwise.
+
+Exam flags are left where they are: the exam pages save each question's
+answer and flag together in ``users/{uid}/exams/{examId}``, already one
+document per exam, which the page reads to resume and ``scp items``
+reads for per-question flag rates.
+
+Migrated documents are deleted in the same batched writes that set the
+state. Bits are OR-ed into an existing version 2 state, so running the
+migration again is safe. Documents whose case is not in the manifest
+are kept and reported.
+
+Users come from Firestore (google-cloud-firestore; set
+FIRESTORE_EMULATOR_HOST to run against the emulator) or from a JSON-lines
+export stand-in with one ``{"path": ..., "data": {...}}`` object per line,
+bytes as ``{"__bytes__": base64}``. Writes against an export rewrite the
+file.
+
+The report compares, per user, document count and storage size (the
+Firestore size rules), the documents and bytes read by one year
+dashboard load, and the time to decode them into completion/flag maps
+(Python, as a stand-in for the client).
+
+Usage:
+    scp userstate migrate --export users.jsonl --dry-run
+    scp userstate migrate --firestore --project scp-cases
+"""
+
+import base64
+import json
+import os
+import re
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from .manifest import YEARS, case_numbers, load_manifest
+
+STATE_VERSION = 2
+# Case pages have at most 10 questions
+QUESTION_STRIDE = 16
+FIELDS = ("completed", "caseFlags", "questionFlags")
+
+# Firestore allows at most 500 writes per batch
+WRITE_BATCH = 500
+
+# Bare case ids predate year4
+DEFAULT_YEAR = "year3"
+
+LEGACY_PATH = re.compile(
+    r"^users/(?P<uid>[^/]+)/(?:"
+    r"(?P<legacy>progress|flags|caseFlags)"
+    r"|(?P<year>year\d+)/(?P<collection>progress/cases|flags/questions|flags/cases)"
+    r")/(?P<key>[^/]+)$"
+)
+COLLECTION_FIELDS = {
+    "progress": "completed",
+    "flags": "questionFlags",
+    "caseFlags": "caseFlags",
+    "progress/cases": "completed",
+    "flags/questions": "questionFlags",
+    "flags/cases": "caseFlags",
+}
+KEY = re.compile(r"^(?:(year\d+)_)?(\d+_\d+)(?:_q(\d+))?$")
+
+
+# === Bitsets ===
+
+def encode_bits(bits):
+    """Pack bit indices into bytes, LSB-first, without trailing zero bytes."""
+    packed = bytearray((max(bits) >> 3) + 1 if bits else 0)
+    for bit in bits:
+        packed[bit >> 3] |= 1 << (bit & 7)
+    return bytes(packed)
+
+
+def decode_bits(packed):
+    """Return the set of bit indices set in ``packed``."""
+    value = int.from_bytes(packed or b"", "little")
+    bits = set()
+    while value:
+        low = value & -value
+        bits.add(low.bit_length() - 1)
+        value ^= low
+    return bits
+
+
+def legacy_bit(path, numbers):
+    """
+    Return (field, bit) for a legacy progress or flag document, or None if
+    it is not one or its case has no stable id.
+    """
+    match = LEGACY_PATH.match(path)
+    if not match:
+        return None
+    key = KEY.match(match["key"])
+    if not key:
+        return None
+    key_year, case_id, question = key.groups()
+    field = COLLECTION_FIELDS[match["legacy"] or match["collection"]]
+    if (field == "questionFlags") != (question is not None):
+        return None
+    n = numbers.get(f"{key_year or match['year'] or DEFAULT_YEAR}_{case_id}")
+    if n is None:
+        return None
+    if question is None:
+        return field, n
+    question = int(question)
+    if not 1 <= question <= QUESTION_STRIDE:
+        return None
+    return field, n * QUESTION_STRIDE + question - 1
+
+
+def fold_user(uid, docs, numbers):
+    """
+    Fold one user's documents into a version 2 state.
+
+    Returns (state, migrated paths, unknown paths); ``state`` holds the bit
+    sets, OR-ed with any packed state already on the user document.
+    """
+    user = docs.get(f"users/{uid}") or {}
+    stored = user.get("state") or {}
+    packed = stored.get("version") == STATE_VERSION
+    state = {field: decode_bits(stored.get(field)) if packed else set() for field in FIELDS}
+    migrated, unknown = [], []
+    for path in docs:
+        if not LEGACY_PATH.match(path):
+            continue
+        found = legacy_bit(path, numbers)
+        if found:
+            state[found[0]].add(found[1])
+            migrated.append(path)
+        else:
+            unknown.append(path)
+    return state, migrated, unknown
+
+
+# === Sizes (https://firebase.google.com/docs/firestore/storage-size) ===
+
+def value_size(value):
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, (int, float, datetime)):
+        return 8
+    if isinstance(value, str):
+        return len(value.encode("utf-8")) + 1
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(key.encode("utf-8")) + 1 + value_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(value_size(item) for item in value)
+    # Server timestamp sentinels, references, geo points
+    return 16
+
+
+def doc_size(path, data):
+    """Storage size of a document: name + fields + 32 bytes of overhead."""
+    name = sum(len(segment.encode("utf-8")) + 1 for segment in path.split("/")) + 16
+    return name + value_size(data) + 32
+
+
+def dashboard_paths(uid, year, docs):
+    """Documents a year index page reads at sign-in with the per-case layout."""
+    prefixes = [f"users/{uid}/{year}/{collection}/" for collection in ("progress/cases", "flags/questions", "flags/cases")]
+    return [path for path in docs if any(path.startswith(prefix) and "/" not in path[len(prefix):] for prefix in prefixes)]
+
+
+def decode_per_case(wire):
+    """Client-side work of a per-case dashboard load: one document per id."""
+    maps = {}
+    for path, raw in wire:
+        maps[path.rsplit("/", 1)[1]] = json.loads(raw)
+    return maps
+
+
+def decode_packed(raw):
+    """Client-side work of a packed dashboard load: three bitsets from one document."""
+    state = json.loads(raw)["state"]
+    return {field: decode_bits(base64.b64decode(state[field]["__bytes__"])) for field in FIELDS if field in state}
+
+
+def time_decode(function, argument, repeat=20):
+    started = time.perf_counter()
+    for _ in range(repeat):
+        function(argument)
+    return (time.perf_counter() - started) / repeat
+
+
+# === Sources ===
+
+def to_export(value):
+    if isinstance(value, bytes):
+        return {"__bytes__": base64.b64encode(value).decode("ascii")}
+    if isinstance(value, datetime):
+        seconds = value.timestamp()
+        return {"_seconds": int(seconds // 1), "_nanoseconds": round(seconds % 1 * 1e9)}
+    if isinstance(value, dict):
+        return {key: to_export(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [to_export(item) for item in value]
+    return value
+
+
+def from_export(value):
+    if isinstance(value, dict):
+        if set(value) == {"__bytes__"}:
+            return base64.b64decode(value["__bytes__"])
+        if set(value) == {"_seconds", "_nanoseconds"}:
+            return datetime.fromtimestamp(value["_seconds"] + value["_nanoseconds"] / 1e9, timezone.utc)
+        return {key: from_export(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [from_export(item) for item in value]
+    return value
+
+
+class ExportSource:
+    """User documents from a JSON-lines export, standing in for Firestore."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.docs = {}
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    doc = json.loads(line)
+                    self.docs[doc["path"]] = from_export(doc["data"])
+        self.written = 0
+
+    def users(self):
+        """Yield (uid, {path: data}) for every user with a document or subcollection."""
+        by_user = {}
+        for path, data in self.docs.items():
+            parts = path.split("/")
+            if parts[0] == "users" and len(parts) >= 2:
+                by_user.setdefault(parts[1], {})[path] = data
+        yield from by_user.items()
+
+    def commit(self, writes):
+        for kind, path, data in writes:
+            if kind == "delete":
+                self.docs.pop(path, None)
+            else:
+                doc = self.docs.setdefault(path, {})
+                doc["state"] = {**doc.get("state", {}), **data["state"],
+                                "migratedAt": datetime.now(timezone.utc)}
+            self.written += 1
+
+    def close(self):
+        if not self.written:
+            return
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for path, data in self.docs.items():
+                f.write(json.dumps({"path": path, "data": to_export(data)}, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
+
+
+class FirestoreSource:
+    """User documents read from and written to Firestore (or its emulator)."""
+
+    def __init__(self, project=None):
+        try:
+            from google.cloud import firestore
+        except ImportError:
+            raise SystemExit("scp userstate --firestore needs google-cloud-firestore: pip install -e \".[firestore]\"")
+        self.firestore = firestore
+        self.client = firestore.Client(project=project)
+
+    def users(self):
+        # list_documents includes users with subcollections but no user document
+        for user_ref in self.client.collection("users").list_documents():
+            uid = user_ref.id
+            docs = {}
+            snapshot = user_ref.get()
+            if snapshot.exists:
+                docs[user_ref.path] = snapshot.to_dict()
+            collections = [f"users/{uid}/{name}" for name in ("progress", "flags", "caseFlags")]
+            for year in YEARS:
+                collections += [f"users/{uid}/{year}/progress/cases", f"users/{uid}/{year}/flags/questions",
+                                f"users/{uid}/{year}/flags/cases"]
+            for collection in collections:
+                for doc in self.client.collection(collection).stream():
+                    docs[doc.reference.path] = doc.to_dict()
+            yield uid, docs
+
+    def commit(self, writes):
+        batch = self.client.batch()
+        for kind, path, data in writes:
+            if kind == "delete":
+                batch.delete(self.client.document(path))
+            else:
+                data = {"state": {**data["state"], "migratedAt": self.firestore.SERVER_TIMESTAMP}}
+                batch.set(self.client.document(path), data, merge=True)
+        batch.commit()
+
+    def close(self):
+        self.client.close()
+
+
+# === Migration ===
+
+def migrate(source, numbers, years, batch_size=WRITE_BATCH, dry_run=False, log=print):
+    """
+    Pack every user's progress and flags; returns a stats dict with
+    before/after sizes, dashboard reads and decode times.
+    """
+    stats = {
+        "users": 0, "migrated_users": 0, "migrated_docs": 0, "unknown_docs": 0, "writes": 0, "batches": 0,
+        "before": {"docs": [], "bytes": []}, "after": {"docs": [], "bytes": []},
+        "loads": {"before_docs": [], "before_bytes": [], "after_bytes": [], "before_s": [], "after_s": []},
+    }
+    pending = []
+
+    def flush():
+        if not dry_run:
+            source.commit(pending)
+        stats["writes"] += len(pending)
+        stats["batches"] += 1
+        pending.clear()
+
+    for uid, docs in source.users():
+        stats["users"] += 1
+        state, migrated, unknown = fold_user(uid, docs, numbers)
+        stats["unknown_docs"] += len(unknown)
+        for path in unknown:
+            log(f"  kept {path} (no stable id)")
+        user_path = f"users/{uid}"
+        already_packed = ((docs.get(user_path) or {}).get("state") or {}).get("version") == STATE_VERSION
+        if already_packed and not migrated:
+            continue
+        stats["migrated_users"] += 1
+        stats["migrated_docs"] += len(migrated)
+
+        packed = {"version": STATE_VERSION, **{field: encode_bits(state[field]) for field in FIELDS}}
+        user_after = {**(docs.get(user_path) or {}), "state": {**packed, "migratedAt": datetime.now(timezone.utc)}}
+        state_docs = [path for path in docs if path == user_path or LEGACY_PATH.match(path)]
+        stats["before"]["docs"].append(len(state_docs))
+        stats["before"]["bytes"].append(sum(doc_size(path, docs[path]) for path in state_docs))
+        stats["after"]["docs"].append(1 + len(unknown))
+        stats["after"]["bytes"].append(doc_size(user_path, user_after) + sum(doc_size(p, docs[p]) for p in unknown))
+
+        after_wire = json.dumps(to_export(user_after))
+        for year in years:
+            paths = dashboard_paths(uid, year, docs)
+            # An empty query is still billed as one read
+            stats["loads"]["before_docs"].append(max(1, len(paths)))
+            stats["loads"]["before_bytes"].append(sum(doc_size(path, docs[path]) for path in paths))
+            stats["loads"]["after_bytes"].append(doc_size(user_path, user_after))
+            wire = [(path, json.dumps(to_export(docs[path]))) for path in paths]
+            stats["loads"]["before_s"].append(time_decode(decode_per_case, wire))
+            stats["loads"]["after_s"].append(time_decode(decode_packed, after_wire))
+
+        # The state is set before the documents it replaces are deleted
+        pending.append(("set", user_path, {"state": packed}))
+        if len(pending) >= batch_size:
+            flush()
+        for path in migrated:
+            pending.append(("delete", path, None))
+            if len(pending) >= batch_size:
+                flush()
+    if pending:
+        flush()
+    return stats
+
+
+def mean(values):
+    return sum(values) / len(values) if values else 0
+
+
+def report(stats, log=print):
+    before, after, loads = stats["before"], stats["after"], stats["loads"]
+    log(f"{'per user':<28} {'before':>10} {'after':>10}")
+    log(f"{'documents (mean)':<28} {mean(before['docs']):>10.1f} {mean(after['docs']):>10.1f}")
+    log(f"{'bytes (mean)':<28} {mean(before['bytes']):>10,.0f} {mean(after['bytes']):>10,.0f}")
+    log(f"{'bytes (max)':<28} {max(before['bytes'], default=0):>10,} {max(after['bytes'], default=0):>10,}")
+    log(f"{'per dashboard load':<28}")
+    log(f"{'documents read (mean)':<28} {mean(loads['before_docs']):>10.1f} {1:>10.1f}")
+    log(f"{'bytes read (mean)':<28} {mean(loads['before_bytes']):>10,.0f} {mean(loads['after_bytes']):>10,.0f}")
+    log(f"{'decode µs (mean)':<28} {mean(loads['before_s']) * 1e6:>10.1f} {mean(loads['after_s']) * 1e6:>10.1f}")
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="scp userstate", description=__doc__.split("\n\n")[0].strip())
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    migrate_parser = commands.add_parser("migrate", help="Pack progress and flag documents into user state bitsets")
+    source = migrate_parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--export", metavar="FILE", help="JSON-lines export stand-in")
+    source.add_argument("--firestore", action="store_true", help="Read from Firestore (or FIRESTORE_EMULATOR_HOST)")
+    migrate_parser.add_argument("--project", help="Firestore project id")
+    migrate_parser.add_argument("--batch-size", type=int, default=WRITE_BATCH, help="Writes per batched write")
+    migrate_parser.add_argument("--dry-run", action="store_true", help="Report without writing or deleting")
+
+    args = parser.parse_args(argv)
+
+    manifest = load_manifest()
+    numbers = case_numbers(manifest)
+    if not numbers:
+        raise SystemExit("No stable case ids in content/manifest.json: run `scp manifest --assign-ids` first")
+
+    source = FirestoreSource(args.project) if args.firestore else ExportSource(args.export)
+    print(f"Packing user state{' (dry run)' if args.dry_run else ''}")
+    started = time.perf_counter()
+    try:
+        stats = migrate(source, numbers, list(manifest["years"]), batch_size=args.batch_size, dry_run=args.dry_run)
+    finally:
+        source.close()
+    elapsed = time.perf_counter() - started
+    report(stats)
+    print(f"\n✓ {stats['users']} users read, {stats['migrated_users']} packed, {stats['migrated_docs']} documents "
+          f"folded, {stats['unknown_docs']} kept; {stats['writes']} writes in {stats['batches']} batches "
+          f"in {elapsed:.2f}s")
+    return 0
@@ -0,0 +1,169 @@
+"""
+Session compaction (scpbuild.archive) against a JSON-lines export.
+
+compact() deletes users' session documents once they are archived, so
+these check that every month is written and read back before anything
+is deleted, that paging visits each session once, and that re-runs
+change nothing.
+"""
+
+import json
+from datetime import datetime, timezone
+
+import pytest
+
+from scpbuild import archive
+from scpbuild.archive import ColumnFile, ExportSource, compact, query
+
+CUTOFF = datetime(2025, 4, 1, tzinfo=timezone.utc)
+
+
+def stamp(day, hour=0):
+    """A Firestore export timestamp for 2025 ``day`` of the year."""
+    moment = datetime(2025, 1, 1, hour, tzinfo=timezone.utc).timestamp() + (day - 1) * 86400
+    return {"_seconds": int(moment), "_nanoseconds": 0}
+
+
+def session(uid, sid, day, hour=0, **fields):
+    data = {"startTime": stamp(day, hour), "lastHeartbeat": stamp(day, hour), "duration": 600,
+            "isActive": False, "platform": "MacIntel", "userAgent": "Mozilla/5.0",
+            "pages": [{"path": "/year3/index.html", "title": "Year 3", "timestamp": stamp(day, hour)}]}
+    data.update(fields)
+    return (f"users/{uid}/sessions/{sid}", data)
+
+
+@pytest.fixture
+def export(tmp_path):
+    docs = [
+        ("users/u1", {"email": "a@example.com"}),
+        session("u1", "s1", 5),
+        session("u2", "s2", 20, duration=120),
+        session("u1", "s3", 40, referrer="newsletter"),
+        session("u2", "s4", 45),
+        # Several sessions starting at the same instant straddle page boundaries
+        *(session(f"u{n}", f"tie{n}", 70, 9) for n in range(5)),
+        # After the cutoff: stays in Firestore
+        session("u1", "s5", 100),
+        ("users/u1/progress/1_1", {"completed": True}),
+    ]
+    path = tmp_path / "sessions.jsonl"
+    path.write_text("".join(json.dumps({"path": p, "data": d}) + "\n" for p, d in docs), encoding="utf-8")
+    return path
+
+
+def run(export, archive_dir, **kwargs):
+    source = ExportSource(export)
+    try:
+        return compact(source, archive_dir, CUTOFF, log=lambda message: None, **kwargs)
+    finally:
+        source.close()
+
+
+def test_compact_groups_sessions_by_month(export, tmp_path):
+    archive_dir = tmp_path / "archive"
+    stats = run(export, archive_dir)
+    assert stats["read"] == stats["archived"] == stats["deleted"] == 9
+    assert stats["months"] == {"2025-01": 2, "2025-02": 2, "2025-03": 5}
+    assert sorted(path.name for path in archive_dir.iterdir()) == [
+        "2025-01.scpcol", "2025-02.scpcol", "2025-03.scpcol"]
+
+    rows = list(ColumnFile(archive_dir / "2025-02.scpcol").iter_rows())
+    assert [(row["uid"], row["session_id"]) for row in rows] == [("u1", "s3"), ("u2", "s4")]
+    assert rows[0]["start_time"] == stamp(40)["_seconds"] * 1000
+    assert rows[0]["extra"] == {"referrer": "newsletter"} and rows[1]["extra"] is None
+    assert rows[0]["pages"][0]["path"] == "/year3/index.html" and rows[0]["page_count"] == 1
+
+    remaining = ExportSource(export).docs
+    assert sorted(remaining) == ["users/u1", "users/u1/progress/1_1", "users/u1/sessions/s5"]
+
+    totals, scanned = query(archive_dir)
+    assert scanned == 9
+    assert totals["2025-01"] == [2, 720, 2]
+    totals, _ = query(archive_dir, group_by="uid", uid="u2")
+    assert totals == {"u2": [3, 1320, 3]}
+
+
+class RecordingSource(ExportSource):
+    """Checks each delete against the archive on disk at the time it is made."""
+
+    def __init__(self, path, archive_dir, page_size):
+        super().__init__(path)
+        self.archive_dir = archive_dir
+        self.page_size = page_size
+        self.batches = []
+        self.served = []
+
+    def pages(self, cutoff, page_size):
+        assert page_size == self.page_size
+        for page in super().pages(cutoff, page_size):
+            assert 0 < len(page) <= page_size
+            self.served += [path for path, _ in page]
+            yield page
+
+    def delete(self, paths):
+        archived = set()
+        for path in self.archive_dir.glob("*.scpcol"):
+            data = ColumnFile(path).read(["uid", "session_id"])
+            archived |= set(zip(data["uid"], data["session_id"]))
+        for path in paths:
+            parts = path.split("/")
+            assert (parts[1], parts[3]) in archived
+        self.batches.append(list(paths))
+        super().delete(paths)
+
+
+def test_deletes_follow_the_verified_archive_in_batches(export, tmp_path):
+    archive_dir = tmp_path / "archive"
+    source = RecordingSource(export, archive_dir, page_size=3)
+    stats = compact(source, archive_dir, CUTOFF, page_size=3, batch_size=2, log=lambda message: None)
+    source.close()
+
+    # Paging on (startTime, path) visits every session once, ties included
+    assert len(source.served) == len(set(source.served)) == stats["read"] == 9
+    assert all(len(batch) <= 2 for batch in source.batches)
+    assert [len(batch) for batch in source.batches] == [2, 2, 2, 2, 1]
+    assert sorted(path for batch in source.batches for path in batch) == sorted(source.served)
+
+
+def test_failed_verification_deletes_nothing(export, tmp_path, monkeypatch):
+    write_columns = archive.write_columns
+    # A write that silently loses the last row of the month
+    monkeypatch.setattr(archive, "write_columns",
+                        lambda path, columns, rows: write_columns(path, columns, rows[:-1]))
+    source = ExportSource(export)
+    with pytest.raises(ValueError, match="verification failed"):
+        compact(source, tmp_path / "archive", CUTOFF, log=lambda message: None)
+    assert source.deleted == 0
+    source.close()
+    assert len(ExportSource(export).docs) == 12
+
+
+def test_dry_run_and_rerun_change_nothing(export, tmp_path):
+    archive_dir = tmp_path / "archive"
+    before = export.read_text(encoding="utf-8")
+    stats = run(export, archive_dir, dry_run=True)
+    assert stats["read"] == 9 and stats["archived"] == stats["deleted"] == 0
+    assert not archive_dir.exists()
+    assert export.read_text(encoding="utf-8") == before
+
+    run(export, archive_dir)
+    files = {path.name: path.read_bytes() for path in archive_dir.iterdir()}
+    after = export.read_text(encoding="utf-8")
+
+    stats = run(export, archive_dir)
+    assert stats == {"read": 0, "archived": 0, "deleted": 0, "months": {}}
+    assert {path.name: path.read_bytes() for path in archive_dir.iterdir()} == files
+    assert export.read_text(encoding="utf-8") == after
+
+
+def test_late_session_merges_into_its_month(export, tmp_path):
+    archive_dir = tmp_path / "archive"
+    run(export, archive_dir)
+
+    with open(export, "a", encoding="utf-8") as f:
+        path, data = session("u3", "late", 10)
+        f.write(json.dumps({"path": path, "data": data}) + "\n")
+    stats = run(export, archive_dir)
+    assert stats["archived"] == 1 and stats["months"] == {"2025-01": 3}
+    data = ColumnFile(archive_dir / "2025-01.scpcol").read(["session_id"])
+    assert data["session_id"] == ["s1", "late", "s2"]
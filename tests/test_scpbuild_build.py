@@ -0,0 +1,17 @@
+"""
+Build graph planning (scpbuild.build) against the repository's own PDFs
+and pages.
+"""
+
+from scpbuild.build import plan_render
+from scpbuild.manifest import PDF_YEAR, load_manifest
+
+
+def test_render_targets_the_published_case_pages():
+    manifest = load_manifest()
+    cases_dir = manifest["years"][PDF_YEAR]["cases_dir"]
+    tasks = list(plan_render(manifest, jobs=1))
+    assert tasks
+    for task in tasks:
+        assert task.outputs == [task.name.split(":", 1)[1]]
+        assert task.outputs[0].startswith(f"{cases_dir}/case")
@@ -0,0 +1,59 @@
+"""
+Start-up cost of the scp CLI.
+
+`scp --help` and no-op runs are used from editor hooks and watch loops,
+so the CLI must not import PDF libraries or subcommand modules up front.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+SCRIPTS_DIR = Path(__file__).resolve().parent.parent / "scripts"
+
+# Budget for importing scpbuild.cli, in microseconds (as reported by -X importtime)
+IMPORT_BUDGET_US = 20_000
+# Budget for a whole `scp --help` process, interpreter start-up included
+HELP_BUDGET_S = 0.1
+
+HEAVY_MODULES = ("PyPDF2", "concurrent.futures", "argparse", "html.parser", "scpbuild.segment",
+                 "scpbuild.audit", "scpbuild.dedupe")
+
+
+def run_python(*args):
+    env = dict(os.environ, PYTHONPATH=str(SCRIPTS_DIR))
+    return subprocess.run([sys.executable, *args], capture_output=True, text=True, env=env, check=True)
+
+
+def test_cli_import_time():
+    result = run_python("-X", "importtime", "-c", "import scpbuild.cli")
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = (part.strip() for part in line[len("import time:"):].split("|"))
+        if cumulative_us.isdigit():
+            cumulative[name] = int(cumulative_us)
+    assert cumulative["scpbuild.cli"] < IMPORT_BUDGET_US
+
+
+def test_cli_does_not_import_heavy_modules():
+    code = (
+        "import sys, scpbuild.cli\n"
+        f"loaded = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(','.join(loaded))\n"
+    )
+    assert run_python("-c", code).stdout.strip() == ""
+
+
+def test_help_starts_fast():
+    # Best of three to keep scheduler noise out of the measurement
+    timings = []
+    for _ in range(3):
+        start = time.perf_counter()
+        result = run_python("-m", "scpbuild", "--help")
+        timings.append(time.perf_counter() - start)
+    assert "commands:" in result.stdout
+    assert min(timings) < HELP_BUDGET_S
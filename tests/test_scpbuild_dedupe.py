@@ -0,0 +1,74 @@
+"""
+Content-defined chunking and path canonicalisation (scpbuild.dedupe).
+"""
+
+import random
+
+from scpbuild.dedupe import MAX_CHUNK, MIN_CHUNK, chunk_boundaries, chunk_digests, relocate_html
+
+
+def random_bytes(size, seed):
+    return random.Random(seed).randbytes(size)
+
+
+def test_chunk_boundaries_respect_size_limits():
+    assert chunk_boundaries(b"") == []
+    assert chunk_boundaries(b"x" * (MIN_CHUNK - 1)) == [MIN_CHUNK - 1]
+
+    data = random_bytes(200_000, seed=1)
+    ends = chunk_boundaries(data)
+    assert ends[-1] == len(data)
+    sizes = [end - start for start, end in zip([0] + ends, ends)]
+    assert all(MIN_CHUNK < size <= MAX_CHUNK for size in sizes[:-1])
+    assert 0 < sizes[-1] <= MAX_CHUNK
+    # ~1 KiB on average, not pinned to either limit
+    assert 512 < len(data) / len(ends) < 4096
+
+
+def test_chunk_boundaries_are_content_defined():
+    data = random_bytes(100_000, seed=2)
+    assert chunk_boundaries(data) == chunk_boundaries(bytes(data))
+
+    # An insertion near the start only disturbs the chunks around it
+    edited = data[:500] + b"inserted text" + data[500:]
+    before = {digest for digest, _ in chunk_digests(data)}
+    after = {digest for digest, _ in chunk_digests(edited)}
+    assert len(before - after) <= 2
+    assert len(before & after) >= len(before) - 2
+
+    # Long runs of one byte still cut at MAX_CHUNK
+    assert all(end - start <= MAX_CHUNK for start, end in
+               zip([0] + chunk_boundaries(bytes(50_000)), chunk_boundaries(bytes(50_000))))
+
+
+PAGE = (
+    '<link rel="stylesheet" href="../css/case.css">\n'
+    '<script src="../js/case.js?v=2"></script>\n'
+    '<a href="case1_2.html#q1">Next</a>\n'
+    '<a href="https://example.com/">Out</a> <a href="#top">Top</a> <a href="/index.html">Home</a>\n'
+    "<img src='../img/a b.png'>\n"
+)
+
+
+def test_relocate_html_to_root_absolute():
+    assert relocate_html(PAGE, "cases/case1_1.html") == (
+        '<link rel="stylesheet" href="/css/case.css">\n'
+        '<script src="/js/case.js?v=2"></script>\n'
+        '<a href="/cases/case1_2.html#q1">Next</a>\n'
+        '<a href="https://example.com/">Out</a> <a href="#top">Top</a> <a href="/index.html">Home</a>\n'
+        "<img src='/img/a b.png'>\n"
+    )
+
+
+def test_relocate_html_between_trees():
+    moved = relocate_html(PAGE, "cases/case1_1.html", "year3/cases/case1_1.html")
+    assert '<link rel="stylesheet" href="../../css/case.css">' in moved
+    assert '<script src="../../js/case.js?v=2"></script>' in moved
+    assert '<a href="../../cases/case1_2.html#q1">Next</a>' in moved
+    assert "<img src='../../img/a b.png'>" in moved
+    assert '<a href="https://example.com/">Out</a> <a href="#top">Top</a> <a href="/index.html">Home</a>' in moved
+
+    # The moved copy canonicalises to the same text as the original
+    assert relocate_html(moved, "year3/cases/case1_1.html") == relocate_html(PAGE, "cases/case1_1.html")
+    # ...while the same relative links one level deeper point elsewhere
+    assert relocate_html(PAGE, "year3/cases/case1_1.html") != relocate_html(PAGE, "cases/case1_1.html")
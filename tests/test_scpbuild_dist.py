@@ -0,0 +1,117 @@
+"""
+Publish directory assembly (scpbuild.dist) on a small tree in tmp_path.
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+import pytest
+
+from scpbuild import dist
+from scpbuild.sitegraph import Ref, parse_refs
+
+
+def test_allowlist_follows_links_globs_and_directory_index():
+    files = {
+        "index.html", "css/main.css", "img/logo.png", "year3/index.html", "year3/cases/case1_1.html",
+        "exams/mcq-2023.html", "exams/saq-2023.html", "exams/notes.txt", "orphan.html",
+    }
+    graph = {
+        "index.html": parse_refs(
+            '<link rel="stylesheet" href="css/main.css">'
+            '<a href="year3">Year 3</a>'
+            '<a href="https://example.com/">Out</a><a href="#top">Top</a><a href="mailto:x@example.com">Mail</a>'
+        ) + [Ref("js-glob", "exams/*.html")],
+        "css/main.css": [Ref("css", "../img/logo.png")],
+        "year3/index.html": parse_refs('<a href="cases/case1_1.html">1.1</a><a href="cases/case9_9.html">gone</a>'),
+    }
+    allowed = dist.allowlist(["index.html", "missing.html"], files, graph)
+    assert allowed == {
+        "index.html", "css/main.css", "img/logo.png", "year3/index.html", "year3/cases/case1_1.html",
+        "exams/mcq-2023.html", "exams/saq-2023.html",
+    }
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    root = tmp_path / "site"
+    for rel_path, text in {
+        "index.html": "<h1>Home</h1>",
+        "css/main.css": "body {}",
+        "year3/cases/case1_1.html": "<h1>Case 1.1</h1>",
+        "year3/cases/case1_2.html": "<h1>Case 1.2</h1>",
+    }.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    monkeypatch.setattr(dist, "BASE_DIR", root)
+    return root
+
+
+def read_manifest(dist_dir):
+    with open(dist_dir / dist.MANIFEST_NAME, "r", encoding="utf-8") as f:
+        return json.load(f)["files"]
+
+
+def test_build_copies_then_leaves_unchanged_files(site, tmp_path):
+    dist_dir = tmp_path / "dist"
+    files = {"index.html", "css/main.css", "year3/cases/case1_1.html", "year3/cases/case1_2.html"}
+
+    counts, manifest, removed = dist.build(dist_dir, files)
+    assert counts["copy"] == 4 and counts["unchanged"] == 0 and removed == []
+    assert (dist_dir / "year3/cases/case1_1.html").read_text(encoding="utf-8") == "<h1>Case 1.1</h1>"
+    assert manifest["index.html"]["sha256"] == hashlib.sha256(b"<h1>Home</h1>").hexdigest()
+    assert read_manifest(dist_dir) == manifest
+
+    counts, _, removed = dist.build(dist_dir, files)
+    assert counts == {"unchanged": 4, "copy": 0, "link": 0, "reflink": 0} and removed == []
+
+
+def test_build_prunes_files_no_longer_published(site, tmp_path):
+    dist_dir = tmp_path / "dist"
+    dist.build(dist_dir, {"index.html", "year3/cases/case1_1.html", "year3/cases/case1_2.html"})
+    (dist_dir / "stray.txt").write_text("left over", encoding="utf-8")
+
+    counts, manifest, removed = dist.build(dist_dir, {"index.html"}, dry_run=True)
+    assert sorted(removed) == ["stray.txt", "year3/cases/case1_1.html", "year3/cases/case1_2.html"]
+    assert (dist_dir / "stray.txt").exists()
+
+    counts, manifest, removed = dist.build(dist_dir, {"index.html"})
+    assert sorted(removed) == ["stray.txt", "year3/cases/case1_1.html", "year3/cases/case1_2.html"]
+    assert not (dist_dir / "year3").exists()
+    assert sorted(path.name for path in dist_dir.iterdir()) == [dist.MANIFEST_NAME, "index.html"]
+    assert list(read_manifest(dist_dir)) == ["index.html"]
+
+
+def test_build_reuses_manifest_hashes(site, tmp_path, monkeypatch):
+    dist_dir = tmp_path / "dist"
+    files = {"index.html", "css/main.css", "year3/cases/case1_1.html"}
+    dist.build(dist_dir, files)
+
+    hashed = []
+    file_sha256 = dist.file_sha256
+    monkeypatch.setattr(dist, "file_sha256", lambda path: hashed.append(path) or file_sha256(path))
+    dist.build(dist_dir, files)
+    assert hashed == []
+
+    (site / "css/main.css").write_text("body { margin: 0 }", encoding="utf-8")
+    counts, manifest, _ = dist.build(dist_dir, files)
+    assert hashed == [site / "css/main.css"]
+    assert counts["copy"] == 1 and counts["unchanged"] == 2
+    assert manifest["css/main.css"]["sha256"] == hashlib.sha256(b"body { margin: 0 }").hexdigest()
+    assert (dist_dir / "css/main.css").read_text(encoding="utf-8") == "body { margin: 0 }"
+
+
+def test_vite_and_scp_dist_use_separate_directories():
+    root = Path(__file__).resolve().parent.parent
+    out_dir = re.search(r"outDir:\s*'([^']+)'", (root / "vite.config.js").read_text(encoding="utf-8")).group(1)
+    assert (root / out_dir).resolve() != dist.DIST_DIR.resolve()
+
+    # Deploy hooks only pack and publish, never rerun the stages that rewrite firebase.json
+    hosting = json.loads((root / "firebase.json").read_text(encoding="utf-8"))["hosting"]
+    assert f"{out_dir}/**" in hosting["ignore"]
+    for hook in hosting["predeploy"]:
+        assert "build --only packs dist" in hook
+    assert "build --only packs dist" in (root / "netlify.toml").read_text(encoding="utf-8")
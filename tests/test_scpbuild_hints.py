@@ -0,0 +1,103 @@
+"""
+Resource hints (scpbuild.hints): the per-directory Link-header globs and
+their merge into firebase.json.
+"""
+
+from scpbuild import hints
+from scpbuild.hosting import glob_to_regex
+
+
+def test_header_sources_group_pages_by_directory_and_value():
+    link_headers = [
+        ("year3/cases/case1_1.html", "</css/case.css>; rel=preload; as=style"),
+        ("year3/cases/case1_2.html", "</css/case.css>; rel=preload; as=style"),
+        ("year3/cases/case1_3.html", "</css/other.css>; rel=preload; as=style"),
+        ("year3/cases/case1_4.html", ""),
+        ("year3/index.html", "</css/case.css>; rel=preload; as=style"),
+        ("year4/cases/case1_1.html", "</css/case.css>; rel=preload; as=style"),
+    ]
+    assert list(hints.header_sources(link_headers)) == [
+        ("/year3/cases/@(case1_1|case1_2).html", "</css/case.css>; rel=preload; as=style"),
+        ("/year3/cases/case1_3.html", "</css/other.css>; rel=preload; as=style"),
+        ("/year3/index.html", "</css/case.css>; rel=preload; as=style"),
+        ("/year4/cases/case1_1.html", "</css/case.css>; rel=preload; as=style"),
+    ]
+
+    # The glob matches exactly the grouped pages
+    regex = glob_to_regex("/year3/cases/@(case1_1|case1_2).html")
+    assert regex.match("year3/cases/case1_1.html") and regex.match("year3/cases/case1_2.html")
+    assert not regex.match("year3/cases/case1_3.html")
+    assert not regex.match("year3/cases/case1_12.html")
+    assert not regex.match("year4/cases/case1_1.html")
+
+
+def test_update_headers_replaces_generated_entries_only():
+    config = {"hosting": {"headers": [
+        {"source": "**/*.css", "headers": [{"key": "Cache-Control", "value": "max-age=3600"}]},
+        # Hand-written Link header on a page the generator does not own
+        {"source": "/admin.html", "headers": [{"key": "Link", "value": "</css/admin.css>; rel=preload; as=style"}]},
+        # Stale generated entries: a page glob and a single page
+        {"source": "/year3/cases/@(case1_1|case1_9).html", "headers": [{"key": "Link", "value": "<old>"}]},
+        {"source": "/year3/index.html", "headers": [{"key": "Link", "value": "<old>"}]},
+        # A hand-written entry that also sets Link is kept
+        {"source": "/year3/index.html", "headers": [{"key": "Link", "value": "<mine>"},
+                                                    {"key": "X-Frame-Options", "value": "DENY"}]},
+    ]}}
+    link_headers = [
+        ("year3/index.html", "</js/case-catalogue.js>; rel=preload; as=script"),
+        ("year3/cases/case1_1.html", "</css/case.css>; rel=preload; as=style"),
+        ("year3/cases/case1_2.html", "</css/case.css>; rel=preload; as=style"),
+    ]
+    headers = hints.update_headers(config, link_headers)["hosting"]["headers"]
+    assert [entry["source"] for entry in headers] == [
+        "**/*.css",
+        "/admin.html",
+        "/year3/index.html",
+        "/year3/index.html",
+        "/year3/cases/@(case1_1|case1_2).html",
+    ]
+    assert headers[2]["headers"][0]["value"] == "<mine>"
+    assert headers[3]["headers"] == [{"key": "Link", "value": "</js/case-catalogue.js>; rel=preload; as=script"}]
+
+    # Re-running with the same pages is a no-op
+    assert hints.update_headers(config, link_headers)["hosting"]["headers"] == headers
+
+
+def test_collect_hints_preloads_render_critical_resources(tmp_path, monkeypatch):
+    for rel_path in ("css/case.css", "js/head.js", "js/late.js", "js/case-catalogue.js",
+                     "year3/cases/case1_2.html"):
+        path = tmp_path / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("", encoding="utf-8")
+    monkeypatch.setattr(hints, "BASE_DIR", tmp_path)
+
+    page = (
+        "<html><head>\n"
+        '<meta name="viewport" content="width=device-width">\n'
+        '<link rel="stylesheet" href="../../css/case.css">\n'
+        '<script src="../../js/head.js"></script>\n'
+        '<script src="../../js/late.js" defer></script>\n'
+        '<script async src="https://www.googletagmanager.com/gtag/js?id=G-1"></script>\n'
+        "</head><body>\n"
+        '<script src="../../js/case-catalogue.js"></script>\n'
+        '<script src="../../js/missing.js"></script>\n'
+        "</body></html>\n"
+    )
+    found = hints.collect_hints("year3/cases/case1_1.html", page, ("year3/cases/case1_2.html", None))
+    assert found.preconnect == ["https://www.googletagmanager.com"]
+    assert [site_path for _, site_path, _, _ in found.preload] == [
+        "/css/case.css", "/js/head.js", "/js/case-catalogue.js"]
+    assert found.link_header() == (
+        "<https://www.googletagmanager.com>; rel=preconnect, </css/case.css>; rel=preload; as=style, "
+        "</js/head.js>; rel=preload; as=script, </js/case-catalogue.js>; rel=preload; as=script"
+    )
+
+    updated = hints.apply_hints(page, found)
+    # Only the body script needs a hint in the HTML; head resources are found by the parser
+    block = updated[updated.index(hints.HINTS_START):updated.index(hints.HINTS_END)]
+    assert '<link rel="preload" href="../../js/case-catalogue.js" as="script">' in block
+    assert '<link rel="prefetch" href="case1_2.html">' in block
+    assert "case.css" not in block and "head.js" not in block
+    assert updated.index(hints.HINTS_START) > updated.index('<meta name="viewport"')
+    assert hints.apply_hints(updated, hints.collect_hints("year3/cases/case1_1.html", updated,
+                                                         ("year3/cases/case1_2.html", None))) == updated
@@ -0,0 +1,92 @@
+"""
+Firebase Hosting globs and config (scpbuild.hosting), shared by the
+preview server, scp dist and scp links.
+"""
+
+import json
+import os
+
+import pytest
+
+from scpbuild.hosting import HostingConfig, fill_captures, glob_to_regex, source_matcher, source_regex
+
+
+@pytest.mark.parametrize("glob, matching, not_matching", [
+    ("**", ["index.html", "year3/cases/case1_1.html"], []),
+    ("**/*.css", ["main.css", "css/main.css", "a/b/c.css"], ["main.css.map", "css/main.scss"]),
+    ("/js/**", ["js/auth.js", "js/core/UserState.js"], ["js", "css/js/a.js"]),
+    ("**/node_modules/**", ["node_modules/a.js", "x/node_modules/y/z.js"], ["node_modules_x/a.js"]),
+    ("/year3/cases/case?_1.html", ["year3/cases/case1_1.html"], ["year3/cases/case12_1.html"]),
+    ("/year3/cases/@(case1_1|case1_2).html", ["year3/cases/case1_1.html", "year3/cases/case1_2.html"],
+     ["year3/cases/case1_3.html", "year3/cases/case1_12.html"]),
+    ("**/*.@(jpg|png)", ["img/a.jpg", "b.png"], ["c.gif", "d.jpg.txt"]),
+    ("**/*.{js,css}", ["js/a.js", "css/b.css"], ["c.json", "d.cssx"]),
+    ("/exams/!(index).html", ["exams/mcq-2023.html", "exams/indexes.html"], ["exams/index.html", "exams/a/b.html"]),
+    ("!(admin|tests)/**", ["css/a.css", "administrator/x"], ["admin/x", "tests/a.html"]),
+    ("/a+(b|c).txt", ["ab.txt", "abcb.txt"], ["a.txt", "ad.txt"]),
+    ("/file (1).txt", ["file (1).txt"], ["file 1.txt"]),
+])
+def test_glob_to_regex(glob, matching, not_matching):
+    regex = glob_to_regex(glob)
+    for path in matching:
+        assert regex.match(path), path
+    for path in not_matching:
+        assert not regex.match(path), path
+
+
+def test_source_captures():
+    regex = source_regex("/cases/:file")
+    match = regex.match("cases/case1_1.html")
+    assert match.groupdict() == {"file": "case1_1.html"}
+    assert fill_captures("/year3/cases/:file", match) == "/year3/cases/case1_1.html"
+    assert not regex.match("cases/sub/case1_1.html") and not regex.match("cases")
+
+    match = source_regex("/old/:year/:rest*").match("old/year3/cases/case1_1.html")
+    assert match.groupdict() == {"year": "year3", "rest": "cases/case1_1.html"}
+    assert fill_captures("/:year/:rest", match) == "/year3/cases/case1_1.html"
+
+    # Glob segments around a capture
+    match = source_regex("/**/legacy/:file").match("a/b/legacy/x.html")
+    assert match and match.group("file") == "x.html"
+
+    matches = source_matcher({"regex": "^/exams/(mcq|saq)-\\d+\\.html$"})
+    assert matches("exams/mcq-2023.html") and not matches("exams/osce-2023.html")
+
+
+@pytest.fixture
+def hosting(tmp_path):
+    public = tmp_path / "public"
+    for rel_path in ("index.html", "css/main.css", ".env", "js/.hidden/a.js", "node_modules/x/index.js", "about.html"):
+        path = public / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(rel_path, encoding="utf-8")
+    config_path = tmp_path / "firebase.json"
+    config_path.write_text(json.dumps({"hosting": {
+        "public": "public",
+        "ignore": ["firebase.json", "**/.*", "**/node_modules/**"],
+        "cleanUrls": True,
+        "headers": [
+            {"source": "**/*.css", "headers": [{"key": "Cache-Control", "value": "max-age=31536000"}]},
+            {"source": "/css/main.css", "headers": [{"key": "Link", "value": "<x>"}]},
+        ],
+    }}), encoding="utf-8")
+    return HostingConfig(config_path)
+
+
+def test_is_ignored(hosting):
+    assert hosting.is_ignored("firebase.json")
+    assert hosting.is_ignored(".env")
+    assert hosting.is_ignored("js/.hidden/a.js")
+    assert hosting.is_ignored("node_modules/x/index.js")
+    assert not hosting.is_ignored("css/main.css")
+    assert not hosting.is_ignored("about.html")
+
+
+def test_file_for_and_headers(hosting):
+    assert hosting.file_for("") == os.path.join(hosting.public, "index.html")
+    assert hosting.file_for("about") == os.path.join(hosting.public, "about.html")
+    assert hosting.file_for(".env") is None
+    assert hosting.file_for("node_modules/x/index.js") is None
+    assert hosting.file_for("missing.html") is None
+    assert hosting.headers_for("css/main.css") == {"Cache-Control": "max-age=31536000", "Link": "<x>"}
+    assert hosting.headers_for("index.html") == {}
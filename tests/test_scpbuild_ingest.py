@@ -0,0 +1,191 @@
+"""
+Analytics ingestion gateway (scpbuild.ingest) against the in-process store.
+
+Set FIRESTORE_EMULATOR_HOST to also run the round trip against the
+Firestore emulator.
+"""
+
+import asyncio
+import json
+import os
+import time
+
+import pytest
+
+from scpbuild.ingest import (
+    ArrayUnion,
+    BeaconError,
+    Coalescer,
+    Gateway,
+    Increment,
+    Maximum,
+    MemoryStore,
+    merge_fields,
+    parse_beacon,
+    start_server,
+)
+
+
+def heartbeats(session, count):
+    return [{"type": "heartbeat", "session": session, "duration": 30 * n} for n in range(1, count + 1)]
+
+
+async def post(port, beacon):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(beacon).encode()
+    writer.write(b"POST /v1/beacon HTTP/1.1\r\nConnection: close\r\nContent-Type: text/plain\r\n"
+                 b"Content-Length: " + str(len(body)).encode() + b"\r\n\r\n" + body)
+    response = await reader.read()
+    writer.close()
+    head, _, payload = response.partition(b"\r\n\r\n")
+    headers = dict(line.split(": ", 1) for line in head.decode().split("\r\n")[1:])
+    return int(head.split(b" ", 2)[1]), headers, json.loads(payload) if payload else None
+
+
+def test_merge_fields_matches_sequential_writes():
+    pending = {}
+    merge_fields(pending, {"viewCount": Increment(1), "duration": Maximum(60), "viewers": ArrayUnion(["a"])})
+    merge_fields(pending, {"viewCount": Increment(2), "duration": Maximum(30), "viewers": ArrayUnion(["b", "a"])})
+    merge_fields(pending, {"featureUsage": {"flag": Increment(1)}, "title": "x"})
+    merge_fields(pending, {"featureUsage": {"search": Increment(1)}, "title": "y"})
+    assert pending == {
+        "viewCount": Increment(3), "duration": Maximum(60), "viewers": ArrayUnion(["a", "b"]),
+        "featureUsage": {"flag": Increment(1), "search": Increment(1)}, "title": "y",
+    }
+
+
+def test_heartbeats_coalesce_per_session():
+    coalescer = Coalescer()
+    now = time.time()
+    coalescer.apply("u1", heartbeats("s1", 20), now)
+    coalescer.apply("u2", heartbeats("s2", 5), now)
+    coalescer.apply("u1", [{"type": "case_view", "session": "s1", "caseId": "case1_1", "title": "Chest pain"}], now)
+    coalescer.apply("u2", [{"type": "case_view", "caseId": "case1_1", "title": "Chest pain"}], now)
+
+    writes, events = coalescer.drain()
+    assert events == 27
+    paths = sorted(write.path for write in writes)
+    assert paths == ["caseAnalytics/case1_1", "users/u1", "users/u1/sessions/s1", "users/u2", "users/u2/sessions/s2"]
+    by_path = {write.path: write.data for write in writes}
+    assert by_path["users/u1/sessions/s1"]["duration"] == Maximum(600)
+    assert by_path["users/u1/sessions/s1"]["lastCaseViewed"] == "case1_1"
+    assert by_path["caseAnalytics/case1_1"]["viewCount"] == Increment(2)
+    assert by_path["caseAnalytics/case1_1"]["uniqueViewers"] == ArrayUnion(["u1", "u2"])
+    assert len(coalescer) == 0
+
+
+def test_invalid_beacon_is_rejected_whole():
+    coalescer = Coalescer()
+    with pytest.raises(BeaconError):
+        coalescer.apply("u1", heartbeats("s1", 2) + [{"type": "case_view", "caseId": "a/b"}], time.time())
+    assert len(coalescer) == 0
+
+
+def test_non_finite_numbers_are_rejected():
+    for body in ('{"events": [{"type": "heartbeat", "session": "s1", "duration": Infinity}]}',
+                 '{"events": [{"type": "heartbeat", "session": "s1", "duration": NaN}]}'):
+        with pytest.raises(BeaconError):
+            parse_beacon(body)
+    coalescer = Coalescer()
+    with pytest.raises(BeaconError):
+        coalescer.apply("u1", [{"type": "heartbeat", "session": "s1", "duration": float("inf")}], time.time())
+    # A non-finite client time falls back to the receive time
+    coalescer.apply("u1", [{"type": "heartbeat", "session": "s1", "duration": 30, "t": float("nan")}], time.time())
+    assert len(coalescer) == 2
+
+
+def test_consumer_survives_bad_beacons():
+    async def scenario():
+        store = MemoryStore()
+        gateway = Gateway(store, flush_interval=3600)
+        gateway.submit("u1", [{"type": "heartbeat", "session": "s1", "duration": float("inf")}])
+        gateway.submit("u1", [None])
+        gateway.submit("u1", heartbeats("s1", 2))
+        gateway.start()
+        await gateway.queue.join()
+        alive = not gateway.tasks[0].done()
+        await gateway.close()
+        return store, gateway, alive
+
+    store, gateway, alive = asyncio.run(scenario())
+    assert alive
+    assert gateway.counts["rejected_invalid"] == 2
+    assert store.docs["users/u1/sessions/s1"]["duration"] == 60
+
+
+def test_flush_batches_and_retries():
+    async def scenario():
+        store = MemoryStore(fail=1)
+        gateway = Gateway(store, flush_interval=3600, batch_size=500)
+        for n in range(1200):
+            assert gateway.submit(f"u{n}", heartbeats(f"s{n}", 3))
+        gateway.start()
+        await gateway.queue.join()
+        await gateway.flush()
+        assert gateway.counts["failed_batches"] == 1
+        assert len(gateway.retry) == 500
+        await gateway.close()
+        return store, gateway
+
+    store, gateway = asyncio.run(scenario())
+    # 1200 sessions + 1200 users, in batches of at most 500
+    assert gateway.counts["writes"] == 2400
+    assert gateway.counts["batches"] == 5
+    assert gateway.retry == []
+    assert store.docs["users/u7/sessions/s7"]["duration"] == 90
+
+
+def test_http_round_trip_and_backpressure():
+    async def scenario():
+        store = MemoryStore()
+        gateway = Gateway(store, flush_interval=3600, queue_size=2)
+        _, server = await start_server(gateway, "127.0.0.1", 0, trust_uid=True)
+        port = server.sockets[0].getsockname()[1]
+
+        # Nothing drains the queue until the gateway starts, so the third beacon is refused
+        start = {"type": "session_start", "session": "s1", "email": "a@example.com", "path": "/index.html"}
+        views = [{"type": "case_view", "session": "s1", "caseId": "case2_3", "title": "Asthma"}] * 3
+        accepted = [await post(port, {"uid": "u1", "events": [start]}),
+                    await post(port, {"uid": "u1", "events": views})]
+        busy = await post(port, {"uid": "u1", "events": views})
+        invalid = await post(port, {"uid": "u1", "events": [{"type": "nonsense"}]})
+        anonymous = await post(port, {"events": views})
+
+        gateway.start()
+        await gateway.queue.join()
+        server.close()
+        await server.wait_closed()
+        await gateway.close()
+        return store, accepted, busy, invalid, anonymous
+
+    store, accepted, busy, invalid, anonymous = asyncio.run(scenario())
+    assert [status for status, _, _ in accepted] == [202, 202]
+    assert busy[0] == 503 and busy[1]["Retry-After"]
+    assert invalid[0] == 400
+    assert anonymous[0] == 401
+    assert store.docs["caseAnalytics/case2_3"]["viewCount"] == 3
+    assert store.docs["users/u1"]["displayName"] == "a"
+    assert store.docs["users/u1/sessions/s1"]["isActive"] is True
+
+
+@pytest.mark.skipif(not os.environ.get("FIRESTORE_EMULATOR_HOST"), reason="Firestore emulator not running")
+def test_firestore_emulator_round_trip():
+    from google.cloud import firestore
+
+    from scpbuild.ingest import FirestoreStore
+
+    async def scenario():
+        store = FirestoreStore("demo-scp-ingest")
+        gateway = Gateway(store, flush_interval=3600)
+        gateway.submit("emulator-user", heartbeats("emulator-session", 4)
+                       + [{"type": "case_view", "caseId": "emulator-case", "title": "Test"}] * 2)
+        gateway.start()
+        await gateway.queue.join()
+        await gateway.close()
+        store.close()
+
+    client = firestore.Client(project="demo-scp-ingest")
+    before = (client.document("caseAnalytics/emulator-case").get().to_dict() or {}).get("viewCount", 0)
+    asyncio.run(scenario())
+    assert client.document("caseAnalytics/emulator-case").get().to_dict()["viewCount"] == before + 2
+    assert client.document("users/emulator-user/sessions/emulator-session").get().to_dict()["duration"] == 120
@@ -0,0 +1,117 @@
+"""
+Vectorised item analysis (scpbuild.items) against a per-question loop on a
+small seeded attempt matrix.
+"""
+
+import math
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from scpbuild.items import ExamKey, analyse, attempt_matrix, reference_analysis, synthetic_choices  # noqa: E402
+
+ATTEMPTS = 60
+
+
+def saved_attempts(key, choices, flagged):
+    """The attempts as exam pages save them (unanswered questions have no selectedAnswer)."""
+    return [[{"id": qid, "selectedAnswer": int(choice) if choice >= 0 else None, "flagged": bool(flag)}
+             for qid, choice, flag in zip(key.ids, row, flags)]
+            for row, flags in zip(choices, flagged)]
+
+
+def loop_rates(key, saved):
+    """Choice shares and flag rates one question at a time."""
+    rates, flags = [], []
+    for qid, options in zip(key.ids, key.options):
+        picks = [question["selectedAnswer"] for questions in saved for question in questions
+                 if question["id"] == qid and question["selectedAnswer"] is not None]
+        rates.append([picks.count(option) / len(picks) if picks else None for option in range(options)])
+        flags.append(sum(question["flagged"] for questions in saved for question in questions
+                         if question["id"] == qid) / len(saved))
+    return rates, flags
+
+
+def assert_close(actual, expected):
+    assert (actual is None) == (expected is None)
+    if expected is not None:
+        assert actual == pytest.approx(expected, abs=6e-4)  # documents round to 0.001
+
+
+@pytest.fixture
+def keyed_exam():
+    questions = [
+        {"id": f"q{i}", "n": i, "options": ["A", "B", "C", "D"] if i % 3 else ["A", "B", "C"],
+         "correctAnswer": i % 3, "topic": ["Cardiology", "Renal", None][i % 3]}
+        for i in range(12)
+    ]
+    return ExamKey("quiz", {"title": "Quiz", "questions": questions})
+
+
+def test_vectorised_matches_per_question_loop(keyed_exam):
+    key = keyed_exam
+    choices, flagged = synthetic_choices(key, ATTEMPTS, seed=7, omit=0.1)
+    saved = saved_attempts(key, choices, flagged)
+
+    # Small batches so the sums are carried across several chunks
+    document = analyse(key, *attempt_matrix(key, saved), batch=7, min_answered=0)
+    facility, discrimination = reference_analysis(key, saved)
+    rates, flags = loop_rates(key, saved)
+
+    assert document["attempts"] == ATTEMPTS
+    for item, f, d, r, fl in zip(document["items"], facility, discrimination, rates, flags):
+        assert item["answered"] == sum(1 for questions in saved for question in questions
+                                       if question["id"] == item["id"] and question["selectedAnswer"] is not None)
+        assert_close(item["facility"], f)
+        assert_close(item["discrimination"], d)
+        for rate, expected in zip(item["choices"], r):
+            assert_close(rate, expected)
+        assert_close(item["flagged"], fl)
+
+    scores = [sum(question["selectedAnswer"] == k for question, k in zip(questions, key.key)) / len(key.ids)
+              for questions in saved]
+    assert_close(document["meanScore"], sum(scores) / len(scores))
+
+    for topic, summary in document["topics"].items():
+        columns = [col for col, name in enumerate(key.topic) if name == topic]
+        per_student = []
+        for questions in saved:
+            answered = [questions[col] for col in columns if questions[col]["selectedAnswer"] is not None]
+            if answered:
+                per_student.append(sum(question["selectedAnswer"] == key.key[key.column[question["id"]]]
+                                       for question in answered) / len(answered))
+        assert summary["questions"] == len(columns)
+        assert summary["attempts"] == len(per_student)
+        assert_close(summary["meanScore"], sum(per_student) / len(per_student))
+
+
+def test_min_answered_drops_sparse_attempts(keyed_exam):
+    key = keyed_exam
+    choices, flagged = synthetic_choices(key, ATTEMPTS, seed=3, omit=0.0)
+    choices[:5, 2:] = -1  # answered 2 of 12
+    document = analyse(key, choices, flagged, batch=16)
+    assert document["attempts"] == ATTEMPTS - 5
+
+
+def test_unkeyed_exam_reports_choices_and_flags_only():
+    key = ExamKey.load("mcq-2023")
+    assert set(key.key) == {-1}
+    choices, flagged = synthetic_choices(key, ATTEMPTS, seed=11, omit=0.2)
+    saved = saved_attempts(key, choices, flagged)
+
+    # Without a key, attempts are filtered on the share of all questions answered
+    document = analyse(key, *attempt_matrix(key, saved), batch=9)
+    required = math.ceil(0.5 * len(key.ids))
+    kept = [questions for questions in saved
+            if sum(question["selectedAnswer"] is not None for question in questions) >= required]
+    assert document["attempts"] == len(kept)
+    assert document["meanScore"] is None and document["topics"] == {}
+
+    rates, flags = loop_rates(key, kept)
+    for item, r, fl in zip(document["items"], rates, flags):
+        assert item["facility"] is None and item["discrimination"] is None
+        for rate, expected in zip(item["choices"], r):
+            assert_close(rate, expected)
+        assert_close(item["flagged"], fl)
+        assert "weak-distractor" not in item.get("review", ())
@@ -0,0 +1,93 @@
+"""
+The link checker (scpbuild.linkcheck) on a small publish tree.
+"""
+
+import json
+
+import pytest
+
+from scpbuild import dist, linkcheck, sitegraph
+from scpbuild.linkcheck import check, publish_tree
+from scpbuild.sitegraph import build_graph
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    root = tmp_path / "site"
+    files = {
+        "index.html": '<a href="year3/">Year 3</a><a href="Year3/index.html">Typo</a>'
+                      '<a href="notes/.draft.html">Draft</a><a href="../up.html">Up</a>'
+                      '<a href="mailto:x@example.com">Mail</a><a href="https://example.com/">Out</a>',
+        "year3/index.html": '<link rel="stylesheet" href="../css/main.css">'
+                            '<a href="cases/case1_1.html">1.1</a><a href="cases/case9_9.html">gone</a>'
+                            '<script src="../js/nav.js"></script>',
+        "year3/cases/case1_1.html": '<a href="../index.html">Back</a>',
+        "css/main.css": "body { background: url(../img/missing.png); }",
+        "js/nav.js": "window.location.href = `../exams/${year}.html`;\nlocation.href = `../quiz/${n}.html`;\n",
+        "exams/mcq-2023.html": "<h1>MCQ</h1>",
+        "exams/saq-2023.html": "<h1>SAQ</h1>",
+        "admin.html": "<h1>Admin</h1>",
+        "flagged.html": "<h1>Flagged</h1>",
+        "404.html": "<h1>Not found</h1>",
+        "orphan.html": "<h1>Nobody links here</h1>",
+        "notes/.draft.html": "<h1>Draft</h1>",
+    }
+    for rel_path, text in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    (root / "firebase.json").write_text(json.dumps({"hosting": {"public": ".", "ignore": ["firebase.json", "**/.*"]}}),
+                                        encoding="utf-8")
+    monkeypatch.setattr(sitegraph, "CACHE_PATH", tmp_path / "sitegraph.json")
+    return root
+
+
+def run_check(site, entries):
+    root, published, ignored = publish_tree(site / "firebase.json")
+    files = sorted(path for path in published if path.endswith((".html", ".js", ".css")))
+    graph, _ = build_graph(files, base_dir=root)
+    return check(graph, published, ignored, entries)
+
+
+def summary(problems):
+    return sorted((problem["kind"], problem["source"].split(":")[0].split(" ")[0], problem["target"])
+                  for problem in problems)
+
+
+def test_publish_tree_applies_ignore(site):
+    root, published, ignored = publish_tree(site / "firebase.json")
+    assert root == site
+    assert ignored == {"firebase.json", "notes/.draft.html"}
+    assert "exams/mcq-2023.html" in published
+
+
+def test_check_reports_each_kind(site):
+    published = publish_tree(site / "firebase.json")[1]
+    problems, reachable = run_check(site, dist.crawl_entries(dist.DEFAULT_ENTRIES, published))
+    assert summary(problems) == [
+        ("case", "index.html", "Year3/index.html"),
+        ("dangling", "css/main.css", "img/missing.png"),
+        ("dangling", "index.html", None),
+        ("dangling", "year3/index.html", "quiz/*.html"),
+        ("dangling", "year3/index.html", "year3/cases/case9_9.html"),
+        ("orphaned", "orphan.html", None),
+        ("unpublished", "index.html", "notes/.draft.html"),
+    ]
+    # Script navigation resolves against the page that loads the script
+    assert {"exams/mcq-2023.html", "exams/saq-2023.html", "year3/cases/case1_1.html"} <= reachable
+
+
+def test_dist_entry_pages_are_not_orphans(site):
+    problems, _ = run_check(site, ["index.html"])
+    orphans = sorted(problem["source"] for problem in problems if problem["kind"] == "orphaned")
+    assert orphans == ["404.html", "admin.html", "flagged.html", "orphan.html"]
+
+    entries = dist.crawl_entries(linkcheck.DEFAULT_ENTRIES, {"404.html", "exams/mcq-2023.html", "index.html"})
+    assert entries == dist.DEFAULT_ENTRIES + ["404.html", "exams/mcq-2023.html"]
+
+
+def test_main_uses_the_dist_entries(site, capsys):
+    assert linkcheck.main(["--config", str(site / "firebase.json")]) == 1
+    out = capsys.readouterr().out
+    orphaned = out.split("ORPHANED (1)")[1]
+    assert "orphan.html" in orphaned and "admin.html" not in orphaned
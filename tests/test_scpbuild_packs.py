@@ -0,0 +1,138 @@
+"""
+Study pack builds (scpbuild.packs) on a small site in tmp_path: packs are
+byte-for-byte reproducible, valid zips, and an edit recompresses only the
+edited member.
+"""
+
+import hashlib
+import os
+import zipfile
+
+import pytest
+
+from scpbuild import packs, paths, sitegraph
+
+MANIFEST = {
+    "years": {
+        "year3": {
+            "index": "year3/index.html",
+            "cases_dir": "year3/cases",
+            "weeks": [
+                {"week": 1, "label": "Cardiology", "specialties": ["cardiology"], "cases": [
+                    {"id": "1_1", "title": "Hypertension", "discipline": "cardiology"},
+                    {"id": "1_2", "title": "Chest Pain", "discipline": "cardiology"},
+                ]},
+                {"week": 2, "label": "O&G", "specialties": ["og"], "cases": [
+                    {"id": "2_1", "title": "Antenatal Care", "discipline": "og"},
+                ]},
+            ],
+        },
+    },
+}
+
+CASE_PAGE = """<!DOCTYPE html>
+<html>
+<head>
+  <link rel="stylesheet" href="../../css/case.css">
+</head>
+<body>
+  <a href="../index.html">Back</a>
+  <h1>{title}</h1>
+  <script src="../../js/case.js"></script>
+</body>
+</html>
+"""
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    root = tmp_path / "site"
+    files = {
+        "year3/index.html": '<div class="specialty" data-filter="cardiology">Cardiology</div>\n'
+                            '<div class="specialty" data-filter="og">O&amp;G</div>\n',
+        "year3/cases/case1_1.html": CASE_PAGE.format(title="Hypertension"),
+        "year3/cases/case1_2.html": CASE_PAGE.format(title="Chest Pain"),
+        "year3/cases/case2_1.html": CASE_PAGE.format(title="Antenatal Care"),
+        "css/case.css": "body { background: url(../img/bg.bin); }\n" * 20,
+        "js/case.js": "console.log('case');\n" * 20,
+    }
+    for rel_path, text in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    # Incompressible, so it is stored rather than deflated
+    (root / "img").mkdir()
+    (root / "img/bg.bin").write_bytes(os.urandom(4096))
+
+    monkeypatch.setattr(paths, "BASE_DIR", root)
+    monkeypatch.setattr(packs, "BASE_DIR", root)
+    monkeypatch.setattr(sitegraph, "CACHE_PATH", tmp_path / "sitegraph.json")
+    return root
+
+
+def use_store(monkeypatch, store):
+    monkeypatch.setattr(packs, "STORE_DIR", store)
+    monkeypatch.setattr(packs, "MEMBERS_DIR", store / "members")
+    monkeypatch.setattr(packs, "CACHE_PATH", store / "cache.json")
+
+
+def digests(index):
+    return {pack_id: entry["sha256"] for pack_id, entry in index["packs"].items()}
+
+
+def test_packs_are_reproducible_valid_zips(site, tmp_path, monkeypatch):
+    use_store(monkeypatch, tmp_path / "store-a")
+    first, counts = packs.build(MANIFEST, out_root=site / "packs")
+    assert sorted(first["packs"]) == ["year3-cardiology", "year3-og"]
+    assert counts["written"] == 2
+
+    entry = first["packs"]["year3-cardiology"]
+    path = site / entry["file"]
+    data = path.read_bytes()
+    assert hashlib.sha256(data).hexdigest() == entry["sha256"]
+    assert path.name == f"year3-cardiology.{entry['sha256'][:12]}.zip"
+    assert entry["bytes"] == len(data) and entry["cases"] == ["1_1", "1_2"]
+
+    with zipfile.ZipFile(path) as pack:
+        assert pack.testzip() is None
+        assert sorted(pack.namelist()) == [
+            "css/case.css", "img/bg.bin", "index.html", "js/case.js",
+            "year3/cases/case1_1.html", "year3/cases/case1_2.html", "year3/index.html",
+        ]
+        assert pack.read("img/bg.bin") == (site / "img/bg.bin").read_bytes()
+        assert pack.getinfo("img/bg.bin").compress_type == zipfile.ZIP_STORED
+        assert pack.getinfo("css/case.css").compress_type == zipfile.ZIP_DEFLATED
+        assert b"Chest Pain" in pack.read("year3/index.html")
+
+    # A fresh store, a new output directory and newer mtimes give the same bytes
+    for source in site.rglob("*"):
+        if source.is_file():
+            os.utime(source, ns=(source.stat().st_atime_ns, source.stat().st_mtime_ns + 10**9))
+    use_store(monkeypatch, tmp_path / "store-b")
+    second, counts = packs.build(MANIFEST, out_root=site / "packs-again")
+    assert counts["written"] == 2
+    assert digests(second) == digests(first)
+
+
+def test_edit_recompresses_one_member(site, tmp_path, monkeypatch):
+    use_store(monkeypatch, tmp_path / "store")
+    out_root = site / "packs"
+    first, counts = packs.build(MANIFEST, out_root=out_root)
+    # Three pages, three assets, two pack index pages and one shared redirect page
+    assert counts["compressed"] == 9
+
+    index, counts = packs.build(MANIFEST, out_root=out_root)
+    assert counts == {"compressed": 0, "written": 0, "reused": 2, "pruned": 0}
+    assert index == first
+
+    page = site / "year3/cases/case1_2.html"
+    page.write_text(page.read_text(encoding="utf-8").replace("Chest Pain", "Chest Pain (SDL)"), encoding="utf-8")
+    index, counts = packs.build(MANIFEST, out_root=out_root)
+    assert counts == {"compressed": 1, "written": 1, "reused": 1, "pruned": 1}
+    assert index["packs"]["year3-og"] == first["packs"]["year3-og"]
+    assert index["packs"]["year3-cardiology"]["sha256"] != first["packs"]["year3-cardiology"]["sha256"]
+    assert sorted(path.name for path in out_root.iterdir()) == sorted(
+        [packs.INDEX_NAME] + [entry["file"].rsplit("/", 1)[-1] for entry in index["packs"].values()])
+    with zipfile.ZipFile(site / index["packs"]["year3-cardiology"]["file"]) as pack:
+        assert pack.testzip() is None
+        assert b"Chest Pain (SDL)" in pack.read("year3/cases/case1_2.html")
@@ -0,0 +1,261 @@
+"""
+Exam prerendering (scpbuild.prerender): the first-question markup and the
+<template> question store that js/exam-prerender.js hydrates examData from.
+
+The store is read back here the way exam-prerender.js reads it. With node
+installed, each layout's first question is also compared against what the
+exam page's own loadQuestion() renders from the hydrated data.
+"""
+
+import html
+import json
+import re
+import shutil
+import subprocess
+from html.parser import HTMLParser
+from pathlib import Path
+
+import pytest
+
+from scpbuild import prerender
+from scpbuild.prerender import EXAMS, REGION_END, REGION_START, render_page, render_question
+
+ROOT = Path(__file__).resolve().parent.parent
+
+PAGE = """<!DOCTYPE html>
+<html>
+<body>
+  <div class="question-nav">
+    <div class="question-nav-list" id="questionNavList">
+      <!-- Generated by JavaScript -->
+    </div>
+  </div>
+  <div class="question-container" id="questionContainer">
+    <!-- Loaded by JavaScript -->
+  </div>
+  <script src="../js/core/UserState.js"></script>
+  <script>
+    const examData = ExamPrerender.hydrate(document.getElementById('questionContainer'));
+  </script>
+</body>
+</html>
+"""
+
+MCQ = {
+    "title": "Fixture MCQ & friends",
+    "questions": [
+        {"id": 7, "n": 0, "text": "Which <b>dose</b> & route?", "options": ["IV & IM", "5 < 6 mg", "\"None\""],
+         "correctAnswer": 1, "imageUrl": "images/exams/q7.png"},
+        {"id": 9, "n": 1, "text": "Second question", "options": ["Yes", "No"]},
+    ],
+}
+
+SAQ = {
+    "title": "Fixture SAQ",
+    "questions": [
+        {"id": 1, "n": 2, "text": "Shared records", "subQuestions": ["a. 2 acts", "b. 5 <benefits>"]},
+        {"id": 2, "n": 3, "text": "No parts"},
+    ],
+}
+
+# A real page per layout, whose loadQuestion() the prerender mirrors
+CLIENT_PAGES = {"mcq-image": "exams/mcq-2023.html", "mcq": "exams/mcq-2024.html", "saq": "exams/saq-2023.html"}
+
+
+class TemplateReader(HTMLParser):
+    """Rebuild examData from a page the way js/exam-prerender.js does."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.template = None
+        self.inside = False
+        self.questions = []
+        self._field = None
+        self._items = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "template" and attrs.get("id") == "examQuestions":
+            self.template = attrs
+            self.inside = True
+        elif not self.inside:
+            return
+        elif tag == "article":
+            question = {"id": int(attrs["data-id"]), "text": ""}
+            if "data-correct" in attrs:
+                question["correctAnswer"] = int(attrs["data-correct"])
+            self.questions.append(question)
+            self._items = []
+        elif tag == "p":
+            self._field = "text"
+        elif tag == "li":
+            self._items.append("")
+            self._field = "item"
+        elif tag == "img":
+            self.questions[-1]["imageUrl"] = attrs["src"]
+
+    def handle_endtag(self, tag):
+        if not self.inside:
+            return
+        if tag in ("p", "li"):
+            self._field = None
+        elif tag == "article" and self._items:
+            kind = "subQuestions" if self.template["data-kind"] == "saq" else "options"
+            self.questions[-1][kind] = self._items
+        elif tag == "template":
+            self.inside = False
+
+    def handle_data(self, data):
+        if self._field == "text":
+            self.questions[-1]["text"] += data
+        elif self._field == "item":
+            self._items[-1] += data
+
+
+def hydrate(page_html):
+    reader = TemplateReader()
+    reader.feed(page_html)
+    return reader.template, reader.questions
+
+
+def region(page_html, open_tag):
+    start = page_html.index(open_tag)
+    return page_html[page_html.index(REGION_START, start) + len(REGION_START):page_html.index(REGION_END, start)].strip()
+
+
+def test_prerender_fixture_exam():
+    page = "exams/fixture.html"
+    rendered = render_page(PAGE, "fixture", MCQ, "mcq-image", page)
+
+    first = region(rendered, prerender.CONTAINER_OPEN)
+    assert first.startswith(
+        '<div class="question-content-wrapper" data-question-id="7" data-correct-answer="1">'
+        '<div class="question-header"><div class="question-number">Question 1</div>'
+        '<button class="flag-btn" id="flagBtn"><span id="flagBtnText">Flag Question</span></button></div>'
+        '<div class="question-text"><div class="question-text-content">Which &lt;b&gt;dose&lt;/b&gt; &amp; route?</div>'
+        '<img src="../images/exams/q7.png" alt="Question image" class="question-image"></div>'
+        '<div class="mcq-options"><div class="mcq-option " data-option-index="0">'
+        '<span class="mcq-option-label">A</span><span>IV &amp; IM</span>'
+    )
+    assert "Second question" not in first[:first.index("<template")]
+
+    nav = region(rendered, prerender.NAV_OPEN)
+    assert nav == ('<button class="question-nav-btn active">1<span class="flag-indicator">🚩</span></button>'
+                   '<button class="question-nav-btn">2<span class="flag-indicator">🚩</span></button>')
+
+    # The hydrate script is loaded before the page script that calls it
+    assert rendered.index('<script src="../js/exam-prerender.js"></script>') < rendered.index("ExamPrerender.hydrate")
+
+    template, questions = hydrate(rendered)
+    assert template == {"id": "examQuestions", "data-exam": "fixture", "data-kind": "mcq", "data-title": MCQ["title"]}
+    assert questions == [
+        {"id": 7, "text": "Which <b>dose</b> & route?", "correctAnswer": 1, "imageUrl": "../images/exams/q7.png",
+         "options": ["IV & IM", "5 < 6 mg", "\"None\""]},
+        {"id": 9, "text": "Second question", "options": ["Yes", "No"]},
+    ]
+
+    # Re-rendering replaces the generated regions instead of nesting them
+    assert render_page(rendered, "fixture", MCQ, "mcq-image", page) == rendered
+
+
+def test_prerender_saq_fixture():
+    rendered = render_page(PAGE, "fixture", SAQ, "saq", "year3/exams/fixture.html")
+    first = region(rendered, prerender.CONTAINER_OPEN)
+    assert ('<div class="question-text">Shared records<div class="sub-questions">'
+            '<div class="sub-question">a. 2 acts</div><div class="sub-question">b. 5 &lt;benefits&gt;</div></div></div>'
+            '<div class="answer-area"><textarea id="answerInput"') in first
+    assert '<span>1</span><span class="flag-indicator">' in region(rendered, prerender.NAV_OPEN)
+    assert '<script src="../../js/exam-prerender.js"></script>' in rendered
+
+    template, questions = hydrate(rendered)
+    assert template["data-kind"] == "saq"
+    assert questions == [{"id": 1, "text": "Shared records", "subQuestions": ["a. 2 acts", "b. 5 <benefits>"]},
+                         {"id": 2, "text": "No parts"}]
+
+
+@pytest.mark.parametrize("exam", list(EXAMS))
+def test_committed_pages_hold_their_json(exam):
+    """Every exam page is up to date with content/exams/<exam>.json and hydrates back to it."""
+    data = prerender.load_exam(exam)
+    pages = prerender.exam_pages(exam)
+    assert pages
+    for page in pages:
+        current = (ROOT / page).read_text(encoding="utf-8")
+        assert render_page(current, exam, data, EXAMS[exam], page) == current, f"{page} is stale: run scp prerender"
+
+        template, questions = hydrate(current)
+        assert template["data-title"] == data["title"]
+        assert len(questions) == len(data["questions"])
+        for hydrated, source in zip(questions, data["questions"]):
+            assert hydrated["id"] == source["id"]
+            assert hydrated["text"] == source["text"]
+            assert hydrated.get("options", []) == source.get("options", [])
+            assert hydrated.get("subQuestions", []) == source.get("subQuestions", [])
+            assert hydrated.get("correctAnswer") == source.get("correctAnswer")
+            assert ("imageUrl" in hydrated) == bool(source.get("imageUrl"))
+
+
+def function_source(page_html, name):
+    """The source of ``function name(...) {...}`` in a page's inline script."""
+    start = page_html.index(f"function {name}(")
+    depth = 0
+    for index in range(page_html.index("{", start), len(page_html)):
+        depth += {"{": 1, "}": -1}.get(page_html[index], 0)
+        if depth == 0:
+            return page_html[start:index + 1]
+    raise ValueError(f"unterminated {name}()")
+
+
+# Enough of the DOM for loadQuestion() to run; records what it writes into #questionContainer
+CLIENT_HARNESS = """
+const written = {};
+const element = id => new Proxy(function () {}, {
+  get: (target, prop) => prop === Symbol.iterator ? [][Symbol.iterator] : element(id),
+  set: (target, prop, value) => { written[id + '.' + String(prop)] = value; return true; },
+  apply: () => element(id),
+});
+const document = {
+  getElementById: id => element(id),
+  querySelector: () => element('query'),
+  querySelectorAll: () => [],
+};
+const examData = DATA;
+let currentQuestionIndex = 0, isReviewMode = false;
+const saveCurrentAnswer = () => {}, generateQuestionNav = () => {}, saveProgress = () => {},
+      updateProgress = () => {}, updateNavButtons = () => {}, selectAnswer = () => {};
+LOAD_QUESTION
+loadQuestion(0);
+console.log(JSON.stringify(written['questionContainer.innerHTML']));
+"""
+
+
+def normalise(markup):
+    markup = re.sub(r' data-(?:question-id|correct-answer)="[^"]*"', "", markup)
+    return html.unescape(re.sub(r">\s+<", "><", markup).strip())
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="node not installed")
+@pytest.mark.parametrize("layout, data", [("mcq-image", MCQ), ("mcq", MCQ), ("saq", SAQ)])
+def test_first_question_matches_client_render(layout, data):
+    page = CLIENT_PAGES[layout]
+    if layout == "mcq":
+        data = dict(data, questions=[{k: v for k, v in q.items() if k != "imageUrl"} for q in data["questions"]])
+    rendered = render_page(PAGE, "fixture", data, layout, page)
+    _, questions = hydrate(rendered)
+
+    # examData as hydrate() returns it, plus the per-question state it initialises
+    for question in questions:
+        question["flagged"] = False
+        if layout == "saq":
+            question["answer"] = ""
+        else:
+            question["selectedAnswer"] = None
+            question["hasImage"] = "imageUrl" in question
+    exam_data = {"title": data["title"], "totalQuestions": len(questions), "questions": questions}
+
+    script = (CLIENT_HARNESS.replace("DATA", json.dumps(exam_data))
+              .replace("LOAD_QUESTION", function_source((ROOT / page).read_text(encoding="utf-8"), "loadQuestion")))
+    result = subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True)
+    client = json.loads(result.stdout)
+    # The client inserts the (already unescaped) text as-is; compare text, not escaping
+    assert normalise(client) == normalise(render_question(data["questions"][0], 0, layout, page))
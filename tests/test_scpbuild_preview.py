@@ -0,0 +1,152 @@
+"""
+Preview server (scpbuild.preview) against a small public directory:
+redirects, conditional and range requests, precompressed siblings and
+paths that try to leave the public directory.
+"""
+
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from scpbuild.hosting import HostingConfig
+from scpbuild.preview import parse_range, start_server
+
+CSS = b"body { margin: 0 }\n" * 10
+
+
+@pytest.fixture
+def config(tmp_path):
+    public = tmp_path / "public"
+    files = {
+        "index.html": b"<h1>Home</h1>",
+        "404.html": b"<h1>Not here</h1>",
+        "year3/cases/case1_1.html": b"<h1>Case 1.1</h1>",
+        "css/main.css": CSS,
+        "css/main.css.gz": gzip.compress(CSS),
+        ".env": b"SECRET=1",
+    }
+    for rel_path, data in files.items():
+        path = public / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+    (tmp_path / "secret.txt").write_text("outside the public directory", encoding="utf-8")
+
+    config_path = tmp_path / "firebase.json"
+    config_path.write_text(json.dumps({"hosting": {
+        "public": "public",
+        "ignore": ["firebase.json", "**/.*"],
+        "cleanUrls": True,
+        "redirects": [{"source": "/cases/:file", "destination": "/year3/cases/:file", "type": 301}],
+        "headers": [{"source": "**/*.css", "headers": [{"key": "Cache-Control", "value": "max-age=31536000"}]}],
+    }}), encoding="utf-8")
+    return HostingConfig(config_path)
+
+
+async def request(port, target, headers=None, method="GET"):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    lines = [f"{method} {target} HTTP/1.1", "Host: localhost", "Connection: close"]
+    lines += [f"{key}: {value}" for key, value in (headers or {}).items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+    response = await reader.read()
+    writer.close()
+    head, _, body = response.partition(b"\r\n\r\n")
+    status_line, *header_lines = head.decode("latin-1").split("\r\n")
+    response_headers = {}
+    for line in header_lines:
+        key, value = line.split(":", 1)
+        response_headers[key.strip()] = value.strip()
+    return int(status_line.split(" ")[1]), response_headers, body
+
+
+def fetch_all(config, requests):
+    """Serve ``config`` and make each (target, headers) request in turn."""
+    async def run():
+        _, server = await start_server(config, "127.0.0.1", 0, log=False)
+        port = server.sockets[0].getsockname()[1]
+        try:
+            return [await request(port, target, headers) for target, headers in requests]
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    return asyncio.run(run())
+
+
+def test_redirect_and_clean_urls(config):
+    (status, headers, _), (clean, _, body) = fetch_all(config, [
+        ("/cases/case1_1.html", None),
+        ("/year3/cases/case1_1", None),
+    ])
+    assert status == 301
+    assert headers["Location"] == "/year3/cases/case1_1.html"
+    assert clean == 200 and body == b"<h1>Case 1.1</h1>"
+
+
+def test_etag_and_304(config):
+    ((status, headers, body),) = fetch_all(config, [("/css/main.css", None)])
+    assert status == 200 and body == CSS
+    assert headers["Cache-Control"] == "max-age=31536000"
+    assert headers["Content-Type"] == "text/css; charset=utf-8"
+    assert headers["Vary"] == "Accept-Encoding" and "Content-Encoding" not in headers
+
+    etag = headers["ETag"]
+    (status, headers, body), (other, _, _) = fetch_all(config, [
+        ("/css/main.css", {"If-None-Match": f'"stale", {etag}'}),
+        ("/css/main.css", {"If-None-Match": '"stale"'}),
+    ])
+    assert status == 304 and body == b"" and headers["ETag"] == etag
+    assert other == 200
+
+
+def test_precompressed_sibling(config):
+    ((status, headers, body),) = fetch_all(config, [("/css/main.css", {"Accept-Encoding": "br, gzip"})])
+    assert status == 200
+    assert headers["Content-Encoding"] == "gzip"
+    assert gzip.decompress(body) == CSS
+
+
+def test_range_requests(config):
+    size = len(CSS)
+    etag = fetch_all(config, [("/css/main.css", None)])[0][1]["ETag"]
+    (partial, headers, body), (suffix, _, tail), (invalid, bad_headers, _), (stale, _, whole) = fetch_all(config, [
+        ("/css/main.css", {"Range": "bytes=5-14"}),
+        ("/css/main.css", {"Range": "bytes=-4"}),
+        ("/css/main.css", {"Range": f"bytes={size}-"}),
+        ("/css/main.css", {"Range": "bytes=0-3", "If-Range": '"stale"'}),
+    ])
+    assert partial == 206 and body == CSS[5:15]
+    assert headers["Content-Range"] == f"bytes 5-14/{size}" and headers["Content-Length"] == "10"
+    assert suffix == 206 and tail == CSS[-4:]
+    assert invalid == 416 and bad_headers["Content-Range"] == f"bytes */{size}"
+    assert stale == 200 and whole == CSS
+
+    ((status, _, body),) = fetch_all(config, [("/css/main.css", {"Range": "bytes=0-3", "If-Range": etag})])
+    assert status == 206 and body == CSS[:4]
+
+
+def test_parse_range():
+    assert parse_range("bytes=0-0", 10) == (0, 0)
+    assert parse_range("bytes=5-", 10) == (5, 9)
+    assert parse_range("bytes=5-100", 10) == (5, 9)
+    assert parse_range("bytes=-3", 10) == (7, 9)
+    assert parse_range("bytes=-30", 10) == (0, 9)
+    assert parse_range("bytes=10-", 10) == "invalid"
+    assert parse_range("bytes=6-5", 10) == "invalid"
+    assert parse_range("bytes=-0", 10) == "invalid"
+    # Multi-range and other units are served whole
+    assert parse_range("bytes=0-1,4-5", 10) is None
+    assert parse_range("lines=1-2", 10) is None
+
+
+def test_paths_outside_public_are_not_served(config):
+    responses = fetch_all(config, [
+        ("/../secret.txt", None),
+        ("/%2e%2e/secret.txt", None),
+        ("/css/../../secret.txt", None),
+        ("/.env", None),
+    ])
+    for status, _, body in responses:
+        assert status == 404
+        assert body == b"<h1>Not here</h1>"
@@ -0,0 +1,107 @@
+"""
+PDF previews (scpbuild.previews): the index that maps each PDF to its case
+page, and the files ``scp dist`` publishes for linked PDFs and case pages.
+
+Rendering itself needs the ``previews`` extra; the index is built here
+from renders that are already on disk.
+"""
+
+import json
+import shutil
+
+import pytest
+
+from scpbuild import paths, previews
+from scpbuild.manifest import MANIFEST_PATH
+from scpbuild.previews import INDEX_NAME, META_NAME, build, file_sha256, published_files, render_pdf
+
+SETTINGS = {"preview_width": previews.PREVIEW_WIDTH, "thumb_width": previews.THUMB_WIDTH, "quality": previews.QUALITY}
+
+PDFS = {
+    "pdfs/Medicine/Cardiology/1.1_Hypertension.pdf": b"%PDF-1.4 hypertension",
+    # Same bytes under another name: one render, two entries
+    "pdfs/Medicine/Cardiology/copy/1.1_Hypertension.pdf": b"%PDF-1.4 hypertension",
+    "pdfs/Medicine/Renal/14.2_Renal Calculi.pdf": b"%PDF-1.4 calculi",
+    "pdfs/Medicine/Renal/99.9_Not In The Manifest.pdf": b"%PDF-1.4 unknown",
+    "pdfs/Surgery/reading.pdf": b"%PDF-1.4 reading",
+}
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    root = tmp_path / "site"
+    out_root = root / "previews"
+    for rel_path, data in PDFS.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        # An existing render, so build() only indexes
+        render = out_root / file_sha256(path)[:16]
+        render.mkdir(parents=True, exist_ok=True)
+        (render / META_NAME).write_text(json.dumps({
+            "settings": SETTINGS, "pages": 2, "preview": ["preview.webp", 480, 679],
+            "thumbs": [["p1.webp", 160, 226], ["p2.webp", 160, 226]],
+        }), encoding="utf-8")
+    (out_root / "0123456789abcdef.x1y2z3").mkdir()  # left over from an interrupted render
+    (root / "content").mkdir()
+    shutil.copy(MANIFEST_PATH, root / "content/manifest.json")
+    monkeypatch.setattr(paths, "BASE_DIR", root)
+    monkeypatch.setattr(previews, "BASE_DIR", root)
+    monkeypatch.setattr(previews, "DIGEST_CACHE_PATH", tmp_path / "previews.json")
+    return root
+
+
+def test_index_maps_pdfs_to_case_pages(site):
+    out_root = site / "previews"
+    index, counts, failed = build(sorted((site / "pdfs").rglob("*.pdf")), out_root)
+    assert failed == [] and counts == {"rendered": 0, "reused": 4, "pruned": 1}
+
+    pdfs = index["pdfs"]
+    assert index["version"] == previews.INDEX_VERSION
+    hypertension = pdfs["pdfs/Medicine/Cardiology/1.1_Hypertension.pdf"]
+    assert hypertension["case"] == "1_1" and hypertension["page"] == "year3/cases/case1_1.html"
+    assert hypertension["dir"] == pdfs["pdfs/Medicine/Cardiology/copy/1.1_Hypertension.pdf"]["dir"]
+    assert pdfs["pdfs/Medicine/Renal/14.2_Renal Calculi.pdf"]["page"] == "year3/cases/case14_2.html"
+    # Case numbers the manifest does not know, and PDFs that are not cases, have no page
+    assert pdfs["pdfs/Medicine/Renal/99.9_Not In The Manifest.pdf"]["page"] is None
+    assert pdfs["pdfs/Surgery/reading.pdf"] == dict(pdfs["pdfs/Surgery/reading.pdf"], case=None, page=None)
+    assert json.loads((out_root / INDEX_NAME).read_text(encoding="utf-8")) == index
+
+
+def test_published_files_by_case_page_and_link(site):
+    out_root = site / "previews"
+    index, _, _ = build(sorted((site / "pdfs").rglob("*.pdf")), out_root)
+    calculi = index["pdfs"]["pdfs/Medicine/Renal/14.2_Renal Calculi.pdf"]["dir"]
+
+    # A published case page brings its PDF, the preview, the thumbnails and the index
+    assert published_files({"index.html", "year3/cases/case14_2.html"}, out_root) == {
+        "pdfs/Medicine/Renal/14.2_Renal Calculi.pdf",
+        f"{calculi}/preview.webp", f"{calculi}/p1.webp", f"{calculi}/p2.webp",
+        f"previews/{INDEX_NAME}",
+    }
+    # So does a page linking a PDF that has no case page
+    assert "pdfs/Surgery/reading.pdf" in published_files({"pdfs/Surgery/reading.pdf"}, out_root)
+    # The same case id in another year is a different case
+    assert published_files({"year4/cases/case1_1.html"}, out_root) == set()
+    assert published_files({"year3/cases/case1_1.html"}, site / "unbuilt") == set()
+
+
+def test_concurrent_renders_of_identical_pdfs(tmp_path):
+    pdfium = pytest.importorskip("pypdfium2")
+    pytest.importorskip("PIL")
+    from concurrent.futures import ProcessPoolExecutor
+
+    pdf = pdfium.PdfDocument.new()
+    for _ in range(2):
+        pdf.new_page(595, 842)
+    pdf_path = tmp_path / "1.1_Case.pdf"
+    pdf.save(pdf_path)
+    pdf.close()
+
+    out_dir = tmp_path / "previews" / file_sha256(pdf_path)[:16]
+    with ProcessPoolExecutor(max_workers=4) as pool:
+        results = list(pool.map(render_pdf, [(str(pdf_path), str(out_dir), SETTINGS)] * 4))
+    assert all(error is None and meta["pages"] == 2 for _, meta, error in results)
+    assert sorted(path.name for path in out_dir.iterdir()) == [META_NAME, "p1.webp", "p2.webp", "preview.webp"]
+    # No temporary directories are left behind
+    assert [path.name for path in out_dir.parent.iterdir()] == [out_dir.name]
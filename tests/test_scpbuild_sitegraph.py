@@ -0,0 +1,121 @@
+"""
+The cached site graph (scpbuild.sitegraph): parsing, URL resolution and
+the size/mtime cache shared by hints, links, dist and packs.
+"""
+
+import os
+
+import pytest
+
+from scpbuild import sitegraph
+from scpbuild.sitegraph import build_graph, parse_refs, resolve, script_targets
+
+PAGE = """<!DOCTYPE html>
+<html>
+<head>
+  <link rel="stylesheet" href="../../css/case.css">
+  <script src="../../js/case.js" defer></script>
+  <script type="module" src="../../js/app.mjs"></script>
+</head>
+<body>
+  <a href="../index.html">Back</a>
+  <button onclick="location.href='case1_2.html'">Next</button>
+  <script>
+    window.location.href = `../../exams/${year}.html`;
+  </script>
+</body>
+</html>
+"""
+
+
+@pytest.fixture
+def site(tmp_path, monkeypatch):
+    root = tmp_path / "site"
+    files = {
+        "year3/cases/case1_1.html": PAGE,
+        "js/case.js": "function next() { location.assign('/year3/index.html?filter=1'); }\n",
+        "css/case.css": "body { background: url('../img/bg.png'); }\n@import \"print.css\";\n",
+    }
+    for rel_path, text in files.items():
+        path = root / rel_path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(text, encoding="utf-8")
+    monkeypatch.setattr(sitegraph, "CACHE_PATH", tmp_path / "sitegraph.json")
+    return root
+
+
+def as_lists(graph):
+    return {path: [ref.to_list() for ref in refs] for path, refs in graph.items()}
+
+
+def test_parse_refs():
+    refs = parse_refs(PAGE)
+    assert [(ref.tag, ref.url, ref.in_head) for ref in refs] == [
+        ("link", "../../css/case.css", True),
+        ("script", "../../js/case.js", True),
+        ("script", "../../js/app.mjs", True),
+        ("a", "../index.html", False),
+        ("js", "case1_2.html", False),
+        ("js-glob", "../../exams/*.html", False),
+    ]
+    assert refs[0].rel == "stylesheet"
+    assert refs[1].attrs == {"src": "../../js/case.js", "defer": None}
+    assert refs[2].attrs["type"] == "module"
+    assert refs[4].line == 10
+
+
+def test_script_targets():
+    text = ("location.href = 'SCP2.html?filter=' + name;\n"
+            "window.open(`case${id}.html`);\n"
+            "location.replace(`${base}/x.html`);\n"
+            "location = `year3/index.html?week=${week}`;\n")
+    assert list(script_targets(text)) == [
+        (1, "SCP2.html?filter=", "js"),
+        (2, "case*.html", "js-glob"),
+        (4, "year3/index.html?week=", "js"),
+    ]
+
+
+@pytest.mark.parametrize("page, url, expected", [
+    ("year3/cases/case1_1.html", "../../css/case.css", "css/case.css"),
+    ("year3/cases/case1_1.html", "/year3/index.html?x=1#top", "year3/index.html"),
+    ("year3/cases/case1_1.html", "../", "year3/index.html"),
+    ("index.html", "/", "index.html"),
+    ("index.html", "a%20b.html", "a b.html"),
+    ("index.html", "../outside.html", None),
+    ("index.html", "https://example.com/", None),
+    ("index.html", "#top", None),
+])
+def test_resolve(page, url, expected):
+    assert resolve(page, url) == expected
+
+
+def test_cached_graph_matches_a_fresh_parse(site):
+    paths = ["year3/cases/case1_1.html", "js/case.js", "css/case.css"]
+    fresh, reparsed = build_graph(paths, base_dir=site)
+    assert reparsed == 3
+    assert [ref.url for ref in fresh["css/case.css"]] == ["../img/bg.png", "print.css"]
+    assert [ref.url for ref in fresh["js/case.js"]] == ["/year3/index.html?filter=1"]
+
+    cached, reparsed = build_graph(paths, base_dir=site)
+    assert reparsed == 0
+    assert as_lists(cached) == as_lists(fresh)
+    # Attributes survive the cache, so hints sees defer/module scripts either way
+    assert cached["year3/cases/case1_1.html"][1].attrs == {"src": "../../js/case.js", "defer": None}
+
+
+def test_cache_reparses_changed_files_only(site):
+    paths = ["year3/cases/case1_1.html", "js/case.js", "css/case.css"]
+    build_graph(paths, base_dir=site)
+
+    script = site / "js/case.js"
+    script.write_text("location.href = 'index.html';\n", encoding="utf-8")
+    stat = script.stat()
+    os.utime(script, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    graph, reparsed = build_graph(paths, base_dir=site)
+    assert reparsed == 1
+    assert [ref.url for ref in graph["js/case.js"]] == ["index.html"]
+
+    # A stale cache version is ignored
+    sitegraph.CACHE_PATH.write_text('{"version": 1, "files": {}}', encoding="utf-8")
+    assert build_graph(paths, base_dir=site)[1] == 3
@@ -0,0 +1,224 @@
+"""
+Packed user state (scpbuild.userstate) against a JSON-lines export.
+
+The migration deletes users' per-case progress and flag documents, so
+these check the bit layout (against js/core/UserState.js when node is
+installed), every legacy path layout, batching and re-runs.
+"""
+
+import json
+import shutil
+import subprocess
+from pathlib import Path
+
+import pytest
+
+from scpbuild.manifest import assign_ids, case_numbers
+from scpbuild.userstate import (
+    QUESTION_STRIDE,
+    STATE_VERSION,
+    ExportSource,
+    decode_bits,
+    encode_bits,
+    fold_user,
+    legacy_bit,
+    migrate,
+)
+
+USER_STATE_JS = Path(__file__).resolve().parent.parent / "js" / "core" / "UserState.js"
+
+MANIFEST = {
+    "years": {
+        "year3": {"weeks": [{"week": 1, "cases": [{"id": "1_1", "n": 0}, {"id": "1_2", "n": 1}]},
+                            {"week": 12, "cases": [{"id": "12_1", "n": 2}]}]},
+        "year4": {"weeks": [{"week": 1, "cases": [{"id": "1_1", "n": 3}]}]},
+    },
+    "next_ids": {"case": 4, "question": 0},
+}
+NUMBERS = case_numbers(MANIFEST)
+
+STAMP = {"_seconds": 1700000000, "_nanoseconds": 0}
+
+
+def bit(n, question=None):
+    return n if question is None else n * QUESTION_STRIDE + question - 1
+
+
+@pytest.fixture
+def export(tmp_path):
+    """Two users in every legacy layout, one already packed, plus a case with no stable id."""
+    docs = [
+        ("users/u1", {"email": "a@example.com"}),
+        ("users/u1/progress/1_1", {"completed": True, "completedAt": STAMP}),
+        ("users/u1/flags/1_2_q3", {"flagged": True}),
+        ("users/u1/caseFlags/12_1", {"flagged": True}),
+        ("users/u1/year3/progress/cases/1_2", {"completed": True}),
+        ("users/u1/year4/flags/questions/1_1_q10", {"flagged": True}),
+        ("users/u1/year4/flags/cases/1_1", {"flagged": True}),
+        ("users/u1/year3/progress/cases/99_9", {"completed": True}),
+        ("users/u2", {"state": {"version": STATE_VERSION, "completed": {"__bytes__": "BA=="}}}),
+        ("users/u2/year3/progress/cases/1_1", {"completed": True}),
+    ]
+    path = tmp_path / "users.jsonl"
+    path.write_text("".join(json.dumps({"path": p, "data": d}) + "\n" for p, d in docs), encoding="utf-8")
+    return path
+
+
+def test_bitset_layout():
+    assert encode_bits(set()) == b""
+    assert encode_bits({0}) == b"\x01"
+    assert encode_bits({9, 15}) == b"\x00\x82"
+    # Trailing zero bytes are dropped; decoding ignores them
+    assert encode_bits({3, 200}) == bytes([8]) + bytes(24) + bytes([1])
+    assert decode_bits(b"\x01\x00\x00") == {0}
+    bits = {0, 7, 8, 63, 64, 1000, 2783}
+    assert decode_bits(encode_bits(bits)) == bits
+
+
+@pytest.mark.skipif(not shutil.which("node"), reason="node not installed")
+def test_bitset_layout_matches_user_state_js():
+    bits = [0, 5, 8, 17, 255, 256, 1000, 2783]
+    script = (
+        "globalThis.window = globalThis;\n"
+        f"require({json.dumps(str(USER_STATE_JS))});\n"
+        f"const bits = {json.dumps(bits)};\n"
+        "const bytes = UserState.encode(bits);\n"
+        "const decoded = Array.from(UserState.decode(bytes)).sort((a, b) => a - b);\n"
+        "console.log(JSON.stringify({bytes: Array.from(bytes), decoded, stride: UserState.QUESTION_STRIDE}));\n"
+    )
+    result = json.loads(subprocess.run(["node", "-e", script], capture_output=True, text=True, check=True).stdout)
+    assert bytes(result["bytes"]) == encode_bits(set(bits))
+    assert result["decoded"] == bits
+    assert result["stride"] == QUESTION_STRIDE
+
+
+@pytest.mark.parametrize("path, expected", [
+    ("users/u1/progress/1_1", ("completed", bit(0))),
+    ("users/u1/flags/1_2_q3", ("questionFlags", bit(1, 3))),
+    ("users/u1/caseFlags/12_1", ("caseFlags", bit(2))),
+    ("users/u1/year3/progress/cases/1_2", ("completed", bit(1))),
+    ("users/u1/year4/flags/questions/1_1_q10", ("questionFlags", bit(3, 10))),
+    ("users/u1/year4/flags/cases/1_1", ("caseFlags", bit(3))),
+    # Year-prefixed keys win over the collection's year
+    ("users/u1/progress/year4_1_1", ("completed", bit(3))),
+    # Not migratable: unknown case, question out of range, flag key shapes crossed, other collections
+    ("users/u1/year3/progress/cases/99_9", None),
+    ("users/u1/flags/1_1_q17", None),
+    ("users/u1/flags/1_1", None),
+    ("users/u1/caseFlags/1_1_q1", None),
+    ("users/u1/sessions/s1", None),
+    ("users/u1", None),
+])
+def test_legacy_bit_layouts(path, expected):
+    assert legacy_bit(path, NUMBERS) == expected
+
+
+def test_fold_user_ors_into_existing_state(export):
+    docs = dict(ExportSource(export).users())
+    state, migrated, unknown = fold_user("u2", docs["u2"], NUMBERS)
+    # bit 2 was already packed, bit 0 comes from the per-case document
+    assert state["completed"] == {0, 2}
+    assert migrated == ["users/u2/year3/progress/cases/1_1"]
+    assert unknown == []
+
+    state, migrated, unknown = fold_user("u1", docs["u1"], NUMBERS)
+    assert state == {
+        "completed": {bit(0), bit(1)},
+        "caseFlags": {bit(2), bit(3)},
+        "questionFlags": {bit(1, 3), bit(3, 10)},
+    }
+    assert len(migrated) == 6
+    assert unknown == ["users/u1/year3/progress/cases/99_9"]
+
+
+def test_migrate_export(export):
+    source = ExportSource(export)
+    stats = migrate(source, NUMBERS, ["year3", "year4"], log=lambda message: None)
+    source.close()
+    assert stats["migrated_users"] == 2
+    assert stats["migrated_docs"] == 7
+    assert stats["unknown_docs"] == 1
+
+    docs = ExportSource(export).docs
+    assert sorted(docs) == ["users/u1", "users/u1/year3/progress/cases/99_9", "users/u2"]
+    assert docs["users/u1"]["email"] == "a@example.com"
+    state = docs["users/u1"]["state"]
+    assert state["version"] == STATE_VERSION
+    assert decode_bits(state["questionFlags"]) == {bit(1, 3), bit(3, 10)}
+    assert decode_bits(docs["users/u2"]["state"]["completed"]) == {0, 2}
+
+    # A second run finds nothing left to fold
+    source = ExportSource(export)
+    stats = migrate(source, NUMBERS, ["year3", "year4"], log=lambda message: None)
+    assert (stats["migrated_users"], stats["writes"]) == (0, 0)
+
+
+def test_dry_run_writes_nothing(export):
+    before = export.read_text(encoding="utf-8")
+    source = ExportSource(export)
+    stats = migrate(source, NUMBERS, ["year3"], dry_run=True, log=lambda message: None)
+    source.close()
+    assert stats["writes"] == 9
+    assert export.read_text(encoding="utf-8") == before
+
+
+class RecordingSource(ExportSource):
+    def __init__(self, path):
+        super().__init__(path)
+        self.batches = []
+
+    def commit(self, writes):
+        self.batches.append(list(writes))
+        super().commit(writes)
+
+
+def test_writes_are_batched(tmp_path):
+    lines = []
+    for user in range(40):
+        for case in ("1_1", "1_2", "12_1"):
+            lines.append({"path": f"users/u{user}/year3/progress/cases/{case}", "data": {"completed": True}})
+            for question in range(1, 11):
+                lines.append({"path": f"users/u{user}/year3/flags/questions/{case}_q{question}", "data": {}})
+    path = tmp_path / "users.jsonl"
+    path.write_text("".join(json.dumps(line) + "\n" for line in lines), encoding="utf-8")
+
+    source = RecordingSource(path)
+    stats = migrate(source, NUMBERS, ["year3"], log=lambda message: None)
+    writes = [write for batch in source.batches for write in batch]
+    assert stats["writes"] == len(writes) == len(lines) + 40
+    assert all(len(batch) <= 500 for batch in source.batches)
+    assert stats["batches"] == len(source.batches) == -(-len(writes) // 500)
+
+    # Each user's state is set before any of the documents it replaces are deleted
+    seen = set()
+    for kind, doc_path, _ in writes:
+        uid = doc_path.split("/")[1]
+        if kind == "set":
+            seen.add(uid)
+        else:
+            assert uid in seen
+
+    source = RecordingSource(path)
+    migrate(source, NUMBERS, ["year3"], batch_size=7, dry_run=True, log=lambda message: None)
+    assert source.batches == []
+
+
+def test_assign_ids_never_reuses_ids():
+    manifest = json.loads(json.dumps(MANIFEST))
+    weeks = manifest["years"]["year3"]["weeks"]
+    # Retire case 1_2 (n=1), then add two new cases
+    weeks[0]["cases"] = [case for case in weeks[0]["cases"] if case["id"] != "1_2"]
+    weeks[1]["cases"] += [{"id": "12_2"}, {"id": "12_3"}]
+    exams = {"mcq": {"questions": [{"id": "q1", "n": 0}, {"id": "q2"}]}}
+    manifest["next_ids"]["question"] = 1
+
+    assert assign_ids(manifest, exams) == 3
+    numbers = case_numbers(manifest)
+    assert numbers["year3_12_2"] == 4 and numbers["year3_12_3"] == 5
+    assert 1 not in numbers.values()
+    assert numbers["year3_1_1"] == 0 and numbers["year4_1_1"] == 3
+    assert exams["mcq"]["questions"][1] == {"id": "q2", "n": 1}
+
+    # Ids are kept on re-runs
+    assert assign_ids(manifest, exams) == 0
+    assert case_numbers(manifest) == numbers
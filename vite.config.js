@@ -9,7 +9,7 @@ export default defineConfig({
     host: true
   },
   build: {
-    outDir: 'dist',
+    outDir: 'build', // dist/ is the scp dist publish directory
     rollupOptions: {
       input: {
         main: './index.html'